@@ -9,7 +9,12 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from app.database.config import get_supabase, get_supabase_admin
+from app.database.async_db import execute, gather, run_blocking
 from app.enrichment.auto_fill_orchestrator import AutoFillOrchestrator
+from app.enrichment.async_auto_fill_orchestrator import AsyncAutoFillOrchestrator
+from app.jobs.job_queue import get_notification_queue
+from app.jobs.notification_worker import run_notification_worker_task
+from app.schemas.notifications import NotificationChannel, NotificationPriority, NotificationType
 from app.enrichment.web_search_enricher import WebSearchEnricher
 from app.enrichment.field_scrapers import FieldSpecificScrapers
 from app.utils.security import (
@@ -17,7 +22,10 @@ from app.utils.security import (
     require_senior_admin, require_content_admin, require_finance_admin,
     require_support_admin, require_analytics_admin, apply_regional_filter,
 )
+from app.utils.principal_cache import invalidate_principal
 from app.utils.activity_logger import get_recent_activities, ActivityType
+from app.services.activity_rollups import ActivityRollups
+from app.services.user_growth import get_user_growth_engine
 from app.schemas.activity import (
     RecentActivityResponse,
     ActivityLogResponse,
@@ -171,9 +179,9 @@ async def analyze_null_values(
     """
     try:
         db = get_supabase()
-        orchestrator = AutoFillOrchestrator(db)
+        orchestrator = AsyncAutoFillOrchestrator(db)
 
-        analysis = orchestrator.analyze_null_values()
+        analysis = await run_blocking(orchestrator.analyze_null_values)
 
         # Sort by null count (descending)
         sorted_analysis = dict(sorted(
@@ -299,7 +307,7 @@ async def create_admin_user(
         admin_db = get_supabase_admin()
 
         # 1. Create Supabase Auth user via admin API
-        auth_response = admin_db.auth.admin.create_user({
+        auth_response = await run_blocking(admin_db.auth.admin.create_user, {
             "email": request.email,
             "password": request.password,
             "email_confirm": True,
@@ -313,7 +321,8 @@ async def create_admin_user(
         # Explicitly confirm email (belt-and-suspenders for Supabase versions
         # where email_confirm in create_user may not take effect)
         try:
-            admin_db.auth.admin.update_user_by_id(
+            await run_blocking(
+                admin_db.auth.admin.update_user_by_id,
                 new_user_id,
                 {"email_confirm": True}
             )
@@ -321,7 +330,7 @@ async def create_admin_user(
             logger.warning(f"Could not explicitly confirm email: {confirm_err}")
 
         # 2. Insert into users table
-        admin_db.table('users').insert({
+        await execute(admin_db.table('users').insert({
             'id': new_user_id,
             'email': request.email,
             'display_name': request.display_name,
@@ -329,17 +338,17 @@ async def create_admin_user(
             'available_roles': [request.admin_role],
             'phone_number': request.phone_number,
             'is_active': True,
-        }).execute()
+        }))
 
         # 3. Insert into admin_users table
         permissions = _ROLE_PERMISSIONS.get(request.admin_role, {})
-        admin_db.table('admin_users').insert({
+        await execute(admin_db.table('admin_users').insert({
             'id': new_user_id,
             'admin_role': request.admin_role,
             'permissions': permissions,
             'regional_scope': request.regional_scope,
             'is_active': True,
-        }).execute()
+        }))
 
         logger.info(
             f"Admin {current_user.id} ({current_user.role}) created admin user "
@@ -377,7 +386,7 @@ async def get_current_admin_profile(
     """
     try:
         db = get_supabase()
-        response = db.table('admin_users').select('*').eq('id', current_user.id).single().execute()
+        response = await execute(db.table('admin_users').select('*').eq('id', current_user.id).single())
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Admin profile not found")
@@ -413,9 +422,9 @@ async def list_admin_users(
     """
     try:
         db = get_supabase()
-        response = db.table('admin_users').select(
+        response = await execute(db.table('admin_users').select(
             '*, users!inner(email, display_name)'
-        ).execute()
+        ))
 
         # Determine caller's hierarchy level for filtering
         caller_role = UserRole.normalize_role(current_user.role)
@@ -472,9 +481,9 @@ async def get_admin_user(
     """
     try:
         db = get_supabase()
-        response = db.table('admin_users').select(
+        response = await execute(db.table('admin_users').select(
             '*, users!inner(email, display_name, phone_number)'
-        ).eq('id', admin_id).single().execute()
+        ).eq('id', admin_id).single())
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Admin user not found")
@@ -529,7 +538,7 @@ async def update_admin_user(
         if request.admin_role == 'regionaladmin' and not request.regional_scope:
             # Check if existing record already has regional_scope
             db = get_supabase()
-            existing = db.table('admin_users').select('regional_scope').eq('id', admin_id).single().execute()
+            existing = await execute(db.table('admin_users').select('regional_scope').eq('id', admin_id).single())
             if not (existing.data and existing.data.get('regional_scope')):
                 raise HTTPException(
                     status_code=400,
@@ -541,7 +550,7 @@ async def update_admin_user(
     caller_level = _ROLE_HIERARCHY.get(caller_role, 0)
     if caller_level < 3:
         db = get_supabase()
-        existing_admin = db.table('admin_users').select('admin_role').eq('id', admin_id).single().execute()
+        existing_admin = await execute(db.table('admin_users').select('admin_role').eq('id', admin_id).single())
         if existing_admin.data:
             existing_role = existing_admin.data.get('admin_role', '')
             existing_level = _ROLE_HIERARCHY.get(existing_role, 0)
@@ -567,7 +576,7 @@ async def update_admin_user(
             user_updates['is_active'] = request.is_active
 
         if user_updates:
-            admin_db.table('users').update(user_updates).eq('id', admin_id).execute()
+            await execute(admin_db.table('users').update(user_updates).eq('id', admin_id))
 
         # Update admin_users table fields
         admin_updates = {}
@@ -580,7 +589,9 @@ async def update_admin_user(
             admin_updates['is_active'] = request.is_active
 
         if admin_updates:
-            admin_db.table('admin_users').update(admin_updates).eq('id', admin_id).execute()
+            await execute(admin_db.table('admin_users').update(admin_updates).eq('id', admin_id))
+
+        invalidate_principal(admin_id)
 
         logger.info(
             f"Admin {current_user.id} ({current_user.role}) updated admin user {admin_id}"
@@ -667,13 +678,13 @@ async def get_recent_activity(
             query = query.eq('action_type', action_type)
 
         # Get total count (before limit)
-        count_response = query.execute()
+        count_response = await execute(query)
         total_count = count_response.count if count_response.count else 0
 
         # Apply limit and ordering
         query = query.order('timestamp', desc=True).limit(limit)
 
-        response = query.execute()
+        response = await execute(query)
 
         activities = []
         if response.data:
@@ -732,114 +743,11 @@ async def get_activity_stats(
     - recent_applications: Number of recent application submissions
     """
     try:
-        db = get_supabase()
-
-        # Get current time boundaries
-        now = datetime.utcnow()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_start = today_start - timedelta(days=today_start.weekday())
-        month_start = today_start.replace(day=1)
-
-        # Total activities
-        total_response = db.table('activity_log').select('id', count='exact').execute()
-        total_activities = total_response.count if total_response.count else 0
-
-        # Activities today
-        today_response = db.table('activity_log').select('id', count='exact').gte(
-            'timestamp', today_start.isoformat()
-        ).execute()
-        activities_today = today_response.count if today_response.count else 0
-
-        # Activities this week
-        week_response = db.table('activity_log').select('id', count='exact').gte(
-            'timestamp', week_start.isoformat()
-        ).execute()
-        activities_this_week = week_response.count if week_response.count else 0
-
-        # Activities this month
-        month_response = db.table('activity_log').select('id', count='exact').gte(
-            'timestamp', month_start.isoformat()
-        ).execute()
-        activities_this_month = month_response.count if month_response.count else 0
-
-        # Top action types (last 30 days)
-        thirty_days_ago = now - timedelta(days=30)
-        action_types_response = db.table('activity_log').select('action_type').gte(
-            'timestamp', thirty_days_ago.isoformat()
-        ).execute()
-
-        top_action_types = {}
-        if action_types_response.data:
-            for activity in action_types_response.data:
-                action_type = activity['action_type']
-                top_action_types[action_type] = top_action_types.get(action_type, 0) + 1
-
-        # Sort and get top 10
-        top_action_types = dict(sorted(
-            top_action_types.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10])
-
-        # Top users (last 30 days)
-        users_response = db.table('activity_log').select(
-            'user_id, user_name, user_email'
-        ).gte(
-            'timestamp', thirty_days_ago.isoformat()
-        ).not_.is_('user_id', 'null').execute()
-
-        user_activity_counts = {}
-        if users_response.data:
-            for activity in users_response.data:
-                user_id = activity['user_id']
-                if user_id not in user_activity_counts:
-                    user_activity_counts[user_id] = {
-                        'user_id': user_id,
-                        'user_name': activity.get('user_name', 'Unknown'),
-                        'user_email': activity.get('user_email', 'Unknown'),
-                        'activity_count': 0
-                    }
-                user_activity_counts[user_id]['activity_count'] += 1
-
-        top_users = sorted(
-            user_activity_counts.values(),
-            key=lambda x: x['activity_count'],
-            reverse=True
-        )[:10]
-
-        # Recent registrations (last 7 days)
-        seven_days_ago = now - timedelta(days=7)
-        registrations_response = db.table('activity_log').select('id', count='exact').eq(
-            'action_type', ActivityType.USER_REGISTRATION
-        ).gte('timestamp', seven_days_ago.isoformat()).execute()
-        recent_registrations = registrations_response.count if registrations_response.count else 0
-
-        # Recent logins (last 24 hours)
-        logins_response = db.table('activity_log').select('id', count='exact').eq(
-            'action_type', ActivityType.USER_LOGIN
-        ).gte('timestamp', today_start.isoformat()).execute()
-        recent_logins = logins_response.count if logins_response.count else 0
-
-        # Recent applications (last 7 days)
-        applications_response = db.table('activity_log').select('id', count='exact').eq(
-            'action_type', ActivityType.APPLICATION_SUBMITTED
-        ).gte('timestamp', seven_days_ago.isoformat()).execute()
-        recent_applications = applications_response.count if applications_response.count else 0
-
-        return ActivityStatsResponse(
-            total_activities=total_activities,
-            activities_today=activities_today,
-            activities_this_week=activities_this_week,
-            activities_this_month=activities_this_month,
-            top_action_types=top_action_types,
-            top_users=top_users,
-            recent_registrations=recent_registrations,
-            recent_logins=recent_logins,
-            recent_applications=recent_applications
-        )
+        # Pre-aggregated buckets maintained by the activity logger
+        return await ActivityRollups(get_supabase()).get_stats()
 
     except Exception as e:
-        logger.warning(f"Error fetching activity stats (activity_log table may not exist): {e}")
+        logger.warning(f"Error fetching activity stats (rollup tables may not exist): {e}")
         # Return default response if table doesn't exist
         return ActivityStatsResponse(
             total_activities=0,
@@ -881,14 +789,14 @@ async def clear_all_courses(
         db = get_supabase()
 
         # Get count before deletion
-        count_response = db.table('courses').select('id', count='exact').execute()
+        count_response = await execute(db.table('courses').select('id', count='exact'))
         count = count_response.count or 0
 
         if count == 0:
             return {"deleted_count": 0, "message": "No courses to delete"}
 
         # Delete all courses
-        db.table('courses').delete().neq('id', 'impossible-id-that-wont-match').execute()
+        await execute(db.table('courses').delete().neq('id', 'impossible-id-that-wont-match'))
 
         logger.info(f"Admin {current_user.id} deleted all {count} courses")
 
@@ -920,11 +828,11 @@ async def get_courses_count(
         db = get_supabase()
 
         # Get total count
-        total_response = db.table('courses').select('id', count='exact').execute()
+        total_response = await execute(db.table('courses').select('id', count='exact'))
         total = total_response.count or 0
 
         # Get breakdown by status
-        all_courses = db.table('courses').select('status').execute()
+        all_courses = await execute(db.table('courses').select('status'))
 
         by_status = {"draft": 0, "published": 0, "archived": 0}
         if all_courses.data:
@@ -968,9 +876,9 @@ async def get_user_activity(
     try:
         db = get_supabase()
 
-        response = db.table('activity_log').select('*').eq(
+        response = await execute(db.table('activity_log').select('*').eq(
             'user_id', user_id
-        ).order('timestamp', desc=True).limit(limit).execute()
+        ).order('timestamp', desc=True).limit(limit))
 
         activities = []
         if response.data:
@@ -1069,104 +977,16 @@ async def get_user_growth_analytics(
     - average_per_period: Average users registered per month
     """
     try:
-        db = get_supabase()
-        now = datetime.now(timezone.utc)
-
-        # Determine time range
-        if period == "1_year":
-            months_back = 12
-            comparison_months_back = 24
-        elif period == "3_months":
-            months_back = 3
-            comparison_months_back = 6
-        else:  # default 6_months
-            months_back = 6
-            comparison_months_back = 12
-
-        start_date = now - timedelta(days=months_back * 30)
-        comparison_start_date = now - timedelta(days=comparison_months_back * 30)
-        comparison_end_date = start_date
-
-        # Get all users with registration dates
-        response = db.table('users').select('id, created_at, active_role').order('created_at').execute()
-
-        if not response.data:
-            return UserGrowthResponse(
-                data_points=[],
-                total_users=0,
-                growth_rate=0.0,
-                period=period,
-                comparison_period_users=0,
-                average_per_period=0.0
-            )
-
-        # Aggregate by month
-        month_counts = {}
-        total_users = len(response.data)
-        current_period_users = 0
-        comparison_period_users = 0
-
-        for user in response.data:
-            created_at_str = user['created_at']
-            # Parse datetime and ensure timezone awareness
-            if created_at_str:
-                try:
-                    created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                    # Ensure timezone awareness
-                    if created_at.tzinfo is None:
-                        created_at = created_at.replace(tzinfo=timezone.utc)
-                except Exception:
-                    continue  # Skip invalid dates
-
-                # Count for current period
-                if created_at >= start_date:
-                    current_period_users += 1
-                    # Group by month
-                    month_key = created_at.strftime('%Y-%m')
-                    month_label = created_at.strftime('%b')  # Jan, Feb, etc.
-
-                    if month_key not in month_counts:
-                        month_counts[month_key] = {
-                            'label': month_label,
-                            'value': 0,
-                            'date': created_at.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                        }
-                    month_counts[month_key]['value'] += 1
-
-                # Count for comparison period
-                if comparison_start_date <= created_at < comparison_end_date:
-                    comparison_period_users += 1
-
-        # Convert to list and sort by date
-        data_points_raw = sorted(month_counts.values(), key=lambda x: x['date'])
-
-        # Calculate cumulative values for better visualization
-        cumulative = 0
-        data_points = []
-        for point in data_points_raw:
-            cumulative += point['value']
-            data_points.append(DataPoint(
-                label=point['label'],
-                value=cumulative,  # Cumulative total
-                date=point['date']
-            ))
-
-        # Calculate growth rate
-        if comparison_period_users > 0:
-            growth_rate = ((current_period_users - comparison_period_users) / comparison_period_users) * 100
-        else:
-            growth_rate = 100.0 if current_period_users > 0 else 0.0
-
-        # Average per month
-        average_per_period = current_period_users / months_back if months_back > 0 else 0.0
+        snapshot = await get_user_growth_engine().get_snapshot(get_supabase())
+        growth = snapshot.growth(period)
 
         return UserGrowthResponse(
-            data_points=data_points,
-            total_users=total_users,
-            growth_rate=round(growth_rate, 2),
+            data_points=[DataPoint(**point) for point in growth['data_points']],
+            total_users=growth['total_users'],
+            growth_rate=growth['growth_rate'],
             period=period,
-            comparison_period_users=comparison_period_users,
-            average_per_period=round(average_per_period, 2)
+            comparison_period_users=growth['comparison_period_users'],
+            average_per_period=growth['average_per_period']
         )
 
     except Exception as e:
@@ -1198,12 +1018,11 @@ async def get_role_distribution_analytics(
     - role_percentages: Percentage breakdown by role
     """
     try:
-        db = get_supabase()
+        snapshot = await get_user_growth_engine().get_snapshot(get_supabase())
+        role_counts = snapshot.role_counts
+        total_users = snapshot.total_users
 
-        # Get all users with roles
-        response = db.table('users').select('active_role').execute()
-
-        if not response.data:
+        if not role_counts:
             return RoleDistributionResponse(
                 distributions=[],
                 total_users=0,
@@ -1211,14 +1030,6 @@ async def get_role_distribution_analytics(
                 role_percentages={}
             )
 
-        # Count by role
-        role_counts = {}
-        total_users = len(response.data)
-
-        for user in response.data:
-            role = user.get('active_role', 'unknown')
-            role_counts[role] = role_counts.get(role, 0) + 1
-
         # Convert to data points
         distributions = []
         role_percentages = {}
@@ -1318,7 +1129,7 @@ async def get_all_users_for_admin(
         # Apply regional scope filter for regional admins
         query = apply_regional_filter(query, current_user, region_column='location')
 
-        response = query.execute()
+        response = await execute(query)
 
         users = []
         for user_data in response.data or []:
@@ -1389,19 +1200,30 @@ async def get_enhanced_metrics(
         days_7_ago = now - timedelta(days=7)
         days_14_ago = now - timedelta(days=14)
 
-        # Active users (last 30 days) - users who logged in
-        active_30_response = db.table('activity_log').select('user_id', count='exact').eq(
-            'action_type', ActivityType.USER_LOGIN
-        ).gte('timestamp', days_30_ago.isoformat()).execute()
+        # Login activity and applications run concurrently; registrations
+        # and role totals come from the cached registration rollups
+        active_30_response, active_60_response, apps_7_response, apps_14_response = await gather(
+            # Active users (last 30 days) - users who logged in
+            db.table('activity_log').select('user_id').eq(
+                'action_type', ActivityType.USER_LOGIN
+            ).gte('timestamp', days_30_ago.isoformat()),
+            # Active users (previous 30 days)
+            db.table('activity_log').select('user_id').eq(
+                'action_type', ActivityType.USER_LOGIN
+            ).gte('timestamp', days_60_ago.isoformat()).lt('timestamp', days_30_ago.isoformat()),
+            # Applications (last 7 days)
+            db.table('applications').select('id', count='exact').gte(
+                'created_at', days_7_ago.isoformat()
+            ),
+            # Applications (previous 7 days)
+            db.table('applications').select('id', count='exact').gte(
+                'created_at', days_14_ago.isoformat()
+            ).lt('created_at', days_7_ago.isoformat()),
+        )
+        snapshot = await get_user_growth_engine().get_snapshot(db)
 
         # Unique active users
         active_users_30days = len(set([a['user_id'] for a in active_30_response.data if a.get('user_id')])) if active_30_response.data else 0
-
-        # Active users (previous 30 days)
-        active_60_response = db.table('activity_log').select('user_id').eq(
-            'action_type', ActivityType.USER_LOGIN
-        ).gte('timestamp', days_60_ago.isoformat()).lt('timestamp', days_30_ago.isoformat()).execute()
-
         active_users_30days_previous = len(set([a['user_id'] for a in active_60_response.data if a.get('user_id')])) if active_60_response.data else 0
 
         # Calculate change percent
@@ -1410,33 +1232,16 @@ async def get_enhanced_metrics(
         else:
             active_users_change_percent = 100.0 if active_users_30days > 0 else 0.0
 
-        # New registrations (last 7 days)
-        reg_7_response = db.table('users').select('id', count='exact').gte(
-            'created_at', days_7_ago.isoformat()
-        ).execute()
-        new_registrations_7days = reg_7_response.count if reg_7_response.count else 0
-
-        # New registrations (previous 7 days)
-        reg_14_response = db.table('users').select('id', count='exact').gte(
-            'created_at', days_14_ago.isoformat()
-        ).lt('created_at', days_7_ago.isoformat()).execute()
-        new_registrations_7days_previous = reg_14_response.count if reg_14_response.count else 0
+        # New registrations (last 7 days vs previous 7 days)
+        new_registrations_7days = snapshot.registrations(days_7_ago.date())
+        new_registrations_7days_previous = snapshot.registrations(days_14_ago.date(), days_7_ago.date())
 
         if new_registrations_7days_previous > 0:
             registrations_change_percent = ((new_registrations_7days - new_registrations_7days_previous) / new_registrations_7days_previous) * 100
         else:
             registrations_change_percent = 100.0 if new_registrations_7days > 0 else 0.0
 
-        # Applications (last 7 days)
-        apps_7_response = db.table('applications').select('id', count='exact').gte(
-            'created_at', days_7_ago.isoformat()
-        ).execute()
         applications_7days = apps_7_response.count if apps_7_response.count else 0
-
-        # Applications (previous 7 days)
-        apps_14_response = db.table('applications').select('id', count='exact').gte(
-            'created_at', days_14_ago.isoformat()
-        ).lt('created_at', days_7_ago.isoformat()).execute()
         applications_7days_previous = apps_14_response.count if apps_14_response.count else 0
 
         if applications_7days_previous > 0:
@@ -1445,21 +1250,11 @@ async def get_enhanced_metrics(
             applications_change_percent = 100.0 if applications_7days > 0 else 0.0
 
         # Total users by role
-        all_users_response = db.table('users').select('active_role', count='exact').execute()
-        total_users = all_users_response.count if all_users_response.count else 0
-
-        # Count by role (using active_role column)
-        students_response = db.table('users').select('id', count='exact').eq('active_role', 'student').execute()
-        total_students = students_response.count if students_response.count else 0
-
-        institutions_response = db.table('users').select('id', count='exact').eq('active_role', 'institution').execute()
-        total_institutions = institutions_response.count if institutions_response.count else 0
-
-        parents_response = db.table('users').select('id', count='exact').eq('active_role', 'parent').execute()
-        total_parents = parents_response.count if parents_response.count else 0
-
-        counselors_response = db.table('users').select('id', count='exact').eq('active_role', 'counselor').execute()
-        total_counselors = counselors_response.count if counselors_response.count else 0
+        total_users = snapshot.total_users
+        total_students = snapshot.role_counts.get('student', 0)
+        total_institutions = snapshot.role_counts.get('institution', 0)
+        total_parents = snapshot.role_counts.get('parent', 0)
+        total_counselors = snapshot.role_counts.get('counselor', 0)
 
         return EnhancedMetricsResponse(
             active_users_30days=active_users_30days,
@@ -1584,7 +1379,7 @@ async def get_all_content_for_admin(
         if search:
             query = query.ilike('title', f'%{search}%')
 
-        response = query.order('created_at', desc=True).execute()
+        response = await execute(query.order('created_at', desc=True))
 
         content_items = []
         stats = {'draft': 0, 'published': 0, 'archived': 0, 'pending': 0}
@@ -1598,7 +1393,7 @@ async def get_all_content_for_admin(
             institution_name = None
             institution_id = course.get('institution_id')
             if institution_id:
-                inst_response = db.table('users').select('display_name').eq('id', institution_id).single().execute()
+                inst_response = await execute(db.table('users').select('display_name').eq('id', institution_id).single())
                 if inst_response.data:
                     institution_name = inst_response.data.get('display_name')
 
@@ -1659,7 +1454,7 @@ async def get_content_statistics(
         db = get_supabase()
 
         # Get all courses
-        response = db.table('courses').select('status, category, course_type').execute()
+        response = await execute(db.table('courses').select('status, category, course_type'))
 
         stats = AdminContentStatsResponse()
         by_type: Dict[str, int] = {}
@@ -1739,7 +1534,7 @@ async def update_content_status(
         else:
             update_data['is_published'] = False
 
-        response = db.table('courses').update(update_data).eq('id', content_id).execute()
+        response = await execute(db.table('courses').update(update_data).eq('id', content_id))
 
         if not response.data:
             raise HTTPException(
@@ -1783,10 +1578,10 @@ async def delete_content(
         db = get_supabase()
 
         # Soft delete by setting status to archived
-        response = db.table('courses').update({
+        response = await execute(db.table('courses').update({
             'status': 'archived',
             'updated_at': datetime.utcnow().isoformat()
-        }).eq('id', content_id).execute()
+        }).eq('id', content_id))
 
         if not response.data:
             raise HTTPException(
@@ -1882,7 +1677,7 @@ async def create_content(
         if request.institution_id:
             content_data['institution_id'] = request.institution_id
 
-        response = db.table('courses').insert(content_data).execute()
+        response = await execute(db.table('courses').insert(content_data))
 
         if not response.data:
             raise HTTPException(
@@ -1969,7 +1764,7 @@ async def assign_content(
         import uuid
 
         # Verify content exists
-        content_response = db.table('courses').select('id, title').eq('id', request.content_id).single().execute()
+        content_response = await execute(db.table('courses').select('id, title').eq('id', request.content_id).single())
         if not content_response.data:
             raise HTTPException(
                 status_code=404,
@@ -1995,7 +1790,7 @@ async def assign_content(
             }
 
             try:
-                response = db.table('content_assignments').insert(assignment_data).execute()
+                response = await execute(db.table('content_assignments').insert(assignment_data))
                 if response.data:
                     assignments_created.append(ContentAssignmentResponse(
                         id=response.data[0]['id'],
@@ -2039,7 +1834,7 @@ async def assign_content(
         # Create assignments for each target
         for target_id in target_ids:
             # Get target name
-            target_response = db.table('users').select('display_name').eq('id', target_id).single().execute()
+            target_response = await execute(db.table('users').select('display_name').eq('id', target_id).single())
             target_name = target_response.data.get('display_name', 'Unknown') if target_response.data else 'Unknown'
 
             assignment_data = {
@@ -2057,7 +1852,7 @@ async def assign_content(
 
             # Check if content_assignments table exists, if not use a fallback
             try:
-                response = db.table('content_assignments').insert(assignment_data).execute()
+                response = await execute(db.table('content_assignments').insert(assignment_data))
                 if response.data:
                     assignments_created.append(ContentAssignmentResponse(
                         id=response.data[0]['id'],
@@ -2128,12 +1923,12 @@ async def get_content_assignments(
         db = get_supabase()
 
         # Get content title
-        content_response = db.table('courses').select('title').eq('id', content_id).single().execute()
+        content_response = await execute(db.table('courses').select('title').eq('id', content_id).single())
         content_title = content_response.data.get('title', 'Unknown') if content_response.data else 'Unknown'
 
         # Get assignments
         try:
-            response = db.table('content_assignments').select('*').eq('content_id', content_id).execute()
+            response = await execute(db.table('content_assignments').select('*').eq('content_id', content_id))
             assignments = []
 
             for assignment in response.data or []:
@@ -2143,7 +1938,7 @@ async def get_content_assignments(
                 target_name = 'All Students'
 
                 if target_id and target_type != 'all_students':
-                    user_response = db.table('users').select('display_name').eq('id', target_id).single().execute()
+                    user_response = await execute(db.table('users').select('display_name').eq('id', target_id).single())
                     target_name = user_response.data.get('display_name', 'Unknown') if user_response.data else 'Unknown'
 
                 assignments.append(ContentAssignmentResponse(
@@ -2206,7 +2001,7 @@ async def remove_content_assignment(
     try:
         db = get_supabase()
 
-        response = db.table('content_assignments').delete().eq('id', assignment_id).execute()
+        response = await execute(db.table('content_assignments').delete().eq('id', assignment_id))
 
         logger.info(f"Admin {current_user.id} removed content assignment {assignment_id}")
 
@@ -2310,13 +2105,13 @@ async def get_support_tickets(
             query = query.ilike('subject', f'%{search}%')
 
         # Get total count first
-        count_response = db.table('support_tickets').select('id', count='exact').execute()
+        count_response = await execute(db.table('support_tickets').select('id', count='exact'))
         total = count_response.count if count_response.count else 0
 
         # Apply pagination and ordering
         query = query.order('created_at', desc=True).range(offset, offset + limit - 1)
 
-        response = query.execute()
+        response = await execute(query)
 
         tickets = []
         status_counts = {'open': 0, 'in_progress': 0, 'resolved': 0, 'closed': 0}
@@ -2329,7 +2124,7 @@ async def get_support_tickets(
             # Get assigned admin name
             assigned_to_name = None
             if ticket_data.get('assigned_to'):
-                admin_response = db.table('users').select('display_name').eq('id', ticket_data['assigned_to']).single().execute()
+                admin_response = await execute(db.table('users').select('display_name').eq('id', ticket_data['assigned_to']).single())
                 if admin_response.data:
                     assigned_to_name = admin_response.data.get('display_name')
 
@@ -2387,7 +2182,7 @@ async def create_support_ticket(
         user_name = None
         user_email = None
         if request.user_id:
-            user_response = db.table('users').select('display_name, email').eq('id', request.user_id).single().execute()
+            user_response = await execute(db.table('users').select('display_name, email').eq('id', request.user_id).single())
             if user_response.data:
                 user_name = user_response.data.get('display_name')
                 user_email = user_response.data.get('email')
@@ -2406,7 +2201,7 @@ async def create_support_ticket(
             'updated_at': datetime.utcnow().isoformat(),
         }
 
-        response = db.table('support_tickets').insert(ticket_data).execute()
+        response = await execute(db.table('support_tickets').insert(ticket_data))
 
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create ticket")
@@ -2459,7 +2254,7 @@ async def update_ticket_status(
         if request.status.lower() in ['resolved', 'closed']:
             update_data['resolved_at'] = datetime.utcnow().isoformat()
 
-        response = db.table('support_tickets').update(update_data).eq('id', ticket_id).execute()
+        response = await execute(db.table('support_tickets').update(update_data).eq('id', ticket_id))
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -2502,7 +2297,7 @@ async def assign_ticket(
             'updated_at': datetime.utcnow().isoformat(),
         }
 
-        response = db.table('support_tickets').update(update_data).eq('id', ticket_id).execute()
+        response = await execute(db.table('support_tickets').update(update_data).eq('id', ticket_id))
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -2538,7 +2333,7 @@ async def get_ticket_details(
     try:
         db = get_supabase()
 
-        response = db.table('support_tickets').select('*').eq('id', ticket_id).single().execute()
+        response = await execute(db.table('support_tickets').select('*').eq('id', ticket_id).single())
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Ticket not found")
@@ -2548,7 +2343,7 @@ async def get_ticket_details(
         # Get assigned admin name
         assigned_to_name = None
         if ticket_data.get('assigned_to'):
-            admin_response = db.table('users').select('display_name').eq('id', ticket_data['assigned_to']).single().execute()
+            admin_response = await execute(db.table('users').select('display_name').eq('id', ticket_data['assigned_to']).single())
             if admin_response.data:
                 assigned_to_name = admin_response.data.get('display_name')
 
@@ -2659,13 +2454,13 @@ async def get_transactions(
             query = query.lte('created_at', end_date)
 
         # Get total count
-        count_response = db.table('transactions').select('id', count='exact').execute()
+        count_response = await execute(db.table('transactions').select('id', count='exact'))
         total = count_response.count if count_response.count else 0
 
         # Apply pagination and ordering
         query = query.order('created_at', desc=True).range(offset, offset + limit - 1)
 
-        response = query.execute()
+        response = await execute(query)
 
         transactions = []
         total_revenue = 0.0
@@ -2728,7 +2523,7 @@ async def get_finance_stats(
         month_start = today_start.replace(day=1)
 
         # Get all transactions
-        response = db.table('transactions').select('*').execute()
+        response = await execute(db.table('transactions').select('*'))
 
         total_revenue = 0.0
         total_refunds = 0.0
@@ -2855,13 +2650,13 @@ async def get_campaigns(
             query = query.eq('status', status.lower())
 
         # Get total count
-        count_response = db.table('communication_campaigns').select('id', count='exact').execute()
+        count_response = await execute(db.table('communication_campaigns').select('id', count='exact'))
         total = count_response.count if count_response.count else 0
 
         # Apply pagination and ordering
         query = query.order('created_at', desc=True).range(offset, offset + limit - 1)
 
-        response = query.execute()
+        response = await execute(query)
 
         campaigns = []
         status_counts = {'draft': 0, 'scheduled': 0, 'sent': 0}
@@ -2932,7 +2727,7 @@ async def create_campaign(
             'updated_at': datetime.utcnow().isoformat(),
         }
 
-        response = db.table('communication_campaigns').insert(campaign_data).execute()
+        response = await execute(db.table('communication_campaigns').insert(campaign_data))
 
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create campaign")
@@ -2955,61 +2750,78 @@ async def create_campaign(
         )
 
 
-@router.post("/admin/communications/announcements")
+@router.post("/admin/communications/announcements", status_code=202)
 async def send_announcement(
     request: SendAnnouncementRequest,
+    background_tasks: BackgroundTasks,
     current_user: CurrentUser = Depends(require_admin)
 ) -> Dict[str, Any]:
     """
     Send an immediate announcement
 
     **Admin Only** - Send announcement to all users or specific roles.
+    Delivery runs as a background fan-out job; progress is available at
+    GET /notifications/broadcast/{job_id}.
     """
     try:
         db = get_supabase()
         import uuid
 
-        # Determine target users
-        target_users = []
-        if request.target_roles:
-            for role in request.target_roles:
-                users_response = db.table('users').select('id, email, display_name').eq('active_role', role.lower()).execute()
-                target_users.extend(users_response.data or [])
-        else:
-            # All users
-            users_response = db.table('users').select('id, email, display_name').execute()
-            target_users = users_response.data or []
+        target_roles = [role.lower() for role in request.target_roles] if request.target_roles else None
 
-        # Create announcement campaign record
+        # Create announcement campaign record (marked sent by the job when delivery finishes)
         campaign_data = {
             'id': str(uuid.uuid4()),
             'name': f"Announcement: {request.title}",
             'type': 'announcement',
-            'status': 'sent',
-            'target_audience': {'roles': request.target_roles or ['all']},
+            'status': 'scheduled',
+            'target_audience': {'roles': target_roles or ['all']},
             'content': {'title': request.title, 'message': request.message, 'priority': request.priority},
-            'sent_at': datetime.utcnow().isoformat(),
-            'stats': {'sent': len(target_users), 'delivered': len(target_users), 'opened': 0, 'clicked': 0},
+            'scheduled_at': datetime.utcnow().isoformat(),
+            'stats': {'sent': 0, 'delivered': 0, 'opened': 0, 'clicked': 0},
             'created_by': current_user.id,
             'created_at': datetime.utcnow().isoformat(),
             'updated_at': datetime.utcnow().isoformat(),
         }
 
+        campaign_id = None
         try:
-            db.table('communication_campaigns').insert(campaign_data).execute()
+            await execute(db.table('communication_campaigns').insert(campaign_data))
+            campaign_id = campaign_data['id']
         except Exception as table_error:
             logger.warning(f"communication_campaigns table may not exist: {table_error}")
 
-        logger.info(f"Admin {current_user.id} sent announcement to {len(target_users)} users: {request.title}")
+        priority = request.priority.lower()
+        if priority not in {p.value for p in NotificationPriority}:
+            priority = NotificationPriority.NORMAL.value
+
+        job = await run_blocking(
+            get_notification_queue().create_job,
+            {
+                'notification_type': NotificationType.SYSTEM.value,
+                'title': request.title,
+                'message': request.message,
+                'priority': priority,
+                'channels': [NotificationChannel.IN_APP.value],
+                'metadata': {'campaign_id': campaign_id} if campaign_id else {},
+            },
+            target_roles=target_roles,
+            campaign_id=campaign_id,
+            created_by=current_user.id
+        )
+        background_tasks.add_task(run_notification_worker_task)
+
+        logger.info(f"Admin {current_user.id} queued announcement {job.job_id}: {request.title}")
 
         return {
             'success': True,
-            'message': f'Announcement sent to {len(target_users)} users',
-            'recipients_count': len(target_users),
+            'message': 'Announcement queued for delivery',
+            'job_id': job.job_id,
+            'campaign_id': campaign_id,
             'announcement': {
                 'title': request.title,
                 'message': request.message,
-                'target_roles': request.target_roles or ['all'],
+                'target_roles': target_roles or ['all'],
             }
         }
 
@@ -3051,7 +2863,7 @@ async def update_campaign_status(
         if new_status == 'sent':
             update_data['sent_at'] = datetime.utcnow().isoformat()
 
-        response = db.table('communication_campaigns').update(update_data).eq('id', campaign_id).execute()
+        response = await execute(db.table('communication_campaigns').update(update_data).eq('id', campaign_id))
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -3089,7 +2901,7 @@ async def get_system_settings(
     """
     try:
         db = get_supabase_admin()
-        response = db.table('app_config').select('*').execute()
+        response = await execute(db.table('app_config').select('*'))
 
         settings: Dict[str, Any] = {}
         for row in (response.data or []):
@@ -3131,11 +2943,11 @@ async def update_system_settings(
         for key, value in body.settings.items():
             # value column is text not null — convert to string
             str_value = str(value) if value is not None else ''
-            db.table('app_config').upsert({
+            await execute(db.table('app_config').upsert({
                 'key': key,
                 'value': str_value,
                 'updated_at': datetime.now(timezone.utc).isoformat(),
-            }, on_conflict='key').execute()
+            }, on_conflict='key'))
             updated_keys.append(key)
 
         logger.info(
@@ -3143,7 +2955,7 @@ async def update_system_settings(
         )
 
         # Return the refreshed settings
-        response = db.table('app_config').select('*').execute()
+        response = await execute(db.table('app_config').select('*'))
         settings: Dict[str, Any] = {}
         for row in (response.data or []):
             k = row.get('key', '')
@@ -3292,11 +3104,11 @@ async def get_admin_curriculum(
             query = query.or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
 
         query = query.order('created_at', desc=True)
-        response = query.execute()
+        response = await execute(query)
         all_modules = response.data or []
 
         # Fetch lesson counts per module
-        lessons_resp = db.table('course_lessons').select('module_id, id').execute()
+        lessons_resp = await execute(db.table('course_lessons').select('module_id, id'))
         lessons_data = lessons_resp.data or []
         lesson_counts = {}
         for lesson in lessons_data:
@@ -3374,9 +3186,9 @@ async def get_admin_curriculum_detail(
         db = get_supabase_admin()
 
         # Fetch module with course info
-        mod_resp = db.table('course_modules').select(
+        mod_resp = await execute(db.table('course_modules').select(
             '*, courses(id, title)'
-        ).eq('id', module_id).single().execute()
+        ).eq('id', module_id).single())
         mod = mod_resp.data
 
         if not mod:
@@ -3385,9 +3197,9 @@ async def get_admin_curriculum_detail(
         course_data = mod.get('courses') or {}
 
         # Fetch lessons for this module
-        lessons_resp = db.table('course_lessons').select('*').eq(
+        lessons_resp = await execute(db.table('course_lessons').select('*').eq(
             'module_id', module_id
-        ).order('order_index').execute()
+        ).order('order_index'))
         lessons = lessons_resp.data or []
 
         lesson_list = []
@@ -3441,9 +3253,9 @@ async def get_admin_resources(
         resources = []
 
         # Fetch lessons with module and course info for context
-        lessons_resp = db.table('course_lessons').select(
+        lessons_resp = await execute(db.table('course_lessons').select(
             'id, title, module_id, course_modules(id, title, course_id, courses(id, title))'
-        ).execute()
+        ))
         lessons_data = lessons_resp.data or []
 
         # Build lesson context lookup
@@ -3464,7 +3276,7 @@ async def get_admin_resources(
             vid_query = db.table('lesson_videos').select('*')
             if search:
                 vid_query = vid_query.or_(f"title.ilike.%{search}%")
-            vid_resp = vid_query.execute()
+            vid_resp = await execute(vid_query)
             for v in (vid_resp.data or []):
                 lid = v.get('lesson_id')
                 ctx = lesson_context.get(lid, {})
@@ -3494,7 +3306,7 @@ async def get_admin_resources(
             txt_query = db.table('lesson_texts').select('*')
             if search:
                 txt_query = txt_query.or_(f"title.ilike.%{search}%")
-            txt_resp = txt_query.execute()
+            txt_resp = await execute(txt_query)
             for t in (txt_resp.data or []):
                 lid = t.get('lesson_id')
                 ctx = lesson_context.get(lid, {})
@@ -3572,9 +3384,9 @@ async def get_admin_assessments(
         assessments = []
 
         # Fetch lessons with context
-        lessons_resp = db.table('course_lessons').select(
+        lessons_resp = await execute(db.table('course_lessons').select(
             'id, title, module_id, course_modules(id, title, course_id, courses(id, title))'
-        ).execute()
+        ))
         lessons_data = lessons_resp.data or []
 
         lesson_context = {}
@@ -3594,10 +3406,10 @@ async def get_admin_assessments(
             quiz_query = db.table('lesson_quizzes').select('*')
             if search:
                 quiz_query = quiz_query.or_(f"title.ilike.%{search}%")
-            quiz_resp = quiz_query.execute()
+            quiz_resp = await execute(quiz_query)
 
             # Get question counts per quiz
-            questions_resp = db.table('quiz_questions').select('quiz_id, id').execute()
+            questions_resp = await execute(db.table('quiz_questions').select('quiz_id, id'))
             question_counts = {}
             for q in (questions_resp.data or []):
                 qid = q.get('quiz_id')
@@ -3605,9 +3417,9 @@ async def get_admin_assessments(
                     question_counts[qid] = question_counts.get(qid, 0) + 1
 
             # Get attempt stats per quiz
-            attempts_resp = db.table('quiz_attempts').select(
+            attempts_resp = await execute(db.table('quiz_attempts').select(
                 'quiz_id, score, passed'
-            ).execute()
+            ))
             attempt_stats = {}
             for a in (attempts_resp.data or []):
                 qid = a.get('quiz_id')
@@ -3662,12 +3474,12 @@ async def get_admin_assessments(
             asgn_query = db.table('lesson_assignments').select('*')
             if search:
                 asgn_query = asgn_query.or_(f"title.ilike.%{search}%")
-            asgn_resp = asgn_query.execute()
+            asgn_resp = await execute(asgn_query)
 
             # Get submission stats per assignment
-            subs_resp = db.table('assignment_submissions').select(
+            subs_resp = await execute(db.table('assignment_submissions').select(
                 'assignment_id, status, points_earned'
-            ).execute()
+            ))
             sub_stats = {}
             for s in (subs_resp.data or []):
                 aid = s.get('assignment_id')
@@ -3772,21 +3584,21 @@ async def get_admin_quiz_stats(
         db = get_supabase_admin()
 
         # Fetch quiz
-        quiz_resp = db.table('lesson_quizzes').select('*').eq('id', quiz_id).single().execute()
+        quiz_resp = await execute(db.table('lesson_quizzes').select('*').eq('id', quiz_id).single())
         quiz = quiz_resp.data
         if not quiz:
             raise HTTPException(status_code=404, detail="Quiz not found")
 
         # Fetch questions
-        questions_resp = db.table('quiz_questions').select('*').eq(
+        questions_resp = await execute(db.table('quiz_questions').select('*').eq(
             'quiz_id', quiz_id
-        ).order('order_index').execute()
+        ).order('order_index'))
         questions = questions_resp.data or []
 
         # Fetch attempts
-        attempts_resp = db.table('quiz_attempts').select(
+        attempts_resp = await execute(db.table('quiz_attempts').select(
             '*, users(id, display_name, email)'
-        ).eq('quiz_id', quiz_id).order('created_at', desc=True).execute()
+        ).eq('quiz_id', quiz_id).order('created_at', desc=True))
         attempts = attempts_resp.data or []
 
         scores = []
@@ -3861,17 +3673,17 @@ async def get_admin_assignment_submissions(
         db = get_supabase_admin()
 
         # Fetch assignment
-        asgn_resp = db.table('lesson_assignments').select('*').eq(
+        asgn_resp = await execute(db.table('lesson_assignments').select('*').eq(
             'id', assignment_id
-        ).single().execute()
+        ).single())
         assignment = asgn_resp.data
         if not assignment:
             raise HTTPException(status_code=404, detail="Assignment not found")
 
         # Fetch submissions
-        subs_resp = db.table('assignment_submissions').select(
+        subs_resp = await execute(db.table('assignment_submissions').select(
             '*, users(id, display_name, email)'
-        ).eq('assignment_id', assignment_id).order('submitted_at', desc=True).execute()
+        ).eq('assignment_id', assignment_id).order('submitted_at', desc=True))
         submissions = subs_resp.data or []
 
         sub_list = []
@@ -3990,7 +3802,7 @@ async def get_admin_courses_list(
     """Lightweight course list for dropdown selectors."""
     try:
         db = get_supabase_admin()
-        resp = db.table('courses').select('id, title, status').order('title').execute()
+        resp = await execute(db.table('courses').select('id, title, status').order('title'))
         courses = [
             {'id': c['id'], 'title': c.get('title', ''), 'status': c.get('status')}
             for c in (resp.data or [])
@@ -4009,9 +3821,9 @@ async def get_admin_modules_list(
     """Lightweight module list for a course, for dropdown selectors."""
     try:
         db = get_supabase_admin()
-        resp = db.table('course_modules').select(
+        resp = await execute(db.table('course_modules').select(
             'id, title, order_index'
-        ).eq('course_id', course_id).order('order_index').execute()
+        ).eq('course_id', course_id).order('order_index'))
         modules = [
             {'id': m['id'], 'title': m.get('title', ''), 'order_index': m.get('order_index', 0)}
             for m in (resp.data or [])
@@ -4032,16 +3844,16 @@ async def create_admin_module(
         db = get_supabase_admin()
 
         # Verify course exists
-        course_resp = db.table('courses').select('id, title').eq(
+        course_resp = await execute(db.table('courses').select('id, title').eq(
             'id', body.course_id
-        ).single().execute()
+        ).single())
         if not course_resp.data:
             raise HTTPException(status_code=404, detail="Course not found")
 
         # Get next order_index
-        existing = db.table('course_modules').select('order_index').eq(
+        existing = await execute(db.table('course_modules').select('order_index').eq(
             'course_id', body.course_id
-        ).order('order_index', desc=True).limit(1).execute()
+        ).order('order_index', desc=True).limit(1))
         next_order = (existing.data[0]['order_index'] + 1) if existing.data else 0
 
         # Create module
@@ -4052,7 +3864,7 @@ async def create_admin_module(
             'order_index': next_order,
             'is_published': False,
         }
-        result = db.table('course_modules').insert(insert_data).execute()
+        result = await execute(db.table('course_modules').insert(insert_data))
 
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create module")
@@ -4089,9 +3901,9 @@ async def create_admin_resource(
             raise HTTPException(status_code=400, detail="content is required for text resources")
 
         # Get next lesson order_index for this module
-        existing_lessons = db.table('course_lessons').select('order_index').eq(
+        existing_lessons = await execute(db.table('course_lessons').select('order_index').eq(
             'module_id', body.module_id
-        ).order('order_index', desc=True).limit(1).execute()
+        ).order('order_index', desc=True).limit(1))
         next_order = (existing_lessons.data[0]['order_index'] + 1) if existing_lessons.data else 0
 
         # Step 1: Create the lesson
@@ -4103,7 +3915,7 @@ async def create_admin_resource(
             'is_published': False,
             'is_mandatory': True,
         }
-        lesson_result = db.table('course_lessons').insert(lesson_data).execute()
+        lesson_result = await execute(db.table('course_lessons').insert(lesson_data))
         if not lesson_result.data:
             raise HTTPException(status_code=500, detail="Failed to create lesson")
 
@@ -4118,7 +3930,7 @@ async def create_admin_resource(
                 'duration_seconds': body.duration_seconds,
                 'title': body.lesson_title,
             }
-            db.table('lesson_videos').insert(content_data).execute()
+            await execute(db.table('lesson_videos').insert(content_data))
         else:
             content_data = {
                 'lesson_id': lesson_id,
@@ -4127,7 +3939,7 @@ async def create_admin_resource(
                 'estimated_reading_time': body.estimated_reading_time,
                 'title': body.lesson_title,
             }
-            db.table('lesson_texts').insert(content_data).execute()
+            await execute(db.table('lesson_texts').insert(content_data))
 
         logger.info(
             f"Admin {current_user.id} created {body.resource_type} resource "
@@ -4170,9 +3982,9 @@ async def create_admin_assessment(
             )
 
         # Get next lesson order_index
-        existing_lessons = db.table('course_lessons').select('order_index').eq(
+        existing_lessons = await execute(db.table('course_lessons').select('order_index').eq(
             'module_id', body.module_id
-        ).order('order_index', desc=True).limit(1).execute()
+        ).order('order_index', desc=True).limit(1))
         next_order = (existing_lessons.data[0]['order_index'] + 1) if existing_lessons.data else 0
 
         # Step 1: Create the lesson
@@ -4184,7 +3996,7 @@ async def create_admin_assessment(
             'is_published': False,
             'is_mandatory': True,
         }
-        lesson_result = db.table('course_lessons').insert(lesson_data).execute()
+        lesson_result = await execute(db.table('course_lessons').insert(lesson_data))
         if not lesson_result.data:
             raise HTTPException(status_code=500, detail="Failed to create lesson")
 
@@ -4198,7 +4010,7 @@ async def create_admin_assessment(
                 'passing_score': body.passing_score or 70.0,
                 'time_limit_minutes': body.time_limit_minutes,
             }
-            db.table('lesson_quizzes').insert(quiz_data).execute()
+            await execute(db.table('lesson_quizzes').insert(quiz_data))
         else:
             assignment_data = {
                 'lesson_id': lesson_id,
@@ -4207,7 +4019,7 @@ async def create_admin_assessment(
                 'points_possible': body.points_possible or 100,
                 'due_date': body.due_date,
             }
-            db.table('lesson_assignments').insert(assignment_data).execute()
+            await execute(db.table('lesson_assignments').insert(assignment_data))
 
         logger.info(
             f"Admin {current_user.id} created {body.assessment_type} "
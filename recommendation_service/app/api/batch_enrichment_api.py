@@ -8,8 +8,9 @@ from typing import Optional, List
 from datetime import datetime
 import asyncio
 
-from app.jobs.job_queue import job_queue, JobStatus
+from app.jobs.job_queue import job_queue, JobStatus, get_regeneration_queue
 from app.jobs.enrichment_worker import EnrichmentWorker
+from app.jobs.regeneration_worker import RegenerationWorker
 
 router = APIRouter()
 
@@ -67,6 +68,48 @@ class QueueStatsResponse(BaseModel):
     pending_queue_size: int
 
 
+class CreateRegenerationJobRequest(BaseModel):
+    """Request model for creating a recommendation regeneration job"""
+    student_ids: Optional[List[str]] = Field(None, description="Specific student profile IDs (None = all students)")
+    max_results: int = Field(15, ge=1, le=100, description="Recommendations to keep per student")
+    chunk_size: int = Field(200, ge=10, le=1000, description="Students per scoring task and write batch")
+    max_workers: Optional[int] = Field(None, ge=1, le=32, description="Scoring processes (None = one per CPU)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "chunk_size": 200,
+                "max_workers": 4
+            }
+        }
+
+
+class RegenerationJobResponse(BaseModel):
+    """Response model for regeneration job information"""
+    job_id: str
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+    # Job parameters
+    student_ids: Optional[List[str]] = None
+    max_results: int
+    chunk_size: int
+    max_workers: Optional[int] = None
+
+    # Progress
+    total_students: int
+    processed_students: int
+    recommendations_written: int
+    errors_count: int
+    cursor: Optional[str] = None
+
+    # Results
+    error_message: Optional[str] = None
+    results: Optional[dict] = None
+
+
 # Background task runner
 async def run_worker_task():
     """Run worker in background to process one job"""
@@ -74,6 +117,12 @@ async def run_worker_task():
     await worker.run(continuous=False)
 
 
+async def run_regeneration_worker_task():
+    """Run regeneration worker in background until the queue is empty"""
+    worker = RegenerationWorker()
+    await worker.run(continuous=False)
+
+
 # API Endpoints
 @router.post("/jobs", response_model=JobResponse, status_code=201)
 async def create_enrichment_job(
@@ -323,6 +372,57 @@ async def start_worker(background_tasks: BackgroundTasks):
     }
 
 
+@router.post("/recommendation-jobs", response_model=RegenerationJobResponse, status_code=201)
+async def create_regeneration_job(
+    request: CreateRegenerationJobRequest,
+    background_tasks: BackgroundTasks
+):
+    """
+    Regenerate recommendations for all (or selected) students
+
+    Loads the catalog once, scores students in chunks across a process pool
+    and bulk-upserts the results. Students' favorited/notes are preserved.
+    A job interrupted by a restart resumes after the last written student.
+
+    **Example Request:**
+    ```json
+    {
+        "chunk_size": 200,
+        "max_workers": 4
+    }
+    ```
+
+    **Returns:**
+    - Job details including job_id for tracking
+    """
+    job = get_regeneration_queue().create_job(
+        student_ids=request.student_ids,
+        max_results=request.max_results,
+        chunk_size=request.chunk_size,
+        max_workers=request.max_workers
+    )
+
+    background_tasks.add_task(run_regeneration_worker_task)
+
+    return RegenerationJobResponse(**job.to_dict())
+
+
+@router.get("/recommendation-jobs/{job_id}", response_model=RegenerationJobResponse)
+async def get_regeneration_job(job_id: str):
+    """
+    Get status and progress of a recommendation regeneration job
+
+    **Path Parameters:**
+    - `job_id`: Job identifier returned when creating the job
+    """
+    job = get_regeneration_queue().get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    return RegenerationJobResponse(**job.to_dict())
+
+
 @router.get("/health", status_code=200)
 async def batch_system_health():
     """
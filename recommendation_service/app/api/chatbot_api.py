@@ -805,7 +805,8 @@ async def get_admin_stats(
             "total_messages": total_messages,
             "user_messages": user_messages,
             "bot_messages": bot_messages,
-            "topic_counts": topic_counts
+            "topic_counts": topic_counts,
+            "response_cache": get_ai_chat_service().response_cache.stats()
         }
 
     except HTTPException:
@@ -1200,6 +1201,7 @@ async def create_faq(
 
         result = supabase.table('chatbot_faqs').insert(faq_data).execute()
         f = result.data[0]
+        await get_ai_chat_service().refresh_faqs(force=True)
 
         return FAQResponse(
             id=f['id'],
@@ -1264,6 +1266,7 @@ async def update_faq(
             )
 
         f = result.data[0]
+        await get_ai_chat_service().refresh_faqs(force=True)
 
         return FAQResponse(
             id=f['id'],
@@ -1304,6 +1307,7 @@ async def delete_faq(
         supabase = get_supabase()
 
         supabase.table('chatbot_faqs').delete().eq('id', faq_id).execute()
+        await get_ai_chat_service().refresh_faqs(force=True)
 
         return {"success": True}
 
@@ -547,6 +547,39 @@ async def get_available_slots(
         )
 
 
+@router.get("/counseling/first-available")
+async def get_first_available_counselor(
+    start_date: str = Query(..., description="Start date (ISO format)"),
+    end_date: str = Query(..., description="End date (ISO format)"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Get the earliest open booking slot across the caller's institution's counselors
+
+    Callers without an institution search all counselors.
+
+    **Requires:** Authentication
+
+    **Query Parameters:**
+    - start_date: Start of date range (ISO format)
+    - end_date: End of date range (ISO format)
+
+    **Returns:**
+    - slot: Earliest slot with start/end times and counselor_id (null if none)
+    """
+    try:
+        service = CounselingService()
+        result = await service.find_first_available_counselor(
+            start_date, end_date, institution_id=service.user_institution_id(current_user.id)
+        )
+        return {"slot": result}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.post("/counseling/sessions/book", status_code=status.HTTP_201_CREATED)
 async def book_session_as_student(
     counselor_id: str = Body(...),
@@ -7,7 +7,6 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import Optional, List
 import logging
-import aiohttp
 from datetime import datetime
 from app.database.config import get_supabase
 from app.enrichment.auto_fill_orchestrator import AutoFillOrchestrator
@@ -586,41 +585,45 @@ async def run_us_enrichment_job(job_id: str, limit: int):
         from app.enrichment.async_web_search_enricher import AsyncWebSearchEnricher
         from app.enrichment.async_field_scrapers import AsyncFieldScrapers
         from app.enrichment.async_college_scorecard_enricher import AsyncCollegeScorecardEnricher
-        from app.enrichment.async_enrichment_cache import AsyncEnrichmentCache
+        from app.enrichment.async_enrichment_cache import AsyncEnrichmentCache, ENRICHMENT_CACHE_WRITE_BATCH_SIZE
+        from app.enrichment.http_pool import get_http_pool
+
+        session = get_http_pool()  # Shared keep-alive session, per-host limits
+        web_enricher = AsyncWebSearchEnricher()
+        field_scrapers = AsyncFieldScrapers()
+        scorecard_enricher = AsyncCollegeScorecardEnricher()
+        cache = AsyncEnrichmentCache(db, write_batch_size=ENRICHMENT_CACHE_WRITE_BATCH_SIZE)
+        await cache.prefetch_async([u['id'] for u in universities])
 
-        async with aiohttp.ClientSession() as session:
-            web_enricher = AsyncWebSearchEnricher()
-            field_scrapers = AsyncFieldScrapers()
-            scorecard_enricher = AsyncCollegeScorecardEnricher()
-            cache = AsyncEnrichmentCache(db)
-
-            results = {'processed': 0, 'updated': 0, 'errors': 0, 'fields_filled': 0}
-
-            for university in universities:
-                try:
-                    enriched_data, fields_filled = await orchestrator.enrich_university_async(
-                        university, session, web_enricher, field_scrapers, scorecard_enricher, cache
-                    )
-
-                    if enriched_data:
-                        success = orchestrator.update_university(university['id'], enriched_data)
-                        if success:
-                            results['updated'] += 1
-                            results['fields_filled'] += fields_filled
-
-                    results['processed'] += 1
-
-                    # Update progress every 10 universities
-                    if results['processed'] % 10 == 0:
-                        _update_job_in_db(job_id, {
-                            'universities_processed': results['processed'],
-                            'universities_updated': results['updated'],
-                            'total_fields_filled': results['fields_filled']
-                        })
-
-                except Exception as e:
-                    logger.error(f"Error enriching {university.get('name')}: {e}")
-                    results['errors'] += 1
+        results = {'processed': 0, 'updated': 0, 'errors': 0, 'fields_filled': 0}
+
+        for university in universities:
+            try:
+                enriched_data, fields_filled = await orchestrator.enrich_university_async(
+                    university, session, web_enricher, field_scrapers, scorecard_enricher, cache
+                )
+
+                if enriched_data:
+                    success = orchestrator.update_university(university['id'], enriched_data)
+                    if success:
+                        results['updated'] += 1
+                        results['fields_filled'] += fields_filled
+
+                results['processed'] += 1
+
+                # Update progress every 10 universities
+                if results['processed'] % 10 == 0:
+                    _update_job_in_db(job_id, {
+                        'universities_processed': results['processed'],
+                        'universities_updated': results['updated'],
+                        'total_fields_filled': results['fields_filled']
+                    })
+
+            except Exception as e:
+                logger.error(f"Error enriching {university.get('name')}: {e}")
+                results['errors'] += 1
+
+        await cache.flush_async()
 
         _update_job_in_db(job_id, {
             'status': 'completed',
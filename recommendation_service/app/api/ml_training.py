@@ -14,7 +14,8 @@ training_status = {
     "status": "idle",
     "message": None,
     "last_trained": None,
-    "training_count": 0
+    "training_count": 0,
+    "active_version": None
 }
 
 
@@ -31,7 +32,7 @@ def train_models_background():
         # Import here to avoid loading if not needed
         from app.ml.feature_engineering import FeatureEngineer
         from app.ml.models import EnsembleRecommendationModel
-        from app.services.recommendation_engine import RecommendationEngine
+        from app.ml.model_registry import ML_MODELS_DIR, publish_model
         import numpy as np
         import os
         from datetime import datetime
@@ -60,16 +61,16 @@ def train_models_background():
         ml_model = EnsembleRecommendationModel(feature_engineer)
         ml_model.train_ranker(students, universities, programs_by_university, scores)
 
-        # Save models
-        model_dir = "ml_models"
-        os.makedirs(model_dir, exist_ok=True)
-        ml_model.save(model_dir)
+        # Publish as a new version; serving workers swap to it without a restart
+        model_dir = ML_MODELS_DIR
+        version = publish_model(ml_model, model_dir)
 
         training_status["is_training"] = False
         training_status["status"] = "completed"
         training_status["last_trained"] = datetime.utcnow().isoformat()
         training_status["training_count"] = training_status.get("training_count", 0) + 1
-        training_status["message"] = f"Models trained and saved to {model_dir}/ (training #{training_status['training_count']})"
+        training_status["active_version"] = version
+        training_status["message"] = f"Model version {version} published to {model_dir}/ (training #{training_status['training_count']})"
         logger.info("ML training completed successfully!")
 
     except Exception as e:
@@ -82,7 +83,8 @@ def train_models_background():
 def generate_synthetic_data(db, n_students=200, n_universities=500):
     """Generate synthetic training data"""
     import numpy as np
-    from app.services.recommendation_engine import RecommendationEngine
+    from app.services.program_index import ProgramMatchIndex
+    from app.services.vectorized_scorer import UniversityColumns, VectorizedScorer
 
     # Get data - use more universities as data quality improves
     response = db.table('universities').select('*').limit(n_universities).execute()
@@ -106,18 +108,12 @@ def generate_synthetic_data(db, n_students=200, n_universities=500):
         students.append(student)
 
     # Calculate scores
-    rule_engine = RecommendationEngine(db)
-    scores_list = []
-
-    for student in students:
-        student_scores = []
-        for university in universities:
-            dimension_scores = rule_engine._calculate_scores(student, university, programs_by_university)
-            total_score = rule_engine._calculate_total_score(dimension_scores)
-            student_scores.append(total_score)
-        scores_list.append(student_scores)
-
-    scores = np.array(scores_list)
+    scorer = VectorizedScorer(UniversityColumns(universities))
+    program_index = ProgramMatchIndex.from_programs_by_university(programs_by_university)
+    scores = np.array([
+        scorer.score(student, programs_by_university, program_index)["total"]
+        for student in students
+    ])
 
     return students, universities, programs_by_university, scores
 
@@ -2,9 +2,10 @@
 Notifications API Endpoints
 RESTful API for push notifications and in-app notifications
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 
 from app.services.notifications_service import NotificationsService
+from app.jobs.notification_worker import run_notification_worker_task
 from app.schemas.notifications import (
     NotificationCreateRequest,
     NotificationResponse,
@@ -414,6 +415,7 @@ async def send_bulk_notifications(
 
     **Returns:**
     - created_count: Number of notifications created
+    - skipped_count: Users who turned off these notifications
     - failed_count: Number of failures
     - failed_users: List of user IDs that failed
     """
@@ -431,6 +433,7 @@ async def send_bulk_notifications(
 @router.post("/notifications/broadcast")
 async def broadcast_notification(
     broadcast_data: BroadcastNotificationRequest,
+    background_tasks: BackgroundTasks,
     current_user: CurrentUser = Depends(RoleChecker([UserRole.ADMIN_SUPER]))
 ):
     """
@@ -452,18 +455,41 @@ async def broadcast_notification(
     - scheduled_for: Optional scheduled delivery time
 
     **Returns:**
-    - created_count: Number of notifications created
-    - failed_count: Number of failures
-    - failed_users: List of user IDs that failed
+    - job_id: Fan-out job delivering the notifications in the background
+      (progress at GET /notifications/broadcast/{job_id})
 
     **Warning:** Use with caution. This can send notifications to all users.
     """
     try:
         service = NotificationsService()
-        result = await service.broadcast_notification(broadcast_data)
+        result = await service.broadcast_notification(broadcast_data, created_by=current_user.id)
+        background_tasks.add_task(run_notification_worker_task)
         return result
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+
+
+@router.get("/notifications/broadcast/{job_id}")
+async def get_broadcast_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(RoleChecker([UserRole.ADMIN_SUPER, UserRole.ADMIN_CONTENT]))
+):
+    """
+    Get progress of a broadcast or announcement (Admin only)
+
+    **Returns:**
+    - status: pending, running, completed or failed
+    - total_users / processed_users / notifications_created / skipped_users / errors_count
+    - cursor: Last user delivered to (a restarted job resumes after it)
+    """
+    try:
+        service = NotificationsService()
+        return await service.get_broadcast_job(job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
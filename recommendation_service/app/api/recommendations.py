@@ -3,13 +3,17 @@ Recommendations API endpoints - Cloud-Based (Supabase)
 ML-Enhanced with automatic fallback to rule-based scoring
 Phase 3.2 - Enhanced with personalized recommendations and tracking
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from supabase import Client
+from app.database.async_db import run_blocking
 from app.database.config import get_db
 from app.schemas.recommendation import (
     GenerateRecommendationsRequest,
     RecommendationResponse,
     RecommendationListResponse,
+    RecommendationPageResponse,
     UpdateRecommendationRequest,
 )
 from app.schemas.recommendation_tracking import (
@@ -21,11 +25,16 @@ from app.schemas.recommendation_tracking import (
     StudentInteractionSummaryResponse
 )
 from app.services.personalized_recommendations_service import PersonalizedRecommendationsService
+from app.services.catalog_snapshot import get_catalog
+from app.services.recommendation_writer import RecommendationWriter, with_universities
+from app.services.ranking_cache import get_ranking_cache
 # Lazy import ML engine to avoid loading heavy dependencies at startup
 # from app.ml.ml_recommendation_engine import MLRecommendationEngine
+import asyncio
+import json
 import logging
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -239,61 +248,133 @@ async def get_student_recommendation_analytics(
 
 # ==================== Core Recommendation Endpoints ====================
 
-@router.post("/recommendations/generate", response_model=RecommendationListResponse)
-def generate_recommendations(
-    request: GenerateRecommendationsRequest, db: Client = Depends(get_db)
-):
-    """Generate university recommendations for a student"""
-    try:
-        # Get student profile from Supabase - handle both user_id (auth) and internal profile ID
-        response = db.table('student_profiles').select('*').eq('user_id', request.user_id).execute()
+def _rank(db: Client, user_id: str, max_results: int) -> Tuple[Dict, List[Dict], Optional[str]]:
+    """
+    Rank universities for a student without storing anything
 
-        if not response.data or len(response.data) == 0:
-            # Try by internal profile id
-            response = db.table('student_profiles').select('*').eq('id', request.user_id).execute()
+    Returns:
+        (student profile, recommendations ordered by match_score, ML model version or None)
+    """
+    # Get student profile from Supabase - handle both user_id (auth) and internal profile ID
+    response = db.table('student_profiles').select('*').eq('user_id', user_id).execute()
 
-        if not response.data or len(response.data) == 0:
-            raise HTTPException(status_code=404, detail="Student profile not found")
+    if not response.data or len(response.data) == 0:
+        # Try by internal profile id
+        response = db.table('student_profiles').select('*').eq('id', user_id).execute()
 
-        student = response.data[0]
+    if not response.data or len(response.data) == 0:
+        raise HTTPException(status_code=404, detail="Student profile not found")
 
-        # Delete existing recommendations for this student
-        db.table('recommendations').delete().eq('student_id', student['id']).execute()
+    student = response.data[0]
 
-        # Generate new recommendations using ML-enhanced engine
-        # Automatically uses ML if models available, otherwise falls back to rule-based
-        # Lazy import to avoid loading ML dependencies at startup
-        from app.ml.ml_recommendation_engine import MLRecommendationEngine
-        engine = MLRecommendationEngine(db, model_dir=ML_MODELS_DIR)
-        recommendations = engine.generate_recommendations(
-            student, max_results=request.max_results or 15
-        )
+    # Generate new recommendations using ML-enhanced engine
+    # Automatically uses ML if models available, otherwise falls back to rule-based
+    # Lazy import to avoid loading ML dependencies at startup
+    from app.ml.ml_recommendation_engine import MLRecommendationEngine
+    engine = MLRecommendationEngine(db, model_dir=ML_MODELS_DIR)
+    recommendations = engine.generate_recommendations(student, max_results=max_results)
 
-        # Insert recommendations into Supabase
-        if recommendations:
-            db.table('recommendations').insert(recommendations).execute()
+    logger.info(f"Generated {len(recommendations)} recommendations for user: {user_id}")
 
-        logger.info(
-            f"Generated {len(recommendations)} recommendations for user: {request.user_id}"
-        )
+    return student, recommendations, engine.model_version
 
-        # Fetch the inserted recommendations with university data
-        response = db.table('recommendations').select(
-            '*, universities(*)'
-        ).eq('student_id', student['id']).execute()
 
-        inserted_recommendations = response.data
+def _generate_and_store(db: Client, user_id: str, max_results: int) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Rank universities for a student and persist the diff
+
+    Returns:
+        (stored rows ordered by match_score, ML model version or None)
+    """
+    student, recommendations, model_version = _rank(db, user_id, max_results)
+
+    # Write only what changed (keeps favorited/notes) and respond from the result
+    stored = RecommendationWriter(db).sync(student['id'], recommendations)
+
+    return stored, model_version
+
+
+# Rankings whose full sync is still running in this worker, by cursor
+_saving: Dict[str, asyncio.Event] = {}
+_save_tasks: Set[asyncio.Task] = set()
+
+# Ranking depth of a cursor when the request does not set max_results
+RANKED_DEFAULT_MAX_RESULTS = int(os.environ.get('RANKED_DEFAULT_MAX_RESULTS', '100'))
+
+# How long a page request waits for a ranking that is still being stored
+RANKING_SAVE_WAIT_SECONDS = float(os.environ.get('RANKING_SAVE_WAIT_SECONDS', '10'))
 
-        # Organize by category
-        safety_schools = [r for r in inserted_recommendations if r["category"] == "Safety"]
-        match_schools = [r for r in inserted_recommendations if r["category"] == "Match"]
-        reach_schools = [r for r in inserted_recommendations if r["category"] == "Reach"]
+
+async def _save_ranking(db: Client, cursor: str, student_id, recommendations: List[Dict],
+                        model_version: Optional[str]) -> None:
+    """Sync the full ranking to the database, then swap the stored rows into the cache"""
+    cache = get_ranking_cache()
+    try:
+        stored = await run_in_threadpool(RecommendationWriter(db).sync, student_id, recommendations)
+        await run_blocking(cache.replace, cursor, student_id, stored, model_version)
+    except Exception as e:
+        logger.error(f"Error storing ranking for student {student_id}: {e}")
+        await run_blocking(cache.discard, cursor)
+    finally:
+        saving = _saving.pop(cursor, None)
+        if saving is not None:
+            saving.set()
+
+
+async def _saved_entry(cursor: str) -> Optional[Dict]:
+    """Cache entry for a cursor, waiting for this worker's sync if it is still running"""
+    cache = get_ranking_cache()
+    entry = await run_blocking(cache.get, cursor)
+    saving = _saving.get(cursor)
+    if entry is not None and entry.get("pending") and saving is not None:
+        try:
+            await asyncio.wait_for(saving.wait(), RANKING_SAVE_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            return entry
+        entry = await run_blocking(cache.get, cursor)
+    return entry
+
+
+def _split_by_category(rows: List[Dict]) -> Dict[str, List[Dict]]:
+    return {
+        "safety_schools": [r for r in rows if r["category"] == "Safety"],
+        "match_schools": [r for r in rows if r["category"] == "Match"],
+        "reach_schools": [r for r in rows if r["category"] == "Reach"],
+    }
+
+
+def _ranking_page(cursor: str, entry: Dict, page: int, page_size: int) -> RecommendationPageResponse:
+    rows = entry["rows"]
+    total = len(rows)
+    total_pages = (total + page_size - 1) // page_size
+    offset = (page - 1) * page_size
+    page_rows = with_universities([dict(r) for r in rows[offset:offset + page_size]], get_catalog())
+
+    return RecommendationPageResponse(
+        total=total,
+        **_split_by_category(page_rows),
+        model_version=entry.get("model_version"),
+        cursor=cursor,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        has_next=page < total_pages,
+    )
+
+
+@router.post("/recommendations/generate", response_model=RecommendationListResponse)
+def generate_recommendations(
+    request: GenerateRecommendationsRequest, db: Client = Depends(get_db)
+):
+    """Generate university recommendations for a student"""
+    try:
+        stored, model_version = _generate_and_store(db, request.user_id, request.max_results or 15)
+        inserted_recommendations = with_universities(stored, get_catalog())
 
         return RecommendationListResponse(
             total=len(inserted_recommendations),
-            safety_schools=safety_schools,
-            match_schools=match_schools,
-            reach_schools=reach_schools,
+            **_split_by_category(inserted_recommendations),
+            model_version=model_version,
         )
 
     except HTTPException:
@@ -303,6 +384,123 @@ def generate_recommendations(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/recommendations/generate/ranked", response_model=RecommendationPageResponse)
+async def generate_ranked_recommendations(
+    request: GenerateRecommendationsRequest,
+    background_tasks: BackgroundTasks,
+    page_size: int = Query(20, ge=1, le=100, description="Number of recommendations per page"),
+    stream: Optional[str] = Query(None, pattern="^(ndjson|sse)$", description="Stream all results in rank order"),
+    db: Client = Depends(get_db)
+):
+    """
+    Generate recommendations once and page through them by cursor
+
+    The cursor holds up to `max_results` recommendations (default
+    RANKED_DEFAULT_MAX_RESULTS, 100).
+
+    Ranking runs off the event loop. The first page is stored and returned
+    as soon as the ranking is done, together with a `cursor`; the rest is
+    synced in the background. Pass the cursor to
+    GET /recommendations/ranked/{cursor} for further pages, which are served
+    from the ranking cache without recomputation.
+
+    **Streaming:** with `stream=ndjson` or `stream=sse` every recommendation is
+    sent in rank order instead of a page. The first message carries the
+    cursor, total and model version. Rows lack `id` if they could not be
+    stored in time; a final `error` message means storing failed.
+    """
+    try:
+        # An explicit max_results is honoured; otherwise rank deep enough for several pages
+        max_results = request.max_results if "max_results" in request.model_fields_set else None
+        max_results = max_results or RANKED_DEFAULT_MAX_RESULTS
+        student, recommendations, model_version = await run_in_threadpool(
+            _rank, db, request.user_id, max_results
+        )
+        recommendations = recommendations[:max_results]
+        # Only the first page has to be stored before responding; the rest is synced afterwards
+        first = [] if stream else await run_in_threadpool(
+            RecommendationWriter(db).save_first, recommendations[:page_size]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating recommendations: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    rows = first + recommendations[len(first):]
+    cursor = await run_blocking(get_ranking_cache().put, student['id'], rows, model_version, pending=True)
+    _saving[cursor] = asyncio.Event()
+
+    if stream:
+        # Rows are streamed once stored (with ids) when possible; the header goes out first
+        task = asyncio.create_task(_save_ranking(db, cursor, student['id'], recommendations, model_version))
+        _save_tasks.add(task)
+        task.add_done_callback(_save_tasks.discard)
+        return StreamingResponse(
+            _stream_ranking(cursor, rows, model_version, sse=stream == "sse"),
+            media_type="text/event-stream" if stream == "sse" else "application/x-ndjson",
+        )
+
+    background_tasks.add_task(_save_ranking, db, cursor, student['id'], recommendations, model_version)
+    return _ranking_page(cursor, {"rows": rows, "model_version": model_version}, 1, page_size)
+
+
+async def _stream_ranking(cursor: str, ranked: List[Dict], model_version: Optional[str], sse: bool):
+    """
+    Yield the ranking as NDJSON lines or SSE events, header first
+
+    Rows come from the cache once stored. If storing is slow or fails, the
+    ranked rows are streamed without ids; a failure also ends the stream
+    with an error message, as the cursor is then gone.
+    """
+    def encode(payload: Dict) -> str:
+        body = json.dumps(payload, default=str)
+        return f"data: {body}\n\n" if sse else f"{body}\n"
+
+    yield encode({
+        "cursor": cursor,
+        "total": len(ranked),
+        "model_version": model_version,
+    })
+    entry = await _saved_entry(cursor)
+    if entry is None:
+        logger.error(f"Ranking {cursor} was not stored; streaming it without ids")
+
+    catalog = get_catalog()
+    for rank, row in enumerate(entry["rows"] if entry is not None else ranked, start=1):
+        yield encode(dict(with_universities([dict(row)], catalog)[0], rank=rank))
+
+    if entry is None:
+        yield encode({"error": "Recommendations could not be saved; the cursor is no longer valid"})
+
+
+@router.get("/recommendations/ranked/{cursor}", response_model=RecommendationPageResponse)
+async def get_ranked_page(
+    cursor: str,
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Number of recommendations per page"),
+):
+    """
+    Serve a page of a previously generated ranking
+
+    **Errors:**
+    - 409: Page not stored yet; retry after the `Retry-After` delay
+    - 410: Cursor unknown or expired; generate recommendations again
+    """
+    entry = await _saved_entry(cursor)
+    if entry is None:
+        raise HTTPException(status_code=410, detail="Ranking cursor expired. Generate recommendations again.")
+    offset = (page - 1) * page_size
+    if entry.get("pending") and any("id" not in row for row in entry["rows"][offset:offset + page_size]):
+        raise HTTPException(
+            status_code=409,
+            detail="Ranking is still being stored. Retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    return _ranking_page(cursor, entry, page, page_size)
+
+
 @router.get("/recommendations/{user_id}", response_model=RecommendationListResponse)
 def get_recommendations(user_id: str, db: Client = Depends(get_db)):
     """Get existing recommendations for a student by user_id or internal profile ID"""
@@ -21,6 +21,8 @@ from app.schemas.recommendation_tracking import (
     StudentInteractionSummaryResponse
 )
 from app.services.personalized_recommendations_service import PersonalizedRecommendationsService
+from app.services.catalog_snapshot import get_catalog
+from app.services.recommendation_writer import RecommendationWriter, with_universities
 # Lazy import ML engine to avoid loading heavy dependencies at startup
 # from app.ml.ml_recommendation_engine import MLRecommendationEngine
 import logging
@@ -72,9 +74,6 @@ def generate_recommendations(
 
         student = response.data[0]
 
-        # Delete existing recommendations for this student
-        db.table('recommendations').delete().eq('student_id', student['id']).execute()
-
         # Generate new recommendations using ML-enhanced engine
         # Generate more recommendations than requested to allow for pagination
         # Lazy import to avoid loading ML dependencies at startup
@@ -87,33 +86,16 @@ def generate_recommendations(
             student, max_results=max_to_generate
         )
 
-        # Insert recommendations into Supabase
-        if recommendations:
-            db.table('recommendations').insert(recommendations).execute()
+        # Write only what changed (keeps favorited/notes); the page is served from the result
+        stored = RecommendationWriter(db).sync(student['id'], recommendations)
 
         logger.info(
             f"Generated {len(recommendations)} recommendations for user: {request.user_id}"
         )
 
-        # Fetch the inserted recommendations with university data
-        # Apply pagination at database level for efficiency
         offset = (page - 1) * page_size
-
-        # Get total count first
-        count_response = db.table('recommendations').select(
-            'id', count='exact'
-        ).eq('student_id', student['id']).execute()
-
-        total = count_response.count if count_response.count is not None else 0
-
-        # Fetch paginated results with university data
-        response = db.table('recommendations').select(
-            '*, universities(*)'
-        ).eq('student_id', student['id']).order('match_score', desc=True).range(
-            offset, offset + page_size - 1
-        ).execute()
-
-        inserted_recommendations = response.data
+        total = len(stored)
+        inserted_recommendations = with_universities(stored[offset:offset + page_size], get_catalog())
 
         # Organize by category
         safety_schools = [r for r in inserted_recommendations if r["category"] == "Safety"]
@@ -129,6 +111,7 @@ def generate_recommendations(
             safety_schools=safety_schools,
             match_schools=match_schools,
             reach_schools=reach_schools,
+            model_version=engine.model_version,
         )
 
         # Add pagination metadata to response
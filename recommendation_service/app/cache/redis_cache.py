@@ -9,6 +9,8 @@ from typing import Optional, Any
 from datetime import timedelta
 import logging
 
+from app.monitoring import record_cache_access
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +59,7 @@ class RedisCache:
 
         try:
             value = self.client.get(key)
+            record_cache_access('redis', bool(value))
             if value:
                 logger.debug(f"Cache HIT: {key}")
                 return json.loads(value)
@@ -158,41 +158,45 @@ class SupabaseUniversityDataNormalizer:
         self,
         universities_data: List[Dict[str, Any]],
         update_existing: bool = True,
-        commit_batch_size: int = 50
-    ) -> Dict[str, int]:
+        commit_batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Save multiple universities in batches
+        Save multiple universities with bulk upserts
 
         Args:
             universities_data: List of normalized university data
-            update_existing: If True, update existing universities
-            commit_batch_size: Number of records to process at once
+            update_existing: If True, update existing universities (both
+                paths upsert on name+country, as save_to_database does)
+            commit_batch_size: Initial rows per upsert request (adjusted
+                as the import runs)
+            max_workers: Upsert requests in flight at once
 
         Returns:
-            Dict with statistics (added, updated, failed)
+            Dict with statistics (added, updated, skipped, failed) and the
+            per-university errors
         """
-        stats = {'added': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
-
-        for i, uni_data in enumerate(universities_data):
-            # Normalize data
+        normalized_rows = []
+        invalid = 0
+        for uni_data in universities_data:
             normalized = self.normalize_university(uni_data)
-            if not normalized:
-                stats['failed'] += 1
-                continue
-
-            # Save to database
-            result = self.save_to_database(normalized, update_existing=update_existing)
-
-            if result:
-                # Supabase doesn't distinguish between insert/update in response
-                # We'll track as "updated" for simplicity
-                stats['updated'] += 1
+            if normalized:
+                normalized_rows.append(normalized)
             else:
-                stats['failed'] += 1
-
-            # Log progress in batches
-            if (i + 1) % commit_batch_size == 0:
-                logger.info(f"Committed batch of {commit_batch_size} (total processed: {i + 1})")
-
-        logger.info(f"Import completed: {stats}")
+                invalid += 1
+
+        options = {}
+        if commit_batch_size:
+            options['batch_size'] = commit_batch_size
+        if max_workers:
+            options['max_workers'] = max_workers
+        stats = self.supabase.batch_upsert_universities(normalized_rows, **options)
+        stats['failed'] += invalid
+
+        for error in stats['errors'][:20]:
+            logger.warning(f"Failed to save: {error['name']} ({error['country']}): {error['error']}")
+        if len(stats['errors']) > 20:
+            logger.warning(f"... and {len(stats['errors']) - 20} more failures")
+
+        logger.info(f"Import completed: added={stats['added']} updated={stats['updated']} failed={stats['failed']}")
         return stats
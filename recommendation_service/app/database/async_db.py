@@ -0,0 +1,81 @@
+"""
+Async Database Access
+Awaitable wrappers that run blocking supabase queries on a bounded thread pool
+
+The supabase `Client` is synchronous, so calling `.execute()` inside an
+`async def` blocks the event loop for the whole round trip. These helpers
+hand the call to a dedicated executor (sized by DB_EXECUTOR_MAX_WORKERS)
+with a per-call timeout, and let independent queries run concurrently:
+
+    result = await execute(db.table('users').select('*').eq('id', user_id))
+    users, links = await gather(db.table('users').select('id'), db.table('links').select('*'))
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+import asyncio
+import functools
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+DB_EXECUTOR_MAX_WORKERS = int(os.getenv("DB_EXECUTOR_MAX_WORKERS", "32"))
+DB_QUERY_TIMEOUT_SECONDS = float(os.getenv("DB_QUERY_TIMEOUT_SECONDS", "15"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class QueryTimeoutError(Exception):
+    """A database call did not finish within its timeout"""
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the shared database thread pool (created on first use)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_MAX_WORKERS, thread_name_prefix="db")
+    return _executor
+
+
+async def run_blocking(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a blocking database callable on the DB executor
+
+    Args:
+        fn: Function making one or more synchronous client calls
+        timeout: Seconds to wait (default: DB_QUERY_TIMEOUT_SECONDS; 0 disables)
+
+    Raises:
+        QueryTimeoutError: If the call exceeds the timeout. The worker thread
+            finishes the call in the background; the caller stops waiting.
+    """
+    timeout = DB_QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_db_executor(), functools.partial(fn, *args, **kwargs))
+    if not timeout:
+        return await future
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        name = getattr(fn, '__qualname__', repr(fn))
+        logger.warning(f"Database call {name} timed out after {timeout}s")
+        raise QueryTimeoutError(f"Database query timed out after {timeout}s")
+
+
+async def execute(query, timeout: Optional[float] = None) -> Any:
+    """Await a query builder's `.execute()` without blocking the event loop"""
+    return await run_blocking(query.execute, timeout=timeout)
+
+
+async def gather(*queries, timeout: Optional[float] = None) -> List[Any]:
+    """Execute independent query builders concurrently; results in argument order"""
+    return list(await asyncio.gather(*(execute(query, timeout=timeout) for query in queries)))
+
+
+def shutdown_db_executor():
+    """Stop the DB executor (application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
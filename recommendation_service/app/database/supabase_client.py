@@ -4,6 +4,8 @@ Handles connection to Supabase PostgreSQL database
 """
 import os
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Optional, Dict, Any, List
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -11,6 +13,11 @@ from dotenv import load_dotenv
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+UPSERT_CHUNK_SIZE = int(os.getenv("UNIVERSITY_UPSERT_CHUNK_SIZE", "250"))
+UPSERT_MAX_CHUNK_SIZE = int(os.getenv("UNIVERSITY_UPSERT_MAX_CHUNK_SIZE", "1000"))
+UPSERT_TARGET_SECONDS = float(os.getenv("UNIVERSITY_UPSERT_TARGET_SECONDS", "2.0"))
+UPSERT_MAX_WORKERS = int(os.getenv("UNIVERSITY_UPSERT_MAX_WORKERS", "2"))
+
 
 class SupabaseClient:
     """Wrapper for Supabase client with Find Your Path specific methods"""
@@ -109,39 +116,138 @@ class SupabaseClient:
     def batch_upsert_universities(
         self,
         universities_data: List[Dict[str, Any]],
-        batch_size: int = 100
-    ) -> Dict[str, int]:
+        batch_size: int = UPSERT_CHUNK_SIZE,
+        max_workers: int = UPSERT_MAX_WORKERS,
+        on_conflict: str = 'name,country'
+    ) -> Dict[str, Any]:
         """
-        Batch insert/update universities
+        Batch insert/update universities with multi-row upserts
+
+        Rows are sent in chunks (one request each), starting at batch_size
+        and resized after every chunk: halved when it fails or is slower
+        than UPSERT_TARGET_SECONDS, doubled when it is well under it. A
+        failing chunk is split in half and retried until the bad rows are
+        isolated, so one invalid university does not fail its neighbours.
+
+        Rows are grouped by column set before chunking: in a multi-row
+        upsert, columns missing from a row are written as NULL, which would
+        wipe existing values that a single-row upsert leaves alone. Rows
+        with the same conflict key are merged (later values win).
 
         Args:
             universities_data: List of university data dictionaries
-            batch_size: Number of records to process at once
+            batch_size: Initial number of rows per request
+            max_workers: Chunks upserted concurrently
+            on_conflict: Unique columns identifying an existing university
 
         Returns:
-            Statistics dict with added, updated, failed counts
+            Statistics dict with added, updated, failed, skipped counts and
+            errors (name, country and error message for each failed row)
         """
-        stats = {'added': 0, 'updated': 0, 'failed': 0, 'skipped': 0}
-
-        for i in range(0, len(universities_data), batch_size):
-            batch = universities_data[i:i + batch_size]
+        stats = {'added': 0, 'updated': 0, 'failed': 0, 'skipped': 0, 'errors': []}
+        key_columns = [c.strip() for c in on_conflict.split(',')]
+
+        # Merge duplicate keys (Postgres rejects a row affected twice in one statement)
+        rows_by_key: Dict[Any, Dict[str, Any]] = {}
+        for i, uni_data in enumerate(universities_data):
+            key = tuple(uni_data.get(c) for c in key_columns)
+            if None in key:
+                key = ('#', i)  # No conflict key - left for the database to reject
+            elif key in rows_by_key:
+                stats['updated'] += 1
+                rows_by_key[key] = {**rows_by_key[key], **uni_data}
+                continue
+            rows_by_key[key] = uni_data
+
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row in rows_by_key.values():
+            groups.setdefault(frozenset(row), []).append(row)
+        queue = [rows for rows in groups.values()]
+
+        chunk_size = max(1, min(batch_size, UPSERT_MAX_CHUNK_SIZE))
+        processed = 0
+
+        def next_chunk() -> Optional[List[Dict[str, Any]]]:
+            while queue and not queue[0]:
+                queue.pop(0)
+            if not queue:
+                return None
+            chunk, queue[0] = queue[0][:chunk_size], queue[0][chunk_size:]
+            return chunk
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="upsert") as executor:
+            running = {}
+            while True:
+                while len(running) < max(1, max_workers):
+                    chunk = next_chunk()
+                    if chunk is None:
+                        break
+                    running[executor.submit(self._upsert_chunk, chunk, on_conflict)] = chunk
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = running.pop(future)
+                    records, failures, elapsed = future.result()
+
+                    for record in records:
+                        # Check if it was an update or insert based on created_at vs updated_at
+                        if record.get('created_at') == record.get('updated_at'):
+                            stats['added'] += 1
+                        else:
+                            stats['updated'] += 1
+                    for row, error in failures:
+                        stats['failed'] += 1
+                        stats['errors'].append({
+                            'name': row.get('name'), 'country': row.get('country'), 'error': error
+                        })
+
+                    if failures or elapsed > UPSERT_TARGET_SECONDS:
+                        chunk_size = max(1, chunk_size // 2)
+                    elif elapsed < UPSERT_TARGET_SECONDS / 2 and len(chunk) >= chunk_size:
+                        chunk_size = min(UPSERT_MAX_CHUNK_SIZE, chunk_size * 2)
+
+                    processed += len(chunk)
+                    logger.info(
+                        f"Upserted chunk of {len(chunk)} universities in {elapsed:.2f}s "
+                        f"({processed}/{len(rows_by_key)}, next chunk {chunk_size})"
+                    )
+
+        logger.info(
+            f"Batch upsert completed: added={stats['added']} updated={stats['updated']} "
+            f"failed={stats['failed']}"
+        )
+        return stats
 
-            for uni_data in batch:
-                result = self.upsert_university(uni_data)
+    def _upsert_chunk(self, rows: List[Dict[str, Any]], on_conflict: str):
+        """
+        Upsert rows in one request, splitting the chunk on failure
 
-                if result:
-                    # Check if it was an update or insert based on created_at vs updated_at
-                    if result.get('created_at') == result.get('updated_at'):
-                        stats['added'] += 1
-                    else:
-                        stats['updated'] += 1
+        Returns:
+            (upserted records, [(row, error message)] for rows that failed,
+             seconds spent)
+        """
+        start = time.monotonic()
+        records: List[Dict] = []
+        failures: List = []
+        pending = [rows]
+        while pending:
+            part = pending.pop()
+            try:
+                response = self.client.table('universities').upsert(
+                    part,
+                    on_conflict=on_conflict,
+                ).execute()
+                records.extend(response.data or [])
+            except Exception as e:
+                if len(part) == 1:
+                    logger.error(f"Error upserting university {part[0].get('name')}: {e}")
+                    failures.append((part[0], str(e)))
                 else:
-                    stats['failed'] += 1
-
-            logger.info(f"Processed batch {i//batch_size + 1}: {len(batch)} universities")
-
-        logger.info(f"Batch upsert completed: {stats}")
-        return stats
+                    middle = len(part) // 2
+                    pending.extend([part[middle:], part[:middle]])
+        return records, failures, time.monotonic() - start
 
     def get_universities(
         self,
@@ -5,14 +5,29 @@ Provides 5-10x speedup over synchronous version through concurrent processing
 """
 import asyncio
 import logging
+import os
 from typing import Dict, List, Tuple, Optional
 from supabase import Client
 from datetime import datetime
 import aiohttp
 
+from .http_pool import get_http_pool, close_http_pool
+from .field_task_scheduler import FieldTask, FieldTaskScheduler
+from .candidate_selection import (
+    CRITICAL_FIELDS,
+    FILLABLE_FIELDS,
+    US_COUNTRIES,
+    fetch_null_counts,
+    get_candidate_index,
+)
+
 logger = logging.getLogger(__name__)
 
 
+# Per-university wall-clock limit for the concurrent field lookups
+ENRICHMENT_TIME_BUDGET_SECONDS = float(os.getenv("ENRICHMENT_TIME_BUDGET_SECONDS", "60"))
+
+
 class AsyncAutoFillOrchestrator:
     """
     Asynchronous orchestration of automated university data enrichment
@@ -20,29 +35,29 @@ class AsyncAutoFillOrchestrator:
     """
 
     # Fields that can be auto-filled
-    FILLABLE_FIELDS = [
-        'city', 'state', 'website', 'logo_url', 'description',
-        'university_type', 'location_type', 'total_students',
-        'acceptance_rate', 'gpa_average',
-        'sat_math_25th', 'sat_math_75th',
-        'sat_ebrw_25th', 'sat_ebrw_75th',
-        'act_composite_25th', 'act_composite_75th',
-        'tuition_out_state', 'total_cost',
-        'graduation_rate_4year'
-    ]
-
-    def __init__(self, db: Client, rate_limit_delay: float = 1.0, max_concurrent: int = 10):
+    FILLABLE_FIELDS = FILLABLE_FIELDS
+
+    def __init__(
+        self,
+        db: Client,
+        rate_limit_delay: float = 1.0,
+        max_concurrent: int = 10,
+        time_budget: float = ENRICHMENT_TIME_BUDGET_SECONDS
+    ):
         """
         Initialize async orchestrator
 
         Args:
             db: Supabase client
-            rate_limit_delay: Delay between requests (reduced due to async)
+            rate_limit_delay: Kept for compatibility; politeness is enforced per host
+                by the shared HTTP pool (app/enrichment/http_pool.py)
             max_concurrent: Maximum concurrent university enrichments
+            time_budget: Seconds per university before outstanding lookups are cancelled
         """
         self.db = db
         self.rate_limit_delay = rate_limit_delay
         self.max_concurrent = max_concurrent
+        self.time_budget = time_budget
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.stats = {
             'total_processed': 0,
@@ -58,27 +73,29 @@ class AsyncAutoFillOrchestrator:
         Analyze database to identify NULL values
         (Synchronous - database operation)
 
+        Counts are aggregated in the database; without the
+        university_null_field_counts function they come from the candidate
+        index (narrow, paged scan).
+
         Returns:
             Dict with statistics about NULL values per field
         """
         logger.info("Analyzing NULL values in database...")
 
-        # Get all universities
-        response = self.db.table('universities').select('*').execute()
-        universities = response.data
+        server_counts = fetch_null_counts(self.db, self.FILLABLE_FIELDS)
+        if server_counts is not None:
+            total_universities = server_counts['total']
+            null_stats = server_counts['null_counts']
+        else:
+            index = get_candidate_index()
+            index.ensure_loaded(self.db)
+            total_universities = index.total
+            null_stats = index.null_counts()
 
-        if not universities:
+        if not total_universities:
             logger.warning("No universities found in database")
             return {}
 
-        null_stats = {field: 0 for field in self.FILLABLE_FIELDS}
-        total_universities = len(universities)
-
-        for university in universities:
-            for field in self.FILLABLE_FIELDS:
-                if not university.get(field):
-                    null_stats[field] += 1
-
         # Calculate percentages
         analysis = {}
         for field, null_count in null_stats.items():
@@ -97,10 +114,7 @@ class AsyncAutoFillOrchestrator:
         Assign priority to fields (1=highest, 3=lowest)
         Critical fields for ML should be filled first
         """
-        high_priority = [
-            'acceptance_rate', 'gpa_average', 'graduation_rate_4year',
-            'total_students', 'tuition_out_state', 'total_cost'
-        ]
+        high_priority = CRITICAL_FIELDS
         medium_priority = [
             'city', 'state', 'location_type', 'university_type',
             'sat_math_25th', 'sat_math_75th', 'act_composite_25th', 'act_composite_75th'
@@ -123,64 +137,26 @@ class AsyncAutoFillOrchestrator:
         Get list of universities that need enrichment
         (Synchronous - database operation)
 
+        Served from the process-wide candidate index, which is rebuilt from a
+        narrow paged scan when stale and kept current by update_university.
+
         Args:
             limit: Maximum number of universities to return
-            priority_fields: Only consider universities with NULLs in these fields
+            priority_fields: Extra weight for universities with NULLs in these fields
             prioritize_us: If True, prioritize US universities (College Scorecard data)
 
         Returns:
-            List of university dicts sorted by enrichment priority
+            List of university dicts (id, name, country and fillable fields)
+            sorted by enrichment priority
         """
         logger.info(f"Finding universities to enrich (limit={limit}, prioritize_us={prioritize_us})...")
 
-        # Get all universities
-        response = self.db.table('universities').select('*').execute()
-        universities = response.data
-
-        if not universities:
-            return []
-
-        # Score each university by number of missing critical fields
-        scored_universities = []
-
-        for university in universities:
-            missing_count = 0
-            missing_critical = 0
-
-            for field in self.FILLABLE_FIELDS:
-                if not university.get(field):
-                    missing_count += 1
-                    priority = self._get_field_priority(field)
-                    if priority == 1:
-                        missing_critical += 1
-
-                    # If priority_fields specified, only count those
-                    if priority_fields and field in priority_fields:
-                        missing_critical += 1
-
-            # Base score: missing_critical * 100 + missing_total
-            score = missing_critical * 100 + missing_count
-
-            # US universities get priority boost (College Scorecard provides high-quality data)
-            if prioritize_us:
-                country = university.get('country', '')
-                if country in ['USA', 'United States', 'US', 'U.S.', 'U.S.A.']:
-                    score += 10000  # Significant boost to ensure US universities processed first
-
-            if score > 0:  # Has at least one missing field
-                scored_universities.append((university, score, missing_count))
-
-        # Sort by score (descending)
-        scored_universities.sort(key=lambda x: x[1], reverse=True)
-
-        # Apply limit
-        if limit:
-            scored_universities = scored_universities[:limit]
-
-        result = [item[0] for item in scored_universities]
+        index = get_candidate_index()
+        index.ensure_loaded(self.db)
+        result = index.select(limit, priority_fields, prioritize_us)
 
         # Log country breakdown
-        us_count = sum(1 for u in result if u.get('country') in ['USA', 'United States', 'US', 'U.S.', 'U.S.A.'])
+        us_count = sum(1 for u in result if u.get('country') in US_COUNTRIES)
         logger.info(f"Found {len(result)} universities needing enrichment ({us_count} US universities)")
 
         return result
@@ -198,43 +174,9 @@ class AsyncAutoFillOrchestrator:
         """
         logger.info(f"Finding US universities to enrich (limit={limit})...")
 
-        # Get US universities only
-        response = self.db.table('universities').select('*').in_(
-            'country', ['USA', 'United States', 'US', 'U.S.', 'U.S.A.']
-        ).execute()
-        universities = response.data
-
-        if not universities:
-            logger.info("No US universities found in database")
-            return []
-
-        # Score by missing critical fields
-        scored_universities = []
-
-        for university in universities:
-            missing_count = 0
-            missing_critical = 0
-
-            for field in self.FILLABLE_FIELDS:
-                if not university.get(field):
-                    missing_count += 1
-                    priority = self._get_field_priority(field)
-                    if priority == 1:
-                        missing_critical += 1
-
-            score = missing_critical * 100 + missing_count
-
-            if score > 0:
-                scored_universities.append((university, score, missing_count))
-
-        # Sort by score (descending)
-        scored_universities.sort(key=lambda x: x[1], reverse=True)
-
-        # Apply limit
-        if limit:
-            scored_universities = scored_universities[:limit]
-
-        result = [item[0] for item in scored_universities]
+        index = get_candidate_index()
+        index.ensure_loaded(self.db)
+        result = index.select(limit, prioritize_us=False, us_only=True)
         logger.info(f"Found {len(result)} US universities needing enrichment")
 
         return result
@@ -242,31 +184,33 @@ class AsyncAutoFillOrchestrator:
     async def enrich_university_async(
         self,
         university: Dict,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         web_enricher,
         field_scrapers,
         scorecard_enricher=None,
-        cache=None
+        cache=None,
+        critical_fields: Optional[List[str]] = None
     ) -> Tuple[Dict, int]:
         """
         Asynchronously enrich a single university with missing data
 
         Args:
             university: University dict from database
-            session: aiohttp ClientSession
+            session: aiohttp ClientSession (None: shared enrichment HTTP pool)
             web_enricher: AsyncWebSearchEnricher instance
             field_scrapers: AsyncFieldScrapers instance
             scorecard_enricher: Optional AsyncCollegeScorecardEnricher for U.S. universities
             cache: Optional AsyncEnrichmentCache for caching
+            critical_fields: Stop looking once these fields are known (default: run all lookups)
 
         Returns:
             Tuple of (enriched_data dict, fields_filled count)
         """
         async with self.semaphore:  # Limit concurrent enrichments
             logger.info(f"Enriching: {university['name']}")
+            session = session or get_http_pool()
 
             enriched_data = {}
-            fields_filled = 0
             university_id = university.get('id')
 
             try:
@@ -278,137 +222,127 @@ class AsyncAutoFillOrchestrator:
                     for field, value in cached_fields.items():
                         if value and not university.get(field):
                             enriched_data[field] = value
-                            fields_filled += 1
 
                     if cached_fields:
                         logger.info(
                             f"Cache provided {len(cached_fields)} fields for {university['name']}"
                         )
 
-                # Step 0: College Scorecard (U.S. universities only) - Official source first!
-                if scorecard_enricher and university.get('country') in ['USA', 'United States', 'US', None]:
-                    logger.info(f"Checking College Scorecard for: {university['name']}")
-                    scorecard_data = await scorecard_enricher.enrich_university_async(university, session)
-                    for field, value in scorecard_data.items():
-                        if value and not university.get(field) and field not in enriched_data:
-                            enriched_data[field] = value
-                            fields_filled += 1
-
-                    if scorecard_data:
-                        logger.info(f"College Scorecard filled {len(scorecard_data)} fields")
-                        # Cache College Scorecard data (30 day TTL)
-                        if cache and university_id:
-                            cache.cache_multiple_fields(
-                                university_id, scorecard_data, 'college_scorecard'
-                            )
-                        await asyncio.sleep(self.rate_limit_delay)
-
-                # Step 1: General web search (Wikipedia, DuckDuckGo, etc.)
-                general_data = await web_enricher.enrich_university_async(university, session)
-                for field, value in general_data.items():
-                    if value and not university.get(field) and field not in enriched_data:
-                        enriched_data[field] = value
-                        fields_filled += 1
-
-                # Cache web search data (7 day TTL)
-                if cache and university_id and general_data:
-                    cache.cache_multiple_fields(
-                        university_id, general_data, 'wikipedia'
-                    )
-
-                # Small delay to respect rate limits
-                await asyncio.sleep(self.rate_limit_delay)
-
-                # Step 2: Field-specific targeted scraping for high-priority fields
-                website = enriched_data.get('website') or university.get('website')
-
-                # Acceptance rate (high priority)
-                if not university.get('acceptance_rate') and 'acceptance_rate' not in enriched_data:
-                    rate = await field_scrapers.find_acceptance_rate_async(
-                        university['name'], website, session
-                    )
-                    if rate:
-                        enriched_data['acceptance_rate'] = rate
-                        fields_filled += 1
-                    await asyncio.sleep(self.rate_limit_delay)
-
-                # Tuition costs (high priority)
-                if not university.get('tuition_out_state') and 'tuition_out_state' not in enriched_data:
-                    costs = await field_scrapers.find_tuition_costs_async(
-                        university['name'], website, session
-                    )
-                    for field, value in costs.items():
-                        if value and not university.get(field):
-                            enriched_data[field] = value
-                            fields_filled += 1
-                    await asyncio.sleep(self.rate_limit_delay)
-
-                # Test scores (medium priority)
-                if not university.get('sat_math_25th') and 'sat_math_25th' not in enriched_data:
-                    scores = await field_scrapers.find_test_scores_async(
-                        university['name'], website, session
-                    )
-                    for field, value in scores.items():
-                        if value and not university.get(field):
-                            enriched_data[field] = value
-                            fields_filled += 1
-                    await asyncio.sleep(self.rate_limit_delay)
-
-                # Graduation rate (high priority)
-                if not university.get('graduation_rate_4year') and 'graduation_rate_4year' not in enriched_data:
-                    rate = await field_scrapers.find_graduation_rate_async(
-                        university['name'], session
-                    )
-                    if rate:
-                        enriched_data['graduation_rate_4year'] = rate
-                        fields_filled += 1
-                    await asyncio.sleep(self.rate_limit_delay)
-
-                # Student count (high priority)
-                if not university.get('total_students') and 'total_students' not in enriched_data:
-                    count = await field_scrapers.find_student_count_async(
-                        university['name'], website, session
-                    )
-                    if count:
-                        enriched_data['total_students'] = count
-                        fields_filled += 1
-                    await asyncio.sleep(self.rate_limit_delay)
-
-                # Location details (medium priority)
-                if not university.get('city') or not university.get('state'):
-                    location = await field_scrapers.find_location_details_async(
-                        university['name'], session
-                    )
-                    for field, value in location.items():
-                        if value and not university.get(field):
-                            enriched_data[field] = value
-                            fields_filled += 1
+                # Steps 0-2 run concurrently; lookups for fields that are already
+                # known are skipped or cancelled
+                known = {f: v for f, v in university.items() if v}
+                known.update(enriched_data)
+                scheduler = FieldTaskScheduler(self.time_budget, critical_fields)
+                outcome = await scheduler.run(
+                    self._build_field_tasks(
+                        university, session, web_enricher, field_scrapers, scorecard_enricher, cache
+                    ),
+                    known
+                )
+                enriched_data.update(outcome.values)
 
-                # University type (medium priority)
-                if not university.get('university_type') and 'university_type' not in enriched_data:
-                    univ_type = await field_scrapers.find_university_type_async(
-                        university['name'], session
-                    )
-                    if univ_type:
-                        enriched_data['university_type'] = univ_type
-                        fields_filled += 1
-
-                # GPA average (high priority)
-                if not university.get('gpa_average') and 'gpa_average' not in enriched_data:
-                    gpa = await field_scrapers.find_gpa_average_async(
-                        university['name'], session
+                if outcome.timed_out:
+                    logger.info(
+                        f"Time budget ({self.time_budget}s) reached for {university['name']}, "
+                        f"cancelled: {', '.join(outcome.cancelled)}"
                     )
-                    if gpa:
-                        enriched_data['gpa_average'] = gpa
-                        fields_filled += 1
-
-                logger.info(f"✅ Filled {fields_filled} fields for {university['name']}")
+                logger.info(f"✅ Filled {len(enriched_data)} fields for {university['name']}")
 
             except Exception as e:
                 logger.error(f"❌ Error enriching {university['name']}: {e}")
                 self.stats['errors'] += 1
 
-            return enriched_data, fields_filled
+            return enriched_data, len(enriched_data)
+
+    def _build_field_tasks(
+        self,
+        university: Dict,
+        session,
+        web_enricher,
+        field_scrapers,
+        scorecard_enricher=None,
+        cache=None
+    ) -> List[FieldTask]:
+        """
+        Lookup DAG for one university
+
+        Ranks keep the old precedence: College Scorecard (official) over
+        general web search over the field-specific scrapers. For U.S.
+        universities the scrapers wait for College Scorecard so they only
+        run for fields it did not fill; the two scrapers that read the
+        website wait for web search when the website is not known yet.
+        """
+        name = university['name']
+        university_id = university.get('id')
+        tasks = []
+        scraper_deps = ()
+
+        # Step 0: College Scorecard (U.S. universities only) - Official source first!
+        if scorecard_enricher and university.get('country') in ['USA', 'United States', 'US', None]:
+            async def college_scorecard(known):
+                logger.info(f"Checking College Scorecard for: {name}")
+                data = await scorecard_enricher.enrich_university_async(university, session)
+                if data:
+                    logger.info(f"College Scorecard filled {len(data)} fields")
+                    # Cache College Scorecard data (30 day TTL)
+                    if cache and university_id:
+                        cache.cache_multiple_fields(university_id, data, 'college_scorecard')
+                        await cache.flush_if_due()
+                return data
+
+            tasks.append(FieldTask('college_scorecard', college_scorecard, tuple(self.FILLABLE_FIELDS), rank=0))
+            scraper_deps = ('college_scorecard',)
+
+        # Step 1: General web search (Wikipedia, DuckDuckGo, etc.)
+        async def web_search(known):
+            data = await web_enricher.enrich_university_async(university, session)
+            # Cache web search data (7 day TTL)
+            if cache and university_id and data:
+                cache.cache_multiple_fields(university_id, data, 'wikipedia')
+                await cache.flush_if_due()
+            return data
+
+        tasks.append(FieldTask('web_search', web_search, tuple(self.FILLABLE_FIELDS), rank=1))
+
+        # Step 2: Field-specific targeted scraping
+        website_deps = scraper_deps + (() if university.get('website') else ('web_search',))
+
+        async def acceptance_rate(known):
+            rate = await field_scrapers.find_acceptance_rate_async(name, known.get('website'), session)
+            return {'acceptance_rate': rate}
+
+        async def tuition(known):
+            return await field_scrapers.find_tuition_costs_async(name, known.get('website'), session)
+
+        async def test_scores(known):
+            return await field_scrapers.find_test_scores_async(name, known.get('website'), session)
+
+        async def graduation_rate(known):
+            return {'graduation_rate_4year': await field_scrapers.find_graduation_rate_async(name, session)}
+
+        async def student_count(known):
+            return {'total_students': await field_scrapers.find_student_count_async(name, known.get('website'), session)}
+
+        async def location(known):
+            return await field_scrapers.find_location_details_async(name, session)
+
+        async def university_type(known):
+            return {'university_type': await field_scrapers.find_university_type_async(name, session)}
+
+        async def gpa_average(known):
+            return {'gpa_average': await field_scrapers.find_gpa_average_async(name, session)}
+
+        tasks.extend([
+            FieldTask('acceptance_rate', acceptance_rate, ('acceptance_rate',), website_deps, rank=2),
+            FieldTask('tuition', tuition, ('tuition_out_state',), website_deps, rank=3),
+            FieldTask('test_scores', test_scores, ('sat_math_25th',), scraper_deps, rank=4),
+            FieldTask('graduation_rate', graduation_rate, ('graduation_rate_4year',), scraper_deps, rank=5),
+            FieldTask('student_count', student_count, ('total_students',), scraper_deps, rank=6),
+            FieldTask('location', location, ('city', 'state'), scraper_deps, rank=7),
+            FieldTask('university_type', university_type, ('university_type',), scraper_deps, rank=8),
+            FieldTask('gpa_average', gpa_average, ('gpa_average',), scraper_deps, rank=9),
+        ])
+        return tasks
 
     def update_university(self, university_id: int, enriched_data: Dict) -> bool:
         """
@@ -441,6 +375,7 @@ class AsyncAutoFillOrchestrator:
 
             # Update in Supabase using update + eq filter (safer than upsert)
             self.db.table('universities').update(cleaned_data).eq('id', university_id).execute()
+            get_candidate_index().record_filled(university_id, cleaned_data)
 
             logger.debug(f"Updated university {university_id} in database")
             return True
@@ -469,7 +404,7 @@ class AsyncAutoFillOrchestrator:
         from .async_web_search_enricher import AsyncWebSearchEnricher
         from .async_field_scrapers import AsyncFieldScrapers
         from .async_college_scorecard_enricher import AsyncCollegeScorecardEnricher
-        from .async_enrichment_cache import AsyncEnrichmentCache
+        from .async_enrichment_cache import AsyncEnrichmentCache, ENRICHMENT_CACHE_WRITE_BATCH_SIZE
 
         logger.info("=" * 80)
         logger.info("Starting Async Automated Data Enrichment")
@@ -489,97 +424,104 @@ class AsyncAutoFillOrchestrator:
         if dry_run:
             logger.info("🔍 DRY RUN MODE - No database updates will be made")
 
-        # Create aiohttp session
-        async with aiohttp.ClientSession() as session:
-            # Initialize enrichers
-            web_enricher = AsyncWebSearchEnricher(rate_limit_delay=self.rate_limit_delay)
-            field_scrapers = AsyncFieldScrapers()
+        # Shared keep-alive session with per-host rate limits
+        session = get_http_pool()
 
-            # Initialize College Scorecard enricher (U.S. universities only)
-            # Will gracefully skip if API key not configured
-            try:
-                scorecard_enricher = AsyncCollegeScorecardEnricher()
-                logger.info("✅ College Scorecard API enabled for U.S. universities")
-            except Exception as e:
-                logger.info(f"ℹ️  College Scorecard API not available: {e}")
-                scorecard_enricher = None
-
-            # Initialize enrichment cache
-            cache = AsyncEnrichmentCache(self.db, enabled=not dry_run)
-            logger.info(f"✅ Enrichment cache enabled (dry_run={dry_run})")
-
-            # Create tasks for concurrent processing
-            tasks = []
-            for university in universities:
-                task = self.enrich_university_async(
-                    university, session, web_enricher, field_scrapers, scorecard_enricher, cache
-                )
-                tasks.append((university, task))
+        # Initialize enrichers
+        web_enricher = AsyncWebSearchEnricher(rate_limit_delay=self.rate_limit_delay)
+        field_scrapers = AsyncFieldScrapers()
 
-            # Process universities concurrently
-            for i, (university, task) in enumerate(tasks, 1):
-                try:
-                    enriched_data, fields_filled = await task
+        # Initialize College Scorecard enricher (U.S. universities only)
+        # Will gracefully skip if API key not configured
+        try:
+            scorecard_enricher = AsyncCollegeScorecardEnricher()
+            logger.info("✅ College Scorecard API enabled for U.S. universities")
+        except Exception as e:
+            logger.info(f"ℹ️  College Scorecard API not available: {e}")
+            scorecard_enricher = None
+
+        # Initialize enrichment cache: one prefetch for the batch, buffered writes
+        cache = AsyncEnrichmentCache(
+            self.db, enabled=not dry_run, write_batch_size=ENRICHMENT_CACHE_WRITE_BATCH_SIZE
+        )
+        await cache.prefetch_async([u['id'] for u in universities if u.get('id')])
+        logger.info(f"✅ Enrichment cache enabled (dry_run={dry_run})")
+
+        # Schedule all enrichments up front; self.semaphore bounds how many run at once
+        tasks = []
+        for university in universities:
+            task = asyncio.ensure_future(self.enrich_university_async(
+                university, session, web_enricher, field_scrapers, scorecard_enricher, cache,
+                critical_fields=priority_fields
+            ))
+            tasks.append((university, task))
+
+        # Process universities concurrently
+        for i, (university, task) in enumerate(tasks, 1):
+            try:
+                enriched_data, fields_filled = await task
 
-                    # Update database (unless dry run)
-                    if enriched_data and not dry_run:
-                        success = self.update_university(university['id'], enriched_data)
-                        if success:
-                            self.stats['total_updated'] += 1
+                # Update database (unless dry run)
+                if enriched_data and not dry_run:
+                    success = self.update_university(university['id'], enriched_data)
+                    if success:
+                        self.stats['total_updated'] += 1
 
-                    # Update stats
-                    self.stats['total_processed'] += 1
+                # Update stats
+                self.stats['total_processed'] += 1
 
-                    for field in enriched_data.keys():
-                        if field not in self.stats['fields_filled']:
-                            self.stats['fields_filled'][field] = 0
-                        self.stats['fields_filled'][field] += 1
+                for field in enriched_data.keys():
+                    if field not in self.stats['fields_filled']:
+                        self.stats['fields_filled'][field] = 0
+                    self.stats['fields_filled'][field] += 1
 
-                    # Progress update
-                    if i % 10 == 0:
-                        logger.info(f"Progress: {i}/{len(universities)} processed")
-                        logger.info(f"Total fields filled: {sum(self.stats['fields_filled'].values())}")
+                # Progress update
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{len(universities)} processed")
+                    logger.info(f"Total fields filled: {sum(self.stats['fields_filled'].values())}")
 
-                except Exception as e:
-                    logger.error(f"Error processing {university['name']}: {e}")
-                    self.stats['errors'] += 1
+            except Exception as e:
+                logger.error(f"Error processing {university['name']}: {e}")
+                self.stats['errors'] += 1
 
-            self.stats['end_time'] = datetime.utcnow()
-            duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
+        await cache.flush_async()
 
-            # Get cache statistics
-            cache_stats = cache.get_stats() if cache else None
+        self.stats['end_time'] = datetime.utcnow()
+        duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
 
-            # Final report
-            logger.info("")
-            logger.info("=" * 80)
-            logger.info("Async Enrichment Complete!")
-            logger.info("=" * 80)
-            logger.info(f"Universities processed: {self.stats['total_processed']}")
-            logger.info(f"Universities updated: {self.stats['total_updated']}")
-            logger.info(f"Total fields filled: {sum(self.stats['fields_filled'].values())}")
-            logger.info(f"Errors encountered: {self.stats['errors']}")
-            logger.info(f"Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
-            logger.info(f"Speed: {self.stats['total_processed']/duration:.2f} universities/second")
-
-            # Cache statistics
-            if cache_stats and cache_stats['total_requests'] > 0:
-                logger.info("")
-                logger.info("Cache Performance:")
-                logger.info(f"  Cache hits: {cache_stats['hits']}")
-                logger.info(f"  Cache misses: {cache_stats['misses']}")
-                logger.info(f"  Cache writes: {cache_stats['writes']}")
-                logger.info(f"  Hit rate: {cache_stats['hit_rate']}%")
-                logger.info(f"  Time saved: ~{cache_stats['hits'] * 3:.0f} seconds (est)")
+        # Get cache statistics
+        cache_stats = cache.get_stats() if cache else None
 
+        # Final report
+        logger.info("")
+        logger.info("=" * 80)
+        logger.info("Async Enrichment Complete!")
+        logger.info("=" * 80)
+        logger.info(f"Universities processed: {self.stats['total_processed']}")
+        logger.info(f"Universities updated: {self.stats['total_updated']}")
+        logger.info(f"Total fields filled: {sum(self.stats['fields_filled'].values())}")
+        logger.info(f"Errors encountered: {self.stats['errors']}")
+        logger.info(f"Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
+        logger.info(f"Speed: {self.stats['total_processed']/duration:.2f} universities/second")
+
+        # Cache statistics
+        if cache_stats and cache_stats['total_requests'] > 0:
             logger.info("")
-            logger.info("Fields filled breakdown:")
-            for field, count in sorted(self.stats['fields_filled'].items(), key=lambda x: x[1], reverse=True):
-                logger.info(f"  {field}: {count}")
-
-            # Add cache stats to return value
-            if cache_stats:
-                self.stats['cache'] = cache_stats
+            logger.info("Cache Performance:")
+            logger.info(f"  Cache hits: {cache_stats['hits']}")
+            logger.info(f"  Cache misses: {cache_stats['misses']}")
+            logger.info(f"  Cache writes: {cache_stats['writes']}")
+            logger.info(f"  Hit rate: {cache_stats['hit_rate']}%")
+            logger.info(f"  Time saved: ~{cache_stats['hits'] * 3:.0f} seconds (est)")
+
+        logger.info("")
+        logger.info("Fields filled breakdown:")
+        for field, count in sorted(self.stats['fields_filled'].items(), key=lambda x: x[1], reverse=True):
+            logger.info(f"  {field}: {count}")
+
+        # Add cache stats to return value
+        if cache_stats:
+            self.stats['cache'] = cache_stats
 
         return self.stats
 
@@ -601,4 +543,10 @@ class AsyncAutoFillOrchestrator:
         Returns:
             Dict with statistics
         """
-        return asyncio.run(self.run_enrichment_async(limit, priority_fields, dry_run))
+        async def run():
+            try:
+                return await self.run_enrichment_async(limit, priority_fields, dry_run)
+            finally:
+                await close_http_pool()
+
+        return asyncio.run(run())
@@ -10,10 +10,8 @@ import os
 from typing import Dict, Optional, List
 from dotenv import load_dotenv
 
-from app.utils.retry import (
-    retry_async,
-    COLLEGE_SCORECARD_RATE_LIMITER,
-)
+from app.utils.retry import retry_async
+from .http_pool import get_http_pool
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -95,8 +93,6 @@ class AsyncCollegeScorecardEnricher:
             return None
 
         try:
-            # Rate limiting - wait for token before making request
-            await COLLEGE_SCORECARD_RATE_LIMITER.acquire()
             params = {
                 'school.name': university_name,
                 'api_key': self.api_key,
@@ -114,38 +110,31 @@ class AsyncCollegeScorecardEnricher:
                 'school.operating': '1',  # Currently operating
             })
 
-            close_session = False
-            if not session:
-                session = aiohttp.ClientSession()
-                close_session = True
-
-            try:
-                async with session.get(
-                    self.BASE_URL,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get('results', [])
-
-                        if results:
-                            # Return best match (first result is most relevant)
-                            logger.info(
-                                f"Found College Scorecard data for {university_name}"
-                            )
-                            return results[0]
-                        else:
-                            logger.debug(
-                                f"No College Scorecard match for {university_name}"
-                            )
+            # Shared pooled session rate limits api.data.gov per host
+            session = session or get_http_pool()
+            async with session.get(
+                self.BASE_URL,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = data.get('results', [])
+
+                    if results:
+                        # Return best match (first result is most relevant)
+                        logger.info(
+                            f"Found College Scorecard data for {university_name}"
+                        )
+                        return results[0]
                     else:
-                        logger.warning(
-                            f"College Scorecard API error: {response.status}"
+                        logger.debug(
+                            f"No College Scorecard match for {university_name}"
                         )
-            finally:
-                if close_session:
-                    await session.close()
+                else:
+                    logger.warning(
+                        f"College Scorecard API error: {response.status}"
+                    )
 
         except asyncio.TimeoutError:
             logger.warning(f"College Scorecard timeout for {university_name}")
@@ -2,16 +2,46 @@
 Async Enrichment Cache Manager
 Field-level caching to reduce redundant API calls and web scraping
 Provides 2-3x speedup for re-enrichment scenarios
+
+Batch jobs call `prefetch_async` once for all their universities and
+construct the cache with `write_batch_size` > 1, so reads come from the
+in-process L1 and writes go out as multi-row upserts. Buffered writes never
+hit the database inline: a full (or old) buffer sets `flush_due`, which the
+coroutine that wrote awaits via `flush_if_due`, and the job awaits
+`flush_async` at the end. Both async paths make one executor call per chunk
+or batch, so each stays within DB_QUERY_TIMEOUT_SECONDS however large the job.
 """
 import logging
-from typing import Dict, Optional, List, Any
-from datetime import datetime, timedelta
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, List, Any, Iterable, Tuple
+from datetime import datetime, timedelta, timezone
 from supabase import Client
 import json
 
+from app.database.async_db import QueryTimeoutError, run_blocking
+from app.monitoring import record_cache_access
+
 logger = logging.getLogger(__name__)
 
 
+ENRICHMENT_CACHE_WRITE_BATCH_SIZE = int(os.getenv("ENRICHMENT_CACHE_WRITE_BATCH_SIZE", "500"))
+ENRICHMENT_CACHE_FLUSH_INTERVAL_SECONDS = float(os.getenv("ENRICHMENT_CACHE_FLUSH_INTERVAL_SECONDS", "5"))
+ENRICHMENT_CACHE_L1_MAX_UNIVERSITIES = int(os.getenv("ENRICHMENT_CACHE_L1_MAX_UNIVERSITIES", "50000"))
+PREFETCH_CHUNK_SIZE = 200  # university_ids per IN filter (keeps the URL short)
+PAGE_SIZE = 1000  # PostgREST default max rows per request
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Stored timestamps as naive UTC (matching datetime.utcnow())"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 class AsyncEnrichmentCache:
     """
     Manages field-level caching for enriched university data
@@ -32,16 +62,30 @@ class AsyncEnrichmentCache:
         'default': timedelta(days=7)              # Fallback
     }
 
-    def __init__(self, db: Client, enabled: bool = True):
+    def __init__(
+        self,
+        db: Client,
+        enabled: bool = True,
+        write_batch_size: int = 1,
+        flush_interval: float = ENRICHMENT_CACHE_FLUSH_INTERVAL_SECONDS,
+        l1_max_universities: int = ENRICHMENT_CACHE_L1_MAX_UNIVERSITIES
+    ):
         """
         Initialize cache manager
 
         Args:
             db: Supabase client
             enabled: If False, cache is disabled (bypass for testing)
+            write_batch_size: Buffer writes and upsert them in batches of this size
+                (1 = write through immediately)
+            flush_interval: Also flush buffered writes once they are this many seconds old
+            l1_max_universities: Universities kept in the in-process L1
         """
         self.db = db
         self.enabled = enabled
+        self.write_batch_size = max(1, write_batch_size)
+        self.flush_interval = flush_interval
+        self.l1_max_universities = l1_max_universities
         self.stats = {
             'hits': 0,
             'misses': 0,
@@ -49,6 +93,107 @@ class AsyncEnrichmentCache:
             'errors': 0
         }
 
+        # L1: university_id -> {field_name: (value, expires_at)}
+        self._l1: "OrderedDict[int, Dict[str, Tuple[Any, datetime]]]" = OrderedDict()
+        self._complete = set()  # Universities whose cache entries are all in L1
+        self._pending: Dict[Tuple[int, str], Dict] = {}
+        self._last_flush = time.monotonic()
+        self._flush_due = False
+        self._lock = Lock()
+
+    @property
+    def flush_due(self) -> bool:
+        """Buffered writes reached the batch size or flush interval"""
+        return self._flush_due
+
+    def _prefetch_ids(self, university_ids: Iterable[int]) -> List[int]:
+        return [uid for uid in dict.fromkeys(university_ids) if uid is not None and uid not in self._complete]
+
+    def prefetch(self, university_ids: Iterable[int]) -> int:
+        """
+        Load all non-expired cache entries for a batch of universities into L1
+
+        Later get_cached_fields calls for these universities need no query.
+
+        Returns:
+            Number of cache entries loaded
+        """
+        if not self.enabled:
+            return 0
+
+        ids = self._prefetch_ids(university_ids)
+        loaded = sum(
+            self._prefetch_chunk(ids[i:i + PREFETCH_CHUNK_SIZE])
+            for i in range(0, len(ids), PREFETCH_CHUNK_SIZE)
+        )
+        logger.info(f"Prefetched {loaded} cache entries for {len(ids)} universities")
+        return loaded
+
+    async def prefetch_async(self, university_ids: Iterable[int]) -> int:
+        """`prefetch` on the DB executor, one call (and timeout) per chunk of universities"""
+        if not self.enabled:
+            return 0
+
+        ids = self._prefetch_ids(university_ids)
+        loaded = 0
+        for i in range(0, len(ids), PREFETCH_CHUNK_SIZE):
+            try:
+                loaded += await run_blocking(self._prefetch_chunk, ids[i:i + PREFETCH_CHUNK_SIZE])
+            except QueryTimeoutError as e:
+                logger.error(f"Cache prefetch error: {e}")  # Those universities read through instead
+                self.stats['errors'] += 1
+        logger.info(f"Prefetched {loaded} cache entries for {len(ids)} universities")
+        return loaded
+
+    def _prefetch_chunk(self, chunk: List[int]) -> int:
+        """Load one IN-filter chunk of universities into L1; returns entries loaded"""
+        now = datetime.utcnow().isoformat()
+        try:
+            offset = 0
+            rows = []
+            while True:
+                page = self.db.table('enrichment_cache')\
+                    .select('university_id, field_name, field_value, expires_at')\
+                    .in_('university_id', chunk)\
+                    .gte('expires_at', now)\
+                    .order('id')\
+                    .range(offset, offset + PAGE_SIZE - 1)\
+                    .execute().data or []
+                rows.extend(page)
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+        except Exception as e:
+            logger.error(f"Cache prefetch error: {e}")
+            self.stats['errors'] += 1
+            return 0
+
+        loaded = 0
+        with self._lock:
+            for uid in chunk:
+                self._l1_entries(uid)
+                self._complete.add(uid)
+            for row in rows:
+                value = self._deserialize_value(row['field_value'])
+                if value is not None:
+                    self._l1_entries(row['university_id'])[row['field_name']] = (
+                        value, _parse_timestamp(row['expires_at'])
+                    )
+                    loaded += 1
+        return loaded
+
+    def _l1_entries(self, university_id: int) -> Dict[str, Tuple[Any, datetime]]:
+        """L1 entries for a university (created on demand, LRU-bounded); call with _lock held"""
+        entries = self._l1.get(university_id)
+        if entries is None:
+            entries = self._l1[university_id] = {}
+            while len(self._l1) > self.l1_max_universities:
+                evicted, _ = self._l1.popitem(last=False)
+                self._complete.discard(evicted)
+        else:
+            self._l1.move_to_end(university_id)
+        return entries
+
     def get_cached_fields(self, university_id: int, field_names: List[str] = None) -> Dict[str, Any]:
         """
         Get cached fields for a university
@@ -63,10 +208,13 @@ class AsyncEnrichmentCache:
         if not self.enabled:
             return {}
 
+        if university_id in self._complete:
+            return self._get_from_l1(university_id, field_names)
+
         try:
             # Build query
             query = self.db.table('enrichment_cache')\
-                .select('field_name, field_value, data_source, cached_at')\
+                .select('field_name, field_value, data_source, cached_at, expires_at')\
                 .eq('university_id', university_id)\
                 .gte('expires_at', datetime.utcnow().isoformat())  # Only non-expired
 
@@ -84,13 +232,25 @@ class AsyncEnrichmentCache:
                 if field_value is not None:
                     cached_fields[field_name] = field_value
                     self.stats['hits'] += 1
+                    with self._lock:
+                        self._l1_entries(university_id)[field_name] = (
+                            field_value, _parse_timestamp(entry['expires_at'])
+                        )
 
                     logger.debug(
                         f"Cache HIT: {field_name} for university {university_id} "
                         f"(source: {entry['data_source']}, age: "
-                        f"{(datetime.utcnow() - datetime.fromisoformat(entry['cached_at'].replace('Z', '+00:00'))).days} days)"
+                        f"{(datetime.utcnow() - _parse_timestamp(entry['cached_at'])).days} days)"
                     )
 
+            if field_names:
+                missed = len(set(field_names) - set(cached_fields))
+                self.stats['misses'] += missed
+                self._record_access(len(cached_fields), missed)
+            else:
+                self._complete.add(university_id)
+                self._record_access(len(cached_fields), 0)
+
             if cached_fields:
                 logger.info(
                     f"Retrieved {len(cached_fields)} cached fields for university {university_id}"
@@ -103,6 +263,28 @@ class AsyncEnrichmentCache:
             self.stats['errors'] += 1
             return {}
 
+    def _get_from_l1(self, university_id: int, field_names: Optional[List[str]]) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        with self._lock:
+            entries = self._l1_entries(university_id)
+            cached_fields = {
+                name: value for name, (value, expires_at) in entries.items()
+                if expires_at >= now and (not field_names or name in field_names)
+            }
+        missed = len(set(field_names) - set(cached_fields)) if field_names else 0
+        self.stats['hits'] += len(cached_fields)
+        self.stats['misses'] += missed
+        self._record_access(len(cached_fields), missed)
+        return cached_fields
+
+    @staticmethod
+    def _record_access(hits: int, misses: int):
+        """Export field hits/misses to the cache metrics"""
+        if hits:
+            record_cache_access('enrichment', True, hits)
+        if misses:
+            record_cache_access('enrichment', False, misses)
+
     def cache_field(
         self,
         university_id: int,
@@ -127,40 +309,7 @@ class AsyncEnrichmentCache:
         if not self.enabled:
             return False
 
-        try:
-            # Calculate expiration
-            if ttl is None:
-                ttl = self.DEFAULT_TTL.get(data_source, self.DEFAULT_TTL['default'])
-
-            expires_at = datetime.utcnow() + ttl
-
-            # Serialize value
-            serialized_value = self._serialize_value(field_value)
-
-            # Upsert cache entry (replaces existing if present)
-            self.db.table('enrichment_cache').upsert({
-                'university_id': university_id,
-                'field_name': field_name,
-                'field_value': serialized_value,
-                'data_source': data_source,
-                'cached_at': datetime.utcnow().isoformat(),
-                'expires_at': expires_at.isoformat(),
-                'updated_at': datetime.utcnow().isoformat()
-            }, on_conflict='university_id,field_name').execute()
-
-            self.stats['writes'] += 1
-
-            logger.debug(
-                f"Cached {field_name}={field_value} for university {university_id} "
-                f"(source: {data_source}, TTL: {ttl.days} days)"
-            )
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Cache write error for {field_name}: {e}")
-            self.stats['errors'] += 1
-            return False
+        return self._write(university_id, {field_name: field_value}, data_source, ttl) == 1
 
     def cache_multiple_fields(
         self,
@@ -184,11 +333,13 @@ class AsyncEnrichmentCache:
         if not self.enabled or not fields:
             return 0
 
-        cached_count = 0
-        for field_name, field_value in fields.items():
-            if field_value is not None:  # Don't cache None values
-                if self.cache_field(university_id, field_name, field_value, data_source, ttl):
-                    cached_count += 1
+        # Don't cache None values
+        cached_count = self._write(
+            university_id,
+            {name: value for name, value in fields.items() if value is not None},
+            data_source,
+            ttl
+        )
 
         if cached_count > 0:
             logger.info(
@@ -198,6 +349,115 @@ class AsyncEnrichmentCache:
 
         return cached_count
 
+    def _write(
+        self,
+        university_id: int,
+        fields: Dict[str, Any],
+        data_source: str,
+        ttl: Optional[timedelta]
+    ) -> int:
+        """Update L1 and upsert (or buffer) one row per field; returns fields accepted"""
+        if not fields:
+            return 0
+
+        # Calculate expiration
+        if ttl is None:
+            ttl = self.DEFAULT_TTL.get(data_source, self.DEFAULT_TTL['default'])
+        now = datetime.utcnow()
+        expires_at = now + ttl
+
+        rows = {}
+        with self._lock:
+            entries = self._l1_entries(university_id)
+            for field_name, field_value in fields.items():
+                entries[field_name] = (field_value, expires_at)
+                rows[(university_id, field_name)] = {
+                    'university_id': university_id,
+                    'field_name': field_name,
+                    'field_value': self._serialize_value(field_value),
+                    'data_source': data_source,
+                    'cached_at': now.isoformat(),
+                    'expires_at': expires_at.isoformat(),
+                    'updated_at': now.isoformat()
+                }
+
+        logger.debug(
+            f"Caching {len(rows)} fields for university {university_id} "
+            f"(source: {data_source}, TTL: {ttl.days} days)"
+        )
+
+        if self.write_batch_size <= 1:
+            return len(rows) if self._upsert(list(rows.values())) else 0
+
+        with self._lock:
+            self._pending.update(rows)  # Later values for the same field replace earlier ones
+            # Not flushed here: writers run on the event loop (see flush_if_due)
+            self._flush_due = self._flush_due or (
+                len(self._pending) >= self.write_batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        return len(rows)
+
+    def _take_pending(self) -> List[Dict]:
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+            self._flush_due = False
+        return rows
+
+    def flush(self) -> int:
+        """
+        Write buffered cache entries as batched upserts
+
+        Returns:
+            Number of entries written
+        """
+        rows = self._take_pending()
+        written = 0
+        for i in range(0, len(rows), self.write_batch_size):
+            batch = rows[i:i + self.write_batch_size]
+            if self._upsert(batch):
+                written += len(batch)
+        if rows:
+            logger.info(f"Flushed {written}/{len(rows)} cache entries")
+        return written
+
+    async def flush_async(self) -> int:
+        """`flush` on the DB executor, one call (and timeout) per upsert batch"""
+        rows = self._take_pending()
+        written = 0
+        for i in range(0, len(rows), self.write_batch_size):
+            batch = rows[i:i + self.write_batch_size]
+            try:
+                if await run_blocking(self._upsert, batch):
+                    written += len(batch)
+            except QueryTimeoutError as e:
+                logger.error(f"Cache write error for {len(batch)} entries: {e}")
+                self.stats['errors'] += 1
+        if rows:
+            logger.info(f"Flushed {written}/{len(rows)} cache entries")
+        return written
+
+    async def flush_if_due(self) -> int:
+        """Flush buffered writes if the batch is full or old enough; call after cache writes"""
+        if not self._flush_due:
+            return 0
+        return await self.flush_async()
+
+    def _upsert(self, rows: List[Dict]) -> bool:
+        try:
+            # Upsert cache entries (replaces existing if present)
+            self.db.table('enrichment_cache').upsert(
+                rows, on_conflict='university_id,field_name'
+            ).execute()
+            self.stats['writes'] += len(rows)
+            return True
+        except Exception as e:
+            logger.error(f"Cache write error for {len(rows)} entries: {e}")
+            self.stats['errors'] += 1
+            return False
+
     def invalidate_university(self, university_id: int) -> int:
         """
         Invalidate all cached fields for a university
@@ -211,6 +471,11 @@ class AsyncEnrichmentCache:
         if not self.enabled:
             return 0
 
+        with self._lock:
+            self._l1.pop(university_id, None)
+            self._complete.discard(university_id)
+            self._pending = {k: v for k, v in self._pending.items() if k[0] != university_id}
+
         try:
             response = self.db.table('enrichment_cache')\
                 .delete()\
@@ -240,6 +505,11 @@ class AsyncEnrichmentCache:
         if not self.enabled:
             return 0
 
+        with self._lock:
+            for entries in self._l1.values():
+                entries.pop(field_name, None)
+            self._pending = {k: v for k, v in self._pending.items() if k[1] != field_name}
+
         try:
             response = self.db.table('enrichment_cache')\
                 .delete()\
@@ -301,7 +571,8 @@ class AsyncEnrichmentCache:
             'writes': self.stats['writes'],
             'errors': self.stats['errors'],
             'hit_rate': round(hit_rate, 2),
-            'total_requests': total_requests
+            'total_requests': total_requests,
+            'pending_writes': len(self._pending)
         }
 
     def get_database_stats(self) -> Optional[Dict]:
@@ -9,13 +9,15 @@ from typing import Dict, Optional
 from bs4 import BeautifulSoup
 import re
 
+from .http_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
 
 class AsyncFieldScrapers:
     """
     Async specialized scrapers for specific university data fields
-    Uses aiohttp for concurrent requests
+    Uses aiohttp for concurrent requests (shared pool when no session is given)
     """
 
     def __init__(self):
@@ -295,6 +297,7 @@ class AsyncFieldScrapers:
         session: aiohttp.ClientSession = None
     ) -> Optional[str]:
         """Async web search using DuckDuckGo HTML"""
+        session = session or get_http_pool()
         try:
             url = "https://html.duckduckgo.com/html/"
             data = {'q': query}
@@ -334,6 +337,7 @@ class AsyncFieldScrapers:
         session: aiohttp.ClientSession = None
     ) -> Optional[float]:
         """Async scrape university admissions page"""
+        session = session or get_http_pool()
         try:
             # Try common admissions URLs
             urls = [
@@ -372,6 +376,7 @@ class AsyncFieldScrapers:
         session: aiohttp.ClientSession = None
     ) -> Dict[str, Optional[float]]:
         """Async scrape university tuition page"""
+        session = session or get_http_pool()
         costs = {}
 
         try:
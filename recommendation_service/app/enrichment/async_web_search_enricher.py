@@ -1,7 +1,7 @@
 """
 Async Web Search-Based Data Enricher
 High-performance async version using aiohttp
-WITH RETRY LOGIC AND RATE LIMITING
+WITH RETRY LOGIC AND PER-HOST RATE LIMITING (see http_pool.py)
 Enhanced with multiple data sources and rotating user agents
 """
 import aiohttp
@@ -12,13 +12,8 @@ from typing import Dict, Optional, List
 from bs4 import BeautifulSoup
 import re
 
-from app.utils.retry import (
-    retry_async,
-    WIKIPEDIA_RATE_LIMITER,
-    DUCKDUCKGO_RATE_LIMITER,
-    WIKIPEDIA_CIRCUIT_BREAKER,
-    DUCKDUCKGO_CIRCUIT_BREAKER,
-)
+from app.utils.retry import retry_async
+from .http_pool import get_http_pool
 
 logger = logging.getLogger(__name__)
 
@@ -72,11 +67,8 @@ class AsyncWebSearchEnricher:
 
         enriched_data = {}
 
-        # Create session if not provided
-        close_session = False
-        if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
+        # Shared pooled session with per-host rate limits if not provided
+        session = session or get_http_pool()
 
         try:
             # Run all searches concurrently - prioritize reliable sources
@@ -120,11 +112,6 @@ class AsyncWebSearchEnricher:
         except Exception as e:
             logger.error(f"Error searching for {university_name}: {e}")
 
-        finally:
-            # Close session if we created it
-            if close_session and session:
-                await session.close()
-
         return enriched_data
 
     @retry_async(max_attempts=2, initial_delay=1.0, max_delay=5.0)
@@ -141,8 +128,6 @@ class AsyncWebSearchEnricher:
         data = {}
 
         try:
-            await WIKIPEDIA_RATE_LIMITER.acquire()
-
             # Search for entity
             search_url = "https://www.wikidata.org/w/api.php"
             search_params = {
@@ -281,9 +266,6 @@ class AsyncWebSearchEnricher:
         data = {}
 
         try:
-            # Rate limiting - wait for token before making request
-            await WIKIPEDIA_RATE_LIMITER.acquire()
-
             headers = self._get_headers()
 
             # Search Wikipedia API
@@ -422,8 +404,6 @@ class AsyncWebSearchEnricher:
         data = {}
 
         try:
-            await DUCKDUCKGO_RATE_LIMITER.acquire()
-
             # Use HTML search instead of API
             url = "https://html.duckduckgo.com/html/"
             form_data = {
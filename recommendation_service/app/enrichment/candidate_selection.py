@@ -0,0 +1,189 @@
+"""
+Enrichment Candidate Selection - Which universities to enrich next
+
+Reads only the columns enrichment looks at (id, name, country and the
+fillable fields), streamed in id-ordered pages, and keeps each university's
+set of missing fields in memory. Candidates are ranked from that index:
+missing critical fields first, then total missing fields, with U.S.
+universities boosted. Writes from the enrichment run are recorded with
+`record_filled`, so the next batch is picked without rescanning the
+table. Per-field NULL counts come from the `university_null_field_counts`
+function (migrations/create_enrichment_candidates.sql).
+"""
+from heapq import nlargest
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set
+import logging
+import os
+import time
+
+from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+
+ENRICHMENT_CANDIDATES_TTL_SECONDS = int(os.getenv("ENRICHMENT_CANDIDATES_TTL_SECONDS", "900"))
+PAGE_SIZE = 1000  # PostgREST default max rows per request
+
+FILLABLE_FIELDS = [
+    'city', 'state', 'website', 'logo_url', 'description',
+    'university_type', 'location_type', 'total_students',
+    'acceptance_rate', 'gpa_average',
+    'sat_math_25th', 'sat_math_75th',
+    'sat_ebrw_25th', 'sat_ebrw_75th',
+    'act_composite_25th', 'act_composite_75th',
+    'tuition_out_state', 'total_cost',
+    'graduation_rate_4year'
+]
+
+# Priority 1 fields (critical for ML)
+CRITICAL_FIELDS = frozenset({
+    'acceptance_rate', 'gpa_average', 'graduation_rate_4year',
+    'total_students', 'tuition_out_state', 'total_cost'
+})
+
+US_COUNTRIES = frozenset({'USA', 'United States', 'US', 'U.S.', 'U.S.A.'})
+US_BOOST = 10000  # Ensures U.S. universities (College Scorecard coverage) come first
+
+
+def candidate_score(
+    missing: Set[str],
+    country: Optional[str],
+    priority_fields: Optional[Iterable[str]] = None,
+    prioritize_us: bool = True
+) -> int:
+    """missing_critical * 100 + missing_total (+ US_BOOST for U.S. universities)"""
+    missing_critical = len(missing & CRITICAL_FIELDS)
+    if priority_fields:
+        missing_critical += len(missing.intersection(priority_fields))
+    score = missing_critical * 100 + len(missing)
+    if prioritize_us and country in US_COUNTRIES:
+        score += US_BOOST
+    return score
+
+
+class CandidateIndex:
+    """Missing-field sets for every university, loaded in pages"""
+
+    def __init__(self, fields: List[str] = FILLABLE_FIELDS, ttl: int = ENRICHMENT_CANDIDATES_TTL_SECONDS):
+        self.fields = list(fields)
+        self.ttl = ttl
+        self.total = 0
+        self._rows: Dict[int, Dict] = {}          # Universities with missing fields (narrow rows)
+        self._missing: Dict[int, Set[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at <= self.ttl
+
+    def ensure_loaded(self, db: Client):
+        if not self.is_fresh:
+            self.load(db)
+
+    def load(self, db: Client):
+        """Rebuild from the universities table"""
+        columns = ', '.join(['id', 'name', 'country'] + [f for f in self.fields if f not in ('id', 'name', 'country')])
+        rows: Dict[int, Dict] = {}
+        missing: Dict[int, Set[str]] = {}
+        total = 0
+        offset = 0
+        while True:
+            page = db.table('universities').select(columns).order('id')\
+                .range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            for row in page:
+                total += 1
+                row_missing = {f for f in self.fields if not row.get(f)}
+                if row_missing:
+                    rows[row['id']] = row
+                    missing[row['id']] = row_missing
+            if len(page) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+
+        with self._lock:
+            self._rows, self._missing, self.total = rows, missing, total
+            self._loaded_at = time.monotonic()
+        logger.info(f"Candidate index loaded: {len(rows)}/{total} universities have missing fields")
+
+    def select(
+        self,
+        limit: Optional[int] = None,
+        priority_fields: Optional[List[str]] = None,
+        prioritize_us: bool = True,
+        us_only: bool = False
+    ) -> List[Dict]:
+        """Highest-scoring universities (id order breaks ties)"""
+        with self._lock:
+            ids = [
+                uid for uid in self._missing
+                if not us_only or self._rows[uid].get('country') in US_COUNTRIES
+            ]
+
+            def score(uid: int) -> int:
+                return candidate_score(self._missing[uid], self._rows[uid].get('country'), priority_fields, prioritize_us)
+
+            if limit:
+                chosen = nlargest(limit, ids, key=score)
+            else:
+                chosen = sorted(ids, key=score, reverse=True)
+            return [dict(self._rows[uid]) for uid in chosen]
+
+    def record_filled(self, university_id: int, values: Dict[str, Any]):
+        """Account for values written by enrichment"""
+        with self._lock:
+            row_missing = self._missing.get(university_id)
+            if row_missing is None:
+                return
+            for field, value in values.items():
+                if value and field in row_missing:
+                    row_missing.discard(field)
+                    self._rows[university_id][field] = value
+            if not row_missing:
+                del self._missing[university_id]
+                del self._rows[university_id]
+
+    def null_counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict.fromkeys(self.fields, 0)
+            for row_missing in self._missing.values():
+                for field in row_missing:
+                    counts[field] += 1
+            return counts
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+
+def fetch_null_counts(db: Client, fields: List[str]) -> Optional[Dict]:
+    """
+    Server-side NULL counts per field
+
+    Returns:
+        {'total': n, 'null_counts': {field: count}} or None if the function
+        is not available
+    """
+    try:
+        rows = db.rpc('university_null_field_counts', {'p_fields': list(fields)}).execute().data or []
+    except Exception as e:
+        logger.warning(f"university_null_field_counts unavailable, using candidate index: {e}")
+        return None
+    counts = dict.fromkeys(fields, 0)
+    total = 0
+    for row in rows:
+        counts[row['field_name']] = int(row['null_count'])
+        total = int(row['total_count'])
+    return {'total': total, 'null_counts': counts}
+
+
+_candidate_index: Optional[CandidateIndex] = None
+
+
+def get_candidate_index() -> CandidateIndex:
+    """Get the process-wide enrichment candidate index"""
+    global _candidate_index
+    if _candidate_index is None:
+        _candidate_index = CandidateIndex()
+    return _candidate_index
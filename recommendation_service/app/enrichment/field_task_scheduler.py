@@ -0,0 +1,142 @@
+"""
+Field Task Scheduler - Concurrent, dependency-aware field lookups per university
+
+Runs the lookups for one university (College Scorecard, general web search,
+field scrapers) as a small DAG instead of one after another:
+- a lookup starts as soon as the lookups it depends on have finished
+- it is skipped, or cancelled while running, once the fields it exists
+  for are already known
+- everything still running is cancelled once the critical fields are
+  filled or the per-university time budget runs out
+
+Conflicts between lookups resolve by rank (lower wins), so results match
+the old sequential order however the lookups complete.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FieldTask:
+    """One lookup: `run(known_values)` returns {field: value}"""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    provides: Tuple[str, ...] = ()  # Fields that make the lookup worthwhile (empty: always run)
+    after: Tuple[str, ...] = ()     # Tasks that must finish first
+    rank: int = 0
+
+
+@dataclass
+class FieldTaskResult:
+    values: Dict[str, Any]                      # New values only (not the seeded ones)
+    completed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    cancelled: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    timed_out: bool = False
+
+
+class FieldTaskScheduler:
+    """Runs FieldTasks concurrently within a time budget"""
+
+    def __init__(self, time_budget: Optional[float] = None, critical_fields: Optional[Iterable[str]] = None):
+        """
+        Args:
+            time_budget: Seconds before remaining lookups are cancelled (None: no limit)
+            critical_fields: Stop as soon as all of these are known
+        """
+        self.time_budget = time_budget
+        self.critical_fields = tuple(critical_fields or ())
+
+    async def run(self, tasks: List[FieldTask], known: Optional[Dict[str, Any]] = None) -> FieldTaskResult:
+        """
+        Args:
+            tasks: Lookups to run
+            known: Values already available (existing columns, cache); never overwritten
+        """
+        values: Dict[str, Any] = dict(known or {})
+        ranks: Dict[str, int] = {name: -1 for name in values}
+        result = FieldTaskResult(values={})
+
+        pending = {task.name: task for task in tasks}
+        names = set(pending)
+        running: Dict[asyncio.Task, FieldTask] = {}
+        abandoned: List[asyncio.Task] = []
+        finished = set()
+
+        def satisfied(fields: Tuple[str, ...]) -> bool:
+            return all(f in values for f in fields)
+
+        loop = asyncio.get_running_loop()
+        deadline = None if self.time_budget is None else loop.time() + self.time_budget
+
+        try:
+            while True:
+                started = True
+                while started:  # Skipping a task may unblock its dependents
+                    started = False
+                    for task in list(pending.values()):
+                        if not all(dep in finished or dep not in names for dep in task.after):
+                            continue
+                        del pending[task.name]
+                        started = True
+                        if task.provides and satisfied(task.provides):
+                            result.skipped.append(task.name)
+                            finished.add(task.name)
+                        else:
+                            running[asyncio.ensure_future(task.run(dict(values)))] = task
+
+                if not running:
+                    break
+                if self.critical_fields and satisfied(self.critical_fields):
+                    break
+
+                timeout = None if deadline is None else deadline - loop.time()
+                if timeout is not None and timeout <= 0:
+                    result.timed_out = True
+                    break
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    result.timed_out = True
+                    break
+
+                for future in done:
+                    task = running.pop(future)
+                    finished.add(task.name)
+                    try:
+                        found = future.result() or {}
+                    except Exception as e:
+                        logger.debug(f"Field lookup {task.name} failed: {e}")
+                        result.failed.append(task.name)
+                        continue
+                    result.completed.append(task.name)
+                    for name, value in found.items():
+                        if not value or name.startswith('_'):
+                            continue
+                        if name not in ranks or ranks[name] > task.rank:
+                            values[name] = value
+                            ranks[name] = task.rank
+
+                # Lookups whose fields another lookup already found are no longer needed
+                for future, task in list(running.items()):
+                    if task.provides and satisfied(task.provides):
+                        future.cancel()
+                        running.pop(future)
+                        abandoned.append(future)
+                        finished.add(task.name)
+                        result.cancelled.append(task.name)
+        finally:
+            for future, task in running.items():
+                future.cancel()
+                result.cancelled.append(task.name)
+            abandoned.extend(running)
+            if abandoned:
+                await asyncio.gather(*abandoned, return_exceptions=True)
+            result.cancelled.extend(pending)
+
+        result.values = {name: values[name] for name, rank in ranks.items() if rank >= 0}
+        return result
@@ -0,0 +1,231 @@
+"""
+Enrichment HTTP Pool - Shared keep-alive session with per-host politeness
+
+Every async enricher sends its requests through one aiohttp session with a
+pooled connector (keep-alive, DNS cache). Each request first takes a
+concurrency slot and a token from its host's bucket, and the host's circuit
+breaker tracks the result. Requests to different hosts run in parallel, and
+each site still sees a bounded request rate. This replaces the fixed sleeps
+between enrichment steps.
+
+Usage mirrors aiohttp:
+    async with get_http_pool().get(url, timeout=10) as response:
+        ...
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from app.utils.retry import (
+    RateLimiter,
+    CircuitBreaker,
+    RetryConfig,
+    WIKIPEDIA_RATE_LIMITER,
+    WIKIDATA_RATE_LIMITER,
+    DUCKDUCKGO_RATE_LIMITER,
+    COLLEGE_SCORECARD_RATE_LIMITER,
+    WIKIPEDIA_CIRCUIT_BREAKER,
+    WIKIDATA_CIRCUIT_BREAKER,
+    DUCKDUCKGO_CIRCUIT_BREAKER,
+    COLLEGE_SCORECARD_CIRCUIT_BREAKER,
+)
+
+logger = logging.getLogger(__name__)
+
+
+ENRICHMENT_HTTP_MAX_CONNECTIONS = int(os.getenv("ENRICHMENT_HTTP_MAX_CONNECTIONS", "100"))
+ENRICHMENT_HTTP_MAX_PER_HOST = int(os.getenv("ENRICHMENT_HTTP_MAX_PER_HOST", "4"))
+ENRICHMENT_HTTP_DNS_TTL_SECONDS = int(os.getenv("ENRICHMENT_HTTP_DNS_TTL_SECONDS", "300"))
+ENRICHMENT_HTTP_HOST_RPS = float(os.getenv("ENRICHMENT_HTTP_HOST_RPS", "2.0"))
+ENRICHMENT_HTTP_MAX_TRACKED_HOSTS = int(os.getenv("ENRICHMENT_HTTP_MAX_TRACKED_HOSTS", "4096"))
+
+# APIs with agreed limits share the process-wide limiters from app.utils.retry
+KNOWN_HOSTS: Dict[str, Tuple[RateLimiter, CircuitBreaker]] = {
+    'en.wikipedia.org': (WIKIPEDIA_RATE_LIMITER, WIKIPEDIA_CIRCUIT_BREAKER),
+    'www.wikidata.org': (WIKIDATA_RATE_LIMITER, WIKIDATA_CIRCUIT_BREAKER),
+    'html.duckduckgo.com': (DUCKDUCKGO_RATE_LIMITER, DUCKDUCKGO_CIRCUIT_BREAKER),
+    'api.data.gov': (COLLEGE_SCORECARD_RATE_LIMITER, COLLEGE_SCORECARD_CIRCUIT_BREAKER),
+}
+
+
+class _FailedStatus(Exception):
+    """Retryable HTTP status, raised only so the circuit breaker counts it"""
+
+    def __init__(self, response: aiohttp.ClientResponse):
+        super().__init__(f"HTTP {response.status}")
+        self.response = response
+
+
+class HostLimiter:
+    """Concurrency slots, token bucket and circuit breaker for one host"""
+
+    def __init__(self, max_concurrent: int, rate_limiter: RateLimiter, circuit_breaker: CircuitBreaker):
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+
+
+class HostLimiters:
+    """
+    Per-host limiters, created on first use
+
+    Unknown hosts (university websites, guessed domains) get a default
+    bucket; the least recently used are dropped beyond `max_hosts`.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = ENRICHMENT_HTTP_MAX_PER_HOST,
+        requests_per_second: float = ENRICHMENT_HTTP_HOST_RPS,
+        max_hosts: int = ENRICHMENT_HTTP_MAX_TRACKED_HOSTS,
+        known_hosts: Optional[Dict[str, Tuple[RateLimiter, CircuitBreaker]]] = None
+    ):
+        self.max_per_host = max_per_host
+        self.requests_per_second = requests_per_second
+        self.max_hosts = max_hosts
+        self.known_hosts = KNOWN_HOSTS if known_hosts is None else known_hosts
+        self._limiters: "OrderedDict[str, HostLimiter]" = OrderedDict()
+
+    def for_host(self, host: str) -> HostLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is not None:
+            self._limiters.move_to_end(host)
+            return limiter
+
+        if host in self.known_hosts:
+            rate_limiter, circuit_breaker = self.known_hosts[host]
+        else:
+            rate_limiter = RateLimiter(requests_per_second=self.requests_per_second)
+            circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=120)
+
+        limiter = HostLimiter(self.max_per_host, rate_limiter, circuit_breaker)
+        self._limiters[host] = limiter
+        while len(self._limiters) > self.max_hosts:
+            self._limiters.popitem(last=False)  # In-flight requests keep their own reference
+        return limiter
+
+    def clear(self):
+        self._limiters.clear()
+
+    def __len__(self) -> int:
+        return len(self._limiters)
+
+
+class _PooledRequest:
+    """Async context manager holding the host slot until the response is released"""
+
+    def __init__(self, pool: "EnrichmentHttpPool", method: str, url: str, kwargs: Dict):
+        self._pool = pool
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._limiter: Optional[HostLimiter] = None
+        self._response: Optional[aiohttp.ClientResponse] = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        session = self._pool.session
+        limiter = self._pool.limiters.for_host(urlsplit(self._url).hostname or '')
+        await limiter.slots.acquire()
+        try:
+            self._response = await limiter.circuit_breaker.call(self._send, session, limiter)
+        except _FailedStatus as e:
+            self._response = e.response  # Callers check the status themselves
+        except BaseException:
+            limiter.slots.release()
+            raise
+        self._limiter = limiter
+        return self._response
+
+    async def _send(self, session: aiohttp.ClientSession, limiter: HostLimiter) -> aiohttp.ClientResponse:
+        await limiter.rate_limiter.acquire()
+        response = await session.request(self._method, self._url, **self._kwargs)
+        if response.status in RetryConfig.RETRYABLE_STATUS_CODES:
+            raise _FailedStatus(response)
+        return response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            self._response.release()
+        finally:
+            self._limiter.slots.release()
+
+
+class EnrichmentHttpPool:
+    """Shared aiohttp session for enrichment with per-host limiting"""
+
+    def __init__(
+        self,
+        limiters: Optional[HostLimiters] = None,
+        max_connections: int = ENRICHMENT_HTTP_MAX_CONNECTIONS,
+        dns_ttl: int = ENRICHMENT_HTTP_DNS_TTL_SECONDS
+    ):
+        self.limiters = limiters if limiters is not None else HostLimiters()
+        self.max_connections = max_connections
+        self.dns_ttl = dns_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying session, (re)created for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._loop is not None and self._loop is not loop:
+                self.limiters.clear()  # Semaphores are bound to the old loop
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.limiters.max_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+            logger.debug(
+                f"Enrichment HTTP pool opened ({self.max_connections} connections, "
+                f"{self.limiters.max_per_host} per host)"
+            )
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs) -> _PooledRequest:
+        return _PooledRequest(self, method, url, kwargs)
+
+    def get(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> _PooledRequest:
+        return self.request('HEAD', url, **kwargs)
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_http_pool: Optional[EnrichmentHttpPool] = None
+
+
+def get_http_pool() -> EnrichmentHttpPool:
+    """Get the process-wide enrichment HTTP pool"""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = EnrichmentHttpPool()
+    return _http_pool
+
+
+async def close_http_pool():
+    """Close the shared session (on shutdown / end of a batch run)"""
+    if _http_pool is not None:
+        await _http_pool.close()
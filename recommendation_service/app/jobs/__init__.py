@@ -3,7 +3,20 @@ Background Job System for Find Your Path
 Handles async enrichment jobs without blocking API requests
 """
 
-from .job_queue import JobQueue, JobStatus, EnrichmentJob
+from .job_queue import (
+    JobQueue, JobStatus, EnrichmentJob, ResumableJobQueue, RegenerationJobQueue, RegenerationJob,
+    NotificationJobQueue, NotificationJob
+)
 from .enrichment_worker import EnrichmentWorker
+from .regeneration_worker import RegenerationWorker
+from .notification_worker import NotificationWorker
+from .unread_reconciler import reconcile_unread_counts
+from .activity_rollup_backfill import backfill_activity_rollups
+from .user_growth_rebuild import rebuild_user_growth_rollups
 
-__all__ = ['JobQueue', 'JobStatus', 'EnrichmentJob', 'EnrichmentWorker']
+__all__ = [
+    'JobQueue', 'JobStatus', 'EnrichmentJob', 'EnrichmentWorker', 'ResumableJobQueue',
+    'RegenerationJobQueue', 'RegenerationJob', 'RegenerationWorker',
+    'NotificationJobQueue', 'NotificationJob', 'NotificationWorker',
+    'reconcile_unread_counts', 'backfill_activity_rollups', 'rebuild_user_growth_rollups'
+]
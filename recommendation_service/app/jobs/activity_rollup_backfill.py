@@ -0,0 +1,46 @@
+"""
+Activity Rollup Backfill
+Rebuilds the activity dashboard rollups from historical activity_log rows
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.database.config import get_supabase
+from app.services.activity_rollups import BACKFILL_WINDOW_DAYS, ActivityRollups
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_activity_rollups(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    window_days: int = BACKFILL_WINDOW_DAYS
+) -> int:
+    """
+    Recompute rollups for [since, until] (default: all of activity_log)
+
+    Returns:
+        Number of activity_log rows counted
+    """
+    counted = ActivityRollups(get_supabase()).backfill(since, until, window_days)
+    logger.info(f"Activity rollup backfill complete: {counted} activities")
+    return counted
+
+
+# Standalone script support (run once after the migration, or to repair a range):
+#   python -m app.jobs.activity_rollup_backfill [--since 2025-01-01] [--until 2025-02-01]
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="Backfill activity_log rollups")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="First UTC day to rebuild")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Last UTC day to rebuild")
+    parser.add_argument("--window-days", type=int, default=BACKFILL_WINDOW_DAYS)
+    args = parser.parse_args()
+
+    backfill_activity_rollups(args.since, args.until, args.window_days)
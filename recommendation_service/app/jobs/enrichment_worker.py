@@ -11,8 +11,10 @@ from app.database.config import get_supabase
 from app.enrichment.async_auto_fill_orchestrator import AsyncAutoFillOrchestrator
 from app.enrichment.async_web_search_enricher import AsyncWebSearchEnricher
 from app.enrichment.async_college_scorecard_enricher import AsyncCollegeScorecardEnricher
-from app.enrichment.async_enrichment_cache import AsyncEnrichmentCache
+from app.enrichment.async_enrichment_cache import AsyncEnrichmentCache, ENRICHMENT_CACHE_WRITE_BATCH_SIZE
 from app.enrichment.async_field_scrapers import AsyncFieldScrapers
+from app.enrichment.http_pool import get_http_pool, close_http_pool
+from app.enrichment.candidate_selection import get_candidate_index
 from .job_queue import job_queue, JobStatus, EnrichmentJob
 
 logger = logging.getLogger(__name__)
@@ -47,7 +49,7 @@ class EnrichmentWorker:
             # Initialize enrichers
             web_enricher = AsyncWebSearchEnricher()
             scorecard_enricher = AsyncCollegeScorecardEnricher()
-            cache = AsyncEnrichmentCache(self.db)
+            cache = AsyncEnrichmentCache(self.db, write_batch_size=ENRICHMENT_CACHE_WRITE_BATCH_SIZE)
             field_scrapers = AsyncFieldScrapers()
 
             # Determine universities to enrich
@@ -91,6 +93,9 @@ class EnrichmentWorker:
 
             logger.info(f"Job {job.job_id}: Processing {len(universities)} universities")
 
+            # One cache read for the whole batch instead of one per university
+            await cache.prefetch_async([u['id'] for u in universities])
+
             # Process universities with progress callbacks
             results = {
                 'universities_processed': 0,
@@ -144,7 +149,7 @@ class EnrichmentWorker:
                         # enrich_university_async returns (enriched_data, fields_filled) tuple
                         enriched, fields_filled = await self.orchestrator.enrich_university_async(
                             university=university,
-                            session=None,  # Session created internally
+                            session=get_http_pool(),  # Shared keep-alive session, per-host limits
                             web_enricher=web_enricher,
                             field_scrapers=field_scrapers,
                             scorecard_enricher=scorecard_enricher,
@@ -170,6 +175,7 @@ class EnrichmentWorker:
                                         .update(cleaned_data)\
                                         .eq('id', university['id'])\
                                         .execute()
+                                    get_candidate_index().record_filled(university['id'], cleaned_data)
 
                                 progress_callback(university['name'], fields_filled)
 
@@ -189,7 +195,10 @@ class EnrichmentWorker:
                         progress_callback(university['name'], 0, str(e))
 
             # Run all enrichments concurrently
-            await asyncio.gather(*[process_university(uni) for uni in universities])
+            try:
+                await asyncio.gather(*[process_university(uni) for uni in universities])
+            finally:
+                await cache.flush_async()
 
             # Job completed successfully
             job_queue.update_job_status(
@@ -250,6 +259,7 @@ class EnrichmentWorker:
             logger.error(f"Worker error: {e}")
         finally:
             self.is_running = False
+            await close_http_pool()
             logger.info("EnrichmentWorker stopped")
 
     def stop(self):
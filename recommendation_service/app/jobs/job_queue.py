@@ -7,9 +7,11 @@ import uuid
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import json
 import logging
+import os
+import time
 from threading import Lock
 
 from app.database.config import get_supabase
@@ -17,6 +19,13 @@ from app.database.config import get_supabase
 logger = logging.getLogger(__name__)
 
 
+# A running job whose row has not been updated for this long has lost its worker
+# (updated_at is bumped by a trigger on every progress write)
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+# How often an idle worker looks for jobs queued or abandoned by other processes
+JOB_SCAN_INTERVAL_SECONDS = float(os.getenv("JOB_SCAN_INTERVAL_SECONDS", "60"))
+
+
 class JobStatus(str, Enum):
     """Job execution status"""
     PENDING = "pending"      # Job queued, waiting to start
@@ -84,6 +93,9 @@ class JobQueue:
     _instance = None
     _lock = Lock()
 
+    table_name = 'enrichment_jobs'
+    job_class = EnrichmentJob
+
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -109,7 +121,7 @@ class JobQueue:
     def _load_pending_jobs(self):
         """Load pending/running jobs from database on startup"""
         try:
-            response = self.db.table('enrichment_jobs')\
+            response = self.db.table(self.table_name)\
                 .select('*')\
                 .in_('status', ['pending', 'running'])\
                 .order('created_at')\
@@ -117,7 +129,7 @@ class JobQueue:
 
             if response.data:
                 for job_data in response.data:
-                    job = EnrichmentJob.from_dict(job_data)
+                    job = self.job_class.from_dict(job_data)
                     self.jobs[job.job_id] = job
                     if job.status == JobStatus.PENDING:
                         self.pending_queue.append(job.job_id)
@@ -160,7 +172,7 @@ class JobQueue:
 
         # Persist to database
         try:
-            self.db.table('enrichment_jobs').insert(job.to_dict()).execute()
+            self.db.table(self.table_name).insert(job.to_dict()).execute()
         except Exception as e:
             logger.error(f"Failed to persist job {job_id} to database: {e}")
 
@@ -175,13 +187,13 @@ class JobQueue:
 
         # Fallback to database
         try:
-            response = self.db.table('enrichment_jobs')\
+            response = self.db.table(self.table_name)\
                 .select('*')\
                 .eq('job_id', job_id)\
                 .execute()
 
             if response.data:
-                job = EnrichmentJob.from_dict(response.data[0])
+                job = self.job_class.from_dict(response.data[0])
                 self.jobs[job_id] = job  # Cache in memory
                 return job
         except Exception as e:
@@ -227,6 +239,7 @@ class JobQueue:
         job.status = status
 
         # Update timestamps
+        job.updated_at = datetime.utcnow()
         if status == JobStatus.RUNNING and not job.started_at:
             job.started_at = datetime.utcnow()
         elif status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
@@ -242,7 +255,7 @@ class JobQueue:
 
         # Persist to database
         try:
-            self.db.table('enrichment_jobs')\
+            self.db.table(self.table_name)\
                 .update(job.to_dict())\
                 .eq('job_id', job_id)\
                 .execute()
@@ -282,7 +295,7 @@ class JobQueue:
         # Only update every 10 universities or on completion
         if job.processed_universities % 10 == 0 or job.processed_universities == job.total_universities:
             try:
-                self.db.table('enrichment_jobs')\
+                self.db.table(self.table_name)\
                     .update({
                         'processed_universities': job.processed_universities,
                         'successful_updates': job.successful_updates,
@@ -312,7 +325,7 @@ class JobQueue:
             List of EnrichmentJob instances
         """
         try:
-            query = self.db.table('enrichment_jobs').select('*')
+            query = self.db.table(self.table_name).select('*')
 
             if status:
                 query = query.eq('status', status.value)
@@ -322,7 +335,7 @@ class JobQueue:
                 .execute()
 
             if response.data:
-                jobs = [EnrichmentJob.from_dict(job_data) for job_data in response.data]
+                jobs = [self.job_class.from_dict(job_data) for job_data in response.data]
                 # Update memory cache
                 for job in jobs:
                     self.jobs[job.job_id] = job
@@ -336,7 +349,7 @@ class JobQueue:
         """Get queue statistics"""
         try:
             # Count by status
-            response = self.db.table('enrichment_jobs')\
+            response = self.db.table(self.table_name)\
                 .select('status', count='exact')\
                 .execute()
 
@@ -395,7 +408,7 @@ class JobQueue:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-            response = self.db.table('enrichment_jobs')\
+            response = self.db.table(self.table_name)\
                 .delete()\
                 .in_('status', ['completed', 'failed', 'cancelled'])\
                 .lt('completed_at', cutoff_date.isoformat())\
@@ -415,5 +428,417 @@ class JobQueue:
             return 0
 
 
+class ResumableJobQueue(JobQueue):
+    """
+    Job queue shared by several worker processes
+
+    Jobs are claimed with a conditional update before they run, so only one
+    process runs a job. A running job is only taken over once its heartbeat
+    (updated_at) is older than JOB_LEASE_SECONDS, then it resumes from its
+    cursor; a job whose worker is still alive is left alone.
+    """
+    job_label = 'background'
+
+    def _load_pending_jobs(self):
+        self._last_scan = 0.0
+        self.requeue_claimable_jobs()
+
+    def requeue_claimable_jobs(self) -> int:
+        """
+        Queue pending jobs and running jobs with a stale heartbeat
+
+        Returns:
+            Number of jobs added to the pending queue
+        """
+        self._last_scan = time.monotonic()
+        cutoff = (datetime.utcnow() - timedelta(seconds=JOB_LEASE_SECONDS)).isoformat()
+        try:
+            pending = self.db.table(self.table_name)\
+                .select('*')\
+                .eq('status', JobStatus.PENDING.value)\
+                .order('created_at')\
+                .execute()
+            stale = self.db.table(self.table_name)\
+                .select('*')\
+                .eq('status', JobStatus.RUNNING.value)\
+                .lt('updated_at', cutoff)\
+                .order('created_at')\
+                .execute()
+        except Exception as e:
+            logger.warning(f"Could not load pending jobs from database: {e}")
+            return 0
+
+        added = 0
+        for job_data in (pending.data or []) + (stale.data or []):
+            job = self.job_class.from_dict(job_data)
+            current = self.jobs.get(job.job_id)
+            if job.job_id in self.pending_queue or (current and current.status == JobStatus.RUNNING):
+                continue  # Already queued, or running in this process
+            if job.status == JobStatus.RUNNING:
+                logger.info(f"Resuming interrupted {self.job_label} job {job.job_id} after {job.cursor}")
+                job.status = JobStatus.PENDING  # In memory only; claim_job re-checks the lease
+            self.jobs[job.job_id] = job
+            self.pending_queue.append(job.job_id)
+            added += 1
+
+        if added:
+            logger.info(f"Queued {added} {self.job_label} jobs from database")
+        return added
+
+    def get_next_pending_job(self):
+        """Next queued job; rescans the database every JOB_SCAN_INTERVAL_SECONDS when idle"""
+        job = super().get_next_pending_job()
+        if job is None and time.monotonic() - self._last_scan >= JOB_SCAN_INTERVAL_SECONDS:
+            self.requeue_claimable_jobs()
+            job = super().get_next_pending_job()
+        return job
+
+    def claim_job(self, job_id: str):
+        """
+        Atomically take a queued job for this process
+
+        Succeeds only if the job is still pending, or running with a heartbeat
+        older than the lease. The job leaves the pending queue either way.
+
+        Returns:
+            The claimed job as stored (latest cursor and counters), or None
+            if another worker has it
+        """
+        job = self.jobs.get(job_id)
+        if job_id in self.pending_queue:
+            self.pending_queue.remove(job_id)
+        if not job:
+            return None
+
+        now = datetime.utcnow()
+        cutoff = (now - timedelta(seconds=JOB_LEASE_SECONDS)).isoformat()
+        fields = {
+            'status': JobStatus.RUNNING.value,
+            'started_at': (job.started_at or now).isoformat(),
+            'updated_at': now.isoformat()
+        }
+        try:
+            claimed = self.db.table(self.table_name)\
+                .update(fields)\
+                .eq('job_id', job_id)\
+                .eq('status', JobStatus.PENDING.value)\
+                .execute().data
+            if not claimed:
+                claimed = self.db.table(self.table_name)\
+                    .update(fields)\
+                    .eq('job_id', job_id)\
+                    .eq('status', JobStatus.RUNNING.value)\
+                    .lt('updated_at', cutoff)\
+                    .execute().data
+        except Exception as e:
+            logger.error(f"Failed to claim job {job_id}: {e}")
+            return None
+
+        if not claimed:
+            logger.info(f"Job {job_id} is already running in another worker")
+            self.jobs.pop(job_id, None)
+            return None
+
+        # Cursor and counters may have moved on since the job was loaded
+        job = self.jobs[job_id] = self.job_class.from_dict(claimed[0])
+        return job
+
+
+@dataclass
+class RegenerationJob:
+    """Represents a bulk recommendation regeneration job"""
+    job_id: str
+    status: JobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    # Job parameters
+    student_ids: Optional[List[str]] = None  # None = every student
+    max_results: int = 15
+    chunk_size: int = 200
+    max_workers: Optional[int] = None  # None = one process per CPU
+
+    # Progress tracking
+    total_students: int = 0
+    processed_students: int = 0
+    recommendations_written: int = 0
+    errors_count: int = 0
+    cursor: Optional[str] = None  # Last student id fully written; a resumed job continues after it
+
+    # Results
+    error_message: Optional[str] = None
+    results: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization"""
+        data = asdict(self)
+        for key in ['created_at', 'started_at', 'completed_at', 'updated_at']:
+            if data[key]:
+                data[key] = data[key].isoformat()
+        data['status'] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RegenerationJob':
+        """Create from dictionary"""
+        for key in ['created_at', 'started_at', 'completed_at', 'updated_at']:
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        if isinstance(data.get('status'), str):
+            data['status'] = JobStatus(data['status'])
+        return cls(**data)
+
+
+class RegenerationJobQueue(ResumableJobQueue):
+    """
+    Queue of bulk recommendation regeneration jobs
+    Jobs whose worker died are claimed by another worker and resume from their cursor
+    """
+    _instance = None
+    _lock = Lock()
+
+    table_name = 'recommendation_jobs'
+    job_class = RegenerationJob
+    job_label = 'regeneration'
+
+    def create_job(
+        self,
+        student_ids: Optional[List[str]] = None,
+        max_results: int = 15,
+        chunk_size: int = 200,
+        max_workers: Optional[int] = None
+    ) -> RegenerationJob:
+        """
+        Create a new regeneration job
+
+        Args:
+            student_ids: Specific student profile IDs (None = all students)
+            max_results: Recommendations to keep per student
+            chunk_size: Students scored per worker task and written per batch
+            max_workers: Scoring processes (None = one per CPU)
+
+        Returns:
+            RegenerationJob instance
+        """
+        job = RegenerationJob(
+            job_id=str(uuid.uuid4()),
+            status=JobStatus.PENDING,
+            created_at=datetime.utcnow(),
+            student_ids=student_ids,
+            max_results=max_results,
+            chunk_size=chunk_size,
+            max_workers=max_workers
+        )
+
+        self.jobs[job.job_id] = job
+        self.pending_queue.append(job.job_id)
+
+        try:
+            self.db.table(self.table_name).insert(job.to_dict()).execute()
+        except Exception as e:
+            logger.error(f"Failed to persist job {job.job_id} to database: {e}")
+
+        logger.info(f"Created regeneration job {job.job_id} (students={len(student_ids) if student_ids else 'all'})")
+        return job
+
+    def update_job_progress(
+        self,
+        job_id: str,
+        processed: int = 0,
+        written: int = 0,
+        errors: int = 0,
+        cursor: Optional[str] = None
+    ):
+        """
+        Record a written chunk (incremental counters)
+
+        Persisted after every chunk so a restarted job loses at most one chunk
+        of work; each write is also the job's heartbeat.
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return
+
+        job.processed_students += processed
+        job.recommendations_written += written
+        job.errors_count += errors
+        if cursor is not None:
+            job.cursor = cursor
+        job.updated_at = datetime.utcnow()
+
+        try:
+            self.db.table(self.table_name)\
+                .update({
+                    'processed_students': job.processed_students,
+                    'recommendations_written': job.recommendations_written,
+                    'errors_count': job.errors_count,
+                    'cursor': job.cursor,
+                    'updated_at': job.updated_at.isoformat()
+                })\
+                .eq('job_id', job_id)\
+                .execute()
+        except Exception as e:
+            logger.error(f"Failed to update job progress in database: {e}")
+
+
+@dataclass
+class NotificationJob:
+    """Represents a notification fan-out (broadcast/announcement) job"""
+    job_id: str
+    status: JobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    # Job parameters
+    payload: Dict[str, Any] = field(default_factory=dict)  # Notification fields (see notification_fanout.PAYLOAD_FIELDS)
+    target_roles: Optional[List[str]] = None  # None = all users
+    user_ids: Optional[List[str]] = None      # Explicit recipients (overrides target_roles)
+    campaign_id: Optional[str] = None         # communication_campaigns row to stamp on completion
+    created_by: Optional[str] = None
+
+    # Progress tracking
+    total_users: int = 0
+    processed_users: int = 0
+    notifications_created: int = 0
+    skipped_users: int = 0  # Opted out via notification preferences
+    errors_count: int = 0
+    cursor: Optional[str] = None  # Last user id fully delivered; a resumed job continues after it
+
+    # Results
+    error_message: Optional[str] = None
+    results: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization"""
+        data = asdict(self)
+        for key in ['created_at', 'started_at', 'completed_at', 'updated_at']:
+            if data[key]:
+                data[key] = data[key].isoformat()
+        data['status'] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'NotificationJob':
+        """Create from dictionary"""
+        for key in ['created_at', 'started_at', 'completed_at', 'updated_at']:
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        if isinstance(data.get('status'), str):
+            data['status'] = JobStatus(data['status'])
+        return cls(**data)
+
+
+class NotificationJobQueue(ResumableJobQueue):
+    """
+    Queue of notification fan-out jobs
+    Jobs whose worker died are claimed by another worker and resume from their cursor
+    """
+    _instance = None
+    _lock = Lock()
+
+    table_name = 'notification_jobs'
+    job_class = NotificationJob
+    job_label = 'notification'
+
+    def create_job(
+        self,
+        payload: Dict[str, Any],
+        target_roles: Optional[List[str]] = None,
+        user_ids: Optional[List[str]] = None,
+        campaign_id: Optional[str] = None,
+        created_by: Optional[str] = None
+    ) -> NotificationJob:
+        """
+        Create a new notification fan-out job
+
+        Args:
+            payload: Notification fields shared by every recipient
+            target_roles: Roles to notify (None = all users)
+            user_ids: Explicit recipients (overrides target_roles)
+            campaign_id: Campaign to mark as sent when the job completes
+            created_by: Admin who queued the job
+
+        Returns:
+            NotificationJob instance
+        """
+        job = NotificationJob(
+            job_id=str(uuid.uuid4()),
+            status=JobStatus.PENDING,
+            created_at=datetime.utcnow(),
+            payload=payload,
+            target_roles=target_roles,
+            user_ids=user_ids,
+            campaign_id=campaign_id,
+            created_by=created_by
+        )
+
+        self.jobs[job.job_id] = job
+        self.pending_queue.append(job.job_id)
+
+        try:
+            self.db.table(self.table_name).insert(job.to_dict()).execute()
+        except Exception as e:
+            logger.error(f"Failed to persist job {job.job_id} to database: {e}")
+
+        logger.info(f"Created notification job {job.job_id} (roles={target_roles or 'all'})")
+        return job
+
+    def update_job_progress(
+        self,
+        job_id: str,
+        processed: int = 0,
+        created: int = 0,
+        skipped: int = 0,
+        errors: int = 0,
+        cursor: Optional[str] = None
+    ):
+        """
+        Record a delivered page (incremental counters)
+
+        Persisted after every page so a restarted job resumes after the last
+        delivered user; each write is also the job's heartbeat.
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return
+
+        job.processed_users += processed
+        job.notifications_created += created
+        job.skipped_users += skipped
+        job.errors_count += errors
+        if cursor is not None:
+            job.cursor = cursor
+        job.updated_at = datetime.utcnow()
+
+        try:
+            self.db.table(self.table_name)\
+                .update({
+                    'processed_users': job.processed_users,
+                    'notifications_created': job.notifications_created,
+                    'skipped_users': job.skipped_users,
+                    'errors_count': job.errors_count,
+                    'cursor': job.cursor,
+                    'updated_at': job.updated_at.isoformat()
+                })\
+                .eq('job_id', job_id)\
+                .execute()
+        except Exception as e:
+            logger.error(f"Failed to update job progress in database: {e}")
+
+
 # Global singleton instance
 job_queue = JobQueue()
+
+
+def get_regeneration_queue() -> RegenerationJobQueue:
+    """Get the regeneration job queue (created on first use)"""
+    return RegenerationJobQueue()
+
+
+def get_notification_queue() -> NotificationJobQueue:
+    """Get the notification fan-out job queue (created on first use)"""
+    return NotificationJobQueue()
@@ -0,0 +1,169 @@
+"""
+Background Worker for Notification Fan-out
+Delivers broadcast and announcement notifications page by page, resuming from the job's cursor
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.database.async_db import run_blocking
+from app.database.config import get_supabase
+from app.services.notification_fanout import NotificationFanout, delivery_namespace
+from .job_queue import get_notification_queue, JobStatus, NotificationJob
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationWorker:
+    """
+    Background worker that processes notification fan-out jobs from the queue
+
+    Pages of users are delivered in id order and the cursor (last delivered
+    user id) is persisted after each page. Notification ids are derived from
+    the job id, so re-delivering an interrupted page creates no duplicates.
+    """
+
+    def __init__(self):
+        self.db = get_supabase()
+        self.queue = get_notification_queue()
+        self.fanout = NotificationFanout(self.db)
+        self.is_running = False
+        self.current_job_id: Optional[str] = None
+
+    async def process_job(self, job: NotificationJob):
+        """
+        Process a single notification job
+
+        Args:
+            job: NotificationJob instance
+        """
+        job = self.queue.claim_job(job.job_id)
+        if job is None:
+            return  # Another worker has it
+
+        logger.info(f"Starting notification job {job.job_id} (cursor={job.cursor})")
+        self.current_job_id = job.job_id
+
+        try:
+            if not job.total_users:
+                total = await run_blocking(self.fanout.count_targets, job.target_roles, job.user_ids)
+                self.queue.update_job_status(job.job_id, JobStatus.RUNNING, total_users=total)
+
+            def record_page(result, cursor):
+                self.queue.update_job_progress(
+                    job.job_id,
+                    processed=result['created'] + result['skipped'] + len(result['failed_users']),
+                    created=result['created'],
+                    skipped=result['skipped'],
+                    errors=len(result['failed_users']),
+                    cursor=cursor
+                )
+                logger.info(
+                    f"Job {job.job_id}: Progress {job.processed_users}/{job.total_users} "
+                    f"({job.notifications_created} notifications created)"
+                )
+
+            totals = await self.fanout.run(
+                job.payload,
+                target_roles=job.target_roles,
+                user_ids=job.user_ids,
+                cursor=job.cursor,
+                namespace=delivery_namespace(job.job_id),
+                on_page=record_page,
+                should_continue=lambda: self.is_running
+            )
+
+            if not totals['completed']:
+                # Leave it queued; the next run resumes from the cursor
+                logger.info(f"Job {job.job_id}: stopping at cursor {job.cursor}")
+                self.queue.update_job_status(job.job_id, JobStatus.PENDING)
+                return
+
+            results = {
+                'users_processed': job.processed_users,
+                'notifications_created': job.notifications_created,
+                'skipped_users': job.skipped_users,
+                'errors': job.errors_count,
+                'failed_users': totals['failed_users'][:100],
+            }
+            self.queue.update_job_status(job.job_id, JobStatus.COMPLETED, results=results)
+
+            if job.campaign_id:
+                await run_blocking(self._mark_campaign_sent, job)
+
+            logger.info(
+                f"Notification job {job.job_id} completed: {job.notifications_created} created, "
+                f"{job.skipped_users} opted out, {job.errors_count} failed"
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"Notification job {job.job_id} failed: {error_msg}")
+            self.queue.update_job_status(
+                job.job_id,
+                JobStatus.FAILED,
+                error_message=error_msg
+            )
+
+        finally:
+            self.current_job_id = None
+
+    def _mark_campaign_sent(self, job: NotificationJob):
+        """Stamp the announcement campaign with the delivered counts"""
+        try:
+            self.db.table('communication_campaigns').update({
+                'status': 'sent',
+                'sent_at': datetime.utcnow().isoformat(),
+                'stats': {
+                    'sent': job.processed_users,
+                    'delivered': job.notifications_created,
+                    'opened': 0,
+                    'clicked': 0,
+                },
+                'updated_at': datetime.utcnow().isoformat(),
+            }).eq('id', job.campaign_id).execute()
+        except Exception as e:
+            logger.warning(f"Could not update campaign {job.campaign_id}: {e}")
+
+    async def run(self, continuous: bool = True):
+        """
+        Run the worker
+
+        Args:
+            continuous: If True, runs continuously checking for jobs.
+                       If False, processes pending jobs and exits.
+        """
+        self.is_running = True
+        logger.info(f"NotificationWorker started (continuous={continuous})")
+
+        try:
+            while self.is_running:
+                job = self.queue.get_next_pending_job()
+
+                if job:
+                    await self.process_job(job)
+                else:
+                    if not continuous:
+                        logger.info("No pending notification jobs, exiting")
+                        break
+                    await asyncio.sleep(5)
+
+        except KeyboardInterrupt:
+            logger.info("Worker interrupted by user")
+        except Exception as e:
+            logger.error(f"Worker error: {e}")
+        finally:
+            self.is_running = False
+            logger.info("NotificationWorker stopped")
+
+    def stop(self):
+        """Stop after the page in progress; the job resumes from its cursor"""
+        logger.info("Stopping notification worker...")
+        self.is_running = False
+
+
+async def run_notification_worker_task():
+    """Run notification worker in background until the queue is empty"""
+    worker = NotificationWorker()
+    await worker.run(continuous=False)
@@ -0,0 +1,313 @@
+"""
+Background Worker for Bulk Recommendation Regeneration
+Scores every student against one catalog snapshot in a process pool and bulk-upserts the results
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.database.config import get_supabase
+from app.monitoring import recommendation_stage
+from app.services.catalog_snapshot import PAGE_SIZE, CatalogSnapshot, get_catalog
+from app.services.recommendation_writer import USER_STATE_COLUMNS
+from .job_queue import get_regeneration_queue, JobStatus, RegenerationJob
+
+logger = logging.getLogger(__name__)
+
+
+UPSERT_BATCH_SIZE = 1000  # Rows per bulk upsert request
+
+
+# ==================== Process pool workers ====================
+
+_pool_engine = None
+
+
+def _init_pool_worker(universities: List[Dict], programs: Dict, catalog_version: int, model_dir: str):
+    """Build the catalog and engine once per worker process"""
+    global _pool_engine
+    from app.ml.ml_recommendation_engine import MLRecommendationEngine
+
+    logging.getLogger('app').setLevel(logging.WARNING)  # Per-student info logs would flood the job log
+    catalog = CatalogSnapshot(universities, programs, version=catalog_version)
+    _pool_engine = MLRecommendationEngine(None, model_dir=model_dir, catalog=catalog)
+
+
+def score_students(students: List[Dict], max_results: int, engine=None) -> Tuple[List[Dict], List[str]]:
+    """
+    Generate recommendations for a chunk of students
+
+    Returns:
+        (recommendation rows for all students, ids of students that failed)
+    """
+    engine = engine or _pool_engine
+    rows: List[Dict] = []
+    failed: List[str] = []
+    for student in students:
+        try:
+            rows.extend(engine.generate_recommendations(student, max_results=max_results))
+        except Exception as e:
+            logger.error(f"Failed to score student {student.get('id')}: {e}")
+            failed.append(student.get('id'))
+    return rows, failed
+
+
+def to_upsert_rows(recommendations: List[Dict], generated_at: str) -> List[Dict]:
+    """Strip student-owned columns and stamp the generation time"""
+    return [
+        dict(
+            {k: v for k, v in rec.items() if k not in USER_STATE_COLUMNS},
+            generated_at=generated_at,
+        )
+        for rec in recommendations
+    ]
+
+
+# ==================== Worker ====================
+
+class RegenerationWorker:
+    """
+    Background worker that processes regeneration jobs from the queue
+
+    Students are read in id order and scored in chunks by a process pool;
+    chunks are written in the same order, so the job's cursor (last written
+    student id) is a safe resume point after a crash.
+    """
+
+    def __init__(self):
+        self.db = get_supabase()
+        self.queue = get_regeneration_queue()
+        self.is_running = False
+        self.current_job_id: Optional[str] = None
+
+    async def process_job(self, job: RegenerationJob):
+        """
+        Process a single regeneration job
+
+        Args:
+            job: RegenerationJob instance
+        """
+        job = self.queue.claim_job(job.job_id)
+        if job is None:
+            return  # Another worker has it
+
+        logger.info(f"Starting regeneration job {job.job_id} (cursor={job.cursor})")
+        self.current_job_id = job.job_id
+
+        try:
+            from app.ml.model_registry import ML_MODELS_DIR, get_model_registry
+
+            # One catalog snapshot for the whole job
+            catalog = get_catalog()
+            model_version = get_model_registry(ML_MODELS_DIR).active_version
+
+            if not job.total_students:
+                self.queue.update_job_status(
+                    job.job_id,
+                    JobStatus.RUNNING,
+                    total_students=self._count_students(job)
+                )
+
+            # Spawn rather than fork: the API process runs background threads
+            pool = ProcessPoolExecutor(
+                max_workers=job.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_pool_worker,
+                initargs=(catalog.universities, catalog.programs, catalog.version, ML_MODELS_DIR),
+            )
+            loop = asyncio.get_running_loop()
+
+            try:
+                for students in self._student_pages(job):
+                    if not self.is_running:
+                        # Leave it queued; the next run resumes from the cursor
+                        logger.info(f"Job {job.job_id}: stopping at cursor {job.cursor}")
+                        self.queue.update_job_status(job.job_id, JobStatus.PENDING)
+                        return
+
+                    chunks = [
+                        students[i:i + job.chunk_size]
+                        for i in range(0, len(students), job.chunk_size)
+                    ]
+                    futures = [
+                        loop.run_in_executor(pool, score_students, chunk, job.max_results)
+                        for chunk in chunks
+                    ]
+
+                    # Write in submission order so the cursor only ever moves past finished students
+                    for chunk, future in zip(chunks, futures):
+                        rows, failed = await future
+                        written = await asyncio.to_thread(
+                            self._write_chunk, [s['id'] for s in chunk], failed, rows
+                        )
+                        self.queue.update_job_progress(
+                            job.job_id,
+                            processed=len(chunk),
+                            written=written,
+                            errors=len(failed),
+                            cursor=chunk[-1]['id']
+                        )
+
+                    logger.info(
+                        f"Job {job.job_id}: Progress {job.processed_students}/{job.total_students} "
+                        f"({job.recommendations_written} recommendations written)"
+                    )
+            finally:
+                pool.shutdown(cancel_futures=True)
+
+            results = {
+                'students_processed': job.processed_students,
+                'recommendations_written': job.recommendations_written,
+                'errors': job.errors_count,
+                'catalog_version': catalog.version,
+                'model_version': model_version,
+            }
+            self.queue.update_job_status(job.job_id, JobStatus.COMPLETED, results=results)
+
+            logger.info(
+                f"Regeneration job {job.job_id} completed: {job.processed_students} students, "
+                f"{job.recommendations_written} recommendations"
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"Regeneration job {job.job_id} failed: {error_msg}")
+            self.queue.update_job_status(
+                job.job_id,
+                JobStatus.FAILED,
+                error_message=error_msg
+            )
+
+        finally:
+            self.current_job_id = None
+
+    def _count_students(self, job: RegenerationJob) -> int:
+        if job.student_ids:
+            return len(job.student_ids)
+        response = self.db.table('student_profiles').select('id', count='exact').limit(1).execute()
+        return response.count or 0
+
+    def _student_pages(self, job: RegenerationJob):
+        """Yield pages of student profiles after the job's cursor, in id order"""
+        if job.student_ids:
+            remaining = sorted(job.student_ids)
+            if job.cursor is not None:
+                remaining = [sid for sid in remaining if sid > job.cursor]
+            for i in range(0, len(remaining), PAGE_SIZE):
+                response = self.db.table('student_profiles')\
+                    .select('*')\
+                    .in_('id', remaining[i:i + PAGE_SIZE])\
+                    .order('id')\
+                    .execute()
+                if response.data:
+                    yield response.data
+            return
+
+        cursor = job.cursor
+        while True:
+            query = self.db.table('student_profiles').select('*')
+            if cursor is not None:
+                query = query.gt('id', cursor)
+            response = query.order('id').limit(PAGE_SIZE).execute()
+
+            students = response.data or []
+            if not students:
+                return
+            yield students
+            if len(students) < PAGE_SIZE:
+                return
+            cursor = students[-1]['id']
+
+    def _write_chunk(self, student_ids: List[str], failed: List[str], recommendations: List[Dict]) -> int:
+        """
+        Replace the chunk's recommendations with bulk upserts
+
+        Upserting on (student_id, university_id) keeps favorited/notes on rows
+        that survive; rows not regenerated in this run are deleted afterwards.
+        Students that failed to score keep their existing recommendations.
+        """
+        with recommendation_stage('write'):
+            generated_at = datetime.utcnow().isoformat()
+            rows = to_upsert_rows(recommendations, generated_at)
+
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                self.db.table('recommendations')\
+                    .upsert(
+                        rows[i:i + UPSERT_BATCH_SIZE],
+                        on_conflict='student_id,university_id',
+                        default_to_null=False,
+                        returning='minimal'
+                    )\
+                    .execute()
+
+            failed = set(failed)
+            scored = [sid for sid in student_ids if sid not in failed]
+            if scored:
+                self.db.table('recommendations')\
+                    .delete(returning='minimal')\
+                    .in_('student_id', scored)\
+                    .or_(f"generated_at.is.null,generated_at.lt.{generated_at}")\
+                    .execute()
+
+        return len(rows)
+
+    async def run(self, continuous: bool = True):
+        """
+        Run the worker
+
+        Args:
+            continuous: If True, runs continuously checking for jobs.
+                       If False, processes pending jobs and exits.
+        """
+        self.is_running = True
+        logger.info(f"RegenerationWorker started (continuous={continuous})")
+
+        try:
+            while self.is_running:
+                job = self.queue.get_next_pending_job()
+
+                if job:
+                    await self.process_job(job)
+                else:
+                    if not continuous:
+                        logger.info("No pending regeneration jobs, exiting")
+                        break
+                    await asyncio.sleep(5)
+
+        except KeyboardInterrupt:
+            logger.info("Worker interrupted by user")
+        except Exception as e:
+            logger.error(f"Worker error: {e}")
+        finally:
+            self.is_running = False
+            logger.info("RegenerationWorker stopped")
+
+    def stop(self):
+        """Stop after the chunk in progress; the job resumes from its cursor"""
+        logger.info("Stopping regeneration worker...")
+        self.is_running = False
+
+
+# Standalone worker script support (e.g. nightly after enrichment):
+#   python -m app.jobs.regeneration_worker --create
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    continuous = "--continuous" in sys.argv or "-c" in sys.argv
+    if "--create" in sys.argv:
+        get_regeneration_queue().create_job()
+
+    worker = RegenerationWorker()
+
+    try:
+        asyncio.run(worker.run(continuous=continuous))
+    except KeyboardInterrupt:
+        logger.info("Worker stopped by user")
@@ -0,0 +1,60 @@
+"""
+Unread Counter Reconciliation Job
+Rebuilds conversation_unread_counts from the messages table to repair counter drift
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from app.database.config import get_supabase
+from app.services.unread_counters import UnreadCounters
+
+logger = logging.getLogger(__name__)
+
+
+UNREAD_RECONCILE_INTERVAL_SECONDS = int(os.getenv("UNREAD_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+
+def reconcile_unread_counts(user_id: Optional[str] = None) -> int:
+    """
+    Recompute unread counters for one user or everyone
+
+    Returns:
+        Number of non-zero counters after the rebuild
+    """
+    counters = UnreadCounters(get_supabase())
+    written = counters.rebuild(user_id)
+    logger.info(f"Reconciled unread counters ({'user ' + user_id if user_id else 'all users'}): {written} non-zero")
+    return written
+
+
+async def run_reconciler(interval: int = UNREAD_RECONCILE_INTERVAL_SECONDS):
+    """Reconcile on a fixed interval until cancelled"""
+    logger.info(f"Unread counter reconciler started (every {interval}s)")
+    while True:
+        try:
+            await asyncio.to_thread(reconcile_unread_counts)
+        except Exception as e:
+            logger.error(f"Unread counter reconciliation failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# Standalone script support (e.g. from cron):
+#   python -m app.jobs.unread_reconciler [--continuous] [--user <id>]
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if "--continuous" in sys.argv or "-c" in sys.argv:
+        try:
+            asyncio.run(run_reconciler())
+        except KeyboardInterrupt:
+            logger.info("Reconciler stopped by user")
+    else:
+        user = sys.argv[sys.argv.index("--user") + 1] if "--user" in sys.argv else None
+        reconcile_unread_counts(user)
@@ -0,0 +1,27 @@
+"""
+User Growth Rollup Rebuild
+Recomputes user_registration_rollups from the users table (after bulk imports or to repair drift)
+"""
+import logging
+
+from app.database.config import get_supabase
+from app.services.user_growth import get_user_growth_engine
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_user_growth_rollups() -> int:
+    """Rebuild the registration rollups; returns the number of users counted"""
+    total = get_user_growth_engine().rebuild(get_supabase())
+    logger.info(f"User growth rollups rebuilt: {total} users")
+    return total
+
+
+# Standalone script support:
+#   python -m app.jobs.user_growth_rebuild
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    rebuild_user_growth_rollups()
@@ -37,8 +37,26 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to connect to Supabase: {e}")
 
+    # Keep the in-process university/program catalog fresh for recommendations
+    from app.services.catalog_snapshot import CatalogStore
+    catalog_store = CatalogStore()
+    catalog_store.start_background_refresh()
+
+    # Load the active ML ranker once per worker, off the request path
+    try:
+        from app.ml.model_registry import warm_model_registry
+        warm_model_registry()
+    except Exception as e:
+        logger.warning(f"ML model warm-up skipped: {e}")
+
     yield
 
+    catalog_store.stop_background_refresh()
+
+    from app.database.async_db import shutdown_db_executor
+    from app.enrichment.http_pool import close_http_pool
+    shutdown_db_executor()
+    await close_http_pool()
     logger.info("Shutting down Find Your Path Recommendation Service...")
 
 # Create FastAPI app
@@ -270,10 +288,11 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 # Initialize Prometheus metrics
-from app.monitoring import init_prometheus, create_metrics_middleware
+from app.monitoring import init_prometheus, create_metrics_middleware, instrument_postgrest
 prometheus_enabled = init_prometheus(app)
 if prometheus_enabled:
     logger.info("Prometheus metrics enabled at /metrics")
+    instrument_postgrest()
 
 # Add security headers middleware (MUST be added before other middleware)
 app.add_middleware(SecurityHeadersMiddleware)
@@ -1,5 +1,5 @@
 """Middleware Package"""
-from app.middleware.rate_limiting import limiter, RATE_LIMITS
+from app.middleware.rate_limiting import limiter, RATE_LIMITS, RateLimiter
 from app.middleware.error_handling import (
     http_exception_handler,
     validation_exception_handler,
@@ -14,6 +14,7 @@ from app.middleware.security_headers import (
 __all__ = [
     "limiter",
     "RATE_LIMITS",
+    "RateLimiter",
     "http_exception_handler",
     "validation_exception_handler",
     "general_exception_handler",
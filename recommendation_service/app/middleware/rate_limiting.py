@@ -1,18 +1,34 @@
 """
 Rate Limiting Middleware
-Protects API endpoints from abuse using SlowAPI
+Protects API endpoints from abuse using SlowAPI, plus a standalone
+sliding-window limiter for per-user limits inside services (e.g. chat)
 """
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
-from typing import Callable
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional, Tuple
 import logging
+import math
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+# Shared store so limits hold across workers; memory:// when Redis is not configured
+RATE_LIMIT_STORAGE_URI = os.getenv("REDIS_URL") or "memory://"
+RATE_LIMIT_MEMORY_MAX_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", "100000"))
+
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["200/minute"])
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["200/minute"],
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter",
+    in_memory_fallback_enabled=True,
+)
 
 # Rate limit tiers for different endpoint types
 RATE_LIMITS = {
@@ -39,3 +55,115 @@ def rate_limit_by_endpoint_type(endpoint_type: str = "read"):
             pass
     """
     return RATE_LIMITS.get(endpoint_type, RATE_LIMITS["read"])
+
+
+# ==================== Sliding-window limiter ====================
+#
+# Sliding-window counter: each key keeps the count of the current and the
+# previous fixed window, and the previous count is weighted by how much of it
+# still overlaps the sliding window. O(1) time and memory per key.
+
+_SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+if previous * tonumber(ARGV[2]) + current + 1 > limit then
+    return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+def _window_position(window: int, now: float) -> Tuple[int, float]:
+    """(index of the current fixed window, weight of the previous window)"""
+    index = math.floor(now / window)
+    elapsed = now / window - index
+    return index, 1.0 - elapsed
+
+
+class MemoryRateLimitBackend:
+    """Per-process counters with LRU eviction, so idle keys don't accumulate"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MEMORY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, list]" = OrderedDict()  # key -> [window index, current, previous]
+        self._lock = Lock()
+
+    def hit(self, key: str, limit: int, window: int) -> bool:
+        index, weight = _window_position(window, time.time())
+
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [index, 0, 0]
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+
+            if counter[0] != index:
+                # Roll forward; anything older than the previous window no longer counts
+                counter[2] = counter[1] if counter[0] == index - 1 else 0
+                counter[1] = 0
+                counter[0] = index
+
+            if counter[2] * weight + counter[1] + 1 > limit:
+                return False
+            counter[1] += 1
+            return True
+
+
+class RedisRateLimitBackend:
+    """Counters in Redis, checked and incremented atomically by a Lua script"""
+
+    def __init__(self, client):
+        self.client = client
+        self._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, key: str, limit: int, window: int) -> bool:
+        index, weight = _window_position(window, time.time())
+        keys = [f"ratelimit:{key}:{index}", f"ratelimit:{key}:{index - 1}"]
+        return bool(self._script(keys=keys, args=[limit, weight, window * 2]))
+
+
+class RateLimiter:
+    """
+    Allow at most `limit` hits per key in any `window`-second span
+
+    Uses Redis when available so the limit is shared by all workers; falls
+    back to the in-memory backend if Redis errors.
+    """
+
+    def __init__(self, name: str, limit: int, window: int = 60, backend=None):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.backend = backend or get_rate_limit_backend()
+        self._fallback = MemoryRateLimitBackend()
+
+    def allow(self, key: str) -> bool:
+        """Record a hit for `key`; False if it is over the limit"""
+        scoped = f"{self.name}:{key}"
+        try:
+            return self.backend.hit(scoped, self.limit, self.window)
+        except Exception as e:
+            logger.warning(f"Rate limit backend error ({e}); using in-memory limits")
+            return self._fallback.hit(scoped, self.limit, self.window)
+
+
+_rate_limit_backend = None
+
+
+def get_rate_limit_backend():
+    """Shared backend: Redis if the cache is enabled, otherwise in-memory"""
+    global _rate_limit_backend
+    if _rate_limit_backend is None:
+        from app.cache.redis_cache import get_cache
+        cache = get_cache()
+        if cache.enabled and cache.client is not None:
+            _rate_limit_backend = RedisRateLimitBackend(cache.client)
+        else:
+            _rate_limit_backend = MemoryRateLimitBackend()
+    return _rate_limit_backend
@@ -1,16 +1,21 @@
 """
 Machine Learning module for enhanced college recommendations
 """
-from .feature_engineering import FeatureEngineer
+from .feature_engineering import FeatureEngineer, UniversityFeatureTable
 from .models import (
     EnsembleRecommendationModel,
     LightGBMRanker,
     PersonalizedWeightPredictor
 )
+from .model_registry import ModelRegistry, get_model_registry, publish_model
 
 __all__ = [
     'FeatureEngineer',
+    'UniversityFeatureTable',
     'EnsembleRecommendationModel',
     'LightGBMRanker',
-    'PersonalizedWeightPredictor'
+    'PersonalizedWeightPredictor',
+    'ModelRegistry',
+    'get_model_registry',
+    'publish_model'
 ]
@@ -4,12 +4,62 @@ Extracts and transforms features from student and university data
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 import logging
 
+from app.services.program_index import (
+    ProgramMatchIndex,
+    MATCH_NAME,
+    MATCH_FIELD,
+    MATCH_ALTERNATIVE,
+    expand_major,
+    text_matches,
+)
+from app.services.vectorized_scorer import UniversityColumns
+
 logger = logging.getLogger(__name__)
 
+N_STUDENT_FEATURES = 13
+N_UNIVERSITY_FEATURES = 14
+N_INTERACTION_FEATURES = 10
+
+PROGRAM_MATCH_SCORES = {MATCH_NAME: 1.0, MATCH_FIELD: 0.7, MATCH_ALTERNATIVE: 0.6}
+
+
+class UniversityFeatureTable:
+    """
+    Precomputed university side of the feature matrix
+
+    Holds the (n_universities x 14) float32 block from extract_university_features
+    plus the columnar view needed for interaction features. Build it once per
+    catalog and slice it with take() for each candidate set.
+    """
+
+    def __init__(self, features: np.ndarray, columns: UniversityColumns):
+        self.features = features
+        self.columns = columns
+
+    @classmethod
+    def from_universities(
+        cls,
+        universities: List[Dict],
+        feature_engineer: Optional['FeatureEngineer'] = None,
+        columns: Optional[UniversityColumns] = None,
+    ) -> 'UniversityFeatureTable':
+        feature_engineer = feature_engineer or FeatureEngineer()
+        features = np.empty((len(universities), N_UNIVERSITY_FEATURES), dtype=np.float32)
+        for i, university in enumerate(universities):
+            features[i] = feature_engineer.extract_university_features(university)
+        return cls(features, columns or UniversityColumns(universities))
+
+    def __len__(self) -> int:
+        return self.features.shape[0]
+
+    def take(self, rows: np.ndarray) -> 'UniversityFeatureTable':
+        """Subset of rows, in the given order"""
+        return UniversityFeatureTable(self.features[rows], self.columns.take(rows))
+
 
 class FeatureEngineer:
     """
@@ -198,25 +248,27 @@ class FeatureEngineer:
         if not student.get('intended_major') or not programs:
             return 0.5
 
-        intended_major = student['intended_major'].lower()
-        field_of_study = (student.get('field_of_study') or '').lower()
+        intended_major = expand_major(student['intended_major'])
+        field_of_study = student.get('field_of_study')
 
         # Exact match
         for program in programs:
-            if intended_major in program['name'].lower():
+            if text_matches(intended_major, program['name']):
                 return 1.0
 
         # Field match
         if field_of_study:
+            field_variants = expand_major(field_of_study)
             for program in programs:
-                if field_of_study in (program.get('field') or '').lower():
+                if text_matches(field_variants, program.get('field')):
                     return 0.7
 
         # Alternative majors match
         alt_majors = student.get('alternative_majors', []) or []
         for alt_major in alt_majors:
+            alt_variants = expand_major(alt_major)
             for program in programs:
-                if alt_major.lower() in program['name'].lower():
+                if text_matches(alt_variants, program['name']):
                     return 0.6
 
         return 0.3  # Has programs but no match
@@ -258,6 +310,137 @@ class FeatureEngineer:
 
         return full_features
 
+    def build_feature_matrix(
+        self,
+        student: Dict,
+        universities_table: UniversityFeatureTable,
+        programs_index: Union[ProgramMatchIndex, Dict],
+    ) -> np.ndarray:
+        """
+        Create feature vectors for one student against every university in the table
+
+        Equivalent to stacking create_feature_vector() for each university, but the
+        student block is computed once, the university block comes from the
+        precomputed table and interaction features are computed column-wise.
+
+        Args:
+            student: Student profile dict
+            universities_table: Precomputed UniversityFeatureTable
+            programs_index: ProgramMatchIndex, or a mapping of university_id to programs
+
+        Returns:
+            C-contiguous float32 array of shape (n_universities, total_features)
+        """
+        n = len(universities_table)
+        X = np.empty(
+            (n, N_STUDENT_FEATURES + N_UNIVERSITY_FEATURES + N_INTERACTION_FEATURES),
+            dtype=np.float32,
+        )
+        university_end = N_STUDENT_FEATURES + N_UNIVERSITY_FEATURES
+
+        X[:, :N_STUDENT_FEATURES] = self.extract_student_features(student)
+        X[:, N_STUDENT_FEATURES:university_end] = universities_table.features
+        X[:, university_end:] = self._interaction_matrix(
+            student, universities_table.columns, programs_index
+        )
+        return X
+
+    def _interaction_matrix(
+        self, student: Dict, cols: UniversityColumns, programs_index: Union[ProgramMatchIndex, Dict]
+    ) -> np.ndarray:
+        """Column-wise version of extract_interaction_features (float64, cast by caller)"""
+        n = cols.size
+        out = np.empty((n, N_INTERACTION_FEATURES), dtype=np.float64)
+
+        def truthy(column):
+            return ~np.isnan(column) & (column != 0)
+
+        def code_match(codes, values):
+            return (codes >= 0) & np.isin(codes, cols.vocab.lookup(values))
+
+        # Academic fit
+        if student.get('gpa'):
+            has_gpa = truthy(cols.gpa_average)
+            gpa_diff = student['gpa'] - cols.gpa_average
+            out[:, 0] = np.where(has_gpa, gpa_diff / 4.0, 0.0)
+            out[:, 1] = np.where(has_gpa, np.where(gpa_diff > 0, 1.0, 0.0), 0.5)
+        else:
+            out[:, 0] = 0.0
+            out[:, 1] = 0.5
+
+        # SAT fit
+        if student.get('sat_total'):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sat_pct = (student['sat_total'] - cols.sat_25th) / (cols.sat_75th - cols.sat_25th + 1)
+            out[:, 2] = np.where(cols.sat_75th > 0, np.clip(sat_pct, 0, 1), 0.5)
+        else:
+            out[:, 2] = 0.5
+
+        # Financial fit
+        if student.get('max_budget_per_year'):
+            has_cost = truthy(cols.total_cost)
+            cost_ratio = cols.total_cost / (student['max_budget_per_year'] + 1)
+            out[:, 3] = np.where(has_cost, np.minimum(cost_ratio, 2.0) / 2.0, 0.5)
+            out[:, 4] = np.where(has_cost, np.where(cost_ratio <= 1.0, 1.0, 0.0), 0.5)
+        else:
+            out[:, 3] = 0.5
+            out[:, 4] = 0.5
+
+        # Location preference match
+        location_match = np.zeros(n)
+        if student.get('preferred_states'):
+            location_match = location_match + np.where(code_match(cols.state_code, student['preferred_states']), 0.5, 0.0)
+        if student.get('preferred_countries'):
+            location_match = location_match + np.where(code_match(cols.country_code, student['preferred_countries']), 0.5, 0.0)
+        out[:, 5] = location_match
+
+        # Location type and university type match
+        for column, key, codes in (
+            (6, 'location_type_preference', cols.location_type_code),
+            (7, 'preferred_university_type', cols.university_type_code),
+        ):
+            if student.get(key):
+                out[:, column] = np.where(
+                    codes >= 0, np.where(code_match(codes, [student[key]]), 1.0, 0.0), 0.5
+                )
+            else:
+                out[:, column] = 0.5
+
+        # Program match score, from one inverted-index lookup
+        if student.get('intended_major'):
+            if not isinstance(programs_index, ProgramMatchIndex):
+                programs_index = ProgramMatchIndex.from_programs_by_university(programs_index)
+            strengths = programs_index.match(
+                student['intended_major'],
+                student.get('field_of_study'),
+                student.get('alternative_majors'),
+            )
+            out[:, 8] = [
+                PROGRAM_MATCH_SCORES.get(strengths.get(univ_id), 0.3)
+                if programs_index.has_programs(univ_id) else 0.5
+                for univ_id in cols.ids
+            ]
+        else:
+            out[:, 8] = 0.5
+
+        # Size preference match
+        preferred_size = student.get('preferred_size')
+        if preferred_size:
+            total = cols.total_students
+            if preferred_size == 'Small':
+                matches = total < 5000
+            elif preferred_size == 'Medium':
+                matches = (total >= 5000) & (total <= 15000)
+            elif preferred_size == 'Large':
+                matches = total > 15000
+            else:
+                matches = np.zeros(n, dtype=bool)
+            out[:, 9] = np.where(truthy(total), np.where(matches, 1.0, 0.0), 0.5)
+        else:
+            out[:, 9] = 0.5
+
+        return out
+
     def get_feature_names(self) -> List[str]:
         """Get names of all features for interpretability"""
         student_feature_names = [
@@ -6,10 +6,15 @@ from typing import List, Dict, Optional
 from supabase import Client
 import logging
 import os
+import time
 import numpy as np
 
-from .feature_engineering import FeatureEngineer
+from .feature_engineering import FeatureEngineer, UniversityFeatureTable
 from .models import EnsembleRecommendationModel
+from .model_registry import get_model_registry
+from app.monitoring import recommendation_stage, record_recommendations
+from app.services.catalog_snapshot import CatalogSnapshot, get_catalog
+from app.services.program_index import MATCH_FIELD, MATCH_NAME, ProgramMatchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -20,24 +25,28 @@ class MLRecommendationEngine:
     Falls back to rule-based scoring if ML models unavailable
     """
 
-    def __init__(self, db: Client, model_dir: Optional[str] = None):
+    def __init__(
+        self,
+        db: Client,
+        model_dir: Optional[str] = None,
+        catalog: Optional[CatalogSnapshot] = None,
+    ):
         self.db = db
+        self.catalog = catalog  # Defaults to the process-wide snapshot
         self.feature_engineer = FeatureEngineer()
         self.ml_model = None
+        self.model_version = None
         self.use_ml = False
 
-        # Try to load ML models if path provided
-        if model_dir and os.path.exists(model_dir):
-            try:
-                self.ml_model = EnsembleRecommendationModel(self.feature_engineer)
-                self.ml_model.load(model_dir)
-                self.use_ml = True
-                logger.info("✅ ML models loaded successfully - using ML-enhanced recommendations")
-            except Exception as e:
-                logger.warning(f"Failed to load ML models: {e}. Falling back to rule-based scoring.")
-                self.use_ml = False
-        else:
-            logger.info("No ML models found - using rule-based scoring (train models to enable ML)")
+        # Models are loaded once per worker by the registry, not per request
+        if model_dir:
+            self.model_version, self.ml_model = get_model_registry(model_dir).get_active()
+            self.use_ml = self.ml_model is not None
+            if self.use_ml:
+                self.feature_engineer = self.ml_model.feature_engineer
+                logger.debug(f"Using ML model version {self.model_version}")
+            else:
+                logger.info("No ML models found - using rule-based scoring (train models to enable ML)")
 
     def generate_recommendations(
         self, student: Dict, max_results: int = 15
@@ -53,58 +62,48 @@ class MLRecommendationEngine:
             List of recommendation dictionaries with scores
         """
         logger.info(f"Generating recommendations for student {student.get('user_id')} (ML: {self.use_ml})")
+        start_time = time.perf_counter()
 
-        # Build query with filters at database level to avoid Supabase's 1000 row default limit
-        query = self.db.table('universities').select('*')
-
-        # Filter by preferred countries at database level (critical for performance and completeness)
-        if student.get("preferred_countries") and len(student["preferred_countries"]) > 0:
-            query = query.in_('country', student['preferred_countries'])
-            logger.info(f"Filtering by preferred countries: {student['preferred_countries']}")
+        with recommendation_stage('load'):
+            # Read candidates from the in-process catalog snapshot (no catalog I/O per request)
+            catalog = self.catalog if self.catalog is not None else get_catalog()
 
-        # Set a high limit to get all matching universities (Supabase default is 1000)
-        query = query.limit(5000)
-
-        response = query.execute()
-        universities = response.data
-
-        if not universities:
-            logger.warning(f"No universities found for countries: {student.get('preferred_countries', 'all')}")
-            # Fallback: get top universities without country filter
-            response = self.db.table('universities').select('*').limit(500).execute()
-            universities = response.data
+            if student.get("preferred_countries") and len(student["preferred_countries"]) > 0:
+                rows = catalog.rows_for(countries=student['preferred_countries'])[:5000]
+                logger.info(f"Filtering by preferred countries: {student['preferred_countries']}")
+            else:
+                rows = np.arange(min(len(catalog), 5000))
 
-        if not universities:
-            logger.warning("No universities found in database")
-            return []
+            if rows.size == 0:
+                logger.warning(f"No universities found for countries: {student.get('preferred_countries', 'all')}")
+                # Fallback: get top universities without country filter
+                rows = np.arange(min(len(catalog), 500))
 
-        logger.info(f"Loaded {len(universities)} universities for recommendation matching")
+            if rows.size == 0:
+                logger.warning("No universities found in database")
+                return []
 
-        # Batch-load all programs to avoid N+1 queries
-        logger.info("Loading programs for matching...")
-        programs_response = self.db.table('programs').select('*').execute()
-        all_programs = programs_response.data
+            universities = catalog.take(rows)
 
-        # Create index: university_id -> list of programs
-        programs_by_university = {}
-        for program in all_programs:
-            univ_id = program.get('university_id')
-            if univ_id:
-                if univ_id not in programs_by_university:
-                    programs_by_university[univ_id] = []
-                programs_by_university[univ_id].append(program)
+        logger.info(
+            f"Selected {len(universities)} universities for recommendation matching "
+            f"(catalog v{catalog.version})"
+        )
 
-        logger.info(f"Loaded programs for {len(programs_by_university)} universities")
+        programs_by_university = catalog.programs_by_university
+        program_index = catalog.program_index
 
         if self.use_ml and self.ml_model:
             # Use ML model for predictions
             scores = self._generate_ml_recommendations(
-                student, universities, programs_by_university
+                student, universities, programs_by_university,
+                university_table=catalog.feature_table.take(rows),
+                program_index=program_index
             )
         else:
             # Fallback to rule-based scoring
             scores = self._generate_rulebased_recommendations(
-                student, universities, programs_by_university
+                student, universities, program_index
             )
 
         # Sort universities by score
@@ -113,7 +112,7 @@ class MLRecommendationEngine:
 
         # Ensure diversity across countries when multiple countries are selected
         # Group by country and select proportionally to ensure mix
-        preferred_countries = student.get("preferred_countries", [])
+        preferred_countries = student.get("preferred_countries") or []
         if len(preferred_countries) > 1:
             # Group universities by country
             by_country = {}
@@ -151,11 +150,9 @@ class MLRecommendationEngine:
         # Create recommendation dictionaries
         recommendations = []
         for university, score in top_universities:
-            programs = programs_by_university.get(university['id'], [])
-
             # Calculate dimension scores for insights
             dimension_scores = self._calculate_dimension_scores(
-                student, university, programs
+                student, university, program_index
             )
 
             # Determine category based on academic fit
@@ -183,6 +180,7 @@ class MLRecommendationEngine:
             }
             recommendations.append(recommendation)
 
+        record_recommendations(recommendations, time.perf_counter() - start_time)
         logger.info(f"Generated {len(recommendations)} recommendations")
         return recommendations
 
@@ -190,64 +188,70 @@ class MLRecommendationEngine:
         self,
         student: Dict,
         universities: List[Dict],
-        programs_by_university: Dict[int, List[Dict]]
+        programs_by_university: Dict[int, List[Dict]],
+        university_table: Optional[UniversityFeatureTable] = None,
+        program_index: Optional[ProgramMatchIndex] = None
     ) -> np.ndarray:
         """Generate recommendations using ML model (batch prediction)"""
+        if program_index is None:
+            program_index = ProgramMatchIndex.from_programs_by_university(programs_by_university)
         logger.info("Using ML model for predictions...")
 
         try:
             scores = self.ml_model.predict_batch(
-                student, universities, programs_by_university
+                student, universities, programs_by_university,
+                university_table=university_table,
+                program_index=program_index
             )
             return scores
         except Exception as e:
             logger.error(f"ML prediction failed: {e}. Falling back to rule-based.")
             return self._generate_rulebased_recommendations(
-                student, universities, programs_by_university
+                student, universities, program_index
             )
 
     def _generate_rulebased_recommendations(
         self,
         student: Dict,
         universities: List[Dict],
-        programs_by_university: Dict[int, List[Dict]]
+        program_index: ProgramMatchIndex
     ) -> np.ndarray:
         """Generate recommendations using traditional rule-based scoring"""
         logger.info("Using rule-based scoring...")
 
-        scores = []
-        for university in universities:
-            programs = programs_by_university.get(university['id'], [])
-            dimension_scores = self._calculate_dimension_scores(
-                student, university, programs
-            )
+        with recommendation_stage('predict'):
+            scores = []
+            for university in universities:
+                dimension_scores = self._calculate_dimension_scores(
+                    student, university, program_index
+                )
 
-            # Weighted combination
-            weights = {
-                "academic": 0.30,
-                "financial": 0.25,
-                "program": 0.20,
-                "location": 0.15,
-                "characteristics": 0.10,
-            }
+                # Weighted combination
+                weights = {
+                    "academic": 0.30,
+                    "financial": 0.25,
+                    "program": 0.20,
+                    "location": 0.15,
+                    "characteristics": 0.10,
+                }
 
-            total_score = sum(
-                dimension_scores[dim] * weight
-                for dim, weight in weights.items()
-            )
+                total_score = sum(
+                    dimension_scores[dim] * weight
+                    for dim, weight in weights.items()
+                )
 
-            scores.append(total_score)
+                scores.append(total_score)
 
-        return np.array(scores)
+            return np.array(scores)
 
     def _calculate_dimension_scores(
-        self, student: Dict, university: Dict, programs: List[Dict]
+        self, student: Dict, university: Dict, program_index: ProgramMatchIndex
     ) -> Dict[str, float]:
         """Calculate scores for each dimension (for insights and fallback)"""
         return {
             "academic": self._calculate_academic_score(student, university),
             "financial": self._calculate_financial_score(student, university),
-            "program": self._calculate_program_score(student, university, programs),
+            "program": self._calculate_program_score(student, university, program_index),
             "location": self._calculate_location_score(student, university),
             "characteristics": self._calculate_characteristics_score(student, university),
         }
@@ -310,26 +314,23 @@ class MLRecommendationEngine:
             return 25.0
 
     def _calculate_program_score(
-        self, student: Dict, university: Dict, programs: List[Dict]
+        self, student: Dict, university: Dict, program_index: ProgramMatchIndex
     ) -> float:
         """Calculate program match score (0-100)"""
         if not student.get("intended_major"):
             return 70.0
 
-        if not programs:
+        if not program_index.has_programs(university["id"]):
             return 60.0
 
-        # Look for exact major match
-        for program in programs:
-            if student["intended_major"].lower() in program["name"].lower():
-                return 95.0
-
-        # Look for field match
-        if student.get("field_of_study"):
-            for program in programs:
-                if student["field_of_study"].lower() in (program.get("field") or "").lower():
-                    return 80.0
-
+        # Memoized per (major, field), so this is a dict lookup after the first university
+        strength = program_index.match(
+            student["intended_major"], student.get("field_of_study")
+        ).get(university["id"])
+        if strength == MATCH_NAME:
+            return 95.0
+        if strength == MATCH_FIELD:
+            return 80.0
         return 50.0
 
     def _calculate_location_score(
@@ -0,0 +1,180 @@
+"""
+Model Registry for the ML Recommender
+Loads the LightGBM ranker once per worker and hot-swaps to newly published versions
+"""
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock, Thread
+from typing import Dict, Optional, Tuple
+import json
+import logging
+import os
+import time
+
+from .feature_engineering import FeatureEngineer
+from .models import EnsembleRecommendationModel
+
+logger = logging.getLogger(__name__)
+
+
+ML_MODELS_DIR = os.environ.get('ML_MODELS_DIR', './ml_models')
+ACTIVE_POINTER = 'ACTIVE'
+VERSIONS_DIR = 'versions'
+LEGACY_VERSION = 'legacy'
+POINTER_CHECK_SECONDS = 30
+MAX_VERSIONS_IN_MEMORY = 2
+
+
+def publish_model(ml_model: EnsembleRecommendationModel, model_dir: str = ML_MODELS_DIR) -> str:
+    """
+    Save a trained model as a new version and make it active
+
+    The model is written to `versions/<version>/` first and the ACTIVE pointer
+    is replaced atomically afterwards, so readers never see a partial model.
+
+    Returns:
+        The new version identifier
+    """
+    version = datetime.utcnow().strftime('%Y%m%dT%H%M%S%fZ')
+    version_dir = os.path.join(model_dir, VERSIONS_DIR, version)
+    ml_model.save(version_dir)
+
+    pointer_path = os.path.join(model_dir, ACTIVE_POINTER)
+    tmp_path = f"{pointer_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': version, 'published_at': datetime.utcnow().isoformat()}, f)
+    os.replace(tmp_path, pointer_path)
+
+    logger.info(f"Published ML model version {version} to {model_dir}")
+
+    # Swap immediately in this process; other workers pick it up on their next pointer check
+    registry = _registries.get(os.path.abspath(model_dir))
+    if registry is not None:
+        registry.refresh(force=True)
+
+    return version
+
+
+class ModelRegistry:
+    """
+    Per-process cache of versioned recommendation models
+
+    Readers call get_active(), which returns the current (version, model) pair
+    without touching disk except for a cheap, rate-limited check of the ACTIVE
+    pointer. A new version is loaded outside the lock and swapped in with a
+    single assignment, so in-flight requests keep the model they started with.
+    """
+
+    def __init__(self, model_dir: str = ML_MODELS_DIR):
+        self.model_dir = model_dir
+        self._models: "OrderedDict[str, EnsembleRecommendationModel]" = OrderedDict()
+        self._active: Tuple[Optional[str], Optional[EnsembleRecommendationModel]] = (None, None)
+        self._pointer_mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._lock = Lock()
+        self._refresh_lock = Lock()
+
+    @property
+    def active_version(self) -> Optional[str]:
+        return self._active[0]
+
+    def get_active(self) -> Tuple[Optional[str], Optional[EnsembleRecommendationModel]]:
+        """Current (version, model); (None, None) when no model has been trained"""
+        if time.monotonic() - self._last_check >= POINTER_CHECK_SECONDS:
+            self.refresh()
+        return self._active
+
+    def refresh(self, force: bool = False):
+        """Load the version named by the ACTIVE pointer if it changed"""
+        # One loader at a time; concurrent readers keep serving the current model
+        # (they only wait when there is no model loaded yet)
+        if not self._refresh_lock.acquire(blocking=force or self._active[1] is None):
+            return
+        try:
+            self._refresh(force)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self, force: bool):
+        self._last_check = time.monotonic()
+
+        pointer_path = os.path.join(self.model_dir, ACTIVE_POINTER)
+        try:
+            mtime = os.path.getmtime(pointer_path)
+        except OSError:
+            mtime = None
+
+        if not force and mtime == self._pointer_mtime and self._active[1] is not None:
+            return
+
+        version = self._read_pointer(pointer_path) if mtime is not None else None
+        if version is None and os.path.exists(os.path.join(self.model_dir, 'lightgbm_ranker.txt')):
+            version = LEGACY_VERSION  # Model saved before versioning was introduced
+
+        if version is None:
+            self._pointer_mtime = mtime
+            return
+
+        if version == self._active[0]:
+            self._pointer_mtime = mtime
+            return
+
+        model = self._models.get(version)
+        if model is None:
+            try:
+                model = self._load(version)
+            except Exception as e:
+                logger.warning(f"Failed to load ML model version {version}: {e}. Keeping {self._active[0]}.")
+                return
+
+        with self._lock:
+            self._models[version] = model
+            self._models.move_to_end(version)
+            while len(self._models) > MAX_VERSIONS_IN_MEMORY:
+                self._models.popitem(last=False)
+            self._active = (version, model)
+            self._pointer_mtime = mtime
+
+        logger.info(f"✅ ML model version {version} is now active")
+
+    def _read_pointer(self, pointer_path: str) -> Optional[str]:
+        try:
+            with open(pointer_path) as f:
+                return json.load(f).get('version')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable ML model pointer {pointer_path}: {e}")
+            return None
+
+    def _load(self, version: str) -> EnsembleRecommendationModel:
+        path = self.model_dir if version == LEGACY_VERSION else os.path.join(
+            self.model_dir, VERSIONS_DIR, version
+        )
+        model = EnsembleRecommendationModel(FeatureEngineer())
+        model.load(path)
+        return model
+
+
+def warm_model_registry(model_dir: str = ML_MODELS_DIR):
+    """Load the active model in a background thread so the first request doesn't pay for it"""
+    Thread(
+        target=get_model_registry(model_dir).refresh,
+        kwargs={'force': True},
+        daemon=True,
+        name='ml-model-warmup',
+    ).start()
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = Lock()
+
+
+def get_model_registry(model_dir: str = ML_MODELS_DIR) -> ModelRegistry:
+    """Get the process-wide registry for a model directory"""
+    key = os.path.abspath(model_dir)
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = _registries[key] = ModelRegistry(model_dir)
+    return registry
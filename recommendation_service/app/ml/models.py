@@ -11,6 +11,10 @@ import joblib
 import logging
 import os
 
+from .feature_engineering import UniversityFeatureTable
+from app.monitoring import recommendation_stage
+from app.services.program_index import ProgramMatchIndex
+
 # Optional PyTorch import (only needed for neural network personalization)
 try:
     import torch
@@ -310,7 +314,8 @@ class EnsembleRecommendationModel:
         students: List[Dict],
         universities: List[Dict],
         programs_by_university: Dict[int, List[Dict]],
-        scores: np.ndarray
+        scores: np.ndarray,
+        program_index: Optional[ProgramMatchIndex] = None
     ):
         """
         Train the LightGBM ranking model
@@ -320,20 +325,20 @@ class EnsembleRecommendationModel:
             universities: List of universities
             programs_by_university: Mapping of university_id to programs
             scores: Target match scores
+            program_index: Prebuilt ProgramMatchIndex (built once from
+                           programs_by_university if not provided)
         """
         logger.info("Preparing training data for LightGBM...")
 
-        # Extract features for all student-university pairs
-        features_list = []
-        for i, student in enumerate(students):
-            for j, university in enumerate(universities):
-                programs = programs_by_university.get(university['id'], [])
-                features = self.feature_engineer.create_feature_vector(
-                    student, university, programs
-                )
-                features_list.append(features)
-
-        X = np.array(features_list)
+        # Extract features for all student-university pairs (university block and
+        # program index built once for the training set)
+        table = UniversityFeatureTable.from_universities(universities, self.feature_engineer)
+        if program_index is None:
+            program_index = ProgramMatchIndex.from_programs_by_university(programs_by_university)
+        X = np.vstack([
+            self.feature_engineer.build_feature_matrix(student, table, program_index)
+            for student in students
+        ])
         y = scores.flatten()
 
         feature_names = self.feature_engineer.get_feature_names()
@@ -372,7 +377,9 @@ class EnsembleRecommendationModel:
         self,
         student: Dict,
         universities: List[Dict],
-        programs_by_university: Dict[int, List[Dict]]
+        programs_by_university: Dict[int, List[Dict]],
+        university_table: Optional[UniversityFeatureTable] = None,
+        program_index: Optional[ProgramMatchIndex] = None
     ) -> np.ndarray:
         """
         Predict match scores for a student against multiple universities (batch processing)
@@ -381,20 +388,27 @@ class EnsembleRecommendationModel:
             student: Student profile dict
             universities: List of universities
             programs_by_university: Mapping of university_id to programs
+            university_table: Precomputed features aligned with `universities`
+                              (built on the fly if not provided)
+            program_index: Prebuilt ProgramMatchIndex (built from
+                           programs_by_university if not provided)
 
         Returns:
             Array of predicted scores (n_universities,)
         """
-        features_list = []
-        for university in universities:
-            programs = programs_by_university.get(university['id'], [])
-            features = self.feature_engineer.create_feature_vector(
-                student, university, programs
+        with recommendation_stage('features'):
+            if university_table is None:
+                university_table = UniversityFeatureTable.from_universities(
+                    universities, self.feature_engineer
+                )
+
+            X = self.feature_engineer.build_feature_matrix(
+                student, university_table,
+                program_index if program_index is not None else programs_by_university
             )
-            features_list.append(features)
 
-        X = np.array(features_list)
-        scores = self.lgb_ranker.predict(X)
+        with recommendation_stage('predict'):
+            scores = self.lgb_ranker.predict(X)
 
         # Clip to 0-100 range
         return np.clip(scores, 0, 100)
@@ -14,13 +14,26 @@ from .prometheus_config import (
     init_prometheus,
     create_metrics_middleware,
     record_recommendation_generated,
+    record_recommendation_stage,
     record_database_query,
     record_cache_access,
     record_api_request,
     record_error,
     update_active_users,
     record_student_profile_created,
-    record_application_submitted
+    record_application_submitted,
+    update_log_queue_depth,
+    record_logs_dropped,
+    record_logs_handled
+)
+
+from .instrumentation import (
+    UNMATCHED_ROUTE,
+    route_template,
+    describe_query,
+    instrument_postgrest,
+    recommendation_stage,
+    record_recommendations
 )
 
 __all__ = [
@@ -34,6 +47,7 @@ __all__ = [
     'init_prometheus',
     'create_metrics_middleware',
     'record_recommendation_generated',
+    'record_recommendation_stage',
     'record_database_query',
     'record_cache_access',
     'record_api_request',
@@ -41,4 +55,14 @@ __all__ = [
     'update_active_users',
     'record_student_profile_created',
     'record_application_submitted',
+    'update_log_queue_depth',
+    'record_logs_dropped',
+    'record_logs_handled',
+    # Instrumentation
+    'UNMATCHED_ROUTE',
+    'route_template',
+    'describe_query',
+    'instrument_postgrest',
+    'recommendation_stage',
+    'record_recommendations',
 ]
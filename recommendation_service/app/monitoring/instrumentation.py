@@ -0,0 +1,123 @@
+"""
+Application Instrumentation
+Feeds the Prometheus metrics in prometheus_config from the code paths they describe
+
+- HTTP requests are labelled by route template (`/users/{user_id}`), never
+  by raw path, so ids in URLs do not create new time series. Requests that
+  match no route share the UNMATCHED_ROUTE label.
+- Once `instrument_postgrest()` has run, every supabase `.execute()` is
+  timed by table and operation (select, count, insert, upsert, update,
+  delete, rpc).
+- Recommendation generation is timed per stage with `recommendation_stage`
+  (load, features, predict, write).
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+import functools
+import logging
+import time
+
+from .prometheus_config import (
+    record_database_query,
+    record_recommendation_generated,
+    record_recommendation_stage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# PostgREST HTTP method -> operation label (POST and /rpc/ paths are resolved separately)
+_OPERATIONS = {'GET': 'select', 'HEAD': 'count', 'PATCH': 'update', 'DELETE': 'delete'}
+
+_postgrest_instrumented = False
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the route that handled a request (UNMATCHED_ROUTE if none did)"""
+    route = scope.get('route')
+    return getattr(route, 'path_format', None) or getattr(route, 'path', None) or UNMATCHED_ROUTE
+
+
+# ==================== Database ====================
+
+def describe_query(builder) -> Tuple[str, str]:
+    """(table, operation) labels for a PostgREST request builder"""
+    request = getattr(builder, 'request', builder)  # postgrest 1.x+ keeps the config on `.request`
+    method = str(getattr(request, 'http_method', '')).upper()
+    path = getattr(request, 'path', '')
+    segments = str(getattr(path, 'path', path)).rstrip('/').split('/')
+    table = segments[-1] or 'unknown'
+
+    if len(segments) > 1 and segments[-2] == 'rpc':
+        return table, 'rpc'
+    if method == 'POST':
+        headers = getattr(request, 'headers', None)
+        prefer = (headers.get('Prefer') if headers is not None else None) or ''
+        return table, 'upsert' if 'resolution=' in prefer else 'insert'
+    return table, _OPERATIONS.get(method, method.lower() or 'unknown')
+
+
+def _timed_execute(execute):
+    @functools.wraps(execute)
+    def timed(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return execute(self, *args, **kwargs)
+        finally:
+            table, operation = describe_query(self)
+            record_database_query(table, operation, time.perf_counter() - start)
+    return timed
+
+
+def instrument_postgrest() -> bool:
+    """
+    Time every synchronous PostgREST query (idempotent)
+
+    Wraps `execute` on each request builder class that defines it, so the
+    supabase client and every caller holding one are covered without
+    changes at the call sites.
+    """
+    global _postgrest_instrumented
+    if _postgrest_instrumented:
+        return True
+
+    try:
+        from postgrest._sync import request_builder
+    except ImportError:
+        logger.warning("postgrest request builders not found - database metrics disabled")
+        return False
+
+    for cls in vars(request_builder).values():
+        if isinstance(cls, type) and cls.__module__ == request_builder.__name__ and 'execute' in vars(cls):
+            cls.execute = _timed_execute(cls.execute)
+
+    _postgrest_instrumented = True
+    logger.info("Database query metrics enabled")
+    return True
+
+
+# ==================== Recommendations ====================
+
+@contextmanager
+def recommendation_stage(stage: str):
+    """Time a block as one recommendation stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_recommendation_stage(stage, time.perf_counter() - start)
+
+
+def record_recommendations(recommendations: List[Dict], duration: float, user_type: str = 'student'):
+    """Count one generation run's recommendations by category and observe its duration"""
+    counts: Dict[str, int] = {}
+    for recommendation in recommendations:
+        category = recommendation.get('category') or 'unknown'
+        counts[category] = counts.get(category, 0) + 1
+
+    if not counts:
+        counts['none'] = 0
+    for index, (category, count) in enumerate(counts.items()):
+        record_recommendation_generated(user_type, category, duration if index == 0 else None, count)
@@ -4,7 +4,7 @@ Exposes application metrics for monitoring and alerting
 """
 import os
 import logging
-from typing import Callable
+from typing import Callable, Optional
 from fastapi import FastAPI
 from prometheus_client import Counter, Histogram, Gauge, Info
 
@@ -27,6 +27,13 @@ recommendation_generation_time = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
 )
 
+recommendation_stage_duration = Histogram(
+    'recommendation_stage_seconds',
+    'Time spent in each recommendation stage (load, features, predict, write)',
+    ['stage'],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0]
+)
+
 # Database metrics
 database_queries = Counter(
     'database_queries_total',
@@ -92,6 +99,24 @@ applications_submitted = Counter(
     ['application_status']
 )
 
+# Log shipper metrics (SupabaseHandler)
+log_shipper_queue_depth = Gauge(
+    'log_shipper_queue_depth',
+    'Log entries buffered and waiting to be shipped'
+)
+
+log_shipper_dropped = Counter(
+    'log_shipper_dropped_total',
+    'Log entries dropped by the log shipper',
+    ['level', 'reason']
+)
+
+log_shipper_entries = Counter(
+    'log_shipper_entries_total',
+    'Log entries handled by the log shipper',
+    ['outcome']
+)
+
 # System info
 app_info = Info('app', 'Application information')
 
@@ -165,15 +190,24 @@ def init_prometheus(app: FastAPI) -> bool:
 # Helper Functions for Metric Recording
 # ========================================
 
-def record_recommendation_generated(user_type: str, category: str, duration: float):
-    """Record a recommendation generation event"""
+def record_recommendation_generated(user_type: str, category: str, duration: Optional[float] = None, count: int = 1):
+    """Record generated recommendations (duration: whole generation run, if it should be observed)"""
     try:
-        recommendations_generated.labels(user_type=user_type, category=category).inc()
-        recommendation_generation_time.observe(duration)
+        recommendations_generated.labels(user_type=user_type, category=category).inc(count)
+        if duration is not None:
+            recommendation_generation_time.observe(duration)
     except Exception as e:
         logger.error(f"Failed to record recommendation metric: {e}")
 
 
+def record_recommendation_stage(stage: str, duration: float):
+    """Record the time spent in one recommendation stage"""
+    try:
+        recommendation_stage_duration.labels(stage=stage).observe(duration)
+    except Exception as e:
+        logger.error(f"Failed to record recommendation stage metric: {e}")
+
+
 def record_database_query(table: str, operation: str, duration: float):
     """Record a database query"""
     try:
@@ -183,13 +217,13 @@ def record_database_query(table: str, operation: str, duration: float):
         logger.error(f"Failed to record database metric: {e}")
 
 
-def record_cache_access(cache_type: str, hit: bool):
-    """Record a cache access"""
+def record_cache_access(cache_type: str, hit: bool, count: int = 1):
+    """Record a cache access (count: keys looked up, for multi-key reads)"""
     try:
         if hit:
-            cache_hits.labels(cache_type=cache_type).inc()
+            cache_hits.labels(cache_type=cache_type).inc(count)
         else:
-            cache_misses.labels(cache_type=cache_type).inc()
+            cache_misses.labels(cache_type=cache_type).inc(count)
     except Exception as e:
         logger.error(f"Failed to record cache metric: {e}")
 
@@ -211,6 +245,30 @@ def record_error(error_type: str, endpoint: str):
         logger.error(f"Failed to record error metric: {e}")
 
 
+def update_log_queue_depth(depth: int):
+    """Update the log shipper's buffered entry count"""
+    try:
+        log_shipper_queue_depth.set(depth)
+    except Exception as e:
+        logger.error(f"Failed to update log queue depth metric: {e}")
+
+
+def record_logs_dropped(level: str, reason: str, count: int = 1):
+    """Record log entries dropped by the log shipper (buffer_full, spill_full, ...)"""
+    try:
+        log_shipper_dropped.labels(level=level, reason=reason).inc(count)
+    except Exception as e:
+        logger.error(f"Failed to record dropped logs metric: {e}")
+
+
+def record_logs_handled(outcome: str, count: int):
+    """Record log entries shipped, spilled to disk or replayed from disk"""
+    try:
+        log_shipper_entries.labels(outcome=outcome).inc(count)
+    except Exception as e:
+        logger.error(f"Failed to record log shipper metric: {e}")
+
+
 def update_active_users(count: int):
     """Update active users count"""
     try:
@@ -249,30 +307,24 @@ def create_metrics_middleware() -> Callable:
     import time
     from starlette.middleware.base import BaseHTTPMiddleware
     from starlette.requests import Request
+    from .instrumentation import route_template
 
     class MetricsMiddleware(BaseHTTPMiddleware):
         async def dispatch(self, request: Request, call_next):
-            start_time = time.time()
-
-            # Process request
-            response = await call_next(request)
-
-            # Calculate duration
-            duration = time.time() - start_time
+            start_time = time.perf_counter()
+            status = 500
 
-            # Record metrics
             try:
-                method = request.method
-                path = request.url.path
+                response = await call_next(request)
                 status = response.status_code
-
-                # Skip metrics endpoint itself
-                if path != "/metrics":
-                    record_api_request(method, path, status, duration)
-
-            except Exception as e:
-                logger.error(f"Error recording request metrics: {e}")
-
-            return response
+                return response
+            finally:
+                # Label by route template (set on the scope by the router), not the raw path
+                try:
+                    endpoint = route_template(request.scope)
+                    if endpoint != "/metrics":
+                        record_api_request(request.method, endpoint, status, time.perf_counter() - start_time)
+                except Exception as e:
+                    logger.error(f"Error recording request metrics: {e}")
 
     return MetricsMiddleware
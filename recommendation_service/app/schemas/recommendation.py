@@ -44,6 +44,16 @@ class RecommendationListResponse(BaseModel):
     safety_schools: List[RecommendationResponse]
     match_schools: List[RecommendationResponse]
     reach_schools: List[RecommendationResponse]
+    model_version: Optional[str] = None  # Active ML model version (None for rule-based)
+
+
+class RecommendationPageResponse(RecommendationListResponse):
+    """One page of a cached ranking; pass `cursor` back to fetch other pages"""
+    cursor: str
+    page: int
+    page_size: int
+    total_pages: int
+    has_next: bool
 
 
 class GenerateRecommendationsRequest(BaseModel):
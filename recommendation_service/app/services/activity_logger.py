@@ -10,6 +10,7 @@ from uuid import uuid4
 from supabase import Client
 
 from app.schemas.activity import StudentActivityType
+from app.services.parent_dashboard import get_dashboard_cache
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,7 @@ class ActivityLogger:
             result = self.db.table('student_activities').insert(activity_data).execute()
 
             if result.data:
+                get_dashboard_cache().invalidate_student(student_id)
                 logger.info(f"Created activity: {activity_type.value} for student {student_id}")
                 return True
             else:
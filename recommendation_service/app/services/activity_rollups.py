@@ -0,0 +1,156 @@
+"""
+Activity Rollups - Incrementally maintained activity_log counters
+
+Every activity logged through app/utils/activity_logger.py bumps an hourly
+per-action_type bucket and a daily per-user bucket (Postgres functions in
+migrations/create_activity_rollups.sql). The admin activity stats are built
+from those buckets with two reads instead of counting activity_log rows;
+`backfill` recomputes buckets for historical data.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import logging
+
+from supabase import Client
+
+from app.database.async_db import gather
+from app.schemas.activity import ActivityStatsResponse
+from app.utils.activity_logger import ActivityType
+
+logger = logging.getLogger(__name__)
+
+
+TOP_LIMIT = 10
+BACKFILL_WINDOW_DAYS = 7  # Days recomputed per backfill call (keeps each statement short)
+
+
+def _hour_floor(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def summarize_rollups(counts: List[Dict[str, Any]], top_users: List[Dict[str, Any]]) -> ActivityStatsResponse:
+    """
+    Build the dashboard response from `activity_rollup_counts` rows
+
+    Args:
+        counts: One row per action_type with total/today/this_week/this_month/recent/top_window
+        top_users: `top_activity_users` rows
+    """
+    by_type = {row['action_type']: row for row in counts}
+
+    def total(column: str) -> int:
+        return int(sum(row[column] or 0 for row in counts))
+
+    def for_type(action_type: str, column: str) -> int:
+        return int((by_type.get(action_type) or {}).get(column) or 0)
+
+    top_types = sorted(
+        ((row['action_type'], int(row['top_window'])) for row in counts if row['top_window']),
+        key=lambda item: item[1],
+        reverse=True
+    )[:TOP_LIMIT]
+
+    return ActivityStatsResponse(
+        total_activities=total('total'),
+        activities_today=total('today'),
+        activities_this_week=total('this_week'),
+        activities_this_month=total('this_month'),
+        top_action_types=dict(top_types),
+        top_users=[
+            {
+                'user_id': user['user_id'],
+                'user_name': user.get('user_name') or 'Unknown',
+                'user_email': user.get('user_email') or 'Unknown',
+                'activity_count': int(user['activity_count']),
+            }
+            for user in top_users
+        ],
+        recent_registrations=for_type(ActivityType.USER_REGISTRATION, 'recent'),
+        recent_logins=for_type(ActivityType.USER_LOGIN, 'today'),
+        recent_applications=for_type(ActivityType.APPLICATION_SUBMITTED, 'recent'),
+    )
+
+
+class ActivityRollups:
+    """Records into and reads from the activity rollup tables"""
+
+    def __init__(self, db: Client):
+        self.db = db
+
+    def record(self, activity: Dict[str, Any]):
+        """Count one inserted activity_log row"""
+        self.db.rpc('record_activity_rollup', {
+            'p_timestamp': activity['timestamp'],
+            'p_action_type': activity['action_type'],
+            'p_user_id': activity.get('user_id'),
+            'p_user_name': activity.get('user_name'),
+            'p_user_email': activity.get('user_email'),
+        }).execute()
+
+    async def get_stats(self, now: Optional[datetime] = None) -> ActivityStatsResponse:
+        """Admin activity stats from the rollup buckets (UTC boundaries)"""
+        now = now or datetime.now(timezone.utc)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = today_start - timedelta(days=today_start.weekday())
+        month_start = today_start.replace(day=1)
+        # Rolling windows include the whole current-hour bucket at their start
+        seven_days_ago = _hour_floor(now - timedelta(days=7))
+        thirty_days_ago = _hour_floor(now - timedelta(days=30))
+
+        counts, users = await gather(
+            self.db.rpc('activity_rollup_counts', {
+                'p_today': today_start.isoformat(),
+                'p_week': week_start.isoformat(),
+                'p_month': month_start.isoformat(),
+                'p_recent': seven_days_ago.isoformat(),
+                'p_top_since': thirty_days_ago.isoformat(),
+            }),
+            self.db.rpc('top_activity_users', {
+                'p_since': thirty_days_ago.date().isoformat(),
+                'p_limit': TOP_LIMIT,
+            }),
+        )
+        return summarize_rollups(counts.data or [], users.data or [])
+
+    def backfill(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        window_days: int = BACKFILL_WINDOW_DAYS
+    ) -> int:
+        """
+        Recompute rollups from activity_log, one window of whole days at a time
+
+        Args:
+            since: First day to rebuild (default: earliest activity)
+            until: Rebuild up to this time (default: now)
+
+        Returns:
+            Number of activity_log rows counted
+        """
+        if since is None:
+            first = self.db.table('activity_log').select('timestamp').order('timestamp').limit(1).execute()
+            if not first.data:
+                return 0
+            since = datetime.fromisoformat(first.data[0]['timestamp'].replace('Z', '+00:00'))
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        until = until or datetime.now(timezone.utc)
+        if until.tzinfo is None:
+            until = until.replace(tzinfo=timezone.utc)
+
+        start = since.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_day = until.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+        counted = 0
+        while start < end_day:
+            end = min(start + timedelta(days=window_days), end_day)
+            response = self.db.rpc('backfill_activity_rollups', {
+                'p_since': start.isoformat(),
+                'p_until': end.isoformat(),
+            }).execute()
+            counted += response.data or 0
+            logger.info(f"Backfilled activity rollups {start.date()} - {end.date()}: {counted} rows so far")
+            start = end
+        return counted
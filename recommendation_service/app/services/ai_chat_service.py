@@ -23,6 +23,10 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 import re
+import time
+
+from app.middleware.rate_limiting import RateLimiter
+from app.services.chat_response_cache import CachedAnswer, ChatResponseCache, context_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +57,15 @@ class AIProvider(str, Enum):
     GEMINI = "gemini"
     OPENAI = "openai"
     FAQ = "faq"
+    CACHE = "cache"
     NONE = "none"
 
 
+FAQ_REFRESH_SECONDS = int(os.getenv("CHAT_FAQ_REFRESH_SECONDS", "300"))
+FAQ_FALLBACK_MIN_SIMILARITY = 0.5  # Looser match once no LLM is available
+CACHEABLE_MIN_CONFIDENCE = 0.7
+
+
 @dataclass
 class ChatResponse:
     """Response from AI chat service"""
@@ -164,10 +174,14 @@ Current user context will be provided with each message."""
             self.openai_client = openai.OpenAI(api_key=self.openai_api_key)
             logger.info("OpenAI client initialized as fallback")
 
-        # Rate limiting (in-memory, consider Redis for production)
-        self.rate_limits: Dict[str, List[datetime]] = {}
+        # Rate limiting (shared across workers via Redis when configured)
         self.rate_limit_max = int(os.getenv("CHAT_RATE_LIMIT", "15"))  # Gemini free tier: 15/min
         self.rate_limit_window = 60  # seconds
+        self.rate_limiter = RateLimiter("chat", self.rate_limit_max, self.rate_limit_window)
+
+        # Answers for repeated questions and FAQs, served without an LLM call
+        self.response_cache = ChatResponseCache()
+        self._faqs_loaded_at: Optional[float] = None
 
         # Token encoder for counting
         self.encoder = None
@@ -186,24 +200,7 @@ Current user context will be provided with each message."""
 
     def check_rate_limit(self, user_id: str) -> bool:
         """Check if user is within rate limit. Returns True if allowed."""
-        now = datetime.now()
-        window_start = now - timedelta(seconds=self.rate_limit_window)
-
-        # Clean old entries
-        if user_id in self.rate_limits:
-            self.rate_limits[user_id] = [
-                t for t in self.rate_limits[user_id] if t > window_start
-            ]
-        else:
-            self.rate_limits[user_id] = []
-
-        # Check limit
-        if len(self.rate_limits[user_id]) >= self.rate_limit_max:
-            return False
-
-        # Record this request
-        self.rate_limits[user_id].append(now)
-        return True
+        return self.rate_limiter.allow(user_id)
 
     def should_escalate(self, message: str, confidence: float = 1.0) -> Tuple[bool, Optional[str]]:
         """Check if conversation should be escalated to human agent"""
@@ -438,6 +435,23 @@ Current user context will be provided with each message."""
                 should_escalate=False
             )
 
+        # Standalone questions (no earlier bot turn) can be answered from the cache
+        role = (user_context or {}).get("user_role")
+        page = (user_context or {}).get("current_page")
+        fingerprint = context_fingerprint(user_context)  # Pending items are part of the prompt
+        standalone = not any(m.get("sender") != "user" for m in conversation_history or [])
+        if standalone:
+            await self.refresh_faqs()
+            cached = self.response_cache.lookup(message, role=role, page=page, context=fingerprint)
+            if cached:
+                answer, similarity = cached
+                logger.info(f"Response served from {answer.source} cache (similarity {similarity:.2f})")
+                response = self._cached_chat_response(answer, similarity)
+                response.should_escalate, response.escalation_reason = self.should_escalate(
+                    message, response.confidence
+                )
+                return response
+
         # Build context messages
         messages = self.build_context_messages(
             message,
@@ -471,6 +485,20 @@ Current user context will be provided with each message."""
             except asyncio.TimeoutError:
                 logger.warning("OpenAI request timed out")
 
+        if response and standalone and self._is_cacheable(message, response, user_context):
+            self.response_cache.store(
+                message,
+                CachedAnswer(
+                    content=response.content,
+                    provider=response.provider.value,
+                    confidence=response.confidence,
+                    quick_actions=response.quick_actions,
+                ),
+                role=role,
+                page=page,
+                context=fingerprint,
+            )
+
         # Final fallback to FAQ matching
         if not response:
             response = await self.get_faq_response(message)
@@ -483,10 +511,54 @@ Current user context will be provided with each message."""
 
         return response
 
+    def _is_cacheable(self, message: str, response: ChatResponse, user_context: Optional[Dict[str, Any]]) -> bool:
+        """Only confident, non-personal answers to non-sensitive questions are reused"""
+        if response.confidence < CACHEABLE_MIN_CONFIDENCE:
+            return False
+        if self.should_escalate(message, response.confidence)[0]:
+            return False
+        user_name = (user_context or {}).get("user_name")
+        if user_name and user_name.lower() in response.content.lower():
+            return False
+        return True
+
+    def _cached_chat_response(self, answer: CachedAnswer, similarity: float) -> ChatResponse:
+        return ChatResponse(
+            content=answer.content,
+            provider=AIProvider.FAQ if answer.source == "faq" else AIProvider.CACHE,
+            confidence=min(answer.confidence, similarity) if answer.source == "faq" else answer.confidence,
+            tokens_used=0,
+            quick_actions=answer.quick_actions,
+            metadata=dict(answer.metadata, cache=answer.source, similarity=round(similarity, 3)),
+        )
+
+    async def refresh_faqs(self, force: bool = False):
+        """Load active `chatbot_faqs` into the response cache (at most every few minutes)"""
+        now = time.monotonic()
+        if not force and self._faqs_loaded_at is not None and now - self._faqs_loaded_at < FAQ_REFRESH_SECONDS:
+            return
+        self._faqs_loaded_at = now
+
+        try:
+            from app.database.config import get_supabase
+            result = await asyncio.to_thread(
+                lambda: get_supabase().table('chatbot_faqs')
+                .select('id, question, answer, keywords, category, quick_actions, is_active')
+                .eq('is_active', True)
+                .order('priority', desc=True)
+                .execute()
+            )
+            self.response_cache.load_faqs(result.data or [])
+        except Exception as e:
+            logger.warning(f"Could not load chatbot FAQs: {e}")
+
     async def get_faq_response(self, message: str) -> ChatResponse:
         """Get response from FAQ database (final fallback)"""
-        # This would query the chatbot_faqs table
-        # For now, return a generic fallback
+        await self.refresh_faqs()
+        matched = self.response_cache.lookup_faq(message, min_similarity=FAQ_FALLBACK_MIN_SIMILARITY)
+        if matched:
+            return self._cached_chat_response(*matched)
+
         fallback_content = """I apologize, but I'm having trouble processing your request right now.
 
 Here are some things you can try:
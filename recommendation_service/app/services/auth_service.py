@@ -12,7 +12,9 @@ from fastapi import status
 
 from app.database.config import get_supabase, get_supabase_admin
 from app.utils.security import UserRole
+from app.utils.principal_cache import invalidate_principal
 from app.utils.activity_logger import log_activity_sync, ActivityType
+from app.services.user_growth import get_user_growth_engine
 from app.utils.exceptions import (
     AuthException,
     AuthErrorCode,
@@ -216,6 +218,9 @@ class AuthService:
 
             profile_response = self.db.table('users').insert(user_profile).execute()
 
+            # The users trigger has counted the registration; reload on next read
+            get_user_growth_engine().invalidate()
+
             logger.info(f"User registered successfully: {signup_data.email} (Role: {signup_data.role})")
 
             # Log activity
@@ -613,6 +618,7 @@ class AuthService:
 
             # Update in database
             response = self.db.table('users').update(update_data).eq('id', user_id).execute()
+            invalidate_principal(user_id)
 
             if not response.data:
                 raise AuthException(
@@ -665,6 +671,7 @@ class AuthService:
                 "active_role": new_role,
                 "updated_at": datetime.utcnow().isoformat()
             }).eq('id', user_id).execute()
+            invalidate_principal(user_id)
 
             logger.info(f"User {user_id} switched to role: {new_role}")
 
@@ -728,6 +735,7 @@ class AuthService:
                 "available_roles": available_roles,
                 "updated_at": datetime.utcnow().isoformat()
             }).eq('id', user_id).execute()
+            invalidate_principal(user_id)
 
             logger.info(f"Role {new_role} added to user: {user_id}")
 
@@ -754,6 +762,7 @@ class AuthService:
                 "deleted_at": datetime.utcnow().isoformat(),
                 "updated_at": datetime.utcnow().isoformat()
             }).eq('id', user_id).execute()
+            invalidate_principal(user_id)
 
             logger.info(f"User deleted: {user_id}")
 
@@ -0,0 +1,223 @@
+"""
+Availability Engine - Free slots and conflict checks over busy intervals
+
+Busy time (meetings, counseling sessions) is loaded once per query window
+and merged into a sorted list of disjoint intervals per staff member. An
+overlap check is then a binary search (O(log n)), and listing free slots
+tests each slot of the weekly availability grid against that set, so a
+month of slots for a busy counselor costs O(slots · log meetings) instead
+of O(slots × meetings). `StaffSchedules` holds the sets for several staff
+members to answer "earliest free slot across all counselors" in one pass.
+
+All datetimes are compared as naive UTC: stored timestamps are converted,
+and availability windows (wall-clock times without a zone) are read as UTC.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from supabase import Client
+
+
+# Longest booking considered when bounding window queries by start time:
+# anything that started this long before the window may still overlap it
+MAX_BOOKING_LENGTH = timedelta(hours=24)
+
+PAGE_SIZE = 1000
+
+# Ids per `in` filter; keeps the request URL short for large staff lists
+ID_CHUNK_SIZE = 200
+
+
+def to_naive_utc(value: Union[str, datetime]) -> datetime:
+    """Parse an ISO timestamp (or take a datetime) as naive UTC"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_time_of_day(value: Union[str, time]) -> time:
+    """'HH:MM', 'HH:MM:SS' or a full ISO timestamp as a time of day"""
+    if isinstance(value, time):
+        return value
+    if 'T' in value or ' ' in value.strip():
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).time()
+    return time.fromisoformat(value)
+
+
+class BusyIntervals:
+    """Sorted, disjoint [start, end) intervals of booked time"""
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime]] = ()):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)  # Overlapping or touching: merge
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+        default_duration: int = 30,
+        exclude_id: Optional[str] = None
+    ) -> 'BusyIntervals':
+        """Intervals from booking rows with `scheduled_date` and `duration_minutes`"""
+        intervals = []
+        for row in rows:
+            if not row.get('scheduled_date') or (exclude_id is not None and row.get('id') == exclude_id):
+                continue
+            start = to_naive_utc(row['scheduled_date'])
+            intervals.append((start, start + timedelta(minutes=row.get('duration_minutes') or default_duration)))
+        return cls(intervals)
+
+    def overlaps(self, start: datetime, end: datetime, padding: timedelta = timedelta(0)) -> bool:
+        """True if [start - padding, end + padding) intersects any busy interval"""
+        i = bisect_right(self.ends, start - padding)  # First interval ending after the query starts
+        return i < len(self.starts) and self.starts[i] < end + padding
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+@dataclass
+class AvailabilityWindow:
+    """A weekly recurring availability block, cut into bookable slots"""
+    weekday: int  # 0=Monday, 6=Sunday (datetime.weekday())
+    start: time
+    end: time
+    slot_minutes: int
+    step_minutes: int  # Minutes from one slot start to the next
+
+    def slots_on(self, day: date) -> Iterator[Tuple[datetime, datetime]]:
+        length = timedelta(minutes=self.slot_minutes)
+        step = timedelta(minutes=self.step_minutes)
+        current = datetime.combine(day, self.start)
+        window_end = datetime.combine(day, self.end)
+        while current + length <= window_end:
+            yield current, current + length
+            current += step
+
+
+def iter_slots(
+    windows: Sequence[AvailabilityWindow],
+    start_date: date,
+    end_date: date
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Every slot of the availability grid from start_date to end_date (inclusive), in start order per window"""
+    by_weekday: Dict[int, List[AvailabilityWindow]] = {}
+    for window in sorted(windows, key=lambda w: w.start):
+        by_weekday.setdefault(window.weekday, []).append(window)
+
+    day = start_date
+    while day <= end_date:
+        for window in by_weekday.get(day.weekday(), ()):
+            yield from window.slots_on(day)
+        day += timedelta(days=1)
+
+
+def free_slots(
+    windows: Sequence[AvailabilityWindow],
+    busy: BusyIntervals,
+    start_date: date,
+    end_date: date,
+    not_before: Optional[datetime] = None,
+    padding: timedelta = timedelta(0)
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Slots of the availability grid that do not overlap busy time"""
+    for start, end in iter_slots(windows, start_date, end_date):
+        if not_before is not None and start <= not_before:
+            continue
+        if not busy.overlaps(start, end, padding):
+            yield start, end
+
+
+class StaffSchedules:
+    """Availability windows and busy intervals for several staff members"""
+
+    def __init__(self):
+        self.windows: Dict[str, List[AvailabilityWindow]] = {}
+        self.busy: Dict[str, BusyIntervals] = {}
+
+    def add(self, staff_id: str, windows: List[AvailabilityWindow], busy: Optional[BusyIntervals] = None):
+        self.windows[staff_id] = windows
+        self.busy[staff_id] = busy or BusyIntervals()
+
+    def free_slots(self, staff_id: str, start_date: date, end_date: date, **options) -> Iterator[Tuple[datetime, datetime]]:
+        return free_slots(self.windows.get(staff_id, []), self.busy.get(staff_id, BusyIntervals()),
+                          start_date, end_date, **options)
+
+    def first_free(
+        self,
+        start_date: date,
+        end_date: date,
+        **options
+    ) -> Optional[Tuple[str, datetime, datetime]]:
+        """
+        Earliest free slot across all staff members
+
+        Returns:
+            (staff_id, slot start, slot end), or None if nobody is free in the range
+        """
+        best = None
+        for staff_id in self.windows:
+            first = next(self.free_slots(staff_id, start_date, end_date, **options), None)
+            if first is not None and (best is None or first < best[1:]):
+                best = (staff_id, *first)
+        return best
+
+
+def load_busy_intervals(
+    db: Client,
+    table: str,
+    staff_column: str,
+    staff_ids: List[str],
+    statuses: List[str],
+    window_start: datetime,
+    window_end: datetime,
+    default_duration: int = 30,
+    exclude_id: Optional[str] = None
+) -> Dict[str, BusyIntervals]:
+    """
+    Busy intervals per staff member for bookings that may overlap a window
+
+    One paged query per ID_CHUNK_SIZE staff; bookings are bounded by start time
+    (window_start - MAX_BOOKING_LENGTH to window_end).
+    """
+    if not staff_ids:
+        return {}
+
+    rows: Dict[str, List[Dict[str, Any]]] = {staff_id: [] for staff_id in staff_ids}
+    lower = (to_naive_utc(window_start) - MAX_BOOKING_LENGTH).isoformat()
+    upper = to_naive_utc(window_end).isoformat()
+    for chunk_start in range(0, len(staff_ids), ID_CHUNK_SIZE):
+        chunk = staff_ids[chunk_start:chunk_start + ID_CHUNK_SIZE]
+        offset = 0
+        while True:
+            page = db.table(table)\
+                .select(f'id, {staff_column}, scheduled_date, duration_minutes')\
+                .in_(staff_column, chunk)\
+                .in_('status', statuses)\
+                .gte('scheduled_date', lower)\
+                .lt('scheduled_date', upper)\
+                .order('id')\
+                .range(offset, offset + PAGE_SIZE - 1)\
+                .execute().data or []
+            for row in page:
+                rows.setdefault(row[staff_column], []).append(row)
+            if len(page) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+
+    return {
+        staff_id: BusyIntervals.from_rows(staff_rows, default_duration, exclude_id)
+        for staff_id, staff_rows in rows.items()
+    }
@@ -0,0 +1,341 @@
+"""
+Catalog Snapshot - Process-wide, read-mostly view of universities and programs
+
+Recommendation requests read the catalog from memory instead of querying
+`universities` and `programs` on every call. The snapshot is refreshed in the
+background by polling `updated_at`, so only changed rows are transferred; a
+periodic full reload picks up deletions.
+"""
+from typing import List, Dict, Optional, Iterable, Tuple
+from datetime import datetime
+from threading import Lock, Thread, Event
+import logging
+import os
+import time
+
+import numpy as np
+
+from app.database.config import get_supabase
+from app.services.program_index import ProgramMatchIndex
+
+logger = logging.getLogger(__name__)
+
+
+PAGE_SIZE = 1000  # PostgREST default max rows per request
+CATALOG_POLL_SECONDS = int(os.getenv("CATALOG_POLL_SECONDS", "60"))
+CATALOG_FULL_RELOAD_SECONDS = int(os.getenv("CATALOG_FULL_RELOAD_SECONDS", str(6 * 3600)))
+
+
+def _build_index(universities: List[Dict], key: str) -> Dict[str, np.ndarray]:
+    """Map each distinct value of `key` to the row indices holding it"""
+    buckets: Dict[str, List[int]] = {}
+    for i, university in enumerate(universities):
+        value = university.get(key)
+        if value:
+            buckets.setdefault(value, []).append(i)
+    return {value: np.array(rows, dtype=np.int32) for value, rows in buckets.items()}
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the catalog at one point in time
+
+    Never mutated after construction; refreshes build a new snapshot and swap
+    it in, so readers can hold a reference without locking.
+    """
+
+    def __init__(
+        self,
+        universities: List[Dict],
+        programs: Dict[str, Dict],
+        version: int = 1,
+        universities_watermark: Optional[str] = None,
+        programs_watermark: Optional[str] = None,
+        program_index: Optional[ProgramMatchIndex] = None,
+    ):
+        self.universities = universities
+        self.programs = programs  # program id -> program row
+        self.version = version
+        self.universities_watermark = universities_watermark
+        self.programs_watermark = programs_watermark
+        self.loaded_at = datetime.utcnow()
+
+        self.index_by_id = {u["id"]: i for i, u in enumerate(universities)}
+
+        self.programs_by_university: Dict[str, List[Dict]] = {}
+        for program in programs.values():
+            univ_id = program.get("university_id")
+            if univ_id:
+                self.programs_by_university.setdefault(univ_id, []).append(program)
+
+        self.by_country = _build_index(universities, "country")
+        self.by_state = _build_index(universities, "state")
+        self.by_type = _build_index(universities, "university_type")
+
+        self._columns = None
+        self._feature_table = None
+        self._program_index = program_index
+        self._columns_lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.universities)
+
+    @property
+    def columns(self):
+        """Columnar view for vectorized scoring, built on first use"""
+        if self._columns is None:
+            with self._columns_lock:
+                if self._columns is None:
+                    from app.services.vectorized_scorer import UniversityColumns
+                    self._columns = UniversityColumns(self.universities)
+        return self._columns
+
+    @property
+    def feature_table(self):
+        """Precomputed ML university feature block, built on first use"""
+        if self._feature_table is None:
+            columns = self.columns
+            with self._columns_lock:
+                if self._feature_table is None:
+                    from app.ml.feature_engineering import UniversityFeatureTable
+                    self._feature_table = UniversityFeatureTable.from_universities(
+                        self.universities, columns=columns
+                    )
+        return self._feature_table
+
+    @property
+    def program_index(self) -> ProgramMatchIndex:
+        """Inverted index over program names and fields, built on first use"""
+        if self._program_index is None:
+            with self._columns_lock:
+                if self._program_index is None:
+                    self._program_index = ProgramMatchIndex(self.programs.values())
+        return self._program_index
+
+    def rows_for(
+        self,
+        countries: Optional[Iterable[str]] = None,
+        states: Optional[Iterable[str]] = None,
+        university_type: Optional[str] = None,
+    ) -> np.ndarray:
+        """Row indices matching all given filters (None means no filter)"""
+        rows = None
+        for index, values in (
+            (self.by_country, countries),
+            (self.by_state, states),
+            (self.by_type, [university_type] if university_type else None),
+        ):
+            if not values:
+                continue
+            matched = [index[v] for v in values if v in index]
+            selected = np.unique(np.concatenate(matched)) if matched else np.empty(0, dtype=np.int32)
+            rows = selected if rows is None else np.intersect1d(rows, selected, assume_unique=True)
+
+        if rows is None:
+            return np.arange(len(self.universities), dtype=np.int32)
+        return rows
+
+    def universities_for(
+        self,
+        countries: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """University dicts in the given countries, in catalog order"""
+        rows = self.rows_for(countries=countries)
+        if limit is not None:
+            rows = rows[:limit]
+        return self.take(rows)
+
+    def take(self, rows: np.ndarray) -> List[Dict]:
+        """University dicts for the given row indices"""
+        return [self.universities[i] for i in rows]
+
+
+class CatalogStore:
+    """
+    Owns the current CatalogSnapshot and keeps it fresh
+
+    Singleton pattern so every request in the process shares one catalog.
+    """
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._refresh_lock = Lock()
+        self._last_full_load = 0.0
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+        self._initialized = True
+
+    @property
+    def db(self):
+        return get_supabase()
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        """Current snapshot; loads synchronously only if nothing is loaded yet"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self, full: bool = False) -> CatalogSnapshot:
+        """
+        Bring the snapshot up to date
+
+        Args:
+            full: Reload both tables instead of fetching rows changed since
+                  the last watermark
+
+        Returns:
+            The snapshot in effect after the refresh
+        """
+        with self._refresh_lock:
+            current = self._snapshot
+            due_full = time.monotonic() - self._last_full_load >= CATALOG_FULL_RELOAD_SECONDS
+
+            if current is None or full or due_full:
+                self._snapshot = self._full_load(current)
+                self._last_full_load = time.monotonic()
+            else:
+                self._snapshot = self._incremental_load(current)
+
+            return self._snapshot
+
+    def _full_load(self, current: Optional[CatalogSnapshot]) -> CatalogSnapshot:
+        started = time.monotonic()
+        universities, universities_watermark = self._fetch_pages('universities')
+        programs, programs_watermark = self._fetch_pages('programs')
+
+        snapshot = CatalogSnapshot(
+            universities=universities,
+            programs={p["id"]: p for p in programs},
+            version=(current.version + 1) if current else 1,
+            universities_watermark=universities_watermark,
+            programs_watermark=programs_watermark,
+        )
+        logger.info(
+            f"Catalog loaded: {len(universities)} universities, {len(programs)} programs "
+            f"(v{snapshot.version}, {time.monotonic() - started:.1f}s)"
+        )
+        return snapshot
+
+    def _incremental_load(self, current: CatalogSnapshot) -> CatalogSnapshot:
+        changed_universities, universities_watermark = self._fetch_pages(
+            'universities', since=current.universities_watermark
+        )
+        changed_programs, programs_watermark = self._fetch_pages(
+            'programs', since=current.programs_watermark
+        )
+
+        # `gte` on the watermark re-reads rows at the boundary; skip those that did not change
+        changed_universities = [
+            u for u in changed_universities
+            if u["id"] not in current.index_by_id
+            or current.universities[current.index_by_id[u["id"]]] != u
+        ]
+        changed_programs = [
+            p for p in changed_programs if current.programs.get(p["id"]) != p
+        ]
+
+        if not changed_universities and not changed_programs:
+            return current
+
+        universities = list(current.universities)
+        for university in changed_universities:
+            index = current.index_by_id.get(university["id"])
+            if index is None:
+                universities.append(university)
+            else:
+                universities[index] = university
+
+        programs = dict(current.programs)
+        for program in changed_programs:
+            programs[program["id"]] = program
+
+        # Carry the program index forward instead of rebuilding it
+        program_index = None
+        if current._program_index is not None:
+            program_index = current._program_index.copy()
+            program_index.update(changed_programs)
+
+        snapshot = CatalogSnapshot(
+            universities=universities,
+            programs=programs,
+            version=current.version + 1,
+            universities_watermark=universities_watermark or current.universities_watermark,
+            programs_watermark=programs_watermark or current.programs_watermark,
+            program_index=program_index,
+        )
+        logger.info(
+            f"Catalog refreshed: {len(changed_universities)} universities, "
+            f"{len(changed_programs)} programs changed (v{snapshot.version})"
+        )
+        return snapshot
+
+    def _fetch_pages(self, table: str, since: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch all rows of `table` (or rows updated at/after `since`) page by page
+
+        Returns:
+            (rows, highest updated_at seen)
+        """
+        rows: List[Dict] = []
+        offset = 0
+        while True:
+            query = self.db.table(table).select('*')
+            if since:
+                query = query.gte('updated_at', since).order('updated_at')
+            query = query.order('id').range(offset, offset + PAGE_SIZE - 1)
+
+            page = query.execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+
+        watermark = max((r["updated_at"] for r in rows if r.get("updated_at")), default=since)
+        return rows, watermark
+
+    def start_background_refresh(self, interval: int = CATALOG_POLL_SECONDS):
+        """Poll for catalog changes in a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = Thread(target=self._refresh_loop, args=(interval,), daemon=True, name="catalog-refresh")
+        self._thread.start()
+        logger.info(f"Catalog background refresh started (every {interval}s)")
+
+    def stop_background_refresh(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self, interval: int):
+        while not self._stop_event.is_set():
+            try:
+                snapshot = self.refresh()
+                # Precompute derived views off the request path
+                snapshot.feature_table
+                snapshot.program_index
+            except Exception as e:
+                logger.error(f"Catalog refresh failed: {e}")
+            self._stop_event.wait(interval)
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Get the current process-wide catalog snapshot"""
+    return CatalogStore().get_snapshot()
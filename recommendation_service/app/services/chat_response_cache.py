@@ -0,0 +1,290 @@
+"""
+Chat Response Cache - Serves repeated chatbot questions without an LLM call
+
+Two layers: an exact LRU keyed on the normalized message plus the user's role,
+current page and a fingerprint of other personalizing prompt context (pending
+items), and an approximate layer that finds near-duplicate
+questions by TF-IDF cosine similarity over past answers and `chatbot_faqs`
+entries. Everything is in-process, so it works offline.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+
+CHAT_CACHE_TTL_SECONDS = int(os.getenv("CHAT_CACHE_TTL_SECONDS", str(24 * 3600)))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "5000"))
+CHAT_CACHE_MIN_SIMILARITY = float(os.getenv("CHAT_CACHE_MIN_SIMILARITY", "0.85"))
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an the is are was were be to of and or in on for with how do does did i "
+    "my me you your can could would should what where when which who it this that please".split()
+)
+
+
+def normalize_message(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(_TOKEN.findall((text or "").lower()))
+
+
+# Context fields the prompt personalizes an answer on, beyond role and page.
+# Identity fields (user_id, user_name) are left out so answers are shared
+# across users; answers that mention the user's name are never cached.
+PERSONAL_CONTEXT_FIELDS = ("pending_items",)
+
+
+def context_fingerprint(user_context: Optional[Dict[str, Any]]) -> str:
+    """Stable hash of the personalizing fields of a user context ("" when there are none)"""
+    personal = {k: (user_context or {}).get(k) for k in PERSONAL_CONTEXT_FIELDS if (user_context or {}).get(k)}
+    if not personal:
+        return ""
+    encoded = json.dumps(personal, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+@dataclass
+class CachedAnswer:
+    """An answer that can be served for a question"""
+    content: str
+    provider: str
+    confidence: float
+    quick_actions: Optional[List[Dict[str, Any]]] = None
+    source: str = "cache"  # "cache" (past LLM answer) or "faq"
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class _TfidfIndex:
+    """
+    Inverted index of term-frequency vectors scored by TF-IDF cosine
+
+    IDF is computed at query time from current document frequencies, so
+    adding and removing documents is O(terms in the document).
+    """
+
+    def __init__(self):
+        self._docs: Dict[Any, Tuple[Dict[str, int], Any]] = {}  # doc id -> (term counts, scope)
+        self._postings: Dict[str, set] = {}  # term -> doc ids
+        self._df: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id, text: str, scope=None):
+        self.remove(doc_id)
+        counts: Dict[str, int] = {}
+        for term in _terms(text):
+            counts[term] = counts.get(term, 0) + 1
+        if not counts:
+            return
+        self._docs[doc_id] = (counts, scope)
+        for term in counts:
+            self._postings.setdefault(term, set()).add(doc_id)
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def remove(self, doc_id):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for term in doc[0]:
+            self._postings[term].discard(doc_id)
+            self._df[term] -= 1
+            if not self._df[term]:
+                del self._df[term]
+                del self._postings[term]
+
+    def _weights(self, counts: Dict[str, int]) -> Dict[str, float]:
+        n = len(self._docs) + 1
+        return {
+            term: (1 + math.log(tf)) * (math.log(n / (1 + self._df.get(term, 0))) + 1)
+            for term, tf in counts.items()
+        }
+
+    def best_match(self, text: str, scopes: Iterable = (None,)) -> Tuple[Optional[Any], float]:
+        """(doc id, cosine similarity) of the closest document within the scopes"""
+        counts: Dict[str, int] = {}
+        for term in _terms(text):
+            counts[term] = counts.get(term, 0) + 1
+        if not counts:
+            return None, 0.0
+
+        allowed = set(scopes)
+        query = self._weights(counts)
+        query_norm = math.sqrt(sum(w * w for w in query.values()))
+
+        candidates = set()
+        for term in query:
+            candidates.update(self._postings.get(term, ()))
+
+        best_id, best_score = None, 0.0
+        for doc_id in candidates:
+            doc_counts, scope = self._docs[doc_id]
+            if scope not in allowed:
+                continue
+            doc = self._weights(doc_counts)
+            dot = sum(w * doc.get(term, 0.0) for term, w in query.items())
+            norm = query_norm * math.sqrt(sum(w * w for w in doc.values()))
+            score = dot / norm if norm else 0.0
+            if score > best_score:
+                best_id, best_score = doc_id, score
+        return best_id, best_score
+
+
+class ChatResponseCache:
+    """
+    Exact + approximate cache of chatbot answers
+
+    Past LLM answers are scoped to (role, page, personal context fingerprint)
+    so context-specific answers are only reused in the same context, and an
+    answer built from one user's pending items is never served to another;
+    FAQ answers apply everywhere.
+    """
+
+    def __init__(
+        self,
+        ttl: int = CHAT_CACHE_TTL_SECONDS,
+        max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+        min_similarity: float = CHAT_CACHE_MIN_SIMILARITY,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self._entries: "OrderedDict[tuple, Tuple[float, CachedAnswer]]" = OrderedDict()
+        self._index = _TfidfIndex()
+        self._faqs: Dict[Any, CachedAnswer] = {}
+        self._lock = Lock()
+        self._stats = {"exact_hits": 0, "similar_hits": 0, "faq_hits": 0, "misses": 0}
+
+    @staticmethod
+    def _scope(role: Optional[str], page: Optional[str], context: str = "") -> tuple:
+        return ("answer", role or "", page or "", context)
+
+    def lookup(
+        self,
+        message: str,
+        role: Optional[str] = None,
+        page: Optional[str] = None,
+        min_similarity: Optional[float] = None,
+        context: str = "",
+    ) -> Optional[Tuple[CachedAnswer, float]]:
+        """
+        Best cached answer for a message
+
+        Returns:
+            (answer, similarity) or None; similarity is 1.0 for exact hits
+        """
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        scope = self._scope(role, page, context)
+        key = scope + (normalize_message(message),)
+        now = time.monotonic()
+
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, answer = item
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["exact_hits"] += 1
+                    return answer, 1.0
+                self._drop(key)
+
+            doc_id, score = self._index.best_match(message, scopes=(scope, "faq"))
+            if doc_id is not None and score >= threshold:
+                if doc_id in self._faqs:
+                    self._stats["faq_hits"] += 1
+                    return self._faqs[doc_id], score
+                expires_at, answer = self._entries[doc_id]
+                if expires_at > now:
+                    self._entries.move_to_end(doc_id)
+                    self._stats["similar_hits"] += 1
+                    return answer, score
+                self._drop(doc_id)
+
+            self._stats["misses"] += 1
+            return None
+
+    def lookup_faq(self, message: str, min_similarity: Optional[float] = None) -> Optional[Tuple[CachedAnswer, float]]:
+        """Closest FAQ answer for a message, ignoring past LLM answers"""
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        with self._lock:
+            doc_id, score = self._index.best_match(message, scopes=("faq",))
+            if doc_id is not None and score >= threshold:
+                self._stats["faq_hits"] += 1
+                return self._faqs[doc_id], score
+            self._stats["misses"] += 1
+            return None
+
+    def store(
+        self,
+        message: str,
+        answer: CachedAnswer,
+        role: Optional[str] = None,
+        page: Optional[str] = None,
+        context: str = "",
+    ):
+        """Cache an LLM answer for this message and context (`context` from context_fingerprint)"""
+        scope = self._scope(role, page, context)
+        key = scope + (normalize_message(message),)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, answer)
+            self._entries.move_to_end(key)
+            self._index.add(key, message, scope=scope)
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._index.remove(oldest)
+
+    def load_faqs(self, faqs: List[Dict[str, Any]]):
+        """Replace the FAQ layer with active `chatbot_faqs` rows"""
+        with self._lock:
+            for faq_id in list(self._faqs):
+                self._index.remove(faq_id)
+            self._faqs = {}
+            for faq in faqs:
+                if not faq.get("is_active", True):
+                    continue
+                answer = CachedAnswer(
+                    content=faq["answer"],
+                    provider="faq",
+                    confidence=0.9,
+                    quick_actions=faq.get("quick_actions") or None,
+                    source="faq",
+                    metadata={"faq_id": faq["id"], "category": faq.get("category")},
+                )
+                # The question alone, and with keywords, so neither dilutes the other
+                keywords = " ".join(faq.get("keywords") or [])
+                for variant, text in enumerate((faq["question"], f"{faq['question']} {keywords}")):
+                    doc_id = ("faq", faq["id"], variant)
+                    self._index.add(doc_id, text, scope="faq")
+                    self._faqs[doc_id] = answer
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._index.remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = sum(stats.values())
+            hits = lookups - stats["misses"]
+            stats.update(
+                lookups=lookups,
+                hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+                cached_answers=len(self._entries),
+                faqs=len({answer.metadata["faq_id"] for answer in self._faqs.values()}),
+            )
+            return stats
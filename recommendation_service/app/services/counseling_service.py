@@ -3,11 +3,21 @@ Counseling Service
 Business logic for counseling sessions and bookings
 """
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 import logging
 from uuid import uuid4
 
 from app.database.config import get_supabase_admin
+from app.services.availability_engine import (
+    ID_CHUNK_SIZE,
+    PAGE_SIZE,
+    AvailabilityWindow,
+    StaffSchedules,
+    free_slots,
+    load_busy_intervals,
+    parse_time_of_day,
+    to_naive_utc,
+)
 from app.schemas.counseling import (
     CounselingSessionCreateRequest,
     CounselingSessionUpdateRequest,
@@ -31,6 +41,13 @@ from app.schemas.counseling import (
 logger = logging.getLogger(__name__)
 
 
+# Sessions that occupy the counselor's time
+BUSY_STATUSES = [SessionStatus.SCHEDULED.value, SessionStatus.IN_PROGRESS.value]
+
+# counseling_sessions.duration_minutes column default
+DEFAULT_SESSION_MINUTES = 60
+
+
 class CounselingService:
     """Service for managing counseling sessions"""
 
@@ -793,73 +810,148 @@ class CounselingService:
                 return []
 
             # Parse dates
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-
-            # Get existing sessions in the date range
-            existing_sessions = self.db.table('counseling_sessions').select(
-                'scheduled_date, duration_minutes, status'
-            ).eq('counselor_id', counselor_id).gte(
-                'scheduled_date', start_date
-            ).lte('scheduled_date', end_date).in_(
-                'status', [SessionStatus.SCHEDULED.value, SessionStatus.IN_PROGRESS.value]
-            ).execute()
-
-            booked_slots = set()
-            if existing_sessions.data:
-                for session in existing_sessions.data:
-                    if session.get('scheduled_date'):
-                        booked_slots.add(session['scheduled_date'][:16])  # Compare by minute
+            start = to_naive_utc(start_date)
+            end = to_naive_utc(end_date)
+
+            # Sessions that can overlap the requested days, as one sorted interval set
+            busy = load_busy_intervals(
+                self.db, 'counseling_sessions', 'counselor_id', [counselor_id], BUSY_STATUSES,
+                datetime.combine(start.date(), time.min),
+                datetime.combine(end.date() + timedelta(days=1), time.min),
+                default_duration=DEFAULT_SESSION_MINUTES
+            )[counselor_id]
+
+            # Future slots only
+            return [
+                self._slot_response(counselor_id, slot_start, slot_end)
+                for slot_start, slot_end in free_slots(
+                    self._availability_windows(availability), busy,
+                    start.date(), end.date(), not_before=datetime.utcnow()
+                )
+            ]
 
-            # Generate available slots
-            available_slots = []
-            current_date = start.date()
-            end_date_obj = end.date()
+        except Exception as e:
+            logger.error(f"Get available slots error: {e}")
+            return []
 
-            while current_date <= end_date_obj:
-                day_of_week = current_date.weekday()  # 0=Monday, 6=Sunday
+    async def find_first_available_counselor(
+        self,
+        start_date: str,
+        end_date: str,
+        counselor_ids: Optional[List[str]] = None,
+        institution_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Earliest open slot across counselors within date range
+
+        Candidates default to the counselors of `institution_id`, or every
+        counselor when it is None. Their availability and sessions are loaded
+        with paged queries over chunks of ids and answered from per-counselor
+        interval sets.
+
+        Returns:
+            Slot dict (start, end, duration_minutes, counselor_id) or None
+        """
+        try:
+            if counselor_ids is None:
+                counselor_ids = self._counselor_ids(institution_id)
 
-                # Find availability for this day
-                day_availability = [a for a in availability if a.day_of_week == day_of_week]
+            if not counselor_ids:
+                return None
 
-                for avail in day_availability:
-                    # Parse start and end times
-                    start_time_parts = avail.start_time.split(':')
-                    end_time_parts = avail.end_time.split(':')
+            start = to_naive_utc(start_date)
+            end = to_naive_utc(end_date)
 
-                    slot_start = datetime.combine(
-                        current_date,
-                        datetime.strptime(avail.start_time, '%H:%M').time()
-                    )
-                    slot_end = datetime.combine(
-                        current_date,
-                        datetime.strptime(avail.end_time, '%H:%M').time()
-                    )
+            availability_by_counselor = self._active_availability(counselor_ids)
 
-                    duration = avail.session_duration or 30
+            if not availability_by_counselor:
+                return None
 
-                    # Generate slots
-                    while slot_start + timedelta(minutes=duration) <= slot_end:
-                        slot_key = slot_start.isoformat()[:16]
+            busy = load_busy_intervals(
+                self.db, 'counseling_sessions', 'counselor_id', list(availability_by_counselor), BUSY_STATUSES,
+                datetime.combine(start.date(), time.min),
+                datetime.combine(end.date() + timedelta(days=1), time.min),
+                default_duration=DEFAULT_SESSION_MINUTES
+            )
 
-                        # Check if not booked and not in the past
-                        if slot_key not in booked_slots and slot_start > datetime.now():
-                            available_slots.append({
-                                "start": slot_start.isoformat(),
-                                "end": (slot_start + timedelta(minutes=duration)).isoformat(),
-                                "duration_minutes": duration,
-                                "counselor_id": counselor_id
-                            })
+            schedules = StaffSchedules()
+            for counselor_id, availability in availability_by_counselor.items():
+                schedules.add(counselor_id, self._availability_windows(availability), busy.get(counselor_id))
 
-                        slot_start += timedelta(minutes=duration)
+            first = schedules.first_free(start.date(), end.date(), not_before=datetime.utcnow())
+            if first is None:
+                return None
 
-                current_date += timedelta(days=1)
+            return self._slot_response(*first)
 
-            return available_slots
+        except Exception as e:
+            logger.error(f"Find first available counselor error: {e}")
+            raise Exception(f"Failed to find an available counselor: {str(e)}")
 
+    def user_institution_id(self, user_id: str) -> Optional[str]:
+        """The user's institution, or None if unset or unreadable"""
+        try:
+            response = self.db.table('users').select('institution_id').eq('id', user_id).limit(1).execute()
         except Exception as e:
-            logger.error(f"Get available slots error: {e}")
-            return []
+            logger.warning(f"Could not read institution of user {user_id}: {e}")
+            return None
+        return response.data[0].get('institution_id') if response.data else None
+
+    def _counselor_ids(self, institution_id: Optional[str] = None) -> List[str]:
+        """Ids of every user who can act as a counselor (in an institution, if given), read page by page"""
+        counselor_ids: List[str] = []
+        offset = 0
+        while True:
+            query = self.db.table('users').select('id').or_(
+                'active_role.eq.counselor,available_roles.cs.{counselor}'
+            )
+            if institution_id is not None:
+                query = query.eq('institution_id', institution_id)
+            page = query.order('id').range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            counselor_ids.extend(user['id'] for user in page)
+            if len(page) < PAGE_SIZE:
+                return counselor_ids
+            offset += PAGE_SIZE
+
+    def _active_availability(self, counselor_ids: List[str]) -> Dict[str, List[CounselorAvailabilityResponse]]:
+        """Active availability per counselor, one paged query per ID_CHUNK_SIZE counselors"""
+        availability_by_counselor: Dict[str, List[CounselorAvailabilityResponse]] = {}
+        for chunk_start in range(0, len(counselor_ids), ID_CHUNK_SIZE):
+            chunk = counselor_ids[chunk_start:chunk_start + ID_CHUNK_SIZE]
+            offset = 0
+            while True:
+                page = self.db.table('counselor_availability').select('*').in_(
+                    'counselor_id', chunk
+                ).eq('is_active', True).order('id').range(offset, offset + PAGE_SIZE - 1).execute().data or []
+                for row in page:
+                    availability_by_counselor.setdefault(row['counselor_id'], []).append(
+                        CounselorAvailabilityResponse(**row)
+                    )
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+        return availability_by_counselor
+
+    def _availability_windows(self, availability: List[CounselorAvailabilityResponse]) -> List[AvailabilityWindow]:
+        """Weekly windows cut into back-to-back slots of the counselor's session length"""
+        return [
+            AvailabilityWindow(
+                weekday=avail.day_of_week,  # 0=Monday, 6=Sunday
+                start=parse_time_of_day(avail.start_time),
+                end=parse_time_of_day(avail.end_time),
+                slot_minutes=avail.session_duration or 30,
+                step_minutes=avail.session_duration or 30
+            )
+            for avail in availability
+        ]
+
+    def _slot_response(self, counselor_id: str, slot_start: datetime, slot_end: datetime) -> Dict[str, Any]:
+        return {
+            "start": slot_start.isoformat(),
+            "end": slot_end.isoformat(),
+            "duration_minutes": int((slot_end - slot_start).total_seconds() // 60),
+            "counselor_id": counselor_id
+        }
 
     async def book_session_as_student(
         self,
@@ -881,19 +973,17 @@ class CounselingService:
                 raise Exception("Counselor not found")
 
             # Check if slot is available
-            start_dt = datetime.fromisoformat(scheduled_start.replace('Z', '+00:00'))
+            start_dt = to_naive_utc(scheduled_start)
             end_dt = start_dt + timedelta(minutes=30)  # Default 30 min sessions
 
-            conflicts = self.db.table('counseling_sessions').select('id').eq(
-                'counselor_id', counselor_id
-            ).eq('scheduled_date', scheduled_start[:10]).in_(
-                'status', [SessionStatus.SCHEDULED.value, SessionStatus.IN_PROGRESS.value]
-            ).execute()
+            # Check for time overlap with the counselor's sessions around this time
+            busy = load_busy_intervals(
+                self.db, 'counseling_sessions', 'counselor_id', [counselor_id], BUSY_STATUSES,
+                start_dt, end_dt, default_duration=DEFAULT_SESSION_MINUTES
+            )[counselor_id]
 
-            # Check for time overlap
-            if conflicts.data:
-                for conflict in conflicts.data:
-                    raise Exception("This time slot is no longer available")
+            if busy.overlaps(start_dt, end_dt):
+                raise Exception("This time slot is no longer available")
 
             # Create session
             session = {
@@ -5,8 +5,11 @@ Feedback Analytics Service - Track and analyze chatbot feedback
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from uuid import UUID
+import asyncio
 import logging
 
+from app.database.async_db import execute
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,13 +49,13 @@ class FeedbackAnalyticsService:
 
         try:
             # Query all bot messages in date range
-            result = self.supabase.table('chatbot_messages').select(
+            result = await execute(self.supabase.table('chatbot_messages').select(
                 'id, feedback'
             ).eq('sender', 'bot').gte(
                 'created_at', start_date.isoformat()
             ).lte(
                 'created_at', end_date.isoformat()
-            ).execute()
+            ))
 
             messages = result.data if result.data else []
 
@@ -111,11 +114,11 @@ class FeedbackAnalyticsService:
         start_date = datetime.utcnow() - timedelta(days=days)
 
         try:
-            result = self.supabase.table('chatbot_messages').select(
+            result = await execute(self.supabase.table('chatbot_messages').select(
                 'id, feedback, created_at'
             ).eq('sender', 'bot').gte(
                 'created_at', start_date.isoformat()
-            ).execute()
+            ))
 
             messages = result.data if result.data else []
 
@@ -162,11 +165,11 @@ class FeedbackAnalyticsService:
             List of poorly performing message patterns
         """
         try:
-            result = self.supabase.table('chatbot_messages').select(
+            result = await execute(self.supabase.table('chatbot_messages').select(
                 'id, content, ai_provider, created_at, feedback_comment, conversation_id'
             ).eq('sender', 'bot').eq(
                 'feedback', 'not_helpful'
-            ).order('created_at', desc=True).limit(limit).execute()
+            ).order('created_at', desc=True).limit(limit))
 
             messages = result.data if result.data else []
 
@@ -195,9 +198,9 @@ class FeedbackAnalyticsService:
             Dict with stats per provider
         """
         try:
-            result = self.supabase.table('chatbot_messages').select(
+            result = await execute(self.supabase.table('chatbot_messages').select(
                 'ai_provider, feedback'
-            ).eq('sender', 'bot').execute()
+            ).eq('sender', 'bot'))
 
             messages = result.data if result.data else []
 
@@ -241,9 +244,9 @@ class FeedbackAnalyticsService:
         """
         try:
             # Get conversations with topics
-            conv_result = self.supabase.table('chatbot_conversations').select(
+            conv_result = await execute(self.supabase.table('chatbot_conversations').select(
                 'id, topics'
-            ).not_.is_('topics', 'null').execute()
+            ).not_.is_('topics', 'null'))
 
             conversations = conv_result.data if conv_result.data else []
             conv_topics = {c['id']: c['topics'] for c in conversations}
@@ -252,11 +255,11 @@ class FeedbackAnalyticsService:
                 return []
 
             # Get messages for these conversations
-            msg_result = self.supabase.table('chatbot_messages').select(
+            msg_result = await execute(self.supabase.table('chatbot_messages').select(
                 'conversation_id, feedback'
             ).eq('sender', 'bot').in_(
                 'conversation_id', list(conv_topics.keys())
-            ).execute()
+            ))
 
             messages = msg_result.data if msg_result.data else []
 
@@ -389,20 +392,28 @@ class FeedbackAnalyticsService:
         if end_date is None:
             end_date = datetime.utcnow()
 
+        # Sections are independent queries; fetch them concurrently
+        summary, daily_trends, by_provider, by_topic, poor_responses, suggestions = await asyncio.gather(
+            self.get_feedback_stats(start_date, end_date),
+            self.get_daily_feedback_trends(days=(end_date - start_date).days),
+            self.get_feedback_by_ai_provider(),
+            self.get_feedback_by_topic(),
+            self.get_poorly_performing_responses(limit=10),
+            self.generate_improvement_suggestions()
+        )
+
         report = {
             "generated_at": datetime.utcnow().isoformat(),
             "period": {
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat()
             },
-            "summary": await self.get_feedback_stats(start_date, end_date),
-            "daily_trends": await self.get_daily_feedback_trends(
-                days=(end_date - start_date).days
-            ),
-            "by_provider": await self.get_feedback_by_ai_provider(),
-            "by_topic": await self.get_feedback_by_topic(),
-            "poor_responses": await self.get_poorly_performing_responses(limit=10),
-            "suggestions": await self.generate_improvement_suggestions()
+            "summary": summary,
+            "daily_trends": daily_trends,
+            "by_provider": by_provider,
+            "by_topic": by_topic,
+            "poor_responses": poor_responses,
+            "suggestions": suggestions
         }
 
         return report
@@ -22,11 +22,27 @@ from app.schemas.meeting import (
     StaffListItem,
     MeetingStatistics
 )
+from app.services.availability_engine import (
+    AvailabilityWindow,
+    free_slots,
+    load_busy_intervals,
+    parse_time_of_day,
+    to_naive_utc,
+)
 from app.utils.activity_logger import log_activity, ActivityType
 
 logger = logging.getLogger(__name__)
 
 
+# Meetings that occupy the staff member's time
+BUSY_STATUSES = ['pending', 'approved']
+
+# Minutes kept free between meetings
+BUFFER_MINUTES = 15
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
 class MeetingService:
     """
     Service for managing parent-teacher/counselor meetings
@@ -574,56 +590,38 @@ class MeetingService:
             if not availability_response.data:
                 return []
 
-            # Get existing meetings in the date range
-            existing_meetings = self.db.table('meetings').select('scheduled_date, duration_minutes').eq(
-                'staff_id', request_data.staff_id
-            ).in_('status', ['pending', 'approved']).gte(
-                'scheduled_date', request_data.start_date.isoformat()
-            ).lte(
-                'scheduled_date', request_data.end_date.isoformat()
-            ).execute()
-
-            # Generate available slots
-            available_slots = []
-            current_date = request_data.start_date.date()
-            end_date = request_data.end_date.date()
-
-            while current_date <= end_date:
-                day_of_week = (current_date.weekday() + 1) % 7  # Convert to 0=Sunday
-
-                # Find availability for this day
-                day_availability = [
-                    a for a in availability_response.data
-                    if a['day_of_week'] == day_of_week
-                ]
-
-                for avail in day_availability:
-                    # Parse times
-                    start_time = datetime.fromisoformat(avail['start_time']).time()
-                    end_time = datetime.fromisoformat(avail['end_time']).time()
-
-                    # Generate slots for this availability window
-                    slots = self._generate_time_slots(
-                        current_date,
-                        start_time,
-                        end_time,
-                        request_data.duration_minutes
-                    )
-
-                    # Filter out booked slots
-                    for slot in slots:
-                        if not self._is_slot_booked(slot['start_time'], slot['end_time'], existing_meetings.data):
-                            available_slots.append(AvailableSlot(
-                                date=slot['start_time'],
-                                start_time=slot['start_time'],
-                                end_time=slot['end_time'],
-                                day_of_week=day_of_week,
-                                day_name=slot['day_name']
-                            ))
-
-                current_date += timedelta(days=1)
-
-            return available_slots
+            # Meetings that can reach the requested days (buffer included), as one sorted interval set
+            first_day = request_data.start_date.date()
+            last_day = request_data.end_date.date()
+            buffer_time = timedelta(minutes=BUFFER_MINUTES)
+            busy = load_busy_intervals(
+                self.db, 'meetings', 'staff_id', [request_data.staff_id], BUSY_STATUSES,
+                datetime.combine(first_day, time.min) - buffer_time,
+                datetime.combine(last_day + timedelta(days=1), time.min) + buffer_time
+            )[request_data.staff_id]
+
+            # Slots start every duration + buffer minutes within each availability window
+            windows = [
+                AvailabilityWindow(
+                    weekday=(avail['day_of_week'] + 6) % 7,  # Stored with 0=Sunday
+                    start=parse_time_of_day(avail['start_time']),
+                    end=parse_time_of_day(avail['end_time']),
+                    slot_minutes=request_data.duration_minutes,
+                    step_minutes=request_data.duration_minutes + BUFFER_MINUTES
+                )
+                for avail in availability_response.data
+            ]
+
+            return [
+                AvailableSlot(
+                    date=start,
+                    start_time=start,
+                    end_time=end,
+                    day_of_week=(start.weekday() + 1) % 7,  # Convert to 0=Sunday
+                    day_name=DAY_NAMES[start.weekday()]
+                )
+                for start, end in free_slots(windows, busy, first_day, last_day, padding=buffer_time)
+            ]
 
         except Exception as e:
             logger.error(f"Error getting available slots: {e}")
@@ -782,87 +780,21 @@ class MeetingService:
         duration_minutes: int,
         exclude_meeting_id: Optional[str] = None
     ) -> bool:
-        """Check if there's a scheduling conflict"""
+        """Check if there's a scheduling conflict (including the buffer between meetings)"""
         try:
-            end_time = scheduled_date + timedelta(minutes=duration_minutes)
-            buffer_time = timedelta(minutes=15)  # 15-minute buffer
-
-            # Get meetings around this time
-            query = self.db.table('meetings').select('id, scheduled_date, duration_minutes').eq(
-                'staff_id', staff_id
-            ).in_('status', ['pending', 'approved'])
-
-            if exclude_meeting_id:
-                query = query.neq('id', exclude_meeting_id)
-
-            response = query.execute()
-
-            if not response.data:
-                return False
-
-            # Check for overlaps
-            for meeting in response.data:
-                if not meeting['scheduled_date']:
-                    continue
-
-                meeting_start = datetime.fromisoformat(meeting['scheduled_date'])
-                meeting_end = meeting_start + timedelta(minutes=meeting['duration_minutes'])
+            start = to_naive_utc(scheduled_date)
+            end = start + timedelta(minutes=duration_minutes)
+            buffer_time = timedelta(minutes=BUFFER_MINUTES)
 
-                # Check overlap with buffer
-                if (scheduled_date - buffer_time < meeting_end and
-                    end_time + buffer_time > meeting_start):
-                    return True
+            # Only meetings that can reach this time, as a sorted interval set
+            busy = load_busy_intervals(
+                self.db, 'meetings', 'staff_id', [staff_id], BUSY_STATUSES,
+                start - buffer_time, end + buffer_time,
+                exclude_id=exclude_meeting_id
+            )[staff_id]
 
-            return False
+            return busy.overlaps(start, end, padding=buffer_time)
 
         except Exception as e:
             logger.error(f"Error checking scheduling conflict: {e}")
             return True  # Assume conflict on error to be safe
-
-    def _generate_time_slots(
-        self,
-        date: datetime.date,
-        start_time: time,
-        end_time: time,
-        duration_minutes: int
-    ) -> List[Dict[str, Any]]:
-        """Generate time slots for a given day and time range"""
-        slots = []
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-
-        current_datetime = datetime.combine(date, start_time)
-        end_datetime = datetime.combine(date, end_time)
-
-        while current_datetime + timedelta(minutes=duration_minutes) <= end_datetime:
-            slot_end = current_datetime + timedelta(minutes=duration_minutes)
-
-            slots.append({
-                'start_time': current_datetime,
-                'end_time': slot_end,
-                'day_name': day_names[date.weekday()]
-            })
-
-            # Move to next slot (add small buffer)
-            current_datetime = slot_end + timedelta(minutes=15)
-
-        return slots
-
-    def _is_slot_booked(
-        self,
-        start_time: datetime,
-        end_time: datetime,
-        existing_meetings: List[Dict[str, Any]]
-    ) -> bool:
-        """Check if a time slot is already booked"""
-        for meeting in existing_meetings:
-            if not meeting.get('scheduled_date'):
-                continue
-
-            meeting_start = datetime.fromisoformat(meeting['scheduled_date'])
-            meeting_end = meeting_start + timedelta(minutes=meeting.get('duration_minutes', 30))
-
-            # Check for overlap
-            if start_time < meeting_end and end_time > meeting_start:
-                return True
-
-        return False
@@ -8,6 +8,8 @@ import logging
 from uuid import uuid4
 
 from app.database.config import get_supabase
+from app.database.async_db import execute, run_blocking
+from app.services.unread_counters import UnreadCounters
 from app.schemas.messaging import (
     ConversationCreateRequest,
     ConversationResponse,
@@ -30,6 +32,7 @@ class MessagingService:
 
     def __init__(self):
         self.db = get_supabase()
+        self.unread_counters = UnreadCounters(self.db)
 
     async def create_conversation(
         self,
@@ -57,9 +60,9 @@ class MessagingService:
                 logger.info("Checking for existing direct conversation...")
                 try:
                     # Use a simpler query - just get all direct conversations and filter
-                    all_convos = self.db.table('conversations').select('*').eq(
+                    all_convos = await execute(self.db.table('conversations').select('*').eq(
                         'conversation_type', 'direct'
-                    ).execute()
+                    ))
 
                     logger.info(f"Found {len(all_convos.data) if all_convos.data else 0} direct conversations")
 
@@ -73,11 +76,11 @@ class MessagingService:
                                 other_user_id = [pid for pid in conv_participants if pid != user_id][0] if len(conv_participants) > 1 else None
                                 if other_user_id:
                                     try:
-                                        user_result = self.db.table('users').select('display_name, email').eq('id', other_user_id).single().execute()
+                                        user_result = await execute(self.db.table('users').select('display_name, email').eq('id', other_user_id).single())
                                         if user_result.data:
                                             conv['title'] = user_result.data.get('display_name') or user_result.data.get('email', 'Unknown User')
                                             # Also update in database for future
-                                            self.db.table('conversations').update({'title': conv['title']}).eq('id', conv['id']).execute()
+                                            await execute(self.db.table('conversations').update({'title': conv['title']}).eq('id', conv['id']))
                                     except Exception as e:
                                         logger.warning(f"Could not fetch other user's name: {e}")
                             return ConversationResponse(**conv)
@@ -92,7 +95,7 @@ class MessagingService:
                 other_user_id = [pid for pid in participant_ids if pid != user_id][0] if len(participant_ids) > 1 else None
                 if other_user_id:
                     try:
-                        user_result = self.db.table('users').select('display_name, email').eq('id', other_user_id).single().execute()
+                        user_result = await execute(self.db.table('users').select('display_name, email').eq('id', other_user_id).single())
                         if user_result.data:
                             title = user_result.data.get('display_name') or user_result.data.get('email', 'Unknown User')
                             logger.info(f"Set conversation title to: {title}")
@@ -114,7 +117,7 @@ class MessagingService:
             logger.info(f"Inserting conversation: {conversation}")
 
             try:
-                response = self.db.table('conversations').insert(conversation).execute()
+                response = await execute(self.db.table('conversations').insert(conversation))
                 logger.info(f"Insert response: {response}")
             except Exception as insert_error:
                 logger.error(f"Supabase insert error: {insert_error}", exc_info=True)
@@ -145,7 +148,7 @@ class MessagingService:
     ) -> ConversationResponse:
         """Get conversation by ID"""
         try:
-            response = self.db.table('conversations').select('*').eq('id', conversation_id).single().execute()
+            response = await execute(self.db.table('conversations').select('*').eq('id', conversation_id).single())
 
             if not response.data:
                 raise Exception("Conversation not found")
@@ -161,11 +164,11 @@ class MessagingService:
                 other_user_id = [pid for pid in participant_ids if pid != user_id][0] if len(participant_ids) > 1 else None
                 if other_user_id:
                     try:
-                        user_result = self.db.table('users').select('display_name, email').eq('id', other_user_id).single().execute()
+                        user_result = await execute(self.db.table('users').select('display_name, email').eq('id', other_user_id).single())
                         if user_result.data:
                             conv['title'] = user_result.data.get('display_name') or user_result.data.get('email', 'Unknown User')
                             # Update in database for future
-                            self.db.table('conversations').update({'title': conv['title']}).eq('id', conv['id']).execute()
+                            await execute(self.db.table('conversations').update({'title': conv['title']}).eq('id', conv['id']))
                     except Exception as e:
                         logger.warning(f"Could not fetch other user's name: {e}")
                         conv['title'] = 'Chat'
@@ -189,7 +192,7 @@ class MessagingService:
             offset = (page - 1) * page_size
             query = query.order('updated_at', desc=True).range(offset, offset + page_size - 1)
 
-            response = query.execute()
+            response = await execute(query)
 
             # Enrich conversations with titles from other participants
             enriched_data = []
@@ -200,16 +203,25 @@ class MessagingService:
                     other_user_id = [pid for pid in participant_ids if pid != user_id][0] if len(participant_ids) > 1 else None
                     if other_user_id:
                         try:
-                            user_result = self.db.table('users').select('display_name, email').eq('id', other_user_id).single().execute()
+                            user_result = await execute(self.db.table('users').select('display_name, email').eq('id', other_user_id).single())
                             if user_result.data:
                                 conv['title'] = user_result.data.get('display_name') or user_result.data.get('email', 'Unknown User')
                                 # Update in database for future
-                                self.db.table('conversations').update({'title': conv['title']}).eq('id', conv['id']).execute()
+                                await execute(self.db.table('conversations').update({'title': conv['title']}).eq('id', conv['id']))
                         except Exception as e:
                             logger.warning(f"Could not fetch other user's name for conv {conv.get('id')}: {e}")
                             conv['title'] = 'Chat'
                 enriched_data.append(conv)
 
+            # Per-conversation badges in one query
+            if enriched_data:
+                try:
+                    unread = await run_blocking(self.unread_counters.get_counts, user_id)
+                    for conv in enriched_data:
+                        conv['unread_count'] = unread.get(conv['id'], 0)
+                except Exception as e:
+                    logger.warning(f"Could not load unread counts for user {user_id}: {e}")
+
             conversations = [ConversationResponse(**c) for c in enriched_data]
             total = response.count or 0
 
@@ -253,17 +265,19 @@ class MessagingService:
                 "updated_at": datetime.utcnow().isoformat(),
             }
 
-            response = self.db.table('messages').insert(message).execute()
+            response = await execute(self.db.table('messages').insert(message))
 
             if not response.data:
                 raise Exception("Failed to send message")
 
             # Update conversation's last_message_at and last_message_preview
-            self.db.table('conversations').update({
+            await execute(self.db.table('conversations').update({
                 "last_message_at": message["timestamp"],
                 "last_message_preview": message_data.content[:100],  # First 100 chars
                 "updated_at": datetime.utcnow().isoformat()
-            }).eq('id', message_data.conversation_id).execute()
+            }).eq('id', message_data.conversation_id))
+
+            await run_blocking(self.unread_counters.message_sent, message_data.conversation_id, sender_id)
 
             logger.info(f"Message sent: {response.data[0]['id']}")
 
@@ -283,7 +297,7 @@ class MessagingService:
         """Edit a message (only sender can edit)"""
         try:
             # Get message and verify ownership
-            message = self.db.table('messages').select('*').eq('id', message_id).single().execute()
+            message = await execute(self.db.table('messages').select('*').eq('id', message_id).single())
 
             if not message.data:
                 raise Exception("Message not found")
@@ -300,7 +314,7 @@ class MessagingService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.db.table('messages').update(update).eq('id', message_id).execute()
+            response = await execute(self.db.table('messages').update(update).eq('id', message_id))
 
             if not response.data:
                 raise Exception("Failed to update message")
@@ -321,7 +335,7 @@ class MessagingService:
         """Delete a message (soft delete, only sender can delete)"""
         try:
             # Get message and verify ownership
-            message = self.db.table('messages').select('*').eq('id', message_id).single().execute()
+            message = await execute(self.db.table('messages').select('*').eq('id', message_id).single())
 
             if not message.data:
                 raise Exception("Message not found")
@@ -329,17 +343,31 @@ class MessagingService:
             if message.data['sender_id'] != user_id:
                 raise Exception("Not authorized to delete this message")
 
+            # Participants who hadn't read it stop counting it as unread
+            unread_user_ids = []
+            if not message.data.get('is_deleted'):
+                conversation = await execute(self.db.table('conversations').select('participant_ids').eq(
+                    'id', message.data['conversation_id']
+                ).single())
+                read_by = set(message.data.get('read_by') or [])
+                unread_user_ids = [
+                    pid for pid in (conversation.data or {}).get('participant_ids', [])
+                    if pid != user_id and pid not in read_by
+                ]
+
             update = {
                 "is_deleted": True,
                 "content": "[Message deleted]",
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.db.table('messages').update(update).eq('id', message_id).execute()
+            response = await execute(self.db.table('messages').update(update).eq('id', message_id))
 
             if not response.data:
                 raise Exception("Failed to delete message")
 
+            await run_blocking(self.unread_counters.message_deleted, message.data['conversation_id'], unread_user_ids)
+
             logger.info(f"Message deleted: {message_id}")
 
             return MessageResponse(**response.data[0])
@@ -356,34 +384,51 @@ class MessagingService:
         """Mark multiple messages as read"""
         try:
             updated_count = 0
-
-            for message_id in read_receipt_data.message_ids:
-                # Get message
-                message = self.db.table('messages').select('*').eq('id', message_id).single().execute()
-
-                if not message.data:
-                    continue
-
+            message_ids = list(dict.fromkeys(read_receipt_data.message_ids))
+            if not message_ids:
+                return {"success": True, "marked_count": 0}
+
+            # Load the messages and their conversations in two queries
+            messages = (await execute(self.db.table('messages').select(
+                'id, conversation_id, sender_id, read_by, is_deleted'
+            ).in_('id', message_ids))).data or []
+
+            conversation_ids = list({m['conversation_id'] for m in messages})
+            conversations = (await execute(self.db.table('conversations').select('id, participant_ids').in_(
+                'id', conversation_ids
+            ))).data if conversation_ids else []
+            allowed = {c['id'] for c in (conversations or []) if user_id in (c.get('participant_ids') or [])}
+
+            newly_read: Dict[str, int] = {}
+            for message in messages:
                 # Check if user is participant in conversation
-                conversation_id = message.data['conversation_id']
-                conversation = self.db.table('conversations').select('participant_ids').eq('id', conversation_id).single().execute()
-
-                if not conversation.data or user_id not in conversation.data.get('participant_ids', []):
+                conversation_id = message['conversation_id']
+                if conversation_id not in allowed:
                     continue
 
                 # Add user to read_by list if not already there
-                read_by = message.data.get('read_by', [])
-                if user_id not in read_by:
-                    read_by.append(user_id)
+                read_by = message.get('read_by') or []
+                if user_id in read_by:
+                    continue
 
-                    update = {
-                        "read_by": read_by,
-                        "read_at": datetime.utcnow().isoformat(),
-                        "updated_at": datetime.utcnow().isoformat()
-                    }
+                update = {
+                    "read_by": read_by + [user_id],
+                    "read_at": datetime.utcnow().isoformat(),
+                    "updated_at": datetime.utcnow().isoformat()
+                }
+
+                # Skip if a concurrent request already marked it, so it isn't counted twice
+                response = await execute(self.db.table('messages').update(update).eq('id', message['id']).not_.contains(
+                    'read_by', [user_id]
+                ))
+                if not response.data:
+                    continue
+                updated_count += 1
 
-                    self.db.table('messages').update(update).eq('id', message_id).execute()
-                    updated_count += 1
+                if message['sender_id'] != user_id and not message.get('is_deleted'):
+                    newly_read[conversation_id] = newly_read.get(conversation_id, 0) + 1
+
+            await run_blocking(self.unread_counters.messages_read, user_id, newly_read)
 
             logger.info(f"Marked {updated_count} messages as read for user {user_id}")
 
@@ -413,7 +458,7 @@ class MessagingService:
             offset = (page - 1) * page_size
             query = query.order('timestamp', desc=True).range(offset, offset + page_size - 1)
 
-            response = query.execute()
+            response = await execute(query)
 
             messages = [MessageResponse(**m) for m in response.data] if response.data else []
             total = response.count or 0
@@ -463,35 +508,10 @@ class MessagingService:
     async def get_unread_count(self, user_id: str) -> Dict[str, int]:
         """Get unread message count for user across all conversations"""
         try:
-            # Get all conversations user is part of
-            conversations = await self.list_user_conversations(user_id, page=1, page_size=1000)
-
-            total_unread = 0
-            unread_by_conversation = {}
-
-            for conversation in conversations.conversations:
-                # Count messages not read by this user
-                messages = self.db.table('messages').select('*').eq(
-                    'conversation_id', conversation.id
-                ).eq('is_deleted', False).execute()
-
-                unread = 0
-                for message in messages.data:
-                    # Skip messages sent by the user
-                    if message['sender_id'] == user_id:
-                        continue
-
-                    # Check if user has read this message
-                    read_by = message.get('read_by', [])
-                    if user_id not in read_by:
-                        unread += 1
-
-                if unread > 0:
-                    unread_by_conversation[conversation.id] = unread
-                    total_unread += unread
+            unread_by_conversation = await run_blocking(self.unread_counters.get_counts, user_id)
 
             return {
-                "total_unread": total_unread,
+                "total_unread": sum(unread_by_conversation.values()),
                 "by_conversation": unread_by_conversation
             }
 
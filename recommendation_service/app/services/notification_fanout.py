@@ -0,0 +1,257 @@
+"""
+Notification Fan-out - Deliver one notification to many users
+
+Target users are streamed from the users table in id-ordered pages
+(optionally filtered by role), each page is checked against notification
+preferences with a few chunked queries, and the notifications are written with
+multi-row inserts, a few batches in flight at a time. Pages are delivered
+in order, so the last user id of a finished page is a safe resume cursor.
+
+Notification ids can be derived from a job id (see `delivery_namespace`):
+a resumed job then re-inserts the interrupted page without creating
+duplicates.
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4, uuid5
+import asyncio
+import logging
+import os
+
+from supabase import Client
+
+from app.database.async_db import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+NOTIFICATION_FANOUT_PAGE_SIZE = int(os.getenv("NOTIFICATION_FANOUT_PAGE_SIZE", "1000"))
+NOTIFICATION_INSERT_BATCH_SIZE = int(os.getenv("NOTIFICATION_INSERT_BATCH_SIZE", "500"))
+NOTIFICATION_FANOUT_CONCURRENCY = int(os.getenv("NOTIFICATION_FANOUT_CONCURRENCY", "4"))
+# User ids per preferences `in` filter; keeps the request URL short
+NOTIFICATION_PREFERENCES_CHUNK_SIZE = int(os.getenv("NOTIFICATION_PREFERENCES_CHUNK_SIZE", "200"))
+
+# Notification fields carried by a fan-out (BulkNotificationCreateRequest minus user_ids)
+PAYLOAD_FIELDS = (
+    'notification_type', 'title', 'message', 'priority', 'channels',
+    'action_url', 'action_text', 'image_url', 'metadata', 'scheduled_for', 'expires_at',
+)
+
+
+def payload_from_request(request) -> Dict[str, Any]:
+    """JSON-serializable notification payload from a bulk/broadcast request"""
+    data = request.model_dump(mode='json') if hasattr(request, 'model_dump') else request.dict()
+    return {field: data.get(field) for field in PAYLOAD_FIELDS}
+
+
+def delivery_namespace(job_id: str) -> UUID:
+    """Namespace for deterministic notification ids of one fan-out job"""
+    return uuid5(UUID(int=0), f"notification-job:{job_id}")
+
+
+def is_opted_out(preferences: Optional[Dict[str, Any]], notification_type: str) -> bool:
+    """True if the user's preferences exclude this in-app notification"""
+    if not preferences:
+        return False
+    if preferences.get('in_app_enabled') is False:
+        return True
+    return (preferences.get('notification_types') or {}).get(notification_type) is False
+
+
+class NotificationFanout:
+    """Streams target users and bulk-inserts one notification for each"""
+
+    def __init__(
+        self,
+        db: Client,
+        page_size: int = NOTIFICATION_FANOUT_PAGE_SIZE,
+        batch_size: int = NOTIFICATION_INSERT_BATCH_SIZE,
+        concurrency: int = NOTIFICATION_FANOUT_CONCURRENCY
+    ):
+        self.db = db
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+
+    # ==================== Targets ====================
+
+    def _target_query(self, target_roles: Optional[List[str]], columns: str = 'id', **options):
+        query = self.db.table('users').select(columns, **options)
+        if target_roles:
+            query = query.overlaps('available_roles', [role.lower() for role in target_roles])
+        return query
+
+    def count_targets(self, target_roles: Optional[List[str]] = None, user_ids: Optional[List[str]] = None) -> int:
+        if user_ids is not None:
+            return len(set(user_ids))
+        response = self._target_query(target_roles, count='exact').limit(1).execute()
+        return response.count or 0
+
+    def user_pages(
+        self,
+        target_roles: Optional[List[str]] = None,
+        user_ids: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Iterator[List[str]]:
+        """Yield pages of target user ids after `cursor`, in id order"""
+        if user_ids is not None:
+            remaining = sorted(set(user_ids))
+            if cursor is not None:
+                remaining = [uid for uid in remaining if uid > cursor]
+            for i in range(0, len(remaining), self.page_size):
+                yield remaining[i:i + self.page_size]
+            return
+
+        while True:
+            query = self._target_query(target_roles)
+            if cursor is not None:
+                query = query.gt('id', cursor)
+            rows = query.order('id').limit(self.page_size).execute().data or []
+            if not rows:
+                return
+            page = [row['id'] for row in rows]
+            yield page
+            if len(rows) < self.page_size:
+                return
+            cursor = page[-1]
+
+    # ==================== Delivery ====================
+
+    def filter_by_preferences(self, user_ids: List[str], notification_type: str) -> Tuple[List[str], List[str]]:
+        """
+        Split a page by notification preferences (one query per
+        NOTIFICATION_PREFERENCES_CHUNK_SIZE users)
+
+        Users whose preferences cannot be read are treated as having none.
+
+        Returns:
+            (user ids to notify, user ids that opted out)
+        """
+        preferences: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(user_ids), NOTIFICATION_PREFERENCES_CHUNK_SIZE):
+            chunk = user_ids[i:i + NOTIFICATION_PREFERENCES_CHUNK_SIZE]
+            try:
+                response = self.db.table('notification_preferences')\
+                    .select('user_id, in_app_enabled, notification_types')\
+                    .in_('user_id', chunk)\
+                    .execute()
+            except Exception as e:
+                logger.warning(f"Could not read notification preferences for {len(chunk)} users: {e}")
+                continue
+            preferences.update((row['user_id'], row) for row in response.data or [])
+
+        allowed, opted_out = [], []
+        for user_id in user_ids:
+            if is_opted_out(preferences.get(user_id), notification_type):
+                opted_out.append(user_id)
+            else:
+                allowed.append(user_id)
+        return allowed, opted_out
+
+    @staticmethod
+    def build_rows(payload: Dict[str, Any], user_ids: List[str], namespace: Optional[UUID] = None) -> List[Dict]:
+        """Notification rows (same shape as NotificationsService.create_notification)"""
+        now = datetime.utcnow().isoformat()
+        return [
+            {
+                "id": str(uuid5(namespace, user_id) if namespace else uuid4()),
+                "user_id": user_id,
+                "notification_type": payload['notification_type'],
+                "title": payload['title'],
+                "message": payload['message'],
+                "priority": payload.get('priority') or 'normal',
+                "channels": payload.get('channels') or ['in_app'],
+                "action_url": payload.get('action_url'),
+                "action_text": payload.get('action_text'),
+                "image_url": payload.get('image_url'),
+                "is_read": False,
+                "is_delivered": True,
+                "delivered_at": now,
+                "metadata": payload.get('metadata') or {},
+                "expires_at": payload.get('expires_at'),
+                "scheduled_for": payload.get('scheduled_for'),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user_id in user_ids
+        ]
+
+    def _insert_batch(self, rows: List[Dict], idempotent: bool):
+        table = self.db.table('notifications')
+        if idempotent:
+            table.upsert(rows, on_conflict='id', ignore_duplicates=True, returning='minimal').execute()
+        else:
+            table.insert(rows, returning='minimal').execute()
+
+    async def deliver_page(
+        self,
+        user_ids: List[str],
+        payload: Dict[str, Any],
+        namespace: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Notify one page of users
+
+        Returns:
+            {'created': n, 'skipped': n, 'failed_users': [...]}
+        """
+        allowed, opted_out = await run_blocking(
+            self.filter_by_preferences, user_ids, payload['notification_type']
+        )
+        rows = self.build_rows(payload, allowed, namespace)
+        batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def insert(batch: List[Dict]) -> List[str]:
+            async with semaphore:
+                try:
+                    await run_blocking(self._insert_batch, batch, namespace is not None)
+                    return []
+                except Exception as e:
+                    logger.error(f"Failed to insert {len(batch)} notifications: {e}")
+                    return [row['user_id'] for row in batch]
+
+        failed_users = [uid for failed in await asyncio.gather(*(insert(b) for b in batches)) for uid in failed]
+        return {
+            'created': len(rows) - len(failed_users),
+            'skipped': len(opted_out),
+            'failed_users': failed_users,
+        }
+
+    async def run(
+        self,
+        payload: Dict[str, Any],
+        target_roles: Optional[List[str]] = None,
+        user_ids: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        namespace: Optional[UUID] = None,
+        on_page: Optional[Callable[[Dict[str, Any], str], Any]] = None,
+        should_continue: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Deliver to every target user after `cursor`
+
+        Args:
+            on_page: Called with (page result, last user id of the page) after each page
+            should_continue: Checked before each page; returning False stops early
+
+        Returns:
+            Totals: created, skipped, failed_users, completed (False if stopped early)
+        """
+        totals = {'created': 0, 'skipped': 0, 'failed_users': [], 'completed': True}
+        pages = self.user_pages(target_roles, user_ids, cursor)
+        while True:
+            if should_continue is not None and not should_continue():
+                totals['completed'] = False
+                break
+            page = await run_blocking(next, pages, None)
+            if page is None:
+                break
+
+            result = await self.deliver_page(page, payload, namespace)
+            totals['created'] += result['created']
+            totals['skipped'] += result['skipped']
+            totals['failed_users'].extend(result['failed_users'])
+            if on_page is not None:
+                on_page(result, page[-1])
+        return totals
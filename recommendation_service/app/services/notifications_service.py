@@ -8,6 +8,8 @@ import logging
 from uuid import uuid4
 
 from app.database.config import get_supabase, get_supabase_admin
+from app.database.async_db import execute, run_blocking
+from app.services.notification_fanout import NotificationFanout, payload_from_request
 from app.schemas.notifications import (
     NotificationCreateRequest,
     NotificationResponse,
@@ -66,7 +68,7 @@ class NotificationsService:
                 "updated_at": datetime.utcnow().isoformat(),
             }
 
-            response = self.db.table('notifications').insert(notification).execute()
+            response = await execute(self.db.table('notifications').insert(notification))
 
             if not response.data:
                 raise Exception("Failed to create notification")
@@ -84,39 +86,23 @@ class NotificationsService:
         self,
         bulk_data: BulkNotificationCreateRequest
     ) -> Dict[str, Any]:
-        """Create notifications for multiple users"""
+        """Create notifications for multiple users (bulk inserts, preferences checked per page)"""
         try:
-            created_count = 0
-            failed_users = []
-
-            for user_id in bulk_data.user_ids:
-                try:
-                    notification = NotificationCreateRequest(
-                        user_id=user_id,
-                        notification_type=bulk_data.notification_type,
-                        title=bulk_data.title,
-                        message=bulk_data.message,
-                        priority=bulk_data.priority,
-                        channels=bulk_data.channels,
-                        action_url=bulk_data.action_url,
-                        action_text=bulk_data.action_text,
-                        image_url=bulk_data.image_url,
-                        metadata=bulk_data.metadata,
-                        scheduled_for=bulk_data.scheduled_for
-                    )
-
-                    await self.create_notification(notification)
-                    created_count += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to create notification for user {user_id}: {e}")
-                    failed_users.append(user_id)
-
-            logger.info(f"Bulk notifications: {created_count} created, {len(failed_users)} failed")
+            result = await NotificationFanout(self.db).run(
+                payload_from_request(bulk_data),
+                user_ids=bulk_data.user_ids
+            )
+            failed_users = result['failed_users']
+
+            logger.info(
+                f"Bulk notifications: {result['created']} created, {result['skipped']} opted out, "
+                f"{len(failed_users)} failed"
+            )
 
             return {
                 "success": True,
-                "created_count": created_count,
+                "created_count": result['created'],
+                "skipped_count": result['skipped'],
                 "failed_count": len(failed_users),
                 "failed_users": failed_users
             }
@@ -127,57 +113,46 @@ class NotificationsService:
 
     async def broadcast_notification(
         self,
-        broadcast_data: BroadcastNotificationRequest
+        broadcast_data: BroadcastNotificationRequest,
+        created_by: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Broadcast notification to all users or specific roles"""
+        """
+        Queue a broadcast to all users or specific roles
+
+        Delivery runs as a notification fan-out job (app/jobs/notification_worker.py);
+        the returned job_id reports progress.
+        """
+        from app.jobs.job_queue import get_notification_queue
+
         try:
-            # Get target users
-            if broadcast_data.target_roles:
-                # Query users with specific roles
-                # Note: This assumes users table has a 'roles' array field
-                users_query = self.db.table('users').select('id')
-                users = []
-
-                for role in broadcast_data.target_roles:
-                    role_users = users_query.contains('roles', [role]).execute()
-                    if role_users.data:
-                        users.extend(role_users.data)
-
-                # Remove duplicates
-                user_ids = list(set([u['id'] for u in users]))
-            else:
-                # Broadcast to all users
-                all_users = self.db.table('users').select('id').execute()
-                user_ids = [u['id'] for u in all_users.data] if all_users.data else []
-
-            if not user_ids:
-                raise Exception("No target users found")
-
-            # Create bulk notifications
-            bulk_data = BulkNotificationCreateRequest(
-                user_ids=user_ids,
-                notification_type=broadcast_data.notification_type,
-                title=broadcast_data.title,
-                message=broadcast_data.message,
-                priority=broadcast_data.priority,
-                channels=broadcast_data.channels,
-                action_url=broadcast_data.action_url,
-                action_text=broadcast_data.action_text,
-                image_url=broadcast_data.image_url,
-                metadata=broadcast_data.metadata,
-                scheduled_for=broadcast_data.scheduled_for
+            job = get_notification_queue().create_job(
+                payload_from_request(broadcast_data),
+                target_roles=broadcast_data.target_roles,
+                created_by=created_by
             )
 
-            result = await self.create_bulk_notifications(bulk_data)
+            logger.info(f"Broadcast notification queued as job {job.job_id}")
 
-            logger.info(f"Broadcast notification sent to {result['created_count']} users")
-
-            return result
+            return {
+                "success": True,
+                "job_id": job.job_id,
+                "status": job.status.value,
+                "message": "Broadcast queued"
+            }
 
         except Exception as e:
             logger.error(f"Broadcast notification error: {e}")
             raise Exception(f"Failed to broadcast notification: {str(e)}")
 
+    async def get_broadcast_job(self, job_id: str) -> Dict[str, Any]:
+        """Progress of a broadcast/announcement fan-out job"""
+        from app.jobs.job_queue import get_notification_queue
+
+        job = await run_blocking(get_notification_queue().get_job, job_id)
+        if not job:
+            raise Exception("Broadcast job not found")
+        return job.to_dict()
+
     async def get_notification(
         self,
         notification_id: str,
@@ -185,7 +160,7 @@ class NotificationsService:
     ) -> NotificationResponse:
         """Get notification by ID"""
         try:
-            response = self.db.table('notifications').select('*').eq('id', notification_id).single().execute()
+            response = await execute(self.db.table('notifications').select('*').eq('id', notification_id).single())
 
             if not response.data:
                 raise Exception("Notification not found")
@@ -220,12 +195,12 @@ class NotificationsService:
             offset = (page - 1) * page_size
             query = query.order('created_at', desc=True).range(offset, offset + page_size - 1)
 
-            response = query.execute()
+            response = await execute(query)
 
             # Get unread count
-            unread_response = self.db.table('notifications').select('id', count='exact').eq(
+            unread_response = await execute(self.db.table('notifications').select('id', count='exact').eq(
                 'user_id', user_id
-            ).eq('is_read', False).execute()
+            ).eq('is_read', False))
 
             notifications = [NotificationResponse(**n) for n in response.data] if response.data else []
             total = response.count or 0
@@ -255,7 +230,7 @@ class NotificationsService:
 
             for notification_id in mark_data.notification_ids:
                 # Verify ownership
-                notification = self.db.table('notifications').select('user_id').eq('id', notification_id).single().execute()
+                notification = await execute(self.db.table('notifications').select('user_id').eq('id', notification_id).single())
 
                 if not notification.data or notification.data['user_id'] != user_id:
                     continue
@@ -266,7 +241,7 @@ class NotificationsService:
                     "updated_at": datetime.utcnow().isoformat()
                 }
 
-                self.db.table('notifications').update(update).eq('id', notification_id).execute()
+                await execute(self.db.table('notifications').update(update).eq('id', notification_id))
                 updated_count += 1
 
             logger.info(f"Marked {updated_count} notifications as read for user {user_id}")
@@ -289,7 +264,7 @@ class NotificationsService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.db.table('notifications').update(update).eq('user_id', user_id).eq('is_read', False).execute()
+            response = await execute(self.db.table('notifications').update(update).eq('user_id', user_id).eq('is_read', False))
 
             count = len(response.data) if response.data else 0
 
@@ -314,7 +289,7 @@ class NotificationsService:
             # Verify ownership
             notification = await self.get_notification(notification_id, user_id)
 
-            self.db.table('notifications').delete().eq('id', notification_id).execute()
+            await execute(self.db.table('notifications').delete().eq('id', notification_id))
 
             logger.info(f"Notification deleted: {notification_id}")
 
@@ -330,7 +305,7 @@ class NotificationsService:
     ) -> NotificationPreferencesResponse:
         """Get user's notification preferences"""
         try:
-            response = self.db.table('notification_preferences').select('*').eq('user_id', user_id).single().execute()
+            response = await execute(self.db.table('notification_preferences').select('*').eq('user_id', user_id).single())
 
             if not response.data:
                 # Create default preferences
@@ -371,7 +346,7 @@ class NotificationsService:
             if update_data.quiet_hours_end is not None:
                 update["quiet_hours_end"] = update_data.quiet_hours_end
 
-            response = self.db.table('notification_preferences').update(update).eq('id', existing.id).execute()
+            response = await execute(self.db.table('notification_preferences').update(update).eq('id', existing.id))
 
             if not response.data:
                 raise Exception("Failed to update preferences")
@@ -387,7 +362,7 @@ class NotificationsService:
     async def get_notification_stats(self, user_id: str) -> NotificationStats:
         """Get notification statistics for a user"""
         try:
-            all_notifications = self.db.table('notifications').select('*').eq('user_id', user_id).execute()
+            all_notifications = await execute(self.db.table('notifications').select('*').eq('user_id', user_id))
 
             notifications = all_notifications.data if all_notifications.data else []
 
@@ -449,7 +424,7 @@ class NotificationsService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            self.db.table('notifications').update(update).eq('id', notification_id).execute()
+            await execute(self.db.table('notifications').update(update).eq('id', notification_id))
 
             logger.info(f"Notification marked as unread: {notification_id}")
 
@@ -475,7 +450,7 @@ class NotificationsService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            self.db.table('notifications').update(update).eq('id', notification_id).execute()
+            await execute(self.db.table('notifications').update(update).eq('id', notification_id))
 
             logger.info(f"Notification archived: {notification_id}")
 
@@ -501,7 +476,7 @@ class NotificationsService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            self.db.table('notifications').update(update).eq('id', notification_id).execute()
+            await execute(self.db.table('notifications').update(update).eq('id', notification_id))
 
             logger.info(f"Notification unarchived: {notification_id}")
 
@@ -543,10 +518,10 @@ class NotificationsService:
 
             # Use admin client to bypass RLS
             admin_db = get_supabase_admin()
-            response = admin_db.table('notification_preferences').upsert(
+            response = await execute(admin_db.table('notification_preferences').upsert(
                 preferences_records,
                 on_conflict='user_id,notification_type'
-            ).execute()
+            ))
 
             logger.info(f"Created default notification preferences for user {user_id}")
 
@@ -562,7 +537,7 @@ class NotificationsService:
     async def _get_user_preferences(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Internal: Get user preferences"""
         try:
-            response = self.db.table('notification_preferences').select('*').eq('user_id', user_id).single().execute()
+            response = await execute(self.db.table('notification_preferences').select('*').eq('user_id', user_id).single())
             return response.data if response.data else None
         except:
             return None
@@ -582,7 +557,7 @@ class NotificationsService:
                 "updated_at": datetime.utcnow().isoformat(),
             }
 
-            response = self.db.table('notification_preferences').insert(preferences).execute()
+            response = await execute(self.db.table('notification_preferences').insert(preferences))
 
             if response.data:
                 return NotificationPreferencesResponse(**response.data[0])
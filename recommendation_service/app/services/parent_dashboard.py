@@ -0,0 +1,301 @@
+"""
+Parent Dashboard Aggregator - Batched statistics for all of a parent's linked students
+
+Each source table is read once for every linked student (`in_` filters,
+narrow column lists, fetched concurrently on the DB executor) and the per-student stats are
+computed in a single pass over the rows. Results are cached per parent for
+a short TTL and invalidated when a student logs new activity or the
+parent's links change.
+"""
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import os
+import time
+
+from supabase import Client
+
+from app.database.async_db import execute, run_blocking
+from app.schemas.parent_monitoring import MultiStudentDashboardResponse, ParentDashboardStats
+
+logger = logging.getLogger(__name__)
+
+
+DASHBOARD_CACHE_TTL_SECONDS = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "2000"))
+PAGE_SIZE = 1000  # PostgREST default max rows per request
+
+PENDING_APPLICATION_STATUSES = ('pending', 'under_review')
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """ISO timestamp as an aware UTC datetime (naive values are UTC)"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def aggregate_dashboard(
+    student_names: Dict[str, str],
+    enrollments: List[Dict],
+    applications: List[Dict],
+    sessions: List[Dict],
+    achievements: List[Dict],
+    alerts: List[Dict],
+    activities: List[Dict],
+    last_activity: Dict[str, str],
+    now: Optional[datetime] = None,
+) -> List[ParentDashboardStats]:
+    """
+    Per-student dashboard stats from rows covering all students
+
+    Args:
+        student_names: student_id -> display name, in dashboard order
+        alerts: Unread parent alerts only
+        activities: Activities from the last 30 days
+        last_activity: student_id -> latest activity timestamp (any age)
+        now: Reference time (default: current UTC time)
+    """
+    now = now or datetime.now(timezone.utc)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    acc: Dict[str, Dict[str, Any]] = {
+        student_id: {
+            'progress': [], 'at_risk': 0, 'applications': Counter(), 'upcoming': 0,
+            'completed_this_month': 0, 'ratings': [], 'achievements': 0,
+            'achievements_this_month': 0, 'unread_alerts': 0, 'high_alerts': 0,
+            'activity_types': Counter(), 'activities': 0,
+        }
+        for student_id in student_names
+    }
+
+    for e in enrollments:
+        a = acc.get(e['student_id'])
+        if a is None or e.get('status') != 'active':
+            continue
+        progress = e.get('progress_percentage') or 0
+        a['progress'].append(progress)
+        if progress < 50:
+            a['at_risk'] += 1
+
+    for app in applications:
+        if app['student_id'] in acc:
+            acc[app['student_id']]['applications'][app.get('status')] += 1
+
+    for s in sessions:
+        a = acc.get(s['student_id'])
+        if a is None:
+            continue
+        if s.get('status') == 'scheduled':
+            a['upcoming'] += 1
+        elif s.get('status') == 'completed':
+            updated_at = _parse_time(s.get('updated_at'))
+            if updated_at and updated_at >= month_start:
+                a['completed_this_month'] += 1
+        if s.get('feedback_rating'):
+            a['ratings'].append(s['feedback_rating'])
+
+    for ach in achievements:
+        a = acc.get(ach['student_id'])
+        if a is None:
+            continue
+        a['achievements'] += 1
+        earned_at = _parse_time(ach.get('earned_at'))
+        if earned_at and earned_at >= month_start:
+            a['achievements_this_month'] += 1
+
+    for alert in alerts:
+        a = acc.get(alert['student_id'])
+        if a is None:
+            continue
+        a['unread_alerts'] += 1
+        if alert.get('severity') == 'high':
+            a['high_alerts'] += 1
+
+    for activity in activities:
+        a = acc.get(activity['student_id'])
+        if a is None:
+            continue
+        a['activities'] += 1
+        if activity.get('activity_type'):
+            a['activity_types'][activity['activity_type']] += 1
+
+    stats = []
+    for student_id, name in student_names.items():
+        a = acc[student_id]
+        apps = a['applications']
+        last = last_activity.get(student_id)
+        last_at = _parse_time(last)
+        top_type = a['activity_types'].most_common(1)
+        stats.append(ParentDashboardStats(
+            student_id=student_id,
+            student_name=name,
+            is_active=bool(last_at and (now - last_at).days < 7),
+            last_activity=last,
+            active_courses=len(a['progress']),
+            average_course_progress=sum(a['progress']) / len(a['progress']) if a['progress'] else 0.0,
+            courses_at_risk=a['at_risk'],
+            total_applications=sum(apps.values()),
+            pending_applications=sum(apps[s] for s in PENDING_APPLICATION_STATUSES),
+            accepted_applications=apps['accepted'],
+            rejected_applications=apps['rejected'],
+            upcoming_sessions=a['upcoming'],
+            completed_sessions_this_month=a['completed_this_month'],
+            average_counseling_rating=sum(a['ratings']) / len(a['ratings']) if a['ratings'] else None,
+            achievements_count=a['achievements'],
+            achievements_this_month=a['achievements_this_month'],
+            unread_alerts=a['unread_alerts'],
+            high_severity_alerts=a['high_alerts'],
+            total_activities_last_30_days=a['activities'],
+            most_frequent_activity_type=top_type[0][0] if top_type else None,
+        ))
+    return stats
+
+
+class DashboardCache:
+    """Short-TTL per-parent dashboard cache with per-student invalidation"""
+
+    def __init__(self, ttl: int = DASHBOARD_CACHE_TTL_SECONDS, max_entries: int = DASHBOARD_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # parent_id -> (expires_at, response)
+        self._lock = Lock()
+
+    def get(self, parent_id: str) -> Optional[MultiStudentDashboardResponse]:
+        with self._lock:
+            item = self._entries.get(parent_id)
+            if item is None:
+                return None
+            expires_at, response = item
+            if expires_at <= time.monotonic():
+                del self._entries[parent_id]
+                return None
+            self._entries.move_to_end(parent_id)
+            return response
+
+    def put(self, parent_id: str, response: MultiStudentDashboardResponse):
+        with self._lock:
+            self._entries[parent_id] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(parent_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_parent(self, parent_id: str):
+        with self._lock:
+            self._entries.pop(parent_id, None)
+
+    def invalidate_student(self, student_id: str):
+        """Drop every cached dashboard that includes this student"""
+        with self._lock:
+            stale = [
+                parent_id for parent_id, (_, response) in self._entries.items()
+                if any(s.student_id == student_id for s in response.students)
+            ]
+            for parent_id in stale:
+                del self._entries[parent_id]
+
+
+class ParentDashboardAggregator:
+    """Builds a parent's dashboard with one query per table"""
+
+    def __init__(self, db: Client, cache: Optional[DashboardCache] = None):
+        self.db = db
+        self.cache = cache or get_dashboard_cache()
+
+    async def get_dashboard(self, parent_id: str) -> MultiStudentDashboardResponse:
+        cached = self.cache.get(parent_id)
+        if cached is not None:
+            return cached
+
+        links = await execute(
+            self.db.table('parent_student_links').select('student_id').eq(
+                'parent_id', parent_id
+            ).eq('status', 'active')
+        )
+        student_ids = list(dict.fromkeys(link['student_id'] for link in links.data or []))
+
+        if student_ids:
+            students = await self._fetch_students(parent_id, student_ids)
+        else:
+            students = []
+
+        response = MultiStudentDashboardResponse(
+            parent_id=parent_id,
+            students=students,
+            total_students=len(students)
+        )
+        self.cache.put(parent_id, response)
+        return response
+
+    async def _fetch_students(self, parent_id: str, student_ids: List[str]) -> List[ParentDashboardStats]:
+        since = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+
+        users, enrollments, applications, sessions, achievements, alerts, activities = await asyncio.gather(
+            run_blocking(self._fetch, 'users', 'id, display_name', student_ids, key='id'),
+            run_blocking(self._fetch, 'enrollments', 'student_id, status, progress_percentage', student_ids),
+            run_blocking(self._fetch, 'applications', 'student_id, status', student_ids),
+            run_blocking(
+                self._fetch, 'counseling_sessions', 'student_id, status, updated_at, feedback_rating', student_ids
+            ),
+            run_blocking(self._fetch, 'student_achievements', 'student_id, earned_at', student_ids),
+            run_blocking(
+                self._fetch, 'parent_alerts', 'student_id, severity', student_ids,
+                filters=lambda q: q.eq('parent_id', parent_id).eq('is_read', False)
+            ),
+            run_blocking(
+                self._fetch, 'student_activities', 'student_id, activity_type, timestamp', student_ids,
+                filters=lambda q: q.gte('timestamp', since)
+            ),
+        )
+
+        names = {u['id']: u.get('display_name') or 'Student' for u in users}
+        student_names = {student_id: names.get(student_id, 'Student') for student_id in student_ids}
+
+        last_activity: Dict[str, str] = {}
+        for activity in activities:
+            if activity['timestamp'] > last_activity.get(activity['student_id'], ''):
+                last_activity[activity['student_id']] = activity['timestamp']
+
+        # Only students idle for 30+ days need an older lookup
+        for student_id in student_ids:
+            if student_id not in last_activity:
+                latest = await execute(
+                    self.db.table('student_activities').select('timestamp').eq(
+                        'student_id', student_id
+                    ).order('timestamp', desc=True).limit(1)
+                )
+                if latest.data:
+                    last_activity[student_id] = latest.data[0]['timestamp']
+
+        return aggregate_dashboard(
+            student_names, enrollments, applications, sessions, achievements, alerts, activities, last_activity
+        )
+
+    def _fetch(self, table: str, columns: str, student_ids: List[str], key: str = 'student_id', filters=None) -> List[Dict]:
+        """All rows of `table` for the students, page by page"""
+        rows: List[Dict] = []
+        offset = 0
+        while True:
+            query = self.db.table(table).select(columns).in_(key, student_ids).order('id')
+            if filters:
+                query = filters(query)
+            page = query.range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+
+_dashboard_cache: Optional[DashboardCache] = None
+
+
+def get_dashboard_cache() -> DashboardCache:
+    """Get the process-wide parent dashboard cache"""
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        _dashboard_cache = DashboardCache()
+    return _dashboard_cache
@@ -10,6 +10,8 @@ import string
 from uuid import uuid4
 
 from app.database.config import get_supabase_admin
+from app.database.async_db import execute
+from app.services.parent_dashboard import ParentDashboardAggregator, get_dashboard_cache
 from app.schemas.parent_monitoring import (
     ParentStudentLinkCreateRequest,
     ParentStudentLinkResponse,
@@ -60,7 +62,7 @@ class ParentMonitoringService:
         """Create a parent-student link (pending approval)"""
         try:
             # Verify student exists
-            student = self.db.table('users').select('id, available_roles, active_role').eq('id', link_data.student_id).single().execute()
+            student = await execute(self.db.table('users').select('id, available_roles, active_role').eq('id', link_data.student_id).single())
 
             if not student.data:
                 raise Exception("Invalid student ID")
@@ -71,9 +73,9 @@ class ParentMonitoringService:
                 raise Exception("User is not a student")
 
             # Check if link already exists
-            existing = self.db.table('parent_student_links').select('*').eq(
+            existing = await execute(self.db.table('parent_student_links').select('*').eq(
                 'parent_id', parent_id
-            ).eq('student_id', link_data.student_id).execute()
+            ).eq('student_id', link_data.student_id))
 
             if existing.data:
                 raise Exception("Link already exists")
@@ -92,7 +94,7 @@ class ParentMonitoringService:
                 "updated_at": datetime.utcnow().isoformat(),
             }
 
-            response = self.db.table('parent_student_links').insert(link).execute()
+            response = await execute(self.db.table('parent_student_links').insert(link))
 
             if not response.data:
                 raise Exception("Failed to create link")
@@ -110,7 +112,7 @@ class ParentMonitoringService:
     async def approve_parent_link(self, link_id: str, student_id: str) -> ParentStudentLinkResponse:
         """Student approves parent link"""
         try:
-            link = self.db.table('parent_student_links').select('*').eq('id', link_id).single().execute()
+            link = await execute(self.db.table('parent_student_links').select('*').eq('id', link_id).single())
 
             if not link.data:
                 raise Exception("Link not found")
@@ -127,11 +129,12 @@ class ParentMonitoringService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.db.table('parent_student_links').update(update).eq('id', link_id).execute()
+            response = await execute(self.db.table('parent_student_links').update(update).eq('id', link_id))
 
             if not response.data:
                 raise Exception("Failed to approve link")
 
+            get_dashboard_cache().invalidate_parent(link.data['parent_id'])
             logger.info(f"Parent link approved: {link_id}")
 
             return ParentStudentLinkResponse(**response.data[0])
@@ -143,7 +146,7 @@ class ParentMonitoringService:
     async def revoke_parent_link(self, link_id: str, user_id: str) -> Dict[str, Any]:
         """Revoke parent-student link"""
         try:
-            link = self.db.table('parent_student_links').select('*').eq('id', link_id).single().execute()
+            link = await execute(self.db.table('parent_student_links').select('*').eq('id', link_id).single())
 
             if not link.data:
                 raise Exception("Link not found")
@@ -157,8 +160,9 @@ class ParentMonitoringService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            self.db.table('parent_student_links').update(update).eq('id', link_id).execute()
+            await execute(self.db.table('parent_student_links').update(update).eq('id', link_id))
 
+            get_dashboard_cache().invalidate_parent(link.data['parent_id'])
             logger.info(f"Parent link revoked: {link_id}")
 
             return {"success": True}
@@ -175,7 +179,7 @@ class ParentMonitoringService:
     ) -> ParentStudentLinkResponse:
         """Update permissions for a parent-student link (student only)"""
         try:
-            link = self.db.table('parent_student_links').select('*').eq('id', link_id).single().execute()
+            link = await execute(self.db.table('parent_student_links').select('*').eq('id', link_id).single())
 
             if not link.data:
                 raise Exception("Link not found")
@@ -195,7 +199,7 @@ class ParentMonitoringService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.db.table('parent_student_links').update(update).eq('id', link_id).execute()
+            response = await execute(self.db.table('parent_student_links').update(update).eq('id', link_id))
 
             if not response.data:
                 raise Exception("Failed to update permissions")
@@ -203,7 +207,7 @@ class ParentMonitoringService:
             logger.info(f"Link permissions updated: {link_id}")
 
             # Enrich with parent info for response
-            parent = self.db.table('users').select('display_name, email').eq('id', response.data[0]['parent_id']).single().execute()
+            parent = await execute(self.db.table('users').select('display_name, email').eq('id', response.data[0]['parent_id']).single())
             if parent.data:
                 response.data[0]['parent_name'] = parent.data.get('display_name', 'Unknown')
                 response.data[0]['parent_email'] = parent.data.get('email', '')
@@ -218,9 +222,9 @@ class ParentMonitoringService:
         """List parent-student links"""
         try:
             if user_role == "parent":
-                links_response = self.db.table('parent_student_links').select('*').eq('parent_id', user_id).execute()
+                links_response = await execute(self.db.table('parent_student_links').select('*').eq('parent_id', user_id))
             elif user_role == "student":
-                links_response = self.db.table('parent_student_links').select('*').eq('student_id', user_id).execute()
+                links_response = await execute(self.db.table('parent_student_links').select('*').eq('student_id', user_id))
             else:
                 raise Exception("Invalid role")
 
@@ -229,13 +233,13 @@ class ParentMonitoringService:
                 for link in links_response.data:
                     # Enrich with student info for parent view
                     if user_role == "parent":
-                        student = self.db.table('users').select('display_name, email').eq('id', link['student_id']).single().execute()
+                        student = await execute(self.db.table('users').select('display_name, email').eq('id', link['student_id']).single())
                         if student.data:
                             link['student_name'] = student.data.get('display_name', 'Unknown')
                             link['student_email'] = student.data.get('email', '')
                     # Enrich with parent info for student view
                     elif user_role == "student":
-                        parent = self.db.table('users').select('display_name, email').eq('id', link['parent_id']).single().execute()
+                        parent = await execute(self.db.table('users').select('display_name, email').eq('id', link['parent_id']).single())
                         if parent.data:
                             link['parent_name'] = parent.data.get('display_name', 'Unknown')
                             link['parent_email'] = parent.data.get('email', '')
@@ -255,19 +259,19 @@ class ParentMonitoringService:
         try:
             # Resolve student_id - handle both user_id (auth) and internal profile ID
             internal_student_id = student_id
-            profile_response = self.db.table('student_profiles').select('id').eq('user_id', student_id).execute()
+            profile_response = await execute(self.db.table('student_profiles').select('id').eq('user_id', student_id))
 
             if profile_response.data and len(profile_response.data) > 0:
                 internal_student_id = profile_response.data[0]['id']
             else:
                 # Check if it's already an internal profile id
-                profile_by_id = self.db.table('student_profiles').select('id').eq('id', student_id).execute()
+                profile_by_id = await execute(self.db.table('student_profiles').select('id').eq('id', student_id))
                 if profile_by_id.data and len(profile_by_id.data) > 0:
                     internal_student_id = student_id
 
-            link = self.db.table('parent_student_links').select('*').eq(
+            link = await execute(self.db.table('parent_student_links').select('*').eq(
                 'parent_id', parent_id
-            ).eq('student_id', internal_student_id).eq('status', LinkStatus.ACTIVE.value).single().execute()
+            ).eq('student_id', internal_student_id).eq('status', LinkStatus.ACTIVE.value).single())
 
             if not link.data:
                 raise Exception("No active link found")
@@ -289,13 +293,13 @@ class ParentMonitoringService:
         try:
             # Resolve student_id - handle both user_id (auth) and internal profile ID
             internal_student_id = student_id
-            profile_response = self.db.table('student_profiles').select('id').eq('user_id', student_id).execute()
+            profile_response = await execute(self.db.table('student_profiles').select('id').eq('user_id', student_id))
 
             if profile_response.data and len(profile_response.data) > 0:
                 internal_student_id = profile_response.data[0]['id']
             else:
                 # Check if it's already an internal profile id
-                profile_by_id = self.db.table('student_profiles').select('id').eq('id', student_id).execute()
+                profile_by_id = await execute(self.db.table('student_profiles').select('id').eq('id', student_id))
                 if profile_by_id.data and len(profile_by_id.data) > 0:
                     internal_student_id = student_id
 
@@ -313,7 +317,7 @@ class ParentMonitoringService:
             offset = (page - 1) * page_size
             query = query.order('timestamp', desc=True).range(offset, offset + page_size - 1)
 
-            response = query.execute()
+            response = await execute(query)
 
             activities = [StudentActivityResponse(**a) for a in response.data] if response.data else []
             total = response.count or 0
@@ -340,13 +344,13 @@ class ParentMonitoringService:
             # Resolve student_id - handle both user_id (auth) and internal profile ID
             student_id = report_request.student_id
             internal_student_id = student_id
-            profile_response = self.db.table('student_profiles').select('id, user_id').eq('user_id', student_id).execute()
+            profile_response = await execute(self.db.table('student_profiles').select('id, user_id').eq('user_id', student_id))
 
             if profile_response.data and len(profile_response.data) > 0:
                 internal_student_id = profile_response.data[0]['id']
             else:
                 # Check if it's already an internal profile id
-                profile_by_id = self.db.table('student_profiles').select('id, user_id').eq('id', student_id).execute()
+                profile_by_id = await execute(self.db.table('student_profiles').select('id, user_id').eq('id', student_id))
                 if profile_by_id.data and len(profile_by_id.data) > 0:
                     internal_student_id = student_id
                     # Get the user_id for fetching user info
@@ -356,7 +360,7 @@ class ParentMonitoringService:
             await self.verify_parent_access(parent_id, internal_student_id)
 
             # Get student info (using user_id for users table)
-            student = self.db.table('users').select('display_name').eq('id', student_id).single().execute()
+            student = await execute(self.db.table('users').select('display_name').eq('id', student_id).single())
             student_name = student.data.get('display_name', 'Student') if student.data else 'Student'
 
             report = ProgressReportResponse(
@@ -369,7 +373,7 @@ class ParentMonitoringService:
 
             # Courses data
             if report_request.include_courses:
-                enrollments = self.db.table('enrollments').select('*').eq('student_id', internal_student_id).execute()
+                enrollments = await execute(self.db.table('enrollments').select('*').eq('student_id', internal_student_id))
 
                 if enrollments.data:
                     report.total_courses = len(enrollments.data)
@@ -381,7 +385,7 @@ class ParentMonitoringService:
 
                     # Get course details
                     for enrollment in enrollments.data:
-                        course = self.db.table('courses').select('title').eq('id', enrollment['course_id']).single().execute()
+                        course = await execute(self.db.table('courses').select('title').eq('id', enrollment['course_id']).single())
                         course_title = course.data.get('title', 'Unknown') if course.data else 'Unknown'
 
                         report.courses.append(CourseProgressSummary(
@@ -394,7 +398,7 @@ class ParentMonitoringService:
 
             # Applications data
             if report_request.include_applications:
-                applications = self.db.table('applications').select('*').eq('student_id', internal_student_id).execute()
+                applications = await execute(self.db.table('applications').select('*').eq('student_id', internal_student_id))
 
                 if applications.data:
                     report.total_applications = len(applications.data)
@@ -414,7 +418,7 @@ class ParentMonitoringService:
 
             # Counseling data
             if report_request.include_counseling:
-                sessions = self.db.table('counseling_sessions').select('*').eq('student_id', internal_student_id).execute()
+                sessions = await execute(self.db.table('counseling_sessions').select('*').eq('student_id', internal_student_id))
 
                 if sessions.data:
                     report.total_counseling_sessions = len(sessions.data)
@@ -426,7 +430,7 @@ class ParentMonitoringService:
 
                     # Session summaries
                     for session in sessions.data[:10]:  # Last 10 sessions
-                        counselor = self.db.table('users').select('display_name').eq('id', session['counselor_id']).single().execute()
+                        counselor = await execute(self.db.table('users').select('display_name').eq('id', session['counselor_id']).single())
                         counselor_name = counselor.data.get('display_name', 'Unknown') if counselor.data else 'Unknown'
 
                         report.counseling_sessions.append(CounselingSessionSummary(
@@ -440,7 +444,7 @@ class ParentMonitoringService:
 
             # Achievements data
             if report_request.include_achievements:
-                achievements = self.db.table('student_achievements').select('*').eq('student_id', internal_student_id).execute()
+                achievements = await execute(self.db.table('student_achievements').select('*').eq('student_id', internal_student_id))
 
                 if achievements.data:
                     report.total_achievements = len(achievements.data)
@@ -461,9 +465,9 @@ class ParentMonitoringService:
                                 })
 
             # Activity summary
-            activities = self.db.table('student_activities').select('*').eq('student_id', internal_student_id).gte(
+            activities = await execute(self.db.table('student_activities').select('*').eq('student_id', internal_student_id).gte(
                 'timestamp', report_request.report_period_start
-            ).lte('timestamp', report_request.report_period_end).execute()
+            ).lte('timestamp', report_request.report_period_end))
 
             if activities.data:
                 report.total_activities = len(activities.data)
@@ -484,122 +488,7 @@ class ParentMonitoringService:
     async def get_parent_dashboard(self, parent_id: str) -> MultiStudentDashboardResponse:
         """Get dashboard for parent (all linked students)"""
         try:
-            # Get all active links
-            links = await self.list_parent_links(parent_id, "parent")
-            active_links = [link for link in links.links if link.status == LinkStatus.ACTIVE.value]
-
-            if not active_links:
-                return MultiStudentDashboardResponse(
-                    parent_id=parent_id,
-                    students=[],
-                    total_students=0
-                )
-
-            students_stats = []
-
-            for link in active_links:
-                student_id = link.student_id
-
-                # Get student info
-                student = self.db.table('users').select('display_name').eq('id', student_id).single().execute()
-                student_name = student.data.get('display_name', 'Student') if student.data else 'Student'
-
-                stats = ParentDashboardStats(
-                    student_id=student_id,
-                    student_name=student_name,
-                    is_active=False,
-                    active_courses=0,
-                    average_course_progress=0.0,
-                    courses_at_risk=0,
-                    total_applications=0,
-                    pending_applications=0,
-                    accepted_applications=0,
-                    rejected_applications=0,
-                    upcoming_sessions=0,
-                    completed_sessions_this_month=0,
-                    achievements_count=0,
-                    achievements_this_month=0,
-                    unread_alerts=0,
-                    high_severity_alerts=0,
-                    total_activities_last_30_days=0
-                )
-
-                # Last activity check
-                recent_activity = self.db.table('student_activities').select('timestamp').eq(
-                    'student_id', student_id
-                ).order('timestamp', desc=True).limit(1).execute()
-
-                if recent_activity.data:
-                    last_activity = datetime.fromisoformat(recent_activity.data[0]['timestamp'].replace('Z', '+00:00'))
-                    stats.last_activity = recent_activity.data[0]['timestamp']
-                    stats.is_active = (datetime.utcnow() - last_activity).days < 7
-
-                # Course stats
-                enrollments = self.db.table('enrollments').select('*').eq('student_id', student_id).execute()
-                if enrollments.data:
-                    stats.active_courses = len([e for e in enrollments.data if e['status'] == 'active'])
-                    progress_values = [e['progress_percentage'] for e in enrollments.data if e['status'] == 'active']
-                    stats.average_course_progress = sum(progress_values) / len(progress_values) if progress_values else 0.0
-                    stats.courses_at_risk = len([e for e in enrollments.data if e['progress_percentage'] < 50 and e['status'] == 'active'])
-
-                # Application stats
-                applications = self.db.table('applications').select('status').eq('student_id', student_id).execute()
-                if applications.data:
-                    stats.total_applications = len(applications.data)
-                    stats.pending_applications = len([a for a in applications.data if a['status'] in ['pending', 'under_review']])
-                    stats.accepted_applications = len([a for a in applications.data if a['status'] == 'accepted'])
-                    stats.rejected_applications = len([a for a in applications.data if a['status'] == 'rejected'])
-
-                # Counseling stats
-                sessions = self.db.table('counseling_sessions').select('*').eq('student_id', student_id).execute()
-                if sessions.data:
-                    stats.upcoming_sessions = len([s for s in sessions.data if s['status'] == 'scheduled'])
-
-                    # Sessions this month
-                    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                    completed_this_month = [
-                        s for s in sessions.data
-                        if s['status'] == 'completed' and datetime.fromisoformat(s['updated_at'].replace('Z', '+00:00')) >= month_start
-                    ]
-                    stats.completed_sessions_this_month = len(completed_this_month)
-
-                    ratings = [s['feedback_rating'] for s in sessions.data if s.get('feedback_rating')]
-                    stats.average_counseling_rating = sum(ratings) / len(ratings) if ratings else None
-
-                # Achievement stats
-                achievements = self.db.table('student_achievements').select('earned_at').eq('student_id', student_id).execute()
-                if achievements.data:
-                    stats.achievements_count = len(achievements.data)
-
-                    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                    achievements_this_month = [
-                        a for a in achievements.data
-                        if datetime.fromisoformat(a['earned_at'].replace('Z', '+00:00')) >= month_start
-                    ]
-                    stats.achievements_this_month = len(achievements_this_month)
-
-                # Alert stats
-                alerts = self.db.table('parent_alerts').select('*').eq('parent_id', parent_id).eq('student_id', student_id).execute()
-                if alerts.data:
-                    stats.unread_alerts = len([a for a in alerts.data if not a.get('is_read')])
-                    stats.high_severity_alerts = len([a for a in alerts.data if a.get('severity') == 'high' and not a.get('is_read')])
-
-                # Activity stats (last 30 days)
-                thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
-                activities = self.db.table('student_activities').select('*').eq(
-                    'student_id', student_id
-                ).gte('timestamp', thirty_days_ago).execute()
-
-                if activities.data:
-                    stats.total_activities_last_30_days = len(activities.data)
-
-                students_stats.append(stats)
-
-            return MultiStudentDashboardResponse(
-                parent_id=parent_id,
-                students=students_stats,
-                total_students=len(students_stats)
-            )
+            return await ParentDashboardAggregator(self.db).get_dashboard(parent_id)
 
         except Exception as e:
             logger.error(f"Get dashboard error: {e}")
@@ -613,9 +502,9 @@ class ParentMonitoringService:
             logger.info(f"Getting children for parent: {parent_id}")
 
             # Get all active links for parent
-            links = self.db.table('parent_student_links').select('*').eq(
+            links = await execute(self.db.table('parent_student_links').select('*').eq(
                 'parent_id', parent_id
-            ).eq('status', LinkStatus.ACTIVE.value).execute()
+            ).eq('status', LinkStatus.ACTIVE.value))
 
             logger.info(f"Found {len(links.data) if links.data else 0} active links")
 
@@ -644,9 +533,9 @@ class ParentMonitoringService:
         """Get single child by ID"""
         try:
             # Verify link exists
-            link = self.db.table('parent_student_links').select('*').eq(
+            link = await execute(self.db.table('parent_student_links').select('*').eq(
                 'parent_id', parent_id
-            ).eq('student_id', student_id).execute()
+            ).eq('student_id', student_id))
 
             if not link.data:
                 raise Exception("Child not linked to parent")
@@ -665,7 +554,7 @@ class ParentMonitoringService:
         """Build ChildResponse from database"""
         try:
             # Get student/user info (required)
-            user = self.db.table('users').select('*').eq('id', student_id).execute()
+            user = await execute(self.db.table('users').select('*').eq('id', student_id))
             if not user.data or len(user.data) == 0:
                 logger.error(f"No user found for student_id: {student_id}")
                 return None
@@ -676,7 +565,7 @@ class ParentMonitoringService:
             # Get student profile for additional info (optional)
             profile_data = {}
             try:
-                profile = self.db.table('student_profiles').select('*').eq('user_id', student_id).execute()
+                profile = await execute(self.db.table('student_profiles').select('*').eq('user_id', student_id))
                 if profile.data and len(profile.data) > 0:
                     profile_data = profile.data[0]
             except Exception as e:
@@ -685,7 +574,7 @@ class ParentMonitoringService:
             # Get applications (optional)
             applications = []
             try:
-                apps = self.db.table('applications').select('*').eq('student_id', student_id).execute()
+                apps = await execute(self.db.table('applications').select('*').eq('student_id', student_id))
                 if apps.data:
                     for app in apps.data:
                         applications.append(ChildApplicationResponse(
@@ -701,7 +590,7 @@ class ParentMonitoringService:
             # Get enrollments for course list (optional)
             enrolled_courses = []
             try:
-                enrollments = self.db.table('enrollments').select('course_id').eq('student_id', student_id).execute()
+                enrollments = await execute(self.db.table('enrollments').select('course_id').eq('student_id', student_id))
                 if enrollments.data:
                     for enr in enrollments.data:
                         enrolled_courses.append(f"Course {enr.get('course_id', 'Unknown')}")
@@ -711,9 +600,9 @@ class ParentMonitoringService:
             # Get last activity (optional)
             last_active = datetime.utcnow().isoformat()
             try:
-                last_activity = self.db.table('student_activities').select('timestamp').eq(
+                last_activity = await execute(self.db.table('student_activities').select('timestamp').eq(
                     'student_id', student_id
-                ).order('timestamp', desc=True).limit(1).execute()
+                ).order('timestamp', desc=True).limit(1))
                 if last_activity.data:
                     last_active = last_activity.data[0]['timestamp']
             except Exception as e:
@@ -722,7 +611,7 @@ class ParentMonitoringService:
             # Calculate average grade from enrollments (optional)
             average_grade = 0.0
             try:
-                grades = self.db.table('enrollments').select('grade').eq('student_id', student_id).execute()
+                grades = await execute(self.db.table('enrollments').select('grade').eq('student_id', student_id))
                 if grades.data:
                     grade_values = [g['grade'] for g in grades.data if g.get('grade') is not None]
                     if grade_values:
@@ -754,9 +643,9 @@ class ParentMonitoringService:
         """Remove parent-child link"""
         try:
             # Find the link
-            link = self.db.table('parent_student_links').select('id').eq(
+            link = await execute(self.db.table('parent_student_links').select('id').eq(
                 'parent_id', parent_id
-            ).eq('student_id', child_id).single().execute()
+            ).eq('student_id', child_id).single())
 
             if not link.data:
                 raise Exception("Link not found")
@@ -775,9 +664,9 @@ class ParentMonitoringService:
             await self.verify_parent_access(parent_id, child_id)
 
             # Get enrollments with course info
-            enrollments = self.db.table('enrollments').select(
+            enrollments = await execute(self.db.table('enrollments').select(
                 '*, courses(title, total_lessons)'
-            ).eq('student_id', child_id).execute()
+            ).eq('student_id', child_id))
 
             result = []
             if enrollments.data:
@@ -813,7 +702,7 @@ class ParentMonitoringService:
             await self.verify_parent_access(parent_id, child_id)
 
             # Get applications
-            apps = self.db.table('applications').select('*').eq('student_id', child_id).execute()
+            apps = await execute(self.db.table('applications').select('*').eq('student_id', child_id))
 
             result = []
             if apps.data:
@@ -842,9 +731,9 @@ class ParentMonitoringService:
         """Create parent-student link by student's email address"""
         try:
             # Find student by email - only select columns that exist in users table
-            student = self.db.table('users').select('id, display_name, email, available_roles, active_role').eq(
+            student = await execute(self.db.table('users').select('id, display_name, email, available_roles, active_role').eq(
                 'email', request.student_email.lower().strip()
-            ).single().execute()
+            ).single())
 
             if not student.data:
                 return LinkByEmailResponse(
@@ -865,9 +754,9 @@ class ParentMonitoringService:
             student_name = student.data.get('display_name') or 'Student'
 
             # Check if link already exists
-            existing = self.db.table('parent_student_links').select('*').eq(
+            existing = await execute(self.db.table('parent_student_links').select('*').eq(
                 'parent_id', parent_id
-            ).eq('student_id', student_id).execute()
+            ).eq('student_id', student_id))
 
             if existing.data:
                 existing_link = existing.data[0]
@@ -884,7 +773,7 @@ class ParentMonitoringService:
                     )
                 elif status == 'declined':
                     # Delete the old declined link and allow new request
-                    self.db.table('parent_student_links').delete().eq('id', existing_link['id']).execute()
+                    await execute(self.db.table('parent_student_links').delete().eq('id', existing_link['id']))
 
             # Create the link request
             link_request = ParentStudentLinkCreateRequest(
@@ -936,7 +825,7 @@ class ParentMonitoringService:
             # Ensure uniqueness
             attempts = 0
             while attempts < 5:
-                existing = self.db.table('student_invite_codes').select('id').eq('code', code).execute()
+                existing = await execute(self.db.table('student_invite_codes').select('id').eq('code', code))
                 if not existing.data:
                     break
                 code = self._generate_invite_code()
@@ -956,7 +845,7 @@ class ParentMonitoringService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.db.table('student_invite_codes').insert(invite).execute()
+            response = await execute(self.db.table('student_invite_codes').insert(invite))
 
             if not response.data:
                 raise Exception("Failed to create invite code")
@@ -972,9 +861,9 @@ class ParentMonitoringService:
     async def list_invite_codes(self, student_id: str) -> InviteCodeListResponse:
         """List all invite codes for a student"""
         try:
-            response = self.db.table('student_invite_codes').select('*').eq(
+            response = await execute(self.db.table('student_invite_codes').select('*').eq(
                 'student_id', student_id
-            ).order('created_at', desc=True).execute()
+            ).order('created_at', desc=True))
 
             codes = []
             if response.data:
@@ -995,7 +884,7 @@ class ParentMonitoringService:
         """Delete/deactivate an invite code"""
         try:
             # Verify ownership
-            code = self.db.table('student_invite_codes').select('*').eq('id', code_id).single().execute()
+            code = await execute(self.db.table('student_invite_codes').select('*').eq('id', code_id).single())
 
             if not code.data:
                 raise Exception("Invite code not found")
@@ -1004,10 +893,10 @@ class ParentMonitoringService:
                 raise Exception("Not authorized to delete this code")
 
             # Deactivate the code
-            self.db.table('student_invite_codes').update({
+            await execute(self.db.table('student_invite_codes').update({
                 'is_active': False,
                 'updated_at': datetime.utcnow().isoformat()
-            }).eq('id', code_id).execute()
+            }).eq('id', code_id))
 
             logger.info(f"Invite code deactivated: {code_id}")
 
@@ -1027,7 +916,7 @@ class ParentMonitoringService:
             code_str = request.code.upper().strip()
 
             # Find the code
-            code = self.db.table('student_invite_codes').select('*').eq('code', code_str).single().execute()
+            code = await execute(self.db.table('student_invite_codes').select('*').eq('code', code_str).single())
 
             if not code.data:
                 return UseInviteCodeResponse(
@@ -1060,7 +949,7 @@ class ParentMonitoringService:
             student_id = code_data['student_id']
 
             # Get student info
-            student = self.db.table('users').select('display_name, email').eq('id', student_id).single().execute()
+            student = await execute(self.db.table('users').select('display_name, email').eq('id', student_id).single())
             student_name = 'Student'
             student_email = ''
             if student.data:
@@ -1068,9 +957,9 @@ class ParentMonitoringService:
                 student_email = student.data.get('email', '')
 
             # Check if link already exists
-            existing = self.db.table('parent_student_links').select('*').eq(
+            existing = await execute(self.db.table('parent_student_links').select('*').eq(
                 'parent_id', parent_id
-            ).eq('student_id', student_id).execute()
+            ).eq('student_id', student_id))
 
             if existing.data:
                 existing_link = existing.data[0]
@@ -1087,7 +976,7 @@ class ParentMonitoringService:
                     )
                 elif status in ['declined', 'revoked']:
                     # Delete old link and create new one
-                    self.db.table('parent_student_links').delete().eq('id', existing_link['id']).execute()
+                    await execute(self.db.table('parent_student_links').delete().eq('id', existing_link['id']))
 
             # Create the link (with pending status for approval)
             link_request = ParentStudentLinkCreateRequest(
@@ -1102,10 +991,10 @@ class ParentMonitoringService:
             link = await self.create_parent_link(parent_id, link_request)
 
             # Decrement uses remaining
-            self.db.table('student_invite_codes').update({
+            await execute(self.db.table('student_invite_codes').update({
                 'uses_remaining': code_data['uses_remaining'] - 1,
                 'updated_at': datetime.utcnow().isoformat()
-            }).eq('id', code_data['id']).execute()
+            }).eq('id', code_data['id']))
 
             logger.info(f"Invite code used: {code_str} by parent {parent_id} for student {student_id}")
 
@@ -1131,17 +1020,17 @@ class ParentMonitoringService:
         """Get all pending link requests for a student to approve/decline"""
         try:
             # Get pending links
-            links = self.db.table('parent_student_links').select('*').eq(
+            links = await execute(self.db.table('parent_student_links').select('*').eq(
                 'student_id', student_id
-            ).eq('status', LinkStatus.PENDING.value).execute()
+            ).eq('status', LinkStatus.PENDING.value))
 
             pending_links = []
             if links.data:
                 for link in links.data:
                     # Get parent info
-                    parent = self.db.table('users').select('display_name, email').eq(
+                    parent = await execute(self.db.table('users').select('display_name, email').eq(
                         'id', link['parent_id']
-                    ).single().execute()
+                    ).single())
 
                     parent_name = 'Parent'
                     parent_email = ''
@@ -1173,7 +1062,7 @@ class ParentMonitoringService:
     async def decline_parent_link(self, link_id: str, student_id: str) -> Dict[str, Any]:
         """Student declines a parent link request"""
         try:
-            link = self.db.table('parent_student_links').select('*').eq('id', link_id).single().execute()
+            link = await execute(self.db.table('parent_student_links').select('*').eq('id', link_id).single())
 
             if not link.data:
                 raise Exception("Link not found")
@@ -1189,7 +1078,7 @@ class ParentMonitoringService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            self.db.table('parent_student_links').update(update).eq('id', link_id).execute()
+            await execute(self.db.table('parent_student_links').update(update).eq('id', link_id))
 
             logger.info(f"Parent link declined: {link_id}")
 
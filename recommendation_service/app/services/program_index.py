@@ -0,0 +1,281 @@
+"""
+Program Match Index - Inverted index over program names and fields
+
+Answers "which universities offer a program matching major X, and how
+strongly" with one lookup instead of scanning every program of every
+university. Matching is substring-based on normalized text (lowercase,
+collapsed whitespace, '&' -> 'and'), with common abbreviations such as
+"CS" expanded to their full names.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+
+MATCH_NAME = "name"
+MATCH_FIELD = "field"
+MATCH_ALTERNATIVE = "alternative"
+
+# Abbreviation -> canonical program name. Keys are normalized; an abbreviation
+# is replaced (not supplemented) by its expansion so "cs" does not match "physics".
+MAJOR_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "cs": ("computer science",),
+    "comp sci": ("computer science",),
+    "compsci": ("computer science",),
+    "it": ("information technology",),
+    "ict": ("information and communication technology", "information technology"),
+    "ai": ("artificial intelligence",),
+    "ml": ("machine learning",),
+    "ds": ("data science",),
+    "ee": ("electrical engineering",),
+    "eee": ("electrical and electronic engineering", "electrical engineering"),
+    "mech eng": ("mechanical engineering",),
+    "civil eng": ("civil engineering",),
+    "econ": ("economics",),
+    "econs": ("economics",),
+    "bio": ("biology",),
+    "chem": ("chemistry",),
+    "psych": ("psychology",),
+    "poli sci": ("political science",),
+    "polisci": ("political science",),
+    "math": ("mathematics", "math"),
+    "maths": ("mathematics",),
+    "stats": ("statistics",),
+    "mba": ("business administration",),
+    "business admin": ("business administration",),
+    "pre-med": ("medicine", "pre-medical"),
+    "premed": ("medicine", "pre-medical"),
+    "comms": ("communication",),
+    "intl relations": ("international relations",),
+    "ir": ("international relations",),
+}
+
+# Distinct (major, field, alternatives) queries memoized per index (LRU)
+PROGRAM_MATCH_CACHE_SIZE = int(os.getenv("PROGRAM_MATCH_CACHE_SIZE", "2048"))
+
+_WHITESPACE = re.compile(r"\s+")
+_NGRAM = 3
+
+
+def normalize_program_text(text: Optional[str]) -> str:
+    """Normalize a program name, field or major for matching"""
+    if not text:
+        return ""
+    return _WHITESPACE.sub(" ", text.lower().replace("&", "and")).strip()
+
+
+def expand_major(major: Optional[str]) -> Tuple[str, ...]:
+    """Normalized query variants for a major (abbreviations expanded)"""
+    normalized = normalize_program_text(major)
+    if not normalized:
+        return ()
+    return MAJOR_SYNONYMS.get(normalized, (normalized,))
+
+
+def text_matches(variants: Iterable[str], text: Optional[str]) -> bool:
+    """True if any query variant occurs in the normalized text"""
+    normalized = normalize_program_text(text)
+    return any(variant in normalized for variant in variants)
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+class _SubstringIndex:
+    """
+    Trigram index from distinct normalized strings to the universities using them
+
+    Each string keeps a per-university reference count so programs can be
+    added and removed incrementally.
+    """
+
+    def __init__(self):
+        self.owners: Dict[str, Dict[str, int]] = {}  # text -> {university_id: count}
+        self.grams: Dict[str, Set[str]] = {}         # trigram -> texts
+
+    def add(self, text: str, university_id):
+        if not text:
+            return
+        owners = self.owners.get(text)
+        if owners is None:
+            owners = self.owners[text] = {}
+            for gram in _ngrams(text):
+                self.grams.setdefault(gram, set()).add(text)
+        owners[university_id] = owners.get(university_id, 0) + 1
+
+    def remove(self, text: str, university_id):
+        owners = self.owners.get(text)
+        if not owners or university_id not in owners:
+            return
+        owners[university_id] -= 1
+        if owners[university_id] == 0:
+            del owners[university_id]
+        if not owners:
+            del self.owners[text]
+            for gram in _ngrams(text):
+                texts = self.grams.get(gram)
+                if texts is not None:
+                    texts.discard(text)
+                    if not texts:
+                        del self.grams[gram]
+
+    def copy(self) -> "_SubstringIndex":
+        clone = _SubstringIndex()
+        clone.owners = {text: dict(owners) for text, owners in self.owners.items()}
+        clone.grams = {gram: set(texts) for gram, texts in self.grams.items()}
+        return clone
+
+    def texts_containing(self, query: str) -> Iterable[str]:
+        if len(query) < _NGRAM:
+            return [text for text in self.owners if query in text]
+
+        postings = []
+        for gram in _ngrams(query):
+            texts = self.grams.get(gram)
+            if not texts:
+                return []
+            postings.append(texts)
+        postings.sort(key=len)
+        candidates = set.intersection(*postings) if len(postings) > 1 else postings[0]
+        return [text for text in candidates if query in text]
+
+    def universities_matching(self, variants: Iterable[str]) -> Set:
+        matched = set()
+        for variant in variants:
+            for text in self.texts_containing(variant):
+                matched.update(self.owners[text])
+        return matched
+
+
+class ProgramMatchIndex:
+    """
+    Inverted index over programs.name and programs.field
+
+    Build once from the catalog (see CatalogSnapshot.program_index) and keep up
+    to date with update()/remove(). Query results are memoized (bounded LRU)
+    until the index changes, since the same majors come up for many students.
+    """
+
+    def __init__(self, programs: Iterable[Dict] = (), cache_size: int = PROGRAM_MATCH_CACHE_SIZE):
+        self._names = _SubstringIndex()
+        self._fields = _SubstringIndex()
+        self._programs: Dict = {}  # program id -> (university_id, name, field)
+        self._program_counts: Dict = {}  # university_id -> number of programs
+        self._cache_size = cache_size
+        self._query_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._cache_lock = Lock()  # Catalog indexes are shared by request threads
+        self.update(programs)
+
+    @classmethod
+    def from_programs_by_university(cls, programs_by_university: Dict) -> "ProgramMatchIndex":
+        index = cls()
+        for univ_id, programs in programs_by_university.items():
+            index.update(dict(p, university_id=univ_id) for p in programs)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    @property
+    def university_ids(self) -> Set:
+        """Universities with at least one program"""
+        return set(self._program_counts)
+
+    def has_programs(self, university_id) -> bool:
+        return university_id in self._program_counts
+
+    def copy(self) -> "ProgramMatchIndex":
+        """Independent copy, for building the next catalog snapshot"""
+        clone = ProgramMatchIndex(cache_size=self._cache_size)
+        clone._names = self._names.copy()
+        clone._fields = self._fields.copy()
+        clone._programs = dict(self._programs)
+        clone._program_counts = dict(self._program_counts)
+        return clone
+
+    def update(self, programs: Iterable[Dict]):
+        """Insert or replace programs (keyed by program id)"""
+        changed = False
+        for position, program in enumerate(programs):
+            univ_id = program.get("university_id")
+            if univ_id is None:
+                continue
+            program_id = program.get("id", (univ_id, position, program.get("name")))
+            self._remove(program_id)
+
+            entry = (
+                univ_id,
+                normalize_program_text(program.get("name")),
+                normalize_program_text(program.get("field")),
+            )
+            self._programs[program_id] = entry
+            self._program_counts[univ_id] = self._program_counts.get(univ_id, 0) + 1
+            self._names.add(entry[1], univ_id)
+            self._fields.add(entry[2], univ_id)
+            changed = True
+
+        if changed:
+            self._query_cache.clear()
+
+    def remove(self, program_ids: Iterable):
+        """Drop programs by id"""
+        for program_id in program_ids:
+            self._remove(program_id)
+        self._query_cache.clear()
+
+    def _remove(self, program_id):
+        entry = self._programs.pop(program_id, None)
+        if entry is None:
+            return
+        univ_id, name, field = entry
+        self._names.remove(name, univ_id)
+        self._fields.remove(field, univ_id)
+        self._program_counts[univ_id] -= 1
+        if not self._program_counts[univ_id]:
+            del self._program_counts[univ_id]
+
+    def match(
+        self,
+        major: Optional[str],
+        field_of_study: Optional[str] = None,
+        alternative_majors: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Strongest match per university
+
+        Returns:
+            Mapping of university_id -> MATCH_NAME, MATCH_FIELD or MATCH_ALTERNATIVE.
+            Universities with programs but no match are absent.
+        """
+        key = (
+            normalize_program_text(major),
+            normalize_program_text(field_of_study),
+            tuple(normalize_program_text(m) for m in alternative_majors or ()),
+        )
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return cached
+
+        strengths: Dict = {}
+        for alt in alternative_majors or ():
+            for univ_id in self._names.universities_matching(expand_major(alt)):
+                strengths[univ_id] = MATCH_ALTERNATIVE
+        if field_of_study:
+            for univ_id in self._fields.universities_matching(expand_major(field_of_study)):
+                strengths[univ_id] = MATCH_FIELD
+        for univ_id in self._names.universities_matching(expand_major(major)):
+            strengths[univ_id] = MATCH_NAME
+
+        with self._cache_lock:
+            self._query_cache[key] = strengths
+            while len(self._query_cache) > self._cache_size:
+                self._query_cache.popitem(last=False)
+        return strengths
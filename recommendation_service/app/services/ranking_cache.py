@@ -0,0 +1,106 @@
+"""
+Ranking Cache - Cursor-addressed store of computed recommendation rankings
+
+A ranking is computed once per generate call and stored under an opaque
+cursor token, so later pages are sliced from memory (or Redis, when
+configured, so any worker can serve them) instead of being recomputed or
+re-read from the database.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional
+import logging
+import os
+import secrets
+import time
+
+from app.cache.redis_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+
+RANKING_CURSOR_TTL_SECONDS = int(os.getenv("RANKING_CURSOR_TTL_SECONDS", "900"))
+RANKING_CACHE_MAX_ENTRIES = int(os.getenv("RANKING_CACHE_MAX_ENTRIES", "1000"))
+REDIS_KEY_PREFIX = "ranking:"
+
+
+class RankingCache:
+    """
+    Two-level cursor cache: per-process LRU in front of Redis
+
+    Entries are {"student_id", "rows", "model_version", "pending"}; rows are
+    stored without university data, which is re-attached from the catalog
+    snapshot.
+    """
+
+    def __init__(self, ttl: int = RANKING_CURSOR_TTL_SECONDS, max_entries: int = RANKING_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # cursor -> (expires_at, entry)
+        self._lock = Lock()
+
+    def put(self, student_id, rows: List[Dict], model_version: Optional[str] = None, pending: bool = False) -> str:
+        """
+        Store a ranking and return its cursor
+
+        `pending` marks a ranking whose rows past the first page are not
+        stored yet; `replace` it once they are.
+        """
+        cursor = secrets.token_urlsafe(16)
+        self.replace(cursor, student_id, rows, model_version, pending)
+        return cursor
+
+    def replace(self, cursor: str, student_id, rows: List[Dict], model_version: Optional[str] = None,
+                pending: bool = False) -> None:
+        """Store a ranking under an existing cursor"""
+        entry = {
+            "student_id": student_id,
+            "rows": [{k: v for k, v in row.items() if k != "universities"} for row in rows],
+            "model_version": model_version,
+            "pending": pending,
+        }
+
+        with self._lock:
+            self._entries[cursor] = (time.monotonic() + self.ttl, entry)
+            self._entries.move_to_end(cursor)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        get_cache().set(f"{REDIS_KEY_PREFIX}{cursor}", entry, ex=self.ttl)
+
+    def discard(self, cursor: str) -> None:
+        """Forget a ranking, e.g. when storing it failed"""
+        with self._lock:
+            self._entries.pop(cursor, None)
+        get_cache().delete(f"{REDIS_KEY_PREFIX}{cursor}")
+
+    def get(self, cursor: str) -> Optional[Dict]:
+        """Ranking for a cursor, or None if unknown or expired"""
+        with self._lock:
+            item = self._entries.get(cursor)
+            if item is not None:
+                expires_at, entry = item
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(cursor)
+                    return entry
+                del self._entries[cursor]
+
+        # Another worker may have computed it
+        entry = get_cache().get(f"{REDIS_KEY_PREFIX}{cursor}")
+        if entry is not None:
+            with self._lock:
+                self._entries[cursor] = (time.monotonic() + self.ttl, entry)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+
+_ranking_cache: Optional[RankingCache] = None
+
+
+def get_ranking_cache() -> RankingCache:
+    """Get the process-wide ranking cache"""
+    global _ranking_cache
+    if _ranking_cache is None:
+        _ranking_cache = RankingCache()
+    return _ranking_cache
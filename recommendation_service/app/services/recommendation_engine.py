@@ -4,6 +4,18 @@ Recommendation Engine - University Matching Algorithm (Cloud-Based)
 from typing import List, Dict, Tuple
 from supabase import Client
 import logging
+import time
+
+from app.monitoring import recommendation_stage, record_recommendations
+
+from .program_index import expand_major, text_matches
+from .vectorized_scorer import (
+    SCORE_WEIGHTS,
+    CATEGORY_NAMES,
+    UniversityColumns,
+    VectorizedScorer,
+    select_diverse_indices,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +37,58 @@ class RecommendationEngine:
         self, student: Dict, max_results: int = 15
     ) -> List[Dict]:
         """Generate university recommendations for a student"""
+        start_time = time.perf_counter()
+
+        with recommendation_stage('load'):
+            universities, programs_by_university = self._load_candidates(student, max_results)
+
+        if not universities:
+            return []
+
+        # Score all candidates at once on a columnar view of the universities
+        with recommendation_stage('features'):
+            columns = UniversityColumns(universities)
+
+        with recommendation_stage('predict'):
+            score_arrays = VectorizedScorer(columns).score(student, programs_by_university)
+
+            # Select top universities (ensure mix of categories)
+            selected = select_diverse_indices(
+                score_arrays["total"], score_arrays["category"], max_results
+            )
+
+        # Create recommendation dictionaries
+        recommendations = []
+        for index in selected:
+            university = universities[index]
+            scores = {key: float(score_arrays[key][index]) for key in SCORE_WEIGHTS}
+            total_score = float(score_arrays["total"][index])
+            strengths, concerns = self._generate_insights(
+                student, university, scores
+            )
+
+            recommendation = {
+                "student_id": student["id"],
+                "university_id": university["id"],
+                "match_score": round(total_score, 2),
+                "category": CATEGORY_NAMES[score_arrays["category"][index]],
+                "academic_score": round(scores["academic"], 2),
+                "financial_score": round(scores["financial"], 2),
+                "program_score": round(scores["program"], 2),
+                "location_score": round(scores["location"], 2),
+                "characteristics_score": round(scores["characteristics"], 2),
+                "strengths": strengths,
+                "concerns": concerns,
+                "favorited": 0,
+                "notes": None,
+            }
+            recommendations.append(recommendation)
+
+        record_recommendations(recommendations, time.perf_counter() - start_time)
+        return recommendations
+
+    def _load_candidates(self, student: Dict, max_results: int) -> Tuple[List[Dict], Dict[int, List[Dict]]]:
+        """Pre-filtered candidate universities and their programs"""
 
         # PERFORMANCE OPTIMIZATION: Apply pre-filtering to reduce data load
         # Instead of loading ALL universities, filter by student preferences first
@@ -80,7 +144,7 @@ class RecommendationEngine:
 
         if not universities:
             logger.error("No universities found in database at all")
-            return []
+            return [], {}
 
         logger.info(f"Loaded {len(universities)} candidate universities for matching")
 
@@ -105,58 +169,17 @@ class RecommendationEngine:
 
         logger.info(f"Loaded programs for {len(programs_by_university)} universities")
 
-        # Calculate scores for each university
-        scored_universities = []
-        for university in universities:
-            scores = self._calculate_scores(student, university, programs_by_university)
-            total_score = self._calculate_total_score(scores)
-            category = self._determine_category(student, university, scores)
-
-            scored_universities.append({
-                "university": university,
-                "total_score": total_score,
-                "category": category,
-                "scores": scores,
-            })
-
-        # Sort by total score
-        scored_universities.sort(key=lambda x: x["total_score"], reverse=True)
-
-        # Select top universities (ensure mix of categories)
-        selected = self._select_diverse_recommendations(
-            scored_universities, max_results
-        )
-
-        # Create recommendation dictionaries
-        recommendations = []
-        for item in selected:
-            strengths, concerns = self._generate_insights(
-                student, item["university"], item["scores"]
-            )
-
-            recommendation = {
-                "student_id": student["id"],
-                "university_id": item["university"]["id"],
-                "match_score": round(item["total_score"], 2),
-                "category": item["category"],
-                "academic_score": round(item["scores"]["academic"], 2),
-                "financial_score": round(item["scores"]["financial"], 2),
-                "program_score": round(item["scores"]["program"], 2),
-                "location_score": round(item["scores"]["location"], 2),
-                "characteristics_score": round(item["scores"]["characteristics"], 2),
-                "strengths": strengths,
-                "concerns": concerns,
-                "favorited": 0,
-                "notes": None,
-            }
-            recommendations.append(recommendation)
-
-        return recommendations
+        return universities, programs_by_university
 
     def _calculate_scores(
         self, student: Dict, university: Dict, programs_by_university: Dict
     ) -> Dict[str, float]:
-        """Calculate all dimension scores"""
+        """
+        Calculate all dimension scores for a single university
+
+        Reference implementation; generate_recommendations uses the equivalent
+        VectorizedScorer to score all candidates at once.
+        """
         return {
             "academic": self._calculate_academic_score(student, university),
             "financial": self._calculate_financial_score(student, university),
@@ -273,15 +296,17 @@ class RecommendationEngine:
         if not programs:
             return 60.0
 
-        # Look for exact major match
+        # Look for exact major match (normalized, with abbreviations expanded)
+        major = expand_major(student["intended_major"])
         for program in programs:
-            if student["intended_major"].lower() in program["name"].lower():
+            if text_matches(major, program["name"]):
                 return 95.0
 
         # Look for field match
         if student.get("field_of_study"):
+            field = expand_major(student["field_of_study"])
             for program in programs:
-                if student["field_of_study"].lower() in (program.get("field") or "").lower():
+                if text_matches(field, program.get("field")):
                     return 80.0
 
         return 50.0
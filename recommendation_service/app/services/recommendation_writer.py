@@ -0,0 +1,138 @@
+"""
+Recommendation Writer - Diff-based persistence of a student's recommendations
+
+Compares a freshly generated ranking with the rows already stored for the
+student and writes only the difference: changed or new universities are
+upserted, dropped ones deleted, unchanged rows left alone. Student-owned
+columns (favorited, notes) are never overwritten.
+"""
+from typing import Dict, List, Tuple
+from supabase import Client
+import logging
+
+from app.monitoring import recommendation_stage
+
+logger = logging.getLogger(__name__)
+
+
+# Columns produced by the engine that decide whether a stored row is stale
+SCORE_COLUMNS = (
+    "match_score",
+    "category",
+    "academic_score",
+    "financial_score",
+    "program_score",
+    "location_score",
+    "characteristics_score",
+    "strengths",
+    "concerns",
+)
+
+# Columns owned by the student; kept from the stored row
+USER_STATE_COLUMNS = ("favorited", "notes")
+
+
+def _same_value(old, new) -> bool:
+    if isinstance(new, float) and old is not None:
+        return round(float(old), 2) == round(new, 2)
+    return old == new
+
+
+def diff_recommendations(stored: List[Dict], generated: List[Dict]) -> Tuple[List[Dict], List[Dict], List]:
+    """
+    Split a new ranking against stored rows
+
+    Returns:
+        (unchanged stored rows, generated rows to upsert, ids of stored rows to delete)
+    """
+    stored_by_university = {row["university_id"]: row for row in stored}
+    generated_ids = {rec["university_id"] for rec in generated}
+
+    unchanged, to_upsert = [], []
+    for rec in generated:
+        row = stored_by_university.get(rec["university_id"])
+        if row is not None and all(_same_value(row.get(col), rec.get(col)) for col in SCORE_COLUMNS):
+            unchanged.append(row)
+        else:
+            to_upsert.append({k: v for k, v in rec.items() if k not in USER_STATE_COLUMNS})
+
+    to_delete = [row["id"] for row in stored if row["university_id"] not in generated_ids]
+    return unchanged, to_upsert, to_delete
+
+
+def with_universities(rows: List[Dict], catalog) -> List[Dict]:
+    """Attach university rows from the catalog snapshot, like a `universities(*)` join"""
+    for row in rows:
+        index = catalog.index_by_id.get(row["university_id"])
+        row["universities"] = catalog.universities[index] if index is not None else None
+    return rows
+
+
+class RecommendationWriter:
+    """Persists recommendations with at most one read, one upsert and one delete"""
+
+    def __init__(self, db: Client):
+        self.db = db
+
+    def save_first(self, recommendations: List[Dict]) -> List[Dict]:
+        """
+        Upsert the leading rows of a ranking ahead of the full `sync`
+
+        Nothing is deleted, so the rest of the ranking can be synced later.
+
+        Returns:
+            The stored rows, ordered by match_score descending
+        """
+        if not recommendations:
+            return []
+
+        with recommendation_stage('write'):
+            response = self.db.table('recommendations')\
+                .upsert(
+                    [{k: v for k, v in rec.items() if k not in USER_STATE_COLUMNS} for rec in recommendations],
+                    on_conflict='student_id,university_id',
+                    default_to_null=False,
+                )\
+                .execute()
+
+        rows = response.data or []
+        rows.sort(key=lambda row: row.get("match_score") or 0, reverse=True)
+        return rows
+
+    def sync(self, student_id, recommendations: List[Dict]) -> List[Dict]:
+        """
+        Make the student's stored recommendations match `recommendations`
+
+        Returns:
+            The stored rows (with id, created_at, favorited, notes) for the new
+            ranking, ordered by match_score descending
+        """
+        with recommendation_stage('write'):
+            stored = self.db.table('recommendations')\
+                .select('*')\
+                .eq('student_id', student_id)\
+                .execute().data or []
+
+            unchanged, to_upsert, to_delete = diff_recommendations(stored, recommendations)
+
+            written: List[Dict] = []
+            if to_upsert:
+                response = self.db.table('recommendations')\
+                    .upsert(to_upsert, on_conflict='student_id,university_id', default_to_null=False)\
+                    .execute()
+                written = response.data or []
+
+            if to_delete:
+                self.db.table('recommendations')\
+                    .delete(returning='minimal')\
+                    .in_('id', to_delete)\
+                    .execute()
+
+        logger.info(
+            f"Recommendations for student {student_id}: {len(unchanged)} unchanged, "
+            f"{len(to_upsert)} upserted, {len(to_delete)} deleted"
+        )
+
+        rows = unchanged + written
+        rows.sort(key=lambda row: row.get("match_score") or 0, reverse=True)
+        return rows
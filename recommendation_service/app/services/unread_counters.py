@@ -0,0 +1,78 @@
+"""
+Unread Counters - Maintained per-user, per-conversation unread message counts
+
+Counts live in `conversation_unread_counts` and are adjusted atomically by
+Postgres functions when messages are sent, read or deleted, so badges are a
+single indexed read instead of a scan of every message. Counter updates are
+best-effort; `rebuild` recomputes them from the `messages` table and is run
+periodically by app/jobs/unread_reconciler.py to repair any drift.
+"""
+from typing import Dict, Iterable, Optional
+from supabase import Client
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+COUNTERS_TABLE = "conversation_unread_counts"
+
+
+class UnreadCounters:
+    """Reads and adjusts the unread counter table"""
+
+    def __init__(self, db: Client):
+        self.db = db
+
+    def get_counts(self, user_id: str) -> Dict[str, int]:
+        """Non-zero unread counts for a user keyed by conversation ID (one query)"""
+        response = self.db.table(COUNTERS_TABLE).select('conversation_id, unread_count').eq(
+            'user_id', user_id
+        ).gt('unread_count', 0).execute()
+        return {row['conversation_id']: row['unread_count'] for row in (response.data or [])}
+
+    def message_sent(self, conversation_id: str, sender_id: str):
+        """A new message is unread for every participant except the sender"""
+        self._rpc('increment_unread_counts', {
+            'p_conversation_id': conversation_id,
+            'p_sender_id': sender_id,
+        })
+
+    def messages_read(self, user_id: str, read_by_conversation: Dict[str, int]):
+        """The user has newly read this many messages in each conversation"""
+        for conversation_id, count in read_by_conversation.items():
+            if count > 0:
+                self._decrement(conversation_id, [user_id], count)
+
+    def message_deleted(self, conversation_id: str, unread_user_ids: Iterable[str]):
+        """A deleted message no longer counts for participants who hadn't read it"""
+        user_ids = list(unread_user_ids)
+        if user_ids:
+            self._decrement(conversation_id, user_ids, 1)
+
+    def rebuild(self, user_id: Optional[str] = None) -> int:
+        """
+        Recompute counters from the messages table
+
+        Args:
+            user_id: Only rebuild this user's counters (default: everyone)
+
+        Returns:
+            Number of non-zero counters after the rebuild
+        """
+        response = self.db.rpc('rebuild_unread_counts', {'p_user_id': user_id}).execute()
+        return response.data or 0
+
+    def _decrement(self, conversation_id: str, user_ids, amount: int):
+        self._rpc('decrement_unread_counts', {
+            'p_conversation_id': conversation_id,
+            'p_user_ids': user_ids,
+            'p_amount': amount,
+        })
+
+    def _rpc(self, name: str, params: Dict):
+        # A failed adjustment must not fail the message operation; the
+        # reconciliation job corrects the counter
+        try:
+            self.db.rpc(name, params).execute()
+        except Exception as e:
+            logger.warning(f"Unread counter update {name} failed: {e}")
@@ -0,0 +1,169 @@
+"""
+User Growth Analytics - Registration time series from maintained daily rollups
+
+A trigger on `users` keeps `user_registration_rollups` (registrations per
+UTC day and current role) up to date. This module caches that small table
+in-process and answers the admin growth, role distribution and
+registration-comparison metrics from it, so dashboard loads cost
+O(days × roles) instead of a full `users` scan.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import time
+
+from supabase import Client
+
+from app.database.async_db import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+USER_GROWTH_CACHE_TTL_SECONDS = int(os.getenv("USER_GROWTH_CACHE_TTL_SECONDS", "300"))
+ROLLUPS_TABLE = "user_registration_rollups"
+PAGE_SIZE = 1000  # PostgREST default max rows per request
+
+# period -> (months shown, months back to the start of the comparison period)
+GROWTH_PERIODS = {
+    "3_months": (3, 6),
+    "6_months": (6, 12),
+    "1_year": (12, 24),
+}
+
+
+class UserGrowthSnapshot:
+    """Immutable view of the registration rollups with prefix sums over days"""
+
+    def __init__(self, rows: List[Dict]):
+        daily: Dict[date, int] = defaultdict(int)
+        roles: Dict[str, int] = defaultdict(int)
+        for row in rows:
+            day = row['registration_date']
+            day = day if isinstance(day, date) else date.fromisoformat(day)
+            count = int(row['user_count'])
+            daily[day] += count
+            roles[row['role']] += count
+
+        self.days: List[date] = sorted(daily)
+        self.daily_counts: List[int] = [daily[d] for d in self.days]
+        self._prefix = [0]
+        for count in self.daily_counts:
+            self._prefix.append(self._prefix[-1] + count)
+        self.role_counts: Dict[str, int] = {role: count for role, count in roles.items() if count}
+
+    @property
+    def total_users(self) -> int:
+        return self._prefix[-1]
+
+    def registrations(self, start: date, end: Optional[date] = None) -> int:
+        """Users registered on days in [start, end)"""
+        lo = bisect_left(self.days, start)
+        hi = len(self.days) if end is None else bisect_left(self.days, end)
+        return self._prefix[hi] - self._prefix[lo] if hi > lo else 0
+
+    def monthly(self, start: date) -> List[Tuple[date, int]]:
+        """(first day of month, registrations) for months with registrations since `start`"""
+        months: Dict[date, int] = defaultdict(int)
+        for i in range(bisect_left(self.days, start), len(self.days)):
+            day = self.days[i]
+            months[day.replace(day=1)] += self.daily_counts[i]
+        return sorted(months.items())
+
+    def growth(self, period: str, now: Optional[datetime] = None) -> Dict:
+        """
+        Cumulative monthly series for a period plus comparison with the
+        preceding period of equal length (unknown periods use 6_months)
+        """
+        months_back, comparison_months_back = GROWTH_PERIODS.get(period, GROWTH_PERIODS["6_months"])
+        now = now or datetime.now(timezone.utc)
+        start = (now - timedelta(days=months_back * 30)).date()
+        comparison_start = (now - timedelta(days=comparison_months_back * 30)).date()
+
+        current = self.registrations(start)
+        comparison = self.registrations(comparison_start, start)
+
+        data_points = []
+        cumulative = 0
+        for month, count in self.monthly(start):
+            cumulative += count
+            data_points.append({
+                'label': month.strftime('%b'),
+                'value': cumulative,
+                'date': datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+            })
+
+        if comparison > 0:
+            growth_rate = ((current - comparison) / comparison) * 100
+        else:
+            growth_rate = 100.0 if current > 0 else 0.0
+
+        return {
+            'data_points': data_points,
+            'total_users': self.total_users,
+            'growth_rate': round(growth_rate, 2),
+            'comparison_period_users': comparison,
+            'average_per_period': round(current / months_back, 2),
+        }
+
+
+class UserGrowthEngine:
+    """TTL-cached loader for the registration rollups"""
+
+    def __init__(self, ttl: int = USER_GROWTH_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._snapshot: Optional[UserGrowthSnapshot] = None
+        self._loaded_at = 0.0
+        self._generation = 0  # Bumped by invalidate(); a load started before it is not marked fresh
+        self._lock = Lock()
+
+    async def get_snapshot(self, db: Client) -> UserGrowthSnapshot:
+        """Cached snapshot, reloaded from the rollup table after the TTL"""
+        if self._snapshot is None or time.monotonic() - self._loaded_at > self.ttl:
+            await run_blocking(self._load, db)
+        return self._snapshot
+
+    def _load(self, db: Client):
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._loaded_at <= self.ttl:
+                return  # Another request just reloaded it
+            generation = self._generation
+            rows: List[Dict] = []
+            offset = 0
+            while True:
+                page = db.table(ROLLUPS_TABLE).select('registration_date, role, user_count').order(
+                    'registration_date'
+                ).order('role').range(offset, offset + PAGE_SIZE - 1).execute().data or []
+                rows.extend(page)
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+            self._snapshot = UserGrowthSnapshot(rows)
+            if self._generation == generation:
+                self._loaded_at = time.monotonic()
+            logger.info(f"User growth rollups loaded: {len(rows)} buckets, {self._snapshot.total_users} users")
+
+    def invalidate(self):
+        """Reload on next use; never waits for a load in progress"""
+        self._generation += 1
+        self._loaded_at = 0.0
+
+    def rebuild(self, db: Client) -> int:
+        """Recompute the rollups from the users table; returns the user count"""
+        total = db.rpc('rebuild_user_registration_rollups', {}).execute().data or 0
+        self.invalidate()
+        return total
+
+
+_user_growth_engine: Optional[UserGrowthEngine] = None
+
+
+def get_user_growth_engine() -> UserGrowthEngine:
+    """Get the process-wide user growth engine"""
+    global _user_growth_engine
+    if _user_growth_engine is None:
+        _user_growth_engine = UserGrowthEngine()
+    return _user_growth_engine
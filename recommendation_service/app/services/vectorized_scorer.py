@@ -0,0 +1,374 @@
+"""
+Vectorized Scorer - Columnar scoring path for the rule-based RecommendationEngine
+
+Loads candidate universities into NumPy arrays once and computes all five
+dimension scores plus the weighted total as array operations. Scores are
+bit-for-bit identical to the per-dict methods on RecommendationEngine.
+"""
+from typing import List, Dict, Optional, Iterable
+import logging
+
+import numpy as np
+
+from .program_index import ProgramMatchIndex, MATCH_NAME, MATCH_FIELD
+
+logger = logging.getLogger(__name__)
+
+
+SCORE_WEIGHTS = {
+    "academic": 0.30,
+    "financial": 0.25,
+    "program": 0.20,
+    "location": 0.15,
+    "characteristics": 0.10,
+}
+
+CATEGORY_SAFETY = 0
+CATEGORY_MATCH = 1
+CATEGORY_REACH = 2
+CATEGORY_NAMES = ("Safety", "Match", "Reach")
+
+SIZE_SMALL = 0
+SIZE_MEDIUM = 1
+SIZE_LARGE = 2
+SIZE_NAMES = ("Small", "Medium", "Large")
+
+
+def _numeric_column(universities: List[Dict], key: str) -> np.ndarray:
+    """Extract a numeric column, mapping missing values to NaN"""
+    return np.array(
+        [u.get(key) if u.get(key) is not None else np.nan for u in universities],
+        dtype=np.float64,
+    )
+
+
+def _truthy(column: np.ndarray) -> np.ndarray:
+    """Vectorized equivalent of `bool(value)` for a NaN-filled numeric column"""
+    return ~np.isnan(column) & (column != 0)
+
+
+class _Vocabulary:
+    """Maps string values to dense integer codes (-1 for missing/empty)"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, values: Iterable[Optional[str]]) -> np.ndarray:
+        encoded = []
+        for value in values:
+            if not value:
+                encoded.append(-1)
+                continue
+            code = self.codes.get(value)
+            if code is None:
+                code = len(self.codes)
+                self.codes[value] = code
+            encoded.append(code)
+        return np.array(encoded, dtype=np.int32)
+
+    def lookup(self, values: Iterable[str]) -> np.ndarray:
+        """Codes for known values; unknown values cannot match any row"""
+        return np.array(
+            [self.codes[v] for v in values if v in self.codes], dtype=np.int32
+        )
+
+
+class UniversityColumns:
+    """
+    Columnar view of a list of university dicts
+
+    Built once per candidate set; the row order matches the input list so
+    results can be mapped back to the original dicts by index.
+    """
+
+    def __init__(self, universities: List[Dict]):
+        self.universities = universities
+        self.size = len(universities)
+        self.ids = [u["id"] for u in universities]
+
+        self.gpa_average = _numeric_column(universities, "gpa_average")
+        self.sat_math_25th = _numeric_column(universities, "sat_math_25th")
+        self.sat_math_75th = _numeric_column(universities, "sat_math_75th")
+        self.sat_ebrw_25th = _numeric_column(universities, "sat_ebrw_25th")
+        self.sat_ebrw_75th = _numeric_column(universities, "sat_ebrw_75th")
+        self.act_25th = _numeric_column(universities, "act_composite_25th")
+        self.act_75th = _numeric_column(universities, "act_composite_75th")
+        self.total_cost = _numeric_column(universities, "total_cost")
+        self.total_students = _numeric_column(universities, "total_students")
+
+        # SAT totals use `or 0` semantics for each section, like the per-dict path
+        self.sat_25th = np.nan_to_num(self.sat_math_25th) + np.nan_to_num(self.sat_ebrw_25th)
+        self.sat_75th = np.nan_to_num(self.sat_math_75th) + np.nan_to_num(self.sat_ebrw_75th)
+        self.has_sat = _truthy(self.sat_math_25th) & _truthy(self.sat_ebrw_25th)
+
+        self.act_25th_filled = np.nan_to_num(self.act_25th)
+        self.act_75th_filled = np.nan_to_num(self.act_75th)
+
+        self.size_bucket = np.select(
+            [self.total_students < 5000, self.total_students < 15000],
+            [SIZE_SMALL, SIZE_MEDIUM],
+            default=SIZE_LARGE,
+        )
+
+        self.vocab = _Vocabulary()
+        self.state_code = self.vocab.encode(u.get("state") for u in universities)
+        self.country_code = self.vocab.encode(u.get("country") for u in universities)
+        self.location_type_code = self.vocab.encode(u.get("location_type") for u in universities)
+        self.university_type_code = self.vocab.encode(u.get("university_type") for u in universities)
+
+    def take(self, rows: np.ndarray) -> "UniversityColumns":
+        """Subset of rows sharing this view's vocabulary, without re-reading the dicts"""
+        subset = object.__new__(UniversityColumns)
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                setattr(subset, name, value[rows])
+        subset.universities = [self.universities[i] for i in rows]
+        subset.ids = [self.ids[i] for i in rows]
+        subset.size = len(subset.ids)
+        subset.vocab = self.vocab
+        return subset
+
+
+class VectorizedScorer:
+    """
+    Scores every candidate university for a student in one pass
+
+    Mirrors RecommendationEngine._calculate_*_score exactly: terms are added in
+    the same order so floating point results are identical.
+    """
+
+    def __init__(self, columns: UniversityColumns):
+        self.columns = columns
+
+    def score(
+        self,
+        student: Dict,
+        programs_by_university: Dict,
+        program_index: Optional[ProgramMatchIndex] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Return dimension score arrays plus `total` and `category` arrays"""
+        scores = {
+            "academic": self.academic_scores(student),
+            "financial": self.financial_scores(student),
+            "program": self.program_scores(student, programs_by_university, program_index),
+            "location": self.location_scores(student),
+            "characteristics": self.characteristics_scores(student),
+        }
+
+        # Same left-to-right accumulation as sum() in _calculate_total_score
+        total = np.zeros(self.columns.size, dtype=np.float64)
+        for key, weight in SCORE_WEIGHTS.items():
+            total = total + scores[key] * weight
+
+        scores["total"] = total
+        scores["category"] = self.categories(scores["academic"])
+        return scores
+
+    def academic_scores(self, student: Dict) -> np.ndarray:
+        cols = self.columns
+        n = cols.size
+        score = np.zeros(n, dtype=np.float64)
+        factors = np.zeros(n, dtype=np.int64)
+
+        gpa = student.get("gpa")
+        if gpa:
+            has_gpa = _truthy(cols.gpa_average)
+            gpa_diff = gpa - cols.gpa_average
+            gpa_term = np.select(
+                [gpa_diff >= 0.3, gpa_diff >= 0, gpa_diff >= -0.3],
+                [90.0, 75.0, 60.0],
+                default=40.0,
+            )
+            score = score + np.where(has_gpa, gpa_term, 0.0)
+            factors += has_gpa
+
+        sat_total = student.get("sat_total")
+        if sat_total:
+            applies = cols.has_sat & (cols.sat_75th > 0)
+            spread = cols.sat_75th - cols.sat_25th
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct = (sat_total - cols.sat_25th) / spread
+            sat_term = np.select(
+                [sat_total >= cols.sat_75th, (sat_total >= cols.sat_25th) & (spread > 0), sat_total >= cols.sat_25th],
+                [90.0, 60 + (pct * 20), 70.0],
+                default=40.0,
+            )
+            score = score + np.where(applies, sat_term, 0.0)
+            factors += applies
+
+        act = student.get("act_composite")
+        if act:
+            applies = _truthy(cols.act_25th) & (cols.act_75th_filled > 0)
+            spread = cols.act_75th_filled - cols.act_25th_filled
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct = (act - cols.act_25th_filled) / spread
+            act_term = np.select(
+                [act >= cols.act_75th_filled, (act >= cols.act_25th_filled) & (spread > 0), act >= cols.act_25th_filled],
+                [90.0, 60 + (pct * 20), 70.0],
+                default=40.0,
+            )
+            score = score + np.where(applies, act_term, 0.0)
+            factors += applies
+
+        # Class rank depends only on the student, so it is a scalar term
+        if student.get("class_rank") and student.get("class_size"):
+            percentile = (student["class_size"] - student["class_rank"]) / student["class_size"]
+            if percentile >= 0.9:
+                rank_term = 90
+            elif percentile >= 0.75:
+                rank_term = 75
+            elif percentile >= 0.5:
+                rank_term = 60
+            else:
+                rank_term = 50
+            score = score + rank_term
+            factors += 1
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(factors > 0, score / factors, 70.0)
+
+    def financial_scores(self, student: Dict) -> np.ndarray:
+        cols = self.columns
+        budget = student.get("max_budget_per_year")
+        if not budget:
+            return np.full(cols.size, 70.0)
+
+        cost_diff = budget - cols.total_cost
+        tiered = np.select(
+            [cost_diff >= 10000, cost_diff >= 0, cost_diff >= -10000, cost_diff >= -20000],
+            [95.0, 85.0, 65.0, 45.0],
+            default=25.0,
+        )
+        return np.where(_truthy(cols.total_cost), tiered, 70.0)
+
+    def program_scores(
+        self,
+        student: Dict,
+        programs_by_university: Dict,
+        program_index: Optional[ProgramMatchIndex] = None,
+    ) -> np.ndarray:
+        cols = self.columns
+        major = student.get("intended_major")
+        if not major:
+            return np.full(cols.size, 70.0)
+
+        # One inverted-index lookup instead of a program scan per university
+        if program_index is None:
+            program_index = ProgramMatchIndex.from_programs_by_university(programs_by_university)
+        strengths = program_index.match(major, student.get("field_of_study"))
+
+        has_programs = np.fromiter(
+            (program_index.has_programs(univ_id) for univ_id in cols.ids), dtype=bool, count=cols.size
+        )
+        strength = [strengths.get(univ_id) for univ_id in cols.ids]
+        name_match = np.fromiter((s == MATCH_NAME for s in strength), dtype=bool, count=cols.size)
+        field_match = np.fromiter((s == MATCH_FIELD for s in strength), dtype=bool, count=cols.size)
+
+        return np.select(
+            [~has_programs, name_match, field_match],
+            [60.0, 95.0, 80.0],
+            default=50.0,
+        )
+
+    def location_scores(self, student: Dict) -> np.ndarray:
+        cols = self.columns
+        score = np.full(cols.size, 70.0)
+
+        preferred_states = student.get("preferred_states")
+        if preferred_states:
+            has_state = cols.state_code >= 0
+            in_states = np.isin(cols.state_code, cols.vocab.lookup(preferred_states))
+            score = score + np.where(has_state, np.where(in_states, 20, -10), 0)
+
+        preferred_countries = student.get("preferred_countries")
+        if preferred_countries:
+            has_country = cols.country_code >= 0
+            in_countries = np.isin(cols.country_code, cols.vocab.lookup(preferred_countries))
+            score = score + np.where(has_country, np.where(in_countries, 10, -20), 0)
+
+        location_pref = student.get("location_type_preference")
+        if location_pref:
+            pref_code = cols.vocab.lookup([location_pref])
+            matches = (cols.location_type_code >= 0) & np.isin(cols.location_type_code, pref_code)
+            score = score + np.where(matches, 10, 0)
+
+        return np.clip(score, 0, 100)
+
+    def characteristics_scores(self, student: Dict) -> np.ndarray:
+        cols = self.columns
+        score = np.full(cols.size, 70.0)
+
+        type_pref = student.get("preferred_university_type")
+        if type_pref:
+            pref_code = cols.vocab.lookup([type_pref])
+            matches = (cols.university_type_code >= 0) & np.isin(cols.university_type_code, pref_code)
+            score = score + np.where(matches, 15, 0)
+
+        size_pref = student.get("preferred_size")
+        if size_pref in SIZE_NAMES:
+            matches = _truthy(cols.total_students) & (cols.size_bucket == SIZE_NAMES.index(size_pref))
+            score = score + np.where(matches, 15, 0)
+
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def categories(academic: np.ndarray) -> np.ndarray:
+        return np.select(
+            [academic >= 80, academic >= 60],
+            [CATEGORY_SAFETY, CATEGORY_MATCH],
+            default=CATEGORY_REACH,
+        )
+
+
+def top_k_indices(values: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest `values` among `candidates`, ordered by score desc
+
+    Uses argpartition to avoid a full sort; ties are broken by original row
+    order, which matches a stable descending sort of the full list.
+    """
+    if k <= 0 or candidates.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    candidate_values = values[candidates]
+    if k < candidates.size:
+        kth = candidates.size - k
+        threshold = np.partition(candidate_values, kth)[kth]
+        above = candidates[candidate_values > threshold]
+        tied = candidates[candidate_values == threshold][: k - above.size]
+        candidates = np.concatenate([above, tied])
+        candidate_values = values[candidates]
+
+    order = np.lexsort((candidates, -candidate_values))
+    return candidates[order]
+
+
+def select_diverse_indices(total: np.ndarray, category: np.ndarray, max_results: int) -> List[int]:
+    """
+    Array version of RecommendationEngine._select_diverse_recommendations
+
+    Aims for 40% safety, 40% match and 20% reach, topping up from safety and
+    then match when a category is undersupplied.
+    """
+    safety = np.flatnonzero(category == CATEGORY_SAFETY)
+    match = np.flatnonzero(category == CATEGORY_MATCH)
+    reach = np.flatnonzero(category == CATEGORY_REACH)
+
+    safety_count = min(safety.size, int(max_results * 0.4))
+    match_count = min(match.size, int(max_results * 0.4))
+    reach_count = min(reach.size, int(max_results * 0.2))
+
+    remaining = max_results - (safety_count + match_count + reach_count)
+    if remaining > 0:
+        if safety.size > safety_count:
+            safety_count += min(remaining, safety.size - safety_count)
+            remaining = max_results - (safety_count + match_count + reach_count)
+        if remaining > 0 and match.size > match_count:
+            match_count += min(remaining, match.size - match_count)
+
+    selected = np.concatenate([
+        top_k_indices(total, safety, safety_count),
+        top_k_indices(total, match, match_count),
+        top_k_indices(total, reach, reach_count),
+    ])
+    return [int(i) for i in selected]
@@ -8,10 +8,13 @@ from .retry import (
     CircuitBreaker,
     RetryConfig,
     WIKIPEDIA_RATE_LIMITER,
+    WIKIDATA_RATE_LIMITER,
     DUCKDUCKGO_RATE_LIMITER,
     COLLEGE_SCORECARD_RATE_LIMITER,
     WIKIPEDIA_CIRCUIT_BREAKER,
+    WIKIDATA_CIRCUIT_BREAKER,
     DUCKDUCKGO_CIRCUIT_BREAKER,
+    COLLEGE_SCORECARD_CIRCUIT_BREAKER,
 )
 
 __all__ = [
@@ -20,8 +23,11 @@ __all__ = [
     'CircuitBreaker',
     'RetryConfig',
     'WIKIPEDIA_RATE_LIMITER',
+    'WIKIDATA_RATE_LIMITER',
     'DUCKDUCKGO_RATE_LIMITER',
     'COLLEGE_SCORECARD_RATE_LIMITER',
     'WIKIPEDIA_CIRCUIT_BREAKER',
+    'WIKIDATA_CIRCUIT_BREAKER',
     'DUCKDUCKGO_CIRCUIT_BREAKER',
+    'COLLEGE_SCORECARD_CIRCUIT_BREAKER',
 ]
@@ -7,6 +7,7 @@ from datetime import datetime
 import logging
 from uuid import UUID
 
+from app.database.async_db import execute, run_blocking
 from app.database.config import get_supabase
 
 logger = logging.getLogger(__name__)
@@ -72,6 +73,16 @@ class ActivityType:
     DATA_EXPORT = "data_export"
 
 
+def _record_rollup(db, activity: Dict[str, Any]):
+    """Count the activity in the dashboard rollups; never fails the caller"""
+    from app.services.activity_rollups import ActivityRollups  # Imports ActivityType from here
+
+    try:
+        ActivityRollups(db).record(activity)
+    except Exception as e:
+        logger.warning(f"Activity rollup update failed ({activity.get('action_type')}): {e}")
+
+
 async def log_activity(
     action_type: str,
     description: str,
@@ -124,10 +135,11 @@ async def log_activity(
         if user_agent:
             activity_data["user_agent"] = user_agent
 
-        response = db.table('activity_log').insert(activity_data).execute()
+        response = await execute(db.table('activity_log').insert(activity_data))
 
         if response.data:
             logger.debug(f"Activity logged: {action_type} - {description}")
+            await run_blocking(_record_rollup, db, response.data[0])
             return response.data[0]
         else:
             logger.warning(f"Failed to log activity: {action_type}")
@@ -186,6 +198,7 @@ def log_activity_sync(
 
         if response.data:
             logger.debug(f"Activity logged: {action_type} - {description}")
+            _record_rollup(db, response.data[0])
             return response.data[0]
         else:
             logger.warning(f"Failed to log activity: {action_type}")
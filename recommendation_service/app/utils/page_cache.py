@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import threading
 
+from app.monitoring import record_cache_access
+
 logger = logging.getLogger(__name__)
 
 
@@ -109,6 +111,7 @@ class PageCache:
 
                 if not response.data or len(response.data) == 0:
                     self.stats['misses'] += 1
+                    record_cache_access('page', False)
                     return None
 
                 entry = response.data[0]
@@ -119,6 +122,7 @@ class PageCache:
                     logger.debug(f"Cache expired for {url}")
                     self.stats['expired'] += 1
                     self.stats['misses'] += 1
+                    record_cache_access('page', False)
                     # Clean up expired entry
                     try:
                         self.supabase.table('page_cache').delete().eq('url_hash', cache_key).execute()
@@ -128,6 +132,7 @@ class PageCache:
 
                 # Cache hit
                 self.stats['hits'] += 1
+                record_cache_access('page', True)
                 cached_at = datetime.fromisoformat(entry['cached_at'].replace('Z', '+00:00'))
                 age_days = (datetime.now(cached_at.tzinfo) - cached_at).days
                 logger.debug(f"Cache HIT for {url} (age: {age_days} days)")
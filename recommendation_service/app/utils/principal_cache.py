@@ -0,0 +1,126 @@
+"""
+Principal Cache - Recently resolved users for authenticated requests
+
+get_current_user resolves a token's subject to a CurrentUser with one or two
+database reads (users, and admin_users for admin roles). Results are kept
+here for a short TTL in a bounded LRU, and concurrent requests for the same
+user share a single lookup. The token itself is still verified on every
+request; only the user record is cached.
+
+Code that changes what a principal carries (active/available roles,
+display name, admin role or scope) calls `invalidate_principal(user_id)`.
+The cache is per process, so other workers pick the change up when their
+entry expires (PRINCIPAL_CACHE_TTL_SECONDS).
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+class PrincipalCache:
+    """TTL + LRU cache of principals with per-user lookup coalescing"""
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # user id -> (expires_at, principal)
+        self._in_flight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._lock = Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def peek(self, user_id: str) -> Optional[Any]:
+        """Cached principal, or None if absent or expired"""
+        with self._lock:
+            item = self._entries.get(user_id)
+            if item is None:
+                return None
+            expires_at, principal = item
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    async def get(self, user_id: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached principal for user_id, loading it with `loader` on a miss
+
+        The lookup runs as its own task, so a caller that goes away (client
+        disconnect) does not cancel it for the others waiting on it.
+        Failures are not cached; every waiting caller gets the exception.
+        """
+        principal = self.peek(user_id)
+        if principal is not None:
+            self.stats['hits'] += 1
+            return principal
+
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.get(user_id)
+        if in_flight is not None and in_flight[0] is loop:
+            self.stats['coalesced'] += 1
+            task = in_flight[1]
+        else:
+            self.stats['misses'] += 1
+            task = loop.create_task(self._load(user_id, loader))
+            self._in_flight[user_id] = (loop, task)
+        return await asyncio.shield(task)
+
+    async def _load(self, user_id: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            principal = await loader()
+        finally:
+            registered = self._in_flight.get(user_id)
+            # Not registered any more: invalidated while loading, so the result may be stale
+            current = registered is not None and registered[1] is asyncio.current_task()
+            if current:
+                del self._in_flight[user_id]
+        if current:
+            self._store(user_id, principal)
+        return principal
+
+    def _store(self, user_id: str, principal: Any):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        """Drop a user's cached principal (and the result of a lookup already running)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+        self._in_flight.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._in_flight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the process-wide principal cache"""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
+
+
+def invalidate_principal(user_id: str):
+    """Forget a user's cached principal after changing their roles or profile"""
+    get_principal_cache().invalidate(user_id)
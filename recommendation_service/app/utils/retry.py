@@ -343,9 +343,12 @@ class CircuitBreaker:
 
 # Global rate limiters for common APIs
 WIKIPEDIA_RATE_LIMITER = RateLimiter(requests_per_second=1.0)  # 1 req/sec
+WIKIDATA_RATE_LIMITER = RateLimiter(requests_per_second=1.0)  # 1 req/sec
 DUCKDUCKGO_RATE_LIMITER = RateLimiter(requests_per_second=0.5)  # 1 req per 2 sec
 COLLEGE_SCORECARD_RATE_LIMITER = RateLimiter(requests_per_second=2.0)  # 2 req/sec
 
 # Global circuit breakers
 WIKIPEDIA_CIRCUIT_BREAKER = CircuitBreaker(failure_threshold=10, recovery_timeout=300)
+WIKIDATA_CIRCUIT_BREAKER = CircuitBreaker(failure_threshold=10, recovery_timeout=300)
 DUCKDUCKGO_CIRCUIT_BREAKER = CircuitBreaker(failure_threshold=10, recovery_timeout=300)
+COLLEGE_SCORECARD_CIRCUIT_BREAKER = CircuitBreaker(failure_threshold=10, recovery_timeout=300)
@@ -12,6 +12,8 @@ from pydantic import BaseModel
 import logging
 
 from app.database.config import get_supabase, get_supabase_admin
+from app.database.async_db import run_blocking
+from app.utils.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,9 @@ security = HTTPBearer()
 SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET", "")
 ALGORITHM = "HS256"
 
+# users columns needed to build a CurrentUser
+PRINCIPAL_USER_COLUMNS = 'id, email, active_role, display_name, available_roles'
+
 # CRITICAL: Validate JWT secret at startup
 def _validate_jwt_secret():
     """
@@ -187,6 +192,70 @@ async def verify_supabase_token(token: str) -> TokenPayload:
         )
 
 
+def _load_principal(user_id: str) -> CurrentUser:
+    """
+    Build the CurrentUser for a token subject (blocking; run on the DB executor)
+
+    Raises:
+        HTTPException: 404 if the user does not exist
+        Exception: if the admin_users record cannot be read
+    """
+    # Fetch user from database (use admin client to bypass RLS)
+    db = get_supabase_admin()
+    response = db.table('users').select(PRINCIPAL_USER_COLUMNS).eq('id', user_id).single().execute()
+
+    if not response.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    user_data = response.data
+    user_role = user_data.get('active_role', UserRole.STUDENT)
+
+    # Build base user
+    current_user = CurrentUser(
+        id=user_data['id'],
+        email=user_data['email'],
+        role=user_role,
+        display_name=user_data.get('display_name'),
+        available_roles=user_data.get('available_roles', [])
+    )
+
+    # If user has an admin role, fetch admin-specific fields. A failed read
+    # propagates: a principal without its regional scope must never be served
+    # (or cached), since it would see every region.
+    normalized = UserRole.normalize_role(user_role)
+    if normalized in [UserRole.normalize_role(r) for r in UserRole.admin_roles()]:
+        admin_resp = db.table('admin_users').select(
+            'admin_role, regional_scope'
+        ).eq('id', user_data['id']).limit(1).execute()
+
+        if admin_resp.data:
+            admin_role = admin_resp.data[0].get('admin_role')
+            regional_scope = admin_resp.data[0].get('regional_scope')
+            current_user.admin_role = admin_role
+            current_user.regional_scope = regional_scope
+            current_user.is_regional_admin = (
+                admin_role in ('regionaladmin', 'admin_regional')
+                and regional_scope is not None
+            )
+
+    return current_user
+
+
+async def resolve_principal(user_id: str) -> CurrentUser:
+    """
+    CurrentUser for a verified token subject
+
+    Served from the principal cache (short TTL, invalidated on role/profile
+    changes); concurrent requests for the same user share one lookup.
+    Returns a copy, so callers may modify it.
+    """
+    principal = await get_principal_cache().get(user_id, lambda: run_blocking(_load_principal, user_id))
+    return principal.model_copy(deep=True)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> CurrentUser:
@@ -205,50 +274,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Fetch user from database (use admin client to bypass RLS)
     try:
-        db = get_supabase_admin()
-        response = db.table('users').select('*').eq('id', token_data.sub).single().execute()
-
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        user_data = response.data
-        user_role = user_data.get('active_role', UserRole.STUDENT)
-
-        # Build base user
-        current_user = CurrentUser(
-            id=user_data['id'],
-            email=user_data['email'],
-            role=user_role,
-            display_name=user_data.get('display_name'),
-            available_roles=user_data.get('available_roles', [])
-        )
-
-        # If user has an admin role, fetch admin-specific fields
-        normalized = UserRole.normalize_role(user_role)
-        if normalized in [UserRole.normalize_role(r) for r in UserRole.admin_roles()]:
-            try:
-                admin_resp = db.table('admin_users').select(
-                    'admin_role, regional_scope'
-                ).eq('id', user_data['id']).single().execute()
-
-                if admin_resp.data:
-                    admin_role = admin_resp.data.get('admin_role')
-                    regional_scope = admin_resp.data.get('regional_scope')
-                    current_user.admin_role = admin_role
-                    current_user.regional_scope = regional_scope
-                    current_user.is_regional_admin = (
-                        admin_role in ('regionaladmin', 'admin_regional')
-                        and regional_scope is not None
-                    )
-            except Exception as admin_err:
-                logger.warning(f"Could not fetch admin_users record: {admin_err}")
-
-        return current_user
+        return await resolve_principal(token_data.sub)
 
     except HTTPException:
         raise
@@ -277,21 +304,7 @@ async def get_optional_user(
         if not token_data.sub:
             return None
 
-        db = get_supabase_admin()
-        response = db.table('users').select('*').eq('id', token_data.sub).single().execute()
-
-        if not response.data:
-            return None
-
-        user_data = response.data
-
-        return CurrentUser(
-            id=user_data['id'],
-            email=user_data['email'],
-            role=user_data.get('active_role', UserRole.STUDENT),
-            display_name=user_data.get('display_name'),
-            available_roles=user_data.get('available_roles', [])
-        )
+        return await resolve_principal(token_data.sub)
 
     except Exception as e:
         logger.warning(f"Optional auth failed: {e}")
@@ -2,38 +2,186 @@
 Supabase-based Logging Handler
 Writes logs to Supabase instead of local files
 Phase 2 Enhancement - Cloud Migration
+
+Records are queued in a bounded buffer (SYSTEM_LOG_BUFFER_SIZE) and shipped
+by a background thread in multi-row inserts, either when a full batch is
+waiting or every SYSTEM_LOG_FLUSH_INTERVAL seconds. `emit` never blocks on
+the network. When the buffer is full an entry is dropped according to
+SYSTEM_LOG_DROP_POLICY:
+
+- lowest_level (default): the oldest entry of the lowest level (DEBUG
+  first); an incoming record below everything buffered is dropped instead
+- oldest: the oldest entry, whatever its level
+- newest: the incoming record
+
+If Supabase cannot be reached, batches are appended to a gzip-compressed
+JSON-lines spill file in SYSTEM_LOG_SPILL_DIR (capped at
+SYSTEM_LOG_SPILL_MAX_BYTES) and inserts are retried with backoff. Once an
+insert succeeds the spilled entries are replayed. Buffer depth and dropped,
+shipped, spilled and replayed entries are exported as Prometheus metrics.
 """
 
+import glob
+import gzip
+import itertools
+import json
 import logging
 import os
+import re
 import sys
+import tempfile
 import traceback
 import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, Optional
-from queue import Queue, Empty
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from uuid import uuid4
 import time
 
+from app.monitoring import record_logs_dropped, record_logs_handled, update_log_queue_depth
+
+
+SYSTEM_LOG_BUFFER_SIZE = int(os.getenv("SYSTEM_LOG_BUFFER_SIZE", "10000"))
+SYSTEM_LOG_BATCH_SIZE = int(os.getenv("SYSTEM_LOG_BATCH_SIZE", "500"))
+SYSTEM_LOG_FLUSH_INTERVAL = float(os.getenv("SYSTEM_LOG_FLUSH_INTERVAL", "2.0"))
+SYSTEM_LOG_DROP_POLICY = os.getenv("SYSTEM_LOG_DROP_POLICY", "lowest_level")
+SYSTEM_LOG_SPILL_DIR = os.getenv("SYSTEM_LOG_SPILL_DIR", os.path.join(tempfile.gettempdir(), "system_logs"))
+SYSTEM_LOG_SPILL_MAX_BYTES = int(os.getenv("SYSTEM_LOG_SPILL_MAX_BYTES", str(50 * 1024 * 1024)))
+SYSTEM_LOG_MAX_FIELD_CHARS = int(os.getenv("SYSTEM_LOG_MAX_FIELD_CHARS", "8000"))
+SYSTEM_LOG_MAX_BACKOFF = float(os.getenv("SYSTEM_LOG_MAX_BACKOFF", "60"))
+
+DROP_POLICIES = ('lowest_level', 'oldest', 'newest')
+
+# LogRecord attributes that are not "extra" data
+RECORD_ATTRIBUTES = frozenset([
+    'name', 'msg', 'args', 'created', 'filename', 'funcName',
+    'levelname', 'levelno', 'lineno', 'module', 'msecs',
+    'message', 'pathname', 'process', 'processName', 'relativeCreated',
+    'thread', 'threadName', 'exc_info', 'exc_text', 'stack_info', 'taskName'
+])
+
+_SPILL_FILE = re.compile(r'^system_logs-(\d+)(-[0-9a-f]+\.replay)?\.jsonl\.gz$')
+
+
+def _truncate(value: Optional[str]) -> Optional[str]:
+    if value is None or len(value) <= SYSTEM_LOG_MAX_FIELD_CHARS:
+        return value
+    return value[:SYSTEM_LOG_MAX_FIELD_CHARS] + f"... [truncated {len(value) - SYSTEM_LOG_MAX_FIELD_CHARS} chars]"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LogBuffer:
+    """
+    Bounded buffer of log entries, one FIFO per level
+
+    `take` returns entries in arrival order across levels. When the buffer
+    is full, `put` makes room according to the drop policy.
+    """
+
+    def __init__(self, capacity: int, drop_policy: str = 'lowest_level', batch_size: int = 1):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy '{drop_policy}' (expected one of {DROP_POLICIES})")
+        self.capacity = max(1, capacity)
+        self.drop_policy = drop_policy
+        self.batch_size = batch_size
+        self._levels: Dict[int, Deque[Tuple[int, Dict[str, Any]]]] = {}
+        self._size = 0
+        self._seq = itertools.count()
+        self._woken = False
+        self._condition = threading.Condition()
+
+    def put(self, levelno: int, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add an entry
+
+        Returns:
+            The entry dropped to make room (possibly `entry` itself), or None
+        """
+        with self._condition:
+            dropped = None
+            if self._size >= self.capacity:
+                victim = self._victim_level(levelno)
+                if victim is None:
+                    return entry
+                dropped = self._levels[victim].popleft()[1]
+                self._size -= 1
+
+            self._levels.setdefault(levelno, deque()).append((next(self._seq), entry))
+            self._size += 1
+            if self._size >= self.batch_size:
+                self._condition.notify()
+            return dropped
+
+    def _victim_level(self, levelno: int) -> Optional[int]:
+        """Level to evict from for an incoming record (None: drop the incoming record)"""
+        levels = [level for level, entries in self._levels.items() if entries]
+        if self.drop_policy == 'newest' or not levels:
+            return None
+        if self.drop_policy == 'oldest':
+            return min(levels, key=lambda level: self._levels[level][0][0])
+        lowest = min(levels)
+        return lowest if lowest <= levelno else None
+
+    def take(self, limit: int) -> List[Dict[str, Any]]:
+        """Remove and return up to `limit` entries, oldest first"""
+        with self._condition:
+            batch = []
+            while len(batch) < limit and self._size:
+                level = min(
+                    (level for level, entries in self._levels.items() if entries),
+                    key=lambda level: self._levels[level][0][0]
+                )
+                batch.append(self._levels[level].popleft()[1])
+                self._size -= 1
+            return batch
+
+    def wait(self, timeout: float):
+        """Block until a full batch is buffered, `wake` is called or the timeout passes"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._size >= self.batch_size or self._woken, timeout)
+            self._woken = False
+
+    def wake(self):
+        with self._condition:
+            self._woken = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        return self._size
+
 
 class SupabaseHandler(logging.Handler):
     """
     Custom logging handler that writes logs to Supabase
 
     Features:
-    - Async writing to avoid blocking
-    - Batch insertion for performance
-    - Fallback to console if Supabase unavailable
-    - Thread-safe operations
-    - Automatic retry on failure
+    - Non-blocking emit into a bounded, level-aware buffer
+    - Batch insertion on size or time, from a background thread
+    - Compressed on-disk spill while Supabase is unreachable, replayed on recovery
+    - Queue depth and drop metrics
     """
 
     def __init__(
         self,
         supabase_url: Optional[str] = None,
         supabase_key: Optional[str] = None,
-        batch_size: int = 10,
-        flush_interval: float = 5.0,
-        level=logging.INFO
+        batch_size: int = SYSTEM_LOG_BATCH_SIZE,
+        flush_interval: float = SYSTEM_LOG_FLUSH_INTERVAL,
+        level=logging.INFO,
+        buffer_size: int = SYSTEM_LOG_BUFFER_SIZE,
+        drop_policy: str = SYSTEM_LOG_DROP_POLICY,
+        spill_dir: Optional[str] = SYSTEM_LOG_SPILL_DIR,
+        spill_max_bytes: int = SYSTEM_LOG_SPILL_MAX_BYTES,
+        client=None
     ):
         """
         Initialize Supabase logging handler
@@ -41,37 +189,52 @@ class SupabaseHandler(logging.Handler):
         Args:
             supabase_url: Supabase project URL (or None to use env var)
             supabase_key: Supabase API key (or None to use env var)
-            batch_size: Number of logs to batch before writing
-            flush_interval: Seconds between forced flushes
+            batch_size: Maximum logs per insert; a full batch is shipped immediately
+            flush_interval: Seconds between flushes of a partial batch
             level: Minimum logging level
+            buffer_size: Maximum logs held in memory
+            drop_policy: What to drop when the buffer is full (see DROP_POLICIES)
+            spill_dir: Directory for the spill file (None disables spilling)
+            spill_max_bytes: Maximum compressed size of the spill file
+            client: Supabase client to use instead of creating one
         """
         super().__init__(level)
 
-        self.supabase = None
+        self.supabase = client
         self.enabled = False
-        self.queue = Queue()
+        self.buffer = LogBuffer(buffer_size, drop_policy, batch_size)
         self.batch_size = batch_size
         self.flush_interval = flush_interval
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
         self.worker_thread = None
         self.stop_event = threading.Event()
+        self.stats = {'shipped': 0, 'spilled': 0, 'replayed': 0, 'dropped': 0, 'failed_inserts': 0}
+
+        self._worker_ident: Optional[int] = None
+        self._shipping = False
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._spill_pending = spill_dir is not None  # Check for spill files left by earlier runs
 
         # Initialize Supabase connection
         try:
-            from supabase import create_client
+            if self.supabase is None:
+                from supabase import create_client
 
-            url = supabase_url or os.environ.get("SUPABASE_URL")
-            key = supabase_key or os.environ.get("SUPABASE_KEY")
+                url = supabase_url or os.environ.get("SUPABASE_URL")
+                key = supabase_key or os.environ.get("SUPABASE_KEY")
 
-            if not url or not key:
-                print("WARNING: Supabase credentials not found. Logging to console only.", file=sys.stderr)
-                self.enabled = False
-            else:
+                if not url or not key:
+                    print("WARNING: Supabase credentials not found. Logging to console only.", file=sys.stderr)
+                    return
                 self.supabase = create_client(url, key)
-                self.enabled = True
 
-                # Start background worker thread
-                self.worker_thread = threading.Thread(target=self._worker, daemon=True)
-                self.worker_thread.start()
+            self.enabled = True
+
+            # Start background worker thread
+            self.worker_thread = threading.Thread(target=self._worker, name="supabase-log-shipper", daemon=True)
+            self.worker_thread.start()
 
         except Exception as e:
             print(f"ERROR: Failed to initialize Supabase logging: {e}", file=sys.stderr)
@@ -84,17 +247,15 @@ class SupabaseHandler(logging.Handler):
         Args:
             record: LogRecord to emit
         """
-        if not self.enabled:
-            # Fallback to console
+        # Records raised while shipping (e.g. the HTTP client's own logs) would feed back into the queue
+        if not self.enabled or threading.get_ident() == self._worker_ident:
             return
 
         try:
-            # Build log entry
-            log_entry = self._build_log_entry(record)
-
-            # Add to queue
-            self.queue.put(log_entry)
-
+            dropped = self.buffer.put(record.levelno, self._build_log_entry(record))
+            if dropped is not None:
+                self.stats['dropped'] += 1
+                record_logs_dropped(dropped['level'], 'buffer_full')
         except Exception:
             self.handleError(record)
 
@@ -102,6 +263,9 @@ class SupabaseHandler(logging.Handler):
         """
         Build log entry dictionary from LogRecord
 
+        Every entry carries the same keys so a batch can be inserted as one
+        multi-row insert; long text fields are truncated.
+
         Args:
             record: LogRecord to convert
 
@@ -113,103 +277,239 @@ class SupabaseHandler(logging.Handler):
             'timestamp': datetime.fromtimestamp(record.created).isoformat(),
             'level': record.levelname,
             'logger_name': record.name,
-            'message': record.getMessage(),
+            'message': _truncate(record.getMessage()),
             'module': record.module,
             'function_name': record.funcName,
             'line_number': record.lineno,
             'process_id': record.process,
             'thread_id': record.thread,
+            'exception_type': None,
+            'exception_message': None,
+            'stack_trace': None,
         }
 
         # Exception information if present
         if record.exc_info:
             exc_type, exc_value, exc_tb = record.exc_info
             entry['exception_type'] = exc_type.__name__ if exc_type else None
-            entry['exception_message'] = str(exc_value) if exc_value else None
-            entry['stack_trace'] = ''.join(traceback.format_exception(exc_type, exc_value, exc_tb))
-
-        # Extra data (custom fields passed to logger)
-        extra_data = {}
-        for key, value in record.__dict__.items():
-            if key not in [
-                'name', 'msg', 'args', 'created', 'filename', 'funcName',
-                'levelname', 'levelno', 'lineno', 'module', 'msecs',
-                'message', 'pathname', 'process', 'processName', 'relativeCreated',
-                'thread', 'threadName', 'exc_info', 'exc_text', 'stack_info'
-            ]:
-                extra_data[key] = value
-
-        if extra_data:
-            entry['extra_data'] = extra_data
+            entry['exception_message'] = _truncate(str(exc_value)) if exc_value else None
+            entry['stack_trace'] = _truncate(''.join(traceback.format_exception(exc_type, exc_value, exc_tb)))
+
+        # Extra data (custom fields passed to logger), made JSON-safe
+        extra_data = {
+            key: value for key, value in record.__dict__.items()
+            if key not in RECORD_ATTRIBUTES
+        }
+        entry['extra_data'] = json.loads(json.dumps(extra_data, default=str)) if extra_data else {}
 
         return entry
 
+    # ==================== Shipping ====================
+
     def _worker(self):
         """
         Background worker thread that batches and writes logs to Supabase
         """
-        batch = []
-        last_flush = time.time()
+        self._worker_ident = threading.get_ident()
 
         while not self.stop_event.is_set():
             try:
-                # Try to get log entry from queue
-                try:
-                    entry = self.queue.get(timeout=0.1)
-                    batch.append(entry)
-                except Empty:
-                    pass
-
-                # Flush if batch is full or interval elapsed
-                now = time.time()
-                should_flush = (
-                    len(batch) >= self.batch_size or
-                    (batch and (now - last_flush) >= self.flush_interval)
-                )
-
-                if should_flush and batch:
-                    self._flush_batch(batch)
-                    batch = []
-                    last_flush = now
-
+                self.buffer.wait(self.flush_interval)
+                self._ship_pending()
+                if self._spill_pending and time.monotonic() >= self._retry_at:
+                    self._replay_spill()
             except Exception as e:
                 print(f"ERROR in Supabase logging worker: {e}", file=sys.stderr)
                 time.sleep(1)  # Avoid tight loop on persistent errors
 
-        # Flush remaining logs on shutdown
-        if batch:
-            self._flush_batch(batch)
+        # Ship (or spill) remaining logs on shutdown
+        try:
+            self._ship_pending()
+        except Exception as e:
+            print(f"ERROR: Failed to flush logs on shutdown: {e}", file=sys.stderr)
+
+    def _ship_pending(self):
+        """Ship everything buffered, a batch at a time"""
+        self._shipping = True
+        try:
+            while True:
+                batch = self.buffer.take(self.batch_size)
+                update_log_queue_depth(len(self.buffer))
+                if not batch:
+                    return
+                self._ship(batch)
+                if len(batch) < self.batch_size:
+                    return
+        finally:
+            self._shipping = False
+
+    def _ship(self, batch: List[Dict[str, Any]]):
+        """Insert a batch, or spill it while Supabase is backing off"""
+        if time.monotonic() < self._retry_at or not self._insert(batch):
+            self._spill(batch)
+            return
+
+        self.stats['shipped'] += len(batch)
+        record_logs_handled('shipped', len(batch))
+        if self._spill_pending:
+            self._replay_spill()
+
+    def _insert(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write batch of logs to Supabase; on failure start (or extend) the retry backoff"""
+        try:
+            self.supabase.table('system_logs').insert(batch, returning='minimal').execute()
+            self._backoff = 0.0
+            self._retry_at = 0.0
+            return True
+        except Exception as e:
+            self.stats['failed_inserts'] += 1
+            self._backoff = min(max(self._backoff * 2, 1.0), SYSTEM_LOG_MAX_BACKOFF)
+            self._retry_at = time.monotonic() + self._backoff
+            print(
+                f"ERROR: Failed to write {len(batch)} logs to Supabase: {e} "
+                f"(retrying in {self._backoff:.0f}s)",
+                file=sys.stderr
+            )
+            return False
+
+    # ==================== Spill file ====================
+
+    def _spill_path(self) -> str:
+        return os.path.join(self.spill_dir, f"system_logs-{os.getpid()}.jsonl.gz")
+
+    def _spill(self, batch: List[Dict[str, Any]]):
+        """Append a batch to this process's compressed spill file, or drop it if that is full"""
+        if self.spill_dir is None:
+            self._drop(batch, 'unreachable')
+            return
+
+        path = self._spill_path()
+        try:
+            if os.path.exists(path) and os.path.getsize(path) >= self.spill_max_bytes:
+                self._drop(batch, 'spill_full')
+                return
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with gzip.open(path, 'at', encoding='utf-8') as spill:
+                spill.writelines(json.dumps(entry, default=str) + '\n' for entry in batch)
+        except OSError as e:
+            print(f"ERROR: Failed to spill logs to {path}: {e}", file=sys.stderr)
+            self._drop(batch, 'spill_error')
+            return
+
+        self._spill_pending = True
+        self.stats['spilled'] += len(batch)
+        record_logs_handled('spilled', len(batch))
 
-    def _flush_batch(self, batch: list):
+    def _claim_spill_files(self) -> List[str]:
+        """
+        Take over this process's spill file and any left by processes that
+        no longer run, renaming each so nothing appends to it during replay
         """
-        Write batch of logs to Supabase
+        claimed = []
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, 'system_logs-*.jsonl.gz'))):
+            match = _SPILL_FILE.match(os.path.basename(path))
+            if not match:
+                continue
+            pid = int(match.group(1))
+            if pid != os.getpid() and _pid_alive(pid):
+                continue
+            target = os.path.join(self.spill_dir, f"system_logs-{os.getpid()}-{uuid4().hex[:8]}.replay.jsonl.gz")
+            try:
+                os.replace(path, target)
+            except OSError:
+                continue  # Claimed by another process
+            claimed.append(target)
+        return claimed
 
-        Args:
-            batch: List of log entries to write
+    def _replay_spill(self):
         """
-        if not self.supabase or not batch:
+        Insert spilled entries in batches
+
+        Stops at the first failed insert: the rest goes back to the spill
+        file for the next attempt. A truncated tail (crash while spilling)
+        is discarded.
+        """
+        self._spill_pending = False
+        if self.spill_dir is None or not os.path.isdir(self.spill_dir):
             return
 
-        try:
-            # Insert batch into Supabase
-            self.supabase.table('system_logs').insert(batch).execute()
-        except Exception as e:
-            print(f"ERROR: Failed to write logs to Supabase: {e}", file=sys.stderr)
-            # Fallback: print first few log messages to console
-            for entry in batch[:3]:
-                print(f"[{entry['level']}] {entry['logger_name']}: {entry['message']}", file=sys.stderr)
+        for path in self._claim_spill_files():
+            pending: List[Dict[str, Any]] = []
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as spill:
+                    lines = iter(spill)
+                    for line in lines:
+                        pending.append(json.loads(line))
+                        if len(pending) < self.batch_size:
+                            continue
+                        if not self._replay_batch(pending):
+                            self._respill(pending, lines)
+                            pending = []
+                            break
+                        pending = []
+            except (OSError, EOFError, ValueError) as e:
+                print(f"WARNING: Discarding unreadable tail of log spill file {path}: {e}", file=sys.stderr)
+
+            if pending and not self._replay_batch(pending):
+                self._spill(pending)
+            os.remove(path)
+
+            if self._spill_pending:
+                return  # Supabase went away again; retry after the backoff
+
+    def _replay_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        if not self._insert(batch):
+            return False
+        self.stats['replayed'] += len(batch)
+        record_logs_handled('replayed', len(batch))
+        return True
+
+    def _respill(self, batch: List[Dict[str, Any]], lines):
+        """Put a failed replay batch and the unread remainder back into the spill file"""
+        self._spill(batch)
+        chunk = []
+        for line in lines:
+            chunk.append(json.loads(line))
+            if len(chunk) >= self.batch_size:
+                self._spill(chunk)
+                chunk = []
+        if chunk:
+            self._spill(chunk)
+
+    def _drop(self, batch: List[Dict[str, Any]], reason: str):
+        self.stats['dropped'] += len(batch)
+        counts: Dict[str, int] = {}
+        for entry in batch:
+            counts[entry['level']] = counts.get(entry['level'], 0) + 1
+        for level, count in counts.items():
+            record_logs_dropped(level, reason, count)
+
+    # ==================== Lifecycle ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer depth and shipped/spilled/replayed/dropped counts"""
+        return {
+            'queue_depth': len(self.buffer),
+            'capacity': self.buffer.capacity,
+            'drop_policy': self.buffer.drop_policy,
+            'backing_off': time.monotonic() < self._retry_at,
+            **self.stats,
+        }
 
     def flush(self):
-        """Force flush all pending logs"""
-        # Wait for queue to empty (with timeout)
+        """Ship buffered logs now and wait (up to 5s) for the buffer to drain"""
+        if not self.enabled or threading.get_ident() == self._worker_ident:
+            return
+        self.buffer.wake()
         timeout = 5.0
         start = time.time()
-        while not self.queue.empty() and (time.time() - start) < timeout:
-            time.sleep(0.1)
+        while (len(self.buffer) or self._shipping) and (time.time() - start) < timeout:
+            time.sleep(0.05)
 
     def close(self):
         """Close the handler and flush remaining logs"""
         self.stop_event.set()
+        self.buffer.wake()
         if self.worker_thread and self.worker_thread.is_alive():
             self.worker_thread.join(timeout=5.0)
         super().close()
@@ -92,8 +92,7 @@ def import_college_scorecard_universities(limit=None):
         normalizer = SupabaseUniversityDataNormalizer()
         stats = normalizer.batch_save_universities(
             normalized_universities,
-            update_existing=True,
-            commit_batch_size=50
+            update_existing=True
         )
 
         print()
@@ -92,8 +92,7 @@ def import_the_rankings(test_mode=False):
     normalizer = SupabaseUniversityDataNormalizer()
     stats = normalizer.batch_save_universities(
         universities,
-        update_existing=True,
-        commit_batch_size=50
+        update_existing=True
     )
 
     print()
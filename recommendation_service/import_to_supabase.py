@@ -79,8 +79,7 @@ def import_universities(limit=None):
         normalizer = SupabaseUniversityDataNormalizer()
         stats = normalizer.batch_save_universities(
             universities,
-            update_existing=True,
-            commit_batch_size=50
+            update_existing=True
         )
 
         print()
@@ -11,10 +11,11 @@ Usage:
 import argparse
 import logging
 import sys
-from app.database.config import SessionLocal
+from collections import Counter
+from app.database.supabase_client import get_supabase_client
 from app.data_fetchers.college_scorecard import CollegeScorecardFetcher
 from app.data_fetchers.qs_rankings import QSRankingsCSVImporter
-from app.data_fetchers.data_normalizer import UniversityDataNormalizer
+from app.data_fetchers.supabase_normalizer import SupabaseUniversityDataNormalizer
 from app.data_fetchers.kaggle_downloader import KaggleDatasetDownloader
 
 # Configure logging
@@ -44,8 +45,8 @@ def import_from_college_scorecard(
 
     # Initialize fetcher and normalizer
     fetcher = CollegeScorecardFetcher()
-    normalizer = UniversityDataNormalizer()
-    db = SessionLocal()
+    normalizer = SupabaseUniversityDataNormalizer()
+    client = get_supabase_client()
 
     try:
         # Fetch universities
@@ -79,14 +80,11 @@ def import_from_college_scorecard(
         # Save to database
         logger.info("Saving to database...")
         stats = normalizer.batch_save_universities(
-            db,
             normalized_universities,
             update_existing=update_existing
         )
 
         # Print statistics
-        from app.models.university import University
-
         logger.info("=" * 80)
         logger.info("IMPORT STATISTICS")
         logger.info("=" * 80)
@@ -94,14 +92,11 @@ def import_from_college_scorecard(
         logger.info(f"Updated: {stats['updated']}")
         logger.info(f"Skipped: {stats['skipped']}")
         logger.info(f"Failed: {stats['failed']}")
-        logger.info(f"Total in database: {db.query(University).count()}")
+        logger.info(f"Total in database: {client.get_university_count()}")
         logger.info("=" * 80)
 
     except Exception as e:
         logger.error(f"Error during import: {e}", exc_info=True)
-        db.rollback()
-    finally:
-        db.close()
 
 
 def import_from_csv(
@@ -124,8 +119,8 @@ def import_from_csv(
 
     # Initialize importer and normalizer
     importer = QSRankingsCSVImporter()
-    normalizer = UniversityDataNormalizer()
-    db = SessionLocal()
+    normalizer = SupabaseUniversityDataNormalizer()
+    client = get_supabase_client()
 
     try:
         # Import from CSV
@@ -141,14 +136,11 @@ def import_from_csv(
         # Save to database
         logger.info("Saving to database...")
         stats = normalizer.batch_save_universities(
-            db,
             raw_universities,
             update_existing=update_existing
         )
 
         # Print statistics
-        from app.models.university import University
-
         logger.info("=" * 80)
         logger.info("IMPORT STATISTICS")
         logger.info("=" * 80)
@@ -156,7 +148,7 @@ def import_from_csv(
         logger.info(f"Updated: {stats['updated']}")
         logger.info(f"Skipped: {stats['skipped']}")
         logger.info(f"Failed: {stats['failed']}")
-        logger.info(f"Total in database: {db.query(University).count()}")
+        logger.info(f"Total in database: {client.get_university_count()}")
         logger.info("=" * 80)
 
     except FileNotFoundError as e:
@@ -164,9 +156,6 @@ def import_from_csv(
         logger.error("Please ensure the CSV file exists at the specified path")
     except Exception as e:
         logger.error(f"Error during import: {e}", exc_info=True)
-        db.rollback()
-    finally:
-        db.close()
 
 
 def import_specific_universities(names: list):
@@ -181,10 +170,10 @@ def import_specific_universities(names: list):
     logger.info("=" * 80)
 
     fetcher = CollegeScorecardFetcher()
-    normalizer = UniversityDataNormalizer()
-    db = SessionLocal()
+    normalizer = SupabaseUniversityDataNormalizer()
 
     try:
+        matches = []
         for name in names:
             logger.info(f"Searching for: {name}")
             results = fetcher.search_by_name(name)
@@ -195,17 +184,15 @@ def import_specific_universities(names: list):
                     normalized = fetcher.normalize_university_data(result)
                     if normalized:
                         logger.info(f"  - {normalized['name']}")
-                        normalizer.save_to_database(db, normalized)
-
-                db.commit()
+                        matches.append(normalized)
             else:
                 logger.warning(f"No matches found for: {name}")
 
+        if matches:
+            normalizer.batch_save_universities(matches)
+
     except Exception as e:
         logger.error(f"Error during import: {e}", exc_info=True)
-        db.rollback()
-    finally:
-        db.close()
 
 
 def import_from_kaggle(
@@ -267,31 +254,35 @@ def import_from_kaggle(
 
 def show_stats():
     """Show database statistics"""
-    from app.models.university import University
-    from sqlalchemy import func
+    client = get_supabase_client()
+
+    by_state = Counter()
+    by_type = Counter()
+    total = 0
+    page_size = 1000
+    while True:
+        rows = client.client.table('universities').select('id, state, university_type').order('id')\
+            .range(total, total + page_size - 1).execute().data or []
+        for row in rows:
+            by_state[row.get('state')] += 1
+            by_type[row.get('university_type')] += 1
+        total += len(rows)
+        if len(rows) < page_size:
+            break
 
-    db = SessionLocal()
-    try:
-        total = db.query(University).count()
-        by_state = db.query(University.state, func.count(University.id)).group_by(University.state).all()
-        by_type = db.query(University.university_type, func.count(University.id)).group_by(University.university_type).all()
-
-        logger.info("=" * 80)
-        logger.info("DATABASE STATISTICS")
-        logger.info("=" * 80)
-        logger.info(f"Total Universities: {total}")
-        logger.info("")
-        logger.info("By State:")
-        for state, count in sorted(by_state, key=lambda x: x[1], reverse=True)[:10]:
-            logger.info(f"  {state}: {count}")
-        logger.info("")
-        logger.info("By Type:")
-        for uni_type, count in by_type:
-            logger.info(f"  {uni_type}: {count}")
-        logger.info("=" * 80)
-
-    finally:
-        db.close()
+    logger.info("=" * 80)
+    logger.info("DATABASE STATISTICS")
+    logger.info("=" * 80)
+    logger.info(f"Total Universities: {total}")
+    logger.info("")
+    logger.info("By State:")
+    for state, count in by_state.most_common(10):
+        logger.info(f"  {state}: {count}")
+    logger.info("")
+    logger.info("By Type:")
+    for uni_type, count in by_type.items():
+        logger.info(f"  {uni_type}: {count}")
+    logger.info("=" * 80)
 
 
 def main():
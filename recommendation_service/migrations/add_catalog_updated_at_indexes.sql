@@ -0,0 +1,13 @@
+-- ========================================
+-- Catalog Snapshot Refresh Indexes
+-- ========================================
+-- Migration: add_catalog_updated_at_indexes.sql
+-- Purpose: Support incremental catalog refresh (app/services/catalog_snapshot.py),
+--          which polls universities/programs for rows with updated_at >= watermark
+-- ========================================
+
+CREATE INDEX IF NOT EXISTS idx_universities_updated_at
+ON universities(updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_programs_updated_at
+ON programs(updated_at, id);
@@ -0,0 +1,144 @@
+-- ========================================
+-- Activity Log Rollups
+-- ========================================
+-- Migration: create_activity_rollups.sql
+-- Purpose: Pre-aggregated activity_log counters maintained by
+--          app/services/activity_rollups.py, so the admin activity stats
+--          read a few hundred bucket rows instead of scanning activity_log
+-- ========================================
+
+-- Hourly counts per action type
+CREATE TABLE IF NOT EXISTS activity_rollups_hourly (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    action_type TEXT NOT NULL,
+    activity_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket_start, action_type)
+);
+
+-- Daily counts per user
+CREATE TABLE IF NOT EXISTS activity_user_rollups_daily (
+    bucket_date DATE NOT NULL,
+    user_id UUID NOT NULL,
+    user_name TEXT,
+    user_email TEXT,
+    activity_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket_date, user_id)
+);
+
+-- ========================================
+-- Incremental update (one call per logged activity)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION record_activity_rollup(
+    p_timestamp TIMESTAMPTZ,
+    p_action_type TEXT,
+    p_user_id UUID DEFAULT NULL,
+    p_user_name TEXT DEFAULT NULL,
+    p_user_email TEXT DEFAULT NULL
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO activity_rollups_hourly (bucket_start, action_type, activity_count)
+    VALUES (date_trunc('hour', p_timestamp), p_action_type, 1)
+    ON CONFLICT (bucket_start, action_type)
+    DO UPDATE SET activity_count = activity_rollups_hourly.activity_count + 1;
+
+    IF p_user_id IS NOT NULL THEN
+        INSERT INTO activity_user_rollups_daily (bucket_date, user_id, user_name, user_email, activity_count)
+        VALUES ((p_timestamp AT TIME ZONE 'UTC')::DATE, p_user_id, p_user_name, p_user_email, 1)
+        ON CONFLICT (bucket_date, user_id)
+        DO UPDATE SET
+            activity_count = activity_user_rollups_daily.activity_count + 1,
+            user_name = COALESCE(EXCLUDED.user_name, activity_user_rollups_daily.user_name),
+            user_email = COALESCE(EXCLUDED.user_email, activity_user_rollups_daily.user_email);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- Dashboard reads
+-- ========================================
+
+-- One row per action type with counts since each boundary
+CREATE OR REPLACE FUNCTION activity_rollup_counts(
+    p_today TIMESTAMPTZ,
+    p_week TIMESTAMPTZ,
+    p_month TIMESTAMPTZ,
+    p_recent TIMESTAMPTZ,
+    p_top_since TIMESTAMPTZ
+)
+RETURNS TABLE (
+    action_type TEXT,
+    total BIGINT,
+    today BIGINT,
+    this_week BIGINT,
+    this_month BIGINT,
+    recent BIGINT,
+    top_window BIGINT
+) AS $$
+    SELECT
+        r.action_type,
+        SUM(r.activity_count),
+        COALESCE(SUM(r.activity_count) FILTER (WHERE r.bucket_start >= p_today), 0),
+        COALESCE(SUM(r.activity_count) FILTER (WHERE r.bucket_start >= p_week), 0),
+        COALESCE(SUM(r.activity_count) FILTER (WHERE r.bucket_start >= p_month), 0),
+        COALESCE(SUM(r.activity_count) FILTER (WHERE r.bucket_start >= p_recent), 0),
+        COALESCE(SUM(r.activity_count) FILTER (WHERE r.bucket_start >= p_top_since), 0)
+    FROM activity_rollups_hourly r
+    GROUP BY r.action_type;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION top_activity_users(p_since DATE, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (user_id UUID, user_name TEXT, user_email TEXT, activity_count BIGINT) AS $$
+    SELECT
+        u.user_id,
+        MAX(u.user_name),
+        MAX(u.user_email),
+        SUM(u.activity_count) AS activity_count
+    FROM activity_user_rollups_daily u
+    WHERE u.bucket_date >= p_since
+    GROUP BY u.user_id
+    ORDER BY activity_count DESC
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ========================================
+-- Backfill / rebuild from activity_log
+-- ========================================
+-- Recomputes buckets in [p_since, p_until), which should be whole UTC days.
+-- Run from `python -m app.jobs.activity_rollup_backfill` in day windows.
+
+CREATE OR REPLACE FUNCTION backfill_activity_rollups(p_since TIMESTAMPTZ, p_until TIMESTAMPTZ)
+RETURNS BIGINT AS $$
+DECLARE
+    backfilled BIGINT;
+BEGIN
+    DELETE FROM activity_rollups_hourly
+    WHERE bucket_start >= p_since AND bucket_start < p_until;
+
+    INSERT INTO activity_rollups_hourly (bucket_start, action_type, activity_count)
+    SELECT date_trunc('hour', timestamp), action_type, COUNT(*)
+    FROM activity_log
+    WHERE timestamp >= p_since AND timestamp < p_until
+    GROUP BY 1, 2;
+
+    DELETE FROM activity_user_rollups_daily
+    WHERE bucket_date >= (p_since AT TIME ZONE 'UTC')::DATE
+      AND bucket_date < (p_until AT TIME ZONE 'UTC')::DATE;
+
+    INSERT INTO activity_user_rollups_daily (bucket_date, user_id, user_name, user_email, activity_count)
+    SELECT (timestamp AT TIME ZONE 'UTC')::DATE, user_id, MAX(user_name), MAX(user_email), COUNT(*)
+    FROM activity_log
+    WHERE timestamp >= p_since AND timestamp < p_until AND user_id IS NOT NULL
+    GROUP BY 1, 2;
+
+    SELECT COUNT(*) INTO backfilled
+    FROM activity_log
+    WHERE timestamp >= p_since AND timestamp < p_until;
+    RETURN backfilled;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Dashboard reads are admin-only through the service role
+ALTER TABLE activity_rollups_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE activity_user_rollups_daily ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,35 @@
+-- ========================================
+-- Enrichment Candidate Analysis
+-- ========================================
+-- Migration: create_enrichment_candidates.sql
+-- Purpose: Per-field missing-value counts over public.universities computed
+--          in the database, used by AsyncAutoFillOrchestrator.analyze_null_values
+--          (app/enrichment/candidate_selection.py) instead of downloading
+--          every row
+-- ========================================
+
+-- A field counts as missing when it is NULL, '' or numerically 0 (0, 0.0),
+-- matching the truthiness check the enrichment pipeline applies to each row
+-- (`not row.get(field)`). Numbers are compared as numbers and text as text,
+-- so 0.0 is missing while the string '0' is not.
+CREATE OR REPLACE FUNCTION university_null_field_counts(p_fields TEXT[])
+RETURNS TABLE (field_name TEXT, null_count BIGINT, total_count BIGINT) AS $$
+    SELECT
+        f.field_name,
+        COUNT(*) FILTER (
+            WHERE CASE jsonb_typeof(d.doc -> f.field_name)
+                WHEN 'number' THEN NULLIF((d.doc -> f.field_name)::numeric, 0) IS NULL
+                WHEN 'string' THEN NULLIF(d.doc ->> f.field_name, '') IS NULL
+                WHEN 'boolean' THEN NOT (d.doc -> f.field_name)::boolean
+                ELSE (d.doc -> f.field_name) IS NULL OR jsonb_typeof(d.doc -> f.field_name) = 'null'
+            END
+        ) AS null_count,
+        COUNT(*) AS total_count
+    FROM public.universities u
+    CROSS JOIN LATERAL (SELECT to_jsonb(u) AS doc) d
+    CROSS JOIN unnest(p_fields) AS f(field_name)
+    GROUP BY f.field_name;
+$$ LANGUAGE sql STABLE;
+
+-- Candidate selection pages through universities by id
+-- (primary key index already covers ORDER BY id)
@@ -0,0 +1,68 @@
+-- ========================================
+-- Notification Fan-out Jobs
+-- ========================================
+-- Migration: create_notification_jobs_table.sql
+-- Purpose: Job table for app/jobs/notification_worker.py (broadcasts and
+--          admin announcements), and the indexes its paged user scan and
+--          bulk preference lookups rely on
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS notification_jobs (
+    -- Primary key
+    job_id TEXT PRIMARY KEY,
+
+    -- Status tracking
+    status TEXT NOT NULL CHECK (status IN ('pending', 'running', 'completed', 'failed', 'cancelled')),
+
+    -- Timestamps
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+
+    -- Job parameters
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,  -- Notification fields shared by every recipient
+    target_roles TEXT[],  -- NULL = all users
+    user_ids TEXT[],      -- Explicit recipients (overrides target_roles)
+    campaign_id TEXT,     -- communication_campaigns row marked sent on completion
+    created_by TEXT,
+
+    -- Progress tracking
+    total_users INTEGER NOT NULL DEFAULT 0,
+    processed_users INTEGER NOT NULL DEFAULT 0,
+    notifications_created INTEGER NOT NULL DEFAULT 0,
+    skipped_users INTEGER NOT NULL DEFAULT 0,  -- Opted out via notification preferences
+    errors_count INTEGER NOT NULL DEFAULT 0,
+    cursor TEXT,  -- Last user id delivered; resumed jobs continue after it
+
+    -- Results
+    error_message TEXT,
+    results JSONB DEFAULT '{}'::jsonb,
+
+    -- Metadata
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_notification_jobs_status_created
+ON notification_jobs(status, created_at DESC);
+
+CREATE OR REPLACE FUNCTION update_notification_jobs_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notification_jobs_updated_at ON notification_jobs;
+CREATE TRIGGER notification_jobs_updated_at
+    BEFORE UPDATE ON notification_jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION update_notification_jobs_updated_at();
+
+-- ========================================
+-- Fan-out targets
+-- ========================================
+
+-- Role-targeted pages: available_roles && ARRAY[...] ORDER BY id
+CREATE INDEX IF NOT EXISTS idx_users_available_roles
+ON public.users USING GIN (available_roles);
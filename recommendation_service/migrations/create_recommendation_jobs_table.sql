@@ -0,0 +1,103 @@
+-- ========================================
+-- Bulk Recommendation Regeneration
+-- ========================================
+-- Migration: create_recommendation_jobs_table.sql
+-- Purpose: Job table for app/jobs/regeneration_worker.py, and the
+--          recommendations columns/constraints its bulk upserts rely on
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS recommendation_jobs (
+    -- Primary key
+    job_id TEXT PRIMARY KEY,
+
+    -- Status tracking
+    status TEXT NOT NULL CHECK (status IN ('pending', 'running', 'completed', 'failed', 'cancelled')),
+
+    -- Timestamps
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+
+    -- Job parameters
+    student_ids TEXT[],  -- Specific student profile IDs (NULL = all students)
+    max_results INTEGER NOT NULL DEFAULT 15,
+    chunk_size INTEGER NOT NULL DEFAULT 200,
+    max_workers INTEGER,
+
+    -- Progress tracking
+    total_students INTEGER NOT NULL DEFAULT 0,
+    processed_students INTEGER NOT NULL DEFAULT 0,
+    recommendations_written INTEGER NOT NULL DEFAULT 0,
+    errors_count INTEGER NOT NULL DEFAULT 0,
+    cursor TEXT,  -- Last student id written; resumed jobs continue after it
+
+    -- Results
+    error_message TEXT,
+    results JSONB DEFAULT '{}'::jsonb,
+
+    -- Metadata
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_recommendation_jobs_status_created
+ON recommendation_jobs(status, created_at DESC);
+
+CREATE OR REPLACE FUNCTION update_recommendation_jobs_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS recommendation_jobs_updated_at ON recommendation_jobs;
+CREATE TRIGGER recommendation_jobs_updated_at
+    BEFORE UPDATE ON recommendation_jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION update_recommendation_jobs_updated_at();
+
+-- ========================================
+-- Recommendations: upsert target
+-- ========================================
+
+-- Rows not re-stamped by a regeneration run are deleted after each chunk
+ALTER TABLE recommendations ADD COLUMN IF NOT EXISTS generated_at TIMESTAMPTZ;
+
+-- Upserts omit favorited so new rows need a default
+ALTER TABLE recommendations ALTER COLUMN favorited SET DEFAULT 0;
+
+-- Concurrent generate calls could store the same student/university twice,
+-- which would make the unique index below fail. Keep one row per pair:
+-- favorited first, then one with notes, then the newest; the kept row takes
+-- over the group's favorite flag and notes before the others are deleted.
+CREATE TEMP TABLE _recommendation_dedup AS
+SELECT
+    id,
+    ROW_NUMBER() OVER (
+        PARTITION BY student_id, university_id
+        ORDER BY
+            COALESCE(favorited, 0) DESC,
+            (notes IS NOT NULL AND notes <> '') DESC,
+            created_at DESC NULLS LAST,
+            id DESC
+    ) AS rn,
+    MAX(COALESCE(favorited, 0)) OVER (PARTITION BY student_id, university_id) AS group_favorited,
+    MAX(NULLIF(notes, '')) OVER (PARTITION BY student_id, university_id) AS group_notes,
+    COUNT(*) OVER (PARTITION BY student_id, university_id) AS group_size
+FROM recommendations;
+
+UPDATE recommendations r
+SET favorited = d.group_favorited,
+    notes = COALESCE(NULLIF(r.notes, ''), d.group_notes)
+FROM _recommendation_dedup d
+WHERE r.id = d.id AND d.rn = 1 AND d.group_size > 1;
+
+DELETE FROM recommendations r
+USING _recommendation_dedup d
+WHERE r.id = d.id AND d.rn > 1;
+
+DROP TABLE _recommendation_dedup;
+
+-- Conflict target for upserts (one row per student/university)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_recommendations_student_university
+ON recommendations(student_id, university_id);
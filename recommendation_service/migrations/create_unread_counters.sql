@@ -0,0 +1,101 @@
+-- =====================================================
+-- UNREAD MESSAGE COUNTERS
+-- =====================================================
+-- Migration: create_unread_counters.sql
+-- Purpose: Per-user, per-conversation unread counts maintained by
+--          app/services/unread_counters.py, so badges are one indexed read
+--          instead of a scan of every message's read_by array
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS public.conversation_unread_counts (
+  user_id UUID NOT NULL,
+  conversation_id UUID NOT NULL REFERENCES public.conversations(id) ON DELETE CASCADE,
+  unread_count INTEGER NOT NULL DEFAULT 0 CHECK (unread_count >= 0),
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+  PRIMARY KEY (user_id, conversation_id)
+);
+
+-- Badge lookups only read non-zero counters
+CREATE INDEX IF NOT EXISTS idx_unread_counts_user_nonzero
+  ON public.conversation_unread_counts(user_id) WHERE unread_count > 0;
+
+-- =====================================================
+-- COUNTER FUNCTIONS (atomic, called via RPC)
+-- =====================================================
+
+-- New message: +1 for every participant except the sender
+CREATE OR REPLACE FUNCTION increment_unread_counts(p_conversation_id UUID, p_sender_id UUID)
+RETURNS VOID AS $$
+BEGIN
+  INSERT INTO public.conversation_unread_counts (user_id, conversation_id, unread_count)
+  SELECT participant_id, p_conversation_id, 1
+  FROM public.conversations c, unnest(c.participant_ids) AS participant_id
+  WHERE c.id = p_conversation_id AND participant_id <> p_sender_id
+  ON CONFLICT (user_id, conversation_id)
+  DO UPDATE SET unread_count = conversation_unread_counts.unread_count + 1, updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Messages read or deleted: subtract, never below zero
+CREATE OR REPLACE FUNCTION decrement_unread_counts(p_conversation_id UUID, p_user_ids UUID[], p_amount INTEGER)
+RETURNS VOID AS $$
+BEGIN
+  UPDATE public.conversation_unread_counts
+  SET unread_count = GREATEST(unread_count - p_amount, 0), updated_at = NOW()
+  WHERE conversation_id = p_conversation_id AND user_id = ANY(p_user_ids);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Reconciliation: recompute from messages (all users, or one user)
+CREATE OR REPLACE FUNCTION rebuild_unread_counts(p_user_id UUID DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+  written INTEGER;
+BEGIN
+  CREATE TEMP TABLE actual_unread ON COMMIT DROP AS
+  SELECT participant_id AS user_id, m.conversation_id, COUNT(*)::INTEGER AS unread_count
+  FROM public.messages m
+  JOIN public.conversations c ON c.id = m.conversation_id
+  CROSS JOIN LATERAL unnest(c.participant_ids) AS participant_id
+  WHERE m.is_deleted = FALSE
+    AND m.sender_id <> participant_id
+    AND NOT (participant_id = ANY(COALESCE(m.read_by, ARRAY[]::UUID[])))
+    AND (p_user_id IS NULL OR participant_id = p_user_id)
+  GROUP BY participant_id, m.conversation_id;
+
+  -- Counters with no unread messages left
+  UPDATE public.conversation_unread_counts u
+  SET unread_count = 0, updated_at = NOW()
+  WHERE (p_user_id IS NULL OR u.user_id = p_user_id)
+    AND u.unread_count <> 0
+    AND NOT EXISTS (
+      SELECT 1 FROM actual_unread a
+      WHERE a.user_id = u.user_id AND a.conversation_id = u.conversation_id
+    );
+
+  INSERT INTO public.conversation_unread_counts (user_id, conversation_id, unread_count)
+  SELECT user_id, conversation_id, unread_count FROM actual_unread
+  ON CONFLICT (user_id, conversation_id)
+  DO UPDATE SET unread_count = EXCLUDED.unread_count, updated_at = NOW()
+  WHERE conversation_unread_counts.unread_count <> EXCLUDED.unread_count;
+
+  SELECT COUNT(*) INTO written FROM actual_unread;
+  DROP TABLE actual_unread;
+  RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =====================================================
+-- ROW LEVEL SECURITY
+-- =====================================================
+
+ALTER TABLE public.conversation_unread_counts ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own unread counts"
+  ON public.conversation_unread_counts
+  FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Initial backfill
+SELECT rebuild_unread_counts();
@@ -0,0 +1,85 @@
+-- ========================================
+-- User Growth Rollups
+-- ========================================
+-- Migration: create_user_growth_rollups.sql
+-- Purpose: Daily registration counts per current role, maintained by a
+--          trigger on public.users, read by app/services/user_growth.py so
+--          the admin growth / role analytics never scan the users table
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS public.user_registration_rollups (
+    registration_date DATE NOT NULL,
+    role TEXT NOT NULL,
+    user_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (registration_date, role)
+);
+
+-- ========================================
+-- Trigger: keep counts current on register / role change / delete
+-- ========================================
+-- Users are counted under their current active_role, so role switches move
+-- the user between buckets of their registration day.
+
+CREATE OR REPLACE FUNCTION bump_user_registration_rollup(p_date DATE, p_role TEXT, p_delta INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF p_date IS NULL THEN
+        RETURN;  -- Users without created_at are not part of the series
+    END IF;
+    INSERT INTO public.user_registration_rollups (registration_date, role, user_count)
+    VALUES (p_date, COALESCE(p_role, 'unknown'), p_delta)
+    ON CONFLICT (registration_date, role)
+    DO UPDATE SET user_count = user_registration_rollups.user_count + p_delta;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_user_registration_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_user_registration_rollup(
+            (OLD.created_at AT TIME ZONE 'UTC')::DATE, OLD.active_role, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_user_registration_rollup(
+            (NEW.created_at AT TIME ZONE 'UTC')::DATE, NEW.active_role, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_registration_rollups ON public.users;
+CREATE TRIGGER users_registration_rollups
+    AFTER INSERT OR DELETE OR UPDATE OF active_role, created_at ON public.users
+    FOR EACH ROW
+    EXECUTE FUNCTION track_user_registration_rollups();
+
+-- ========================================
+-- Rebuild from the users table (python -m app.jobs.user_growth_rebuild)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION rebuild_user_registration_rollups()
+RETURNS BIGINT AS $$
+DECLARE
+    total BIGINT;
+BEGIN
+    LOCK TABLE public.user_registration_rollups IN EXCLUSIVE MODE;
+    DELETE FROM public.user_registration_rollups;
+
+    INSERT INTO public.user_registration_rollups (registration_date, role, user_count)
+    SELECT (created_at AT TIME ZONE 'UTC')::DATE, COALESCE(active_role, 'unknown'), COUNT(*)
+    FROM public.users
+    WHERE created_at IS NOT NULL
+    GROUP BY 1, 2;
+
+    SELECT COALESCE(SUM(user_count), 0) INTO total FROM public.user_registration_rollups;
+    RETURN total;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE public.user_registration_rollups ENABLE ROW LEVEL SECURITY;
+
+-- Initial build
+SELECT rebuild_user_registration_rollups();
@@ -0,0 +1,110 @@
+"""
+Test Activity Rollups
+Dashboard stats come from pre-aggregated buckets that logging keeps current
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.activity_rollups import ActivityRollups, summarize_rollups
+from app.utils import activity_logger
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Call:
+    def __init__(self, result):
+        self.result = result
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return _Response(self.result)
+
+
+class _FakeDB:
+    def __init__(self, rpc_results=None, table_rows=None):
+        self.rpc_results = rpc_results or {}
+        self.table_rows = table_rows or []
+        self.rpcs = []
+
+    def rpc(self, name, params):
+        self.rpcs.append((name, params))
+        return _Call(self.rpc_results.get(name))
+
+    def table(self, name):
+        return _Call(self.table_rows)
+
+
+def _counts(action_type, total, today=0, this_week=0, this_month=0, recent=0, top_window=0):
+    return dict(action_type=action_type, total=total, today=today, this_week=this_week,
+                this_month=this_month, recent=recent, top_window=top_window)
+
+
+@pytest.mark.unit
+def test_summarize_rollups():
+    stats = summarize_rollups(
+        [
+            _counts('user_login', 500, today=20, this_week=90, this_month=300, recent=140, top_window=310),
+            _counts('user_registration', 40, today=2, this_week=5, this_month=12, recent=6, top_window=15),
+            _counts('program_updated', 7),
+        ],
+        [{'user_id': 'u1', 'user_name': None, 'user_email': 'a@x.org', 'activity_count': 42}],
+    )
+
+    assert stats.total_activities == 547
+    assert (stats.activities_today, stats.activities_this_week, stats.activities_this_month) == (22, 95, 312)
+    assert stats.top_action_types == {'user_login': 310, 'user_registration': 15}
+    assert stats.top_users == [{'user_id': 'u1', 'user_name': 'Unknown', 'user_email': 'a@x.org', 'activity_count': 42}]
+    assert (stats.recent_registrations, stats.recent_logins, stats.recent_applications) == (6, 20, 0)
+
+
+@pytest.mark.unit
+def test_get_stats_reads_two_rollups_with_utc_boundaries():
+    db = _FakeDB({'activity_rollup_counts': [_counts('user_login', 3, today=1)], 'top_activity_users': []})
+    now = datetime(2025, 3, 13, 15, 42, tzinfo=timezone.utc)  # Thursday
+
+    stats = asyncio.run(ActivityRollups(db).get_stats(now))
+
+    assert stats.total_activities == 3
+    (counts_name, params), (users_name, user_params) = db.rpcs
+    assert counts_name == 'activity_rollup_counts' and users_name == 'top_activity_users'
+    assert params['p_today'] == '2025-03-13T00:00:00+00:00'
+    assert params['p_week'] == '2025-03-10T00:00:00+00:00'
+    assert params['p_month'] == '2025-03-01T00:00:00+00:00'
+    assert params['p_recent'] == '2025-03-06T15:00:00+00:00'
+    assert user_params['p_since'] == '2025-02-11'
+
+
+@pytest.mark.unit
+def test_backfill_in_whole_day_windows():
+    db = _FakeDB({'backfill_activity_rollups': 10},
+                 table_rows=[{'timestamp': '2025-01-01T10:30:00+00:00'}])
+
+    counted = ActivityRollups(db).backfill(until=datetime(2025, 1, 16, 8, 0), window_days=7)
+
+    windows = [(p['p_since'][:10], p['p_until'][:10]) for _, p in db.rpcs]
+    assert windows == [('2025-01-01', '2025-01-08'), ('2025-01-08', '2025-01-15'), ('2025-01-15', '2025-01-17')]
+    assert counted == 30
+
+
+@pytest.mark.unit
+def test_logging_an_activity_updates_rollups(monkeypatch):
+    inserted = {'timestamp': '2025-03-13T15:42:00', 'action_type': 'user_login', 'user_id': 'u1'}
+    db = _FakeDB(table_rows=[inserted])
+    monkeypatch.setattr(activity_logger, 'get_supabase', lambda: db)
+
+    assert activity_logger.log_activity_sync('user_login', 'Logged in', user_id='u1') == inserted
+    assert asyncio.run(activity_logger.log_activity('user_login', 'Logged in', user_id='u1')) == inserted
+
+    assert [name for name, _ in db.rpcs] == ['record_activity_rollup'] * 2
+    assert db.rpcs[0][1]['p_timestamp'] == inserted['timestamp']
+
+    # A rollup failure never fails the logged activity
+    db.rpc = lambda name, params: (_ for _ in ()).throw(RuntimeError("rollups missing"))
+    assert activity_logger.log_activity_sync('user_login', 'Logged in') == inserted
@@ -0,0 +1,56 @@
+"""
+Test Async Database Access
+Blocking queries run off the event loop, concurrently, with timeouts
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.database.async_db import QueryTimeoutError, execute, gather
+
+
+class _SlowQuery:
+    def __init__(self, result, delay=0.2):
+        self.result = result
+        self.delay = delay
+
+    def execute(self):
+        time.sleep(self.delay)  # Blocking, like the sync supabase client
+        return self.result
+
+
+@pytest.mark.unit
+def test_slow_query_does_not_block_event_loop():
+    async def scenario():
+        ticks = []
+
+        async def heartbeat():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        result, _ = await asyncio.gather(execute(_SlowQuery("done")), heartbeat())
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert result == "done"
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
+
+
+@pytest.mark.unit
+def test_gather_runs_queries_concurrently_in_order():
+    async def scenario():
+        start = time.monotonic()
+        results = await gather(*(_SlowQuery(i) for i in range(4)))
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == [0, 1, 2, 3]
+    assert elapsed < 0.6  # Sequential would take 0.8s
+
+
+@pytest.mark.unit
+def test_timeout():
+    with pytest.raises(QueryTimeoutError):
+        asyncio.run(execute(_SlowQuery("late", delay=0.3), timeout=0.05))
@@ -0,0 +1,279 @@
+"""
+Test Availability Engine
+Busy interval sets, free slot listing, multi-staff search and the meeting/counseling services on top
+"""
+import asyncio
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.schemas.meeting import AvailableSlotsRequest
+from app.services.availability_engine import (
+    AvailabilityWindow,
+    BusyIntervals,
+    StaffSchedules,
+    free_slots,
+    iter_slots,
+    to_naive_utc,
+)
+from app.services import availability_engine, counseling_service
+from app.services.counseling_service import CounselingService
+from app.services.meeting_service import MeetingService
+
+
+MONDAY = date(2030, 1, 7)
+
+
+def _at(day_offset, hour, minute=0):
+    return datetime.combine(MONDAY + timedelta(days=day_offset), time(hour, minute))
+
+
+@pytest.mark.unit
+def test_busy_intervals_merge_and_overlap():
+    busy = BusyIntervals([
+        (_at(0, 10), _at(0, 11)),
+        (_at(0, 10, 30), _at(0, 11, 30)),  # Overlaps the first: merged
+        (_at(0, 11, 30), _at(0, 12)),      # Touches: merged
+        (_at(0, 14), _at(0, 15)),
+    ])
+
+    assert len(busy) == 2
+    assert busy.overlaps(_at(0, 11, 45), _at(0, 12, 15))
+    assert not busy.overlaps(_at(0, 12), _at(0, 14))                                # Back to back is free
+    assert busy.overlaps(_at(0, 12), _at(0, 13, 50), padding=timedelta(minutes=15))  # Not with a buffer
+    assert not BusyIntervals().overlaps(_at(0, 9), _at(0, 10))
+
+    assert to_naive_utc('2030-01-07T12:00:00+02:00') == _at(0, 10)
+    rows = [{'id': 'm1', 'scheduled_date': '2030-01-07T10:00:00Z', 'duration_minutes': 60}]
+    assert len(BusyIntervals.from_rows(rows, exclude_id='m1')) == 0
+
+
+@pytest.mark.unit
+def test_free_slots_match_brute_force():
+    rng = random.Random(7)
+    windows = [
+        AvailabilityWindow(0, time(9), time(17), 30, 45),
+        AvailabilityWindow(2, time(13), time(18), 60, 60),
+        AvailabilityWindow(2, time(8), time(10), 30, 30),
+    ]
+    meetings = []
+    for _ in range(200):
+        start = _at(rng.randrange(28), rng.randrange(8, 18), rng.choice([0, 15, 30, 45]))
+        meetings.append((start, start + timedelta(minutes=rng.choice([15, 30, 60, 90]))))
+
+    busy = BusyIntervals(meetings)
+    first, last = MONDAY, MONDAY + timedelta(days=27)
+    padding = timedelta(minutes=15)
+
+    expected = [
+        (s, e) for s, e in iter_slots(windows, first, last)
+        if not any(s - padding < me and e + padding > ms for ms, me in meetings)
+    ]
+    assert list(free_slots(windows, busy, first, last, padding=padding)) == expected
+
+    wednesday = [s for s, _ in iter_slots(windows, MONDAY + timedelta(days=2), MONDAY + timedelta(days=2))]
+    assert wednesday == sorted(wednesday)  # Windows are walked in start order
+
+
+@pytest.mark.unit
+def test_first_free_across_staff():
+    schedules = StaffSchedules()
+    schedules.add('busy', [AvailabilityWindow(0, time(9), time(12), 60, 60)],
+                  BusyIntervals([(_at(0, 9), _at(0, 12))]))
+    schedules.add('later', [AvailabilityWindow(0, time(11), time(12), 60, 60)])
+    schedules.add('tuesday', [AvailabilityWindow(1, time(8), time(9), 60, 60)])
+
+    assert schedules.first_free(MONDAY, MONDAY + timedelta(days=6)) == ('later', _at(0, 11), _at(0, 12))
+    assert schedules.first_free(MONDAY, MONDAY + timedelta(days=6), not_before=_at(0, 11)) == \
+        ('tuesday', _at(1, 8), _at(1, 9))
+    assert StaffSchedules().first_free(MONDAY, MONDAY) is None
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.window = None
+        self.one = False
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: to_naive_utc(row[column]) >= to_naive_utc(value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: to_naive_utc(row[column]) < to_naive_utc(value))
+        return self
+
+    def or_(self, expression):
+        self.filters.append(lambda row: row.get('active_role') == 'counselor')
+        return self
+
+    def order(self, column):
+        return self
+
+    def single(self):
+        self.one = True
+        return self
+
+    def limit(self, count):
+        self.window = (0, count)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def execute(self):
+        self.db.queries.append(self.table)
+        rows = [row for row in self.db.tables[self.table] if all(f(row) for f in self.filters)]
+        if self.window:
+            rows = rows[self.window[0]:self.window[1]]
+        return _Response(rows[0] if self.one else rows)
+
+
+class _FakeDB:
+    def __init__(self, **tables):
+        self.tables = tables
+        self.queries = []
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+def _meeting(meeting_id, start, minutes=30, status='approved', staff_id='t1'):
+    return {'id': meeting_id, 'staff_id': staff_id, 'status': status,
+            'scheduled_date': start.isoformat() + '+00:00', 'duration_minutes': minutes}
+
+
+@pytest.mark.unit
+def test_meeting_slots_and_conflicts():
+    service = MeetingService.__new__(MeetingService)
+    service.db = _FakeDB(
+        staff_availability=[
+            {'staff_id': 't1', 'day_of_week': 1, 'start_time': '09:00:00', 'end_time': '11:00:00', 'is_active': True},
+        ],
+        meetings=[
+            _meeting('m1', _at(0, 9, 45)),
+            _meeting('m2', _at(0, 6), minutes=60 * 4),       # Starts before the window, still blocks 9:00
+            _meeting('m3', _at(7, 9), status='declined'),
+            _meeting('m4', _at(7, 10), minutes=20),          # Ends 10:20; the buffer reaches 10:35
+        ],
+    )
+
+    request = AvailableSlotsRequest(
+        staff_id='t1', start_date=datetime.combine(MONDAY, time.min),
+        end_date=datetime.combine(MONDAY + timedelta(days=7), time.min), duration_minutes=30
+    )
+    slots = asyncio.run(service.get_available_slots(request))
+
+    # Grid every 45 minutes: 9:00 (m2 until 10:00), 9:45 (m1), 10:30 free;
+    # next Monday only 9:00, as m4 plus its buffer blocks 9:45 and 10:30
+    assert [s.start_time for s in slots] == [_at(0, 10, 30), _at(7, 9)]
+    assert slots[0].day_of_week == 1 and slots[0].day_name == 'Monday'
+    assert service.db.queries.count('meetings') == 1
+
+    conflict = lambda start, **kw: asyncio.run(service._check_scheduling_conflict('t1', start, 30, **kw))
+    assert conflict(_at(0, 10, 20))                         # Within the 15 minute buffer after m1
+    assert not conflict(_at(0, 10, 30))
+    assert not conflict(_at(0, 10, 20), exclude_meeting_id='m1')  # Rescheduling m1 itself
+
+
+@pytest.mark.unit
+def test_counseling_slots_booking_and_first_available():
+    future = MONDAY + timedelta(weeks=520)
+    at = lambda hour: datetime.combine(future, time(hour))
+    availability = lambda cid, start, end: {
+        'id': f'a-{cid}', 'counselor_id': cid, 'day_of_week': 0, 'start_time': start, 'end_time': end,
+        'session_duration': 60, 'is_active': True, 'created_at': '', 'updated_at': ''
+    }
+    service = CounselingService.__new__(CounselingService)
+    service.db = _FakeDB(
+        users=[{'id': 'c1', 'active_role': 'counselor'}, {'id': 'c2', 'active_role': 'counselor'},
+               {'id': 's1', 'active_role': 'student'}],
+        counselor_availability=[availability('c1', '09:00', '12:00'), availability('c2', '10:00', '12:00')],
+        counseling_sessions=[
+            {'id': 'x1', 'counselor_id': 'c1', 'status': 'scheduled',
+             'scheduled_date': at(9).isoformat() + 'Z', 'duration_minutes': 90},
+        ],
+    )
+
+    slots = asyncio.run(service.get_available_slots('c1', future.isoformat(), future.isoformat()))
+    assert [slot['start'] for slot in slots] == [at(11).isoformat()]  # 9:00 and 10:00 overlap x1
+
+    first = asyncio.run(service.find_first_available_counselor(future.isoformat(), future.isoformat()))
+    assert first == {'start': at(10).isoformat(), 'end': at(11).isoformat(),
+                     'duration_minutes': 60, 'counselor_id': 'c2'}
+
+    with pytest.raises(Exception, match='no longer available'):
+        asyncio.run(service.book_session_as_student('s1', 'c1', at(10).isoformat() + 'Z'))
+
+
+@pytest.mark.unit
+def test_first_available_counselor_pages_users_and_chunks_ids(monkeypatch):
+    for module in (availability_engine, counseling_service):
+        monkeypatch.setattr(module, 'PAGE_SIZE', 2)
+        monkeypatch.setattr(module, 'ID_CHUNK_SIZE', 2)
+
+    future = MONDAY + timedelta(weeks=520)
+    service = CounselingService.__new__(CounselingService)
+    service.db = _FakeDB(
+        users=[{'id': f'c{i}', 'active_role': 'counselor'} for i in range(5)],
+        counselor_availability=[
+            {'id': f'a{i}', 'counselor_id': f'c{i}', 'day_of_week': 0, 'start_time': f'{9 + i}:00',
+             'end_time': f'{10 + i}:00', 'session_duration': 60, 'is_active': True,
+             'created_at': '', 'updated_at': ''}
+            for i in (3, 4)
+        ],
+        counseling_sessions=[],
+    )
+
+    first = asyncio.run(service.find_first_available_counselor(future.isoformat(), future.isoformat()))
+
+    # The last counselors are only reached through the third users page and the second id chunk
+    assert first['counselor_id'] == 'c3'
+    assert service.db.queries.count('users') == 3
+    assert service.db.queries.count('counselor_availability') == 3
+
+
+@pytest.mark.unit
+def test_first_available_counselor_within_the_callers_institution():
+    future = MONDAY + timedelta(weeks=520)
+    service = CounselingService.__new__(CounselingService)
+    service.db = _FakeDB(
+        users=[
+            {'id': 'c1', 'active_role': 'counselor', 'institution_id': 'inst-a'},
+            {'id': 'c2', 'active_role': 'counselor', 'institution_id': 'inst-b'},
+            {'id': 's1', 'active_role': 'student', 'institution_id': 'inst-b'},
+            {'id': 's2', 'active_role': 'student', 'institution_id': None},
+        ],
+        counselor_availability=[
+            {'id': f'a-{cid}', 'counselor_id': cid, 'day_of_week': 0, 'start_time': start, 'end_time': '12:00',
+             'session_duration': 60, 'is_active': True, 'created_at': '', 'updated_at': ''}
+            for cid, start in (('c1', '09:00'), ('c2', '10:00'))
+        ],
+        counseling_sessions=[],
+    )
+    first = lambda user_id: asyncio.run(service.find_first_available_counselor(
+        future.isoformat(), future.isoformat(), institution_id=service.user_institution_id(user_id)
+    ))['counselor_id']
+
+    assert first('s1') == 'c2'  # Only inst-b counselors, though c1 is free earlier
+    assert first('s2') == 'c1'  # No institution: every counselor
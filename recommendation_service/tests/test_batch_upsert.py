@@ -0,0 +1,127 @@
+"""
+Test University Batch Upsert
+Multi-row chunks, split-and-retry, per-row failures and column grouping
+"""
+import threading
+import time
+
+import pytest
+
+from app.database import supabase_client
+from app.database.supabase_client import SupabaseClient
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Upsert:
+    def __init__(self, db, rows, on_conflict):
+        self.db = db
+        self.rows = rows
+        self.on_conflict = on_conflict
+
+    def execute(self):
+        with self.db.lock:
+            self.db.requests.append([dict(r) for r in self.rows])
+            self.db.in_flight += 1
+            self.db.peak = max(self.db.peak, self.db.in_flight)
+        try:
+            time.sleep(self.db.delay)
+            if any(row.get('name') == 'Broken' for row in self.rows):
+                raise Exception('violates check constraint')
+            return _Response([
+                {**row, 'created_at': 't0', 'updated_at': 't0' if row.get('new') else 't1'}
+                for row in self.rows
+            ])
+        finally:
+            with self.db.lock:
+                self.db.in_flight -= 1
+
+
+class _Table:
+    def __init__(self, db):
+        self.db = db
+
+    def upsert(self, rows, on_conflict=None):
+        return _Upsert(self.db, rows, on_conflict)
+
+
+class _FakeDB:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _Table(self)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(SupabaseClient, '_instance', None)
+    instance = SupabaseClient.__new__(SupabaseClient)
+    instance._client = _FakeDB()
+    return instance
+
+
+def _rows(count, **extra):
+    return [{'name': f'University {i}', 'country': 'USA', **extra} for i in range(count)]
+
+
+@pytest.mark.unit
+def test_chunks_instead_of_row_by_row(client):
+    rows = _rows(10, new=True) + _rows(5, country='Canada')
+
+    stats = client.batch_upsert_universities(rows, batch_size=4, max_workers=1)
+
+    assert (stats['added'], stats['updated'], stats['failed']) == (10, 5, 0)
+    assert len(client.client.requests) < len(rows)
+    assert sum(len(r) for r in client.client.requests) == len(rows)
+
+
+@pytest.mark.unit
+def test_failing_chunk_is_split_down_to_the_bad_row(client):
+    rows = _rows(8)
+    rows[5] = {'name': 'Broken', 'country': 'USA'}
+
+    stats = client.batch_upsert_universities(rows, batch_size=8, max_workers=1)
+
+    assert (stats['updated'], stats['failed']) == (7, 1)
+    assert stats['errors'] == [{'name': 'Broken', 'country': 'USA', 'error': 'violates check constraint'}]
+    assert len(client.client.requests) == 7  # 8 -> 4+4 -> 2+2 -> 1+1
+
+
+@pytest.mark.unit
+def test_duplicates_merged_and_column_sets_kept_apart(client):
+    rows = [
+        {'name': 'A', 'country': 'USA', 'city': 'Boston'},
+        {'name': 'B', 'country': 'USA'},
+        {'name': 'A', 'country': 'USA', 'global_rank': 5},
+        {'name': 'C', 'country': 'USA', 'city': 'Austin'},
+    ]
+
+    stats = client.batch_upsert_universities(rows, max_workers=1)
+
+    assert stats['updated'] == 4
+    assert sorted(client.client.requests, key=lambda r: r[0]['name']) == [
+        [{'name': 'A', 'country': 'USA', 'city': 'Boston', 'global_rank': 5}],
+        [{'name': 'B', 'country': 'USA'}],
+        [{'name': 'C', 'country': 'USA', 'city': 'Austin'}],
+    ]
+
+
+@pytest.mark.unit
+def test_chunk_size_adapts_and_chunks_run_concurrently(client, monkeypatch):
+    monkeypatch.setattr(supabase_client, 'UPSERT_TARGET_SECONDS', 10.0)
+    client._client = _FakeDB(delay=0.02)
+
+    stats = client.batch_upsert_universities(_rows(70), batch_size=5, max_workers=3)
+
+    sizes = [len(r) for r in client.client.requests]
+    assert stats['updated'] == 70
+    assert max(sizes) > 5  # Grew while requests were fast
+    assert client.client.peak > 1
@@ -0,0 +1,144 @@
+"""
+Test Enrichment Candidate Selection
+Paged narrow scans, candidate ranking, record_filled bookkeeping and NULL counts
+"""
+import pytest
+
+from app.enrichment.async_auto_fill_orchestrator import AsyncAutoFillOrchestrator
+from app.enrichment.candidate_selection import CandidateIndex, fetch_null_counts
+from app.enrichment import candidate_selection
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, db):
+        self.db = db
+        self.bounds = None
+
+    def select(self, columns):
+        self.db.columns = columns
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        self.db.pages += 1
+        start, end = self.bounds
+        return _Response([dict(row) for row in self.db.rows[start:end + 1]])
+
+
+class _Rpc:
+    def __init__(self, data):
+        self.data = data
+
+    def execute(self):
+        if isinstance(self.data, Exception):
+            raise self.data
+        return _Response(self.data)
+
+
+class _FakeDB:
+    def __init__(self, rows, rpc_result=None):
+        self.rows = rows
+        self.rpc_result = rpc_result if rpc_result is not None else RuntimeError("function does not exist")
+        self.pages = 0
+        self.columns = None
+
+    def table(self, name):
+        return _Query(self)
+
+    def rpc(self, name, params):
+        return _Rpc(self.rpc_result)
+
+
+def _university(uid, country='Canada', **values):
+    row = {'id': uid, 'name': f'University {uid}', 'country': country}
+    row.update({f: 1 for f in candidate_selection.FILLABLE_FIELDS})
+    row.update(values)
+    return row
+
+
+@pytest.mark.unit
+def test_load_pages_past_postgrest_limit(monkeypatch):
+    monkeypatch.setattr(candidate_selection, 'PAGE_SIZE', 3)
+    rows = [_university(i, city=None if i % 2 else 'Town') for i in range(1, 8)]
+    db = _FakeDB(rows)
+
+    index = CandidateIndex()
+    index.load(db)
+
+    assert db.pages == 3
+    assert '*' not in db.columns and db.columns.startswith('id, name, country')
+    assert index.total == 7
+    assert [u['id'] for u in index.select()] == [1, 3, 5, 7]
+
+
+@pytest.mark.unit
+def test_ranking_us_boost_and_us_only():
+    db = _FakeDB([
+        _university(1, city=None, state=None, website=None),
+        _university(2, acceptance_rate=None),
+        _university(3, country='USA', city=None),
+        _university(4, gpa_average=None, total_cost=None),
+        _university(5),
+    ])
+    index = CandidateIndex()
+    index.load(db)
+
+    assert [u['id'] for u in index.select()] == [3, 4, 2, 1]
+    assert [u['id'] for u in index.select(prioritize_us=False)] == [4, 2, 1, 3]
+    assert [u['id'] for u in index.select(2, priority_fields=['city'], prioritize_us=False)] == [4, 1]
+    assert [u['id'] for u in index.select(us_only=True)] == [3]
+
+
+@pytest.mark.unit
+def test_record_filled_updates_candidates_and_counts():
+    index = CandidateIndex()
+    index.load(_FakeDB([
+        _university(1, city=None, acceptance_rate=None),
+        _university(2, city=None),
+    ]))
+    assert index.null_counts()['city'] == 2
+
+    index.record_filled(1, {'acceptance_rate': 0.3, 'state': 'ON'})
+    assert [u['id'] for u in index.select()] == [1, 2]
+    assert index.select(1)[0]['acceptance_rate'] == 0.3
+
+    index.record_filled(1, {'city': 'Toronto'})
+    index.record_filled(99, {'city': 'Nowhere'})
+    assert [u['id'] for u in index.select()] == [2]
+    assert index.null_counts()['city'] == 1 and index.null_counts()['acceptance_rate'] == 0
+
+
+@pytest.mark.unit
+def test_null_counts_from_database_function():
+    db = _FakeDB([], rpc_result=[
+        {'field_name': 'city', 'null_count': 4, 'total_count': 10},
+        {'field_name': 'gpa_average', 'null_count': 9, 'total_count': 10},
+    ])
+
+    counts = fetch_null_counts(db, ['city', 'gpa_average', 'state'])
+
+    assert counts == {'total': 10, 'null_counts': {'city': 4, 'gpa_average': 9, 'state': 0}}
+    assert fetch_null_counts(_FakeDB([]), ['city']) is None
+
+
+@pytest.mark.unit
+def test_analyze_falls_back_to_candidate_index(monkeypatch):
+    monkeypatch.setattr(candidate_selection, '_candidate_index', None)
+    db = _FakeDB([_university(1, gpa_average=None), _university(2, gpa_average=None, city=None)])
+
+    analysis = AsyncAutoFillOrchestrator(db).analyze_null_values()
+
+    assert analysis['gpa_average'] == {'null_count': 2, 'percentage': 100.0, 'priority': 1}
+    assert analysis['city']['percentage'] == 50.0
+    assert analysis['state']['null_count'] == 0
@@ -0,0 +1,83 @@
+"""
+Test Catalog Snapshot
+Indexes and incremental refresh of the in-process university/program catalog
+"""
+import pytest
+
+from app.services.catalog_snapshot import CatalogSnapshot, CatalogStore
+
+
+UNIVERSITIES = [
+    {"id": 1, "name": "A", "country": "Kenya", "state": None, "university_type": "Public", "updated_at": "2025-01-01"},
+    {"id": 2, "name": "B", "country": "Ghana", "state": None, "university_type": "Private", "updated_at": "2025-01-01"},
+    {"id": 3, "name": "C", "country": "United States", "state": "CA", "university_type": "Public", "updated_at": "2025-01-02"},
+    {"id": 4, "name": "D", "country": "United States", "state": "NY", "university_type": "Private", "updated_at": "2025-01-02"},
+]
+
+PROGRAMS = [
+    {"id": "p1", "university_id": 1, "name": "Computer Science", "updated_at": "2025-01-01"},
+    {"id": "p2", "university_id": 3, "name": "Biology", "updated_at": "2025-01-02"},
+]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Fresh CatalogStore whose table reads come from in-memory `tables`"""
+    monkeypatch.setattr(CatalogStore, "_instance", None)
+    store = CatalogStore()
+    store.tables = {"universities": list(UNIVERSITIES), "programs": list(PROGRAMS)}
+
+    def fetch_pages(table, since=None):
+        rows = [r for r in store.tables[table] if since is None or r["updated_at"] >= since]
+        return rows, max((r["updated_at"] for r in rows), default=since)
+
+    monkeypatch.setattr(store, "_fetch_pages", fetch_pages)
+    return store
+
+
+@pytest.mark.unit
+def test_snapshot_indexes():
+    snapshot = CatalogSnapshot(UNIVERSITIES, {p["id"]: p for p in PROGRAMS})
+
+    assert [u["id"] for u in snapshot.universities_for(countries=["United States", "Kenya"])] == [1, 3, 4]
+    assert list(snapshot.rows_for(countries=["United States"], university_type="Private")) == [3]
+    assert list(snapshot.rows_for(states=["CA", "TX"])) == [2]
+    assert snapshot.universities_for(countries=["Chad"]) == []
+    assert [p["id"] for p in snapshot.programs_by_university[1]] == ["p1"]
+
+
+@pytest.mark.unit
+def test_incremental_refresh_applies_only_changes(store):
+    first = store.get_snapshot()
+    assert first.version == 1
+    assert len(first) == 4
+
+    # Nothing changed since the watermark: the same snapshot is kept
+    assert store.refresh() is first
+
+    store.tables["universities"][1] = dict(UNIVERSITIES[1], name="B2", updated_at="2025-01-03")
+    store.tables["universities"].append(
+        {"id": 5, "name": "E", "country": "Kenya", "state": None, "university_type": "Public", "updated_at": "2025-01-03"}
+    )
+    store.tables["programs"].append({"id": "p3", "university_id": 5, "name": "Nursing", "updated_at": "2025-01-03"})
+
+    second = store.refresh()
+    assert second.version == 2
+    assert second.universities[1]["name"] == "B2"
+    assert [u["id"] for u in second.universities_for(countries=["Kenya"])] == [1, 5]
+    assert [p["id"] for p in second.programs_by_university[5]] == ["p3"]
+    assert second.universities_watermark == "2025-01-03"
+
+    # The previous snapshot is untouched for readers still holding it
+    assert first.universities[1]["name"] == "B"
+    assert 5 not in first.programs_by_university
+
+
+@pytest.mark.unit
+def test_full_refresh_drops_deleted_rows(store):
+    store.get_snapshot()
+    del store.tables["universities"][0]
+
+    snapshot = store.refresh(full=True)
+    assert 1 not in snapshot.index_by_id
+    assert snapshot.version == 2
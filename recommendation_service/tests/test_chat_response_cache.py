@@ -0,0 +1,179 @@
+"""
+Test Chat Response Cache
+Repeated and near-duplicate questions are answered without an LLM call
+"""
+import asyncio
+
+import pytest
+
+from app.services.ai_chat_service import AIChatService, AIProvider, ChatResponse
+from app.services.chat_response_cache import CachedAnswer, ChatResponseCache, normalize_message
+
+
+FAQS = [
+    {
+        "id": "faq-1",
+        "question": "How do I reset my password?",
+        "answer": "Use the Forgot password link on the login page.",
+        "keywords": ["password", "reset", "login"],
+    },
+    {
+        "id": "faq-2",
+        "question": "How much does Flow cost?",
+        "answer": "Flow is free for students.",
+        "keywords": ["pricing", "cost", "fee"],
+        "quick_actions": [{"id": "pricing", "label": "Pricing", "action": "navigate_pricing"}],
+    },
+    {"id": "faq-3", "question": "Old question", "answer": "Old", "is_active": False},
+]
+
+
+def _answer(text="You can track applications from your dashboard."):
+    return CachedAnswer(content=text, provider="gemini", confidence=0.85)
+
+
+@pytest.mark.unit
+def test_exact_hit_is_scoped_to_role_and_page():
+    cache = ChatResponseCache()
+    cache.store("How do I track my applications?", _answer(), role="student", page="dashboard")
+
+    assert normalize_message("  How do I track my APPLICATIONS??") == "how do i track my applications"
+    assert cache.lookup("how do I track my applications", role="student", page="dashboard")[1] == 1.0
+    assert cache.lookup("how do I track my applications", role="parent", page="dashboard") is None
+
+
+@pytest.mark.unit
+def test_similar_questions_and_faqs():
+    cache = ChatResponseCache(min_similarity=0.6)
+    cache.load_faqs(FAQS)
+    cache.store("Where can I track my university applications?", _answer(), role="student")
+
+    answer, score = cache.lookup("track university applications online", role="student")
+    assert answer.source == "cache" and 0.6 <= score < 1.0
+
+    answer, _ = cache.lookup("I forgot my password, how to reset it", role="parent")
+    assert answer.metadata["faq_id"] == "faq-1"
+
+    assert cache.lookup("Old question") is None
+    assert cache.lookup("completely unrelated astronomy topic") is None
+
+    stats = cache.stats()
+    assert stats["similar_hits"] == 1 and stats["faq_hits"] == 1 and stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.unit
+def test_ttl_and_lru_eviction():
+    expired = ChatResponseCache(ttl=-1)
+    expired.store("hello there", _answer())
+    assert expired.lookup("hello there") is None
+
+    cache = ChatResponseCache(max_entries=2, min_similarity=0.99)
+    for question in ("first question", "second question", "third question"):
+        cache.store(question, _answer(question))
+    assert cache.lookup("first question") is None
+    assert cache.lookup("third question")[0].content == "third question"
+    assert cache.stats()["cached_answers"] == 2
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    svc = AIChatService()
+    svc.response_cache.load_faqs(FAQS)
+    svc._faqs_loaded_at = float("inf")  # FAQs loaded above; skip the database
+
+    calls = []
+
+    async def fake_llm(messages):
+        calls.append(messages)
+        return ChatResponse(content="Here's how: open Applications.", provider=AIProvider.GEMINI,
+                            confidence=0.9, tokens_used=42)
+
+    svc.gemini_model_instance = object()
+    monkeypatch.setattr(svc, "get_gemini_response", fake_llm)
+    svc.llm_calls = calls
+    return svc
+
+
+@pytest.mark.unit
+def test_service_reuses_llm_answers(service):
+    context = {"user_role": "student", "current_page": "home"}
+
+    first = asyncio.run(service.get_response("How do I see my applications?", user_context=context))
+    again = asyncio.run(service.get_response("how do i see my applications", user_context=context))
+
+    assert first.provider == AIProvider.GEMINI
+    assert again.provider == AIProvider.CACHE and again.tokens_used == 0
+    assert len(service.llm_calls) == 1
+
+    # Follow-ups in a conversation depend on history and always go to the LLM
+    history = [{"sender": "user", "content": "hi"}, {"sender": "bot", "content": "hello"}]
+    asyncio.run(service.get_response("how do i see my applications", history, context))
+    assert len(service.llm_calls) == 2
+
+
+@pytest.mark.unit
+def test_service_answers_faq_without_llm(service):
+    response = asyncio.run(service.get_response("How much does Flow cost?"))
+
+    assert response.provider == AIProvider.FAQ
+    assert response.quick_actions[0]["id"] == "pricing"
+    assert service.llm_calls == []
+
+
+@pytest.mark.unit
+def test_personalised_answers_are_not_cached(service):
+    async def named_llm(messages):
+        return ChatResponse(content="Hi Ada, you can open Applications.", provider=AIProvider.GEMINI,
+                            confidence=0.9, tokens_used=10)
+
+    service.get_gemini_response = named_llm
+    context = {"user_name": "Ada", "user_role": "student"}
+    asyncio.run(service.get_response("Where are my applications?", user_context=context))
+
+    assert service.response_cache.stats()["cached_answers"] == 0
+
+
+@pytest.mark.unit
+def test_answers_built_from_personal_context_stay_with_that_context(service):
+    async def pending_llm(messages):
+        prompt = messages[-1]["parts"][0]
+        items = prompt.split("Pending items: ")[1].strip()
+        return ChatResponse(content=f"You still need to finish: {items}.", provider=AIProvider.GEMINI,
+                            confidence=0.9, tokens_used=10)
+
+    service.get_gemini_response = pending_llm
+    alice = {"user_role": "student", "current_page": "home", "pending_items": ["Essay for MIT"]}
+    bob = {"user_role": "student", "current_page": "home", "pending_items": ["Transcript upload"]}
+
+    first = asyncio.run(service.get_response("What do I still need to do?", user_context=alice))
+    other = asyncio.run(service.get_response("What do I still need to do?", user_context=bob))
+    again = asyncio.run(service.get_response("What do I still need to do?", user_context=alice))
+
+    assert "Essay for MIT" in first.content
+    assert other.provider == AIProvider.GEMINI and "Essay for MIT" not in other.content
+    assert again.provider == AIProvider.CACHE and again.content == first.content
+
+
+@pytest.mark.unit
+def test_users_with_the_same_role_and_page_share_answers(service):
+    ada = {"user_id": "u1", "user_name": "Ada", "user_role": "student", "current_page": "home"}
+    bob = {"user_id": "u2", "user_name": "Bob", "user_role": "student", "current_page": "home"}
+
+    asyncio.run(service.get_response("How do I see my applications?", user_context=ada))
+    shared = asyncio.run(service.get_response("How do I see my applications?", user_context=bob))
+
+    assert shared.provider == AIProvider.CACHE
+    assert len(service.llm_calls) == 1
+
+
+@pytest.mark.unit
+def test_faq_fallback_is_not_shadowed_by_past_answers(service):
+    service.response_cache.store("How do I reset my password now?", _answer("Ask your counselor."))
+
+    response = asyncio.run(service.get_faq_response("How do I reset my password now?"))
+
+    assert response.provider == AIProvider.FAQ
+    assert response.metadata["faq_id"] == "faq-1"
@@ -0,0 +1,171 @@
+"""
+Test Enrichment Cache Bulk Path
+Batch prefetch into L1, TTL-aware reads and buffered multi-row upserts
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.enrichment.async_enrichment_cache import AsyncEnrichmentCache
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, db):
+        self.db = db
+        self.filters = {}
+        self.rows = None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = set(values)
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = {value}
+        return self
+
+    def gte(self, column, value):
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def execute(self):
+        if self.rows is not None:
+            self.db.upserts.append(self.rows)
+            return _Response(self.rows)
+        self.db.reads += 1
+        matching = [
+            row for row in self.db.rows
+            if all(row[column] in values for column, values in self.filters.items())
+        ]
+        if hasattr(self, 'bounds'):
+            matching = matching[self.bounds[0]:self.bounds[1] + 1]
+        return _Response(matching)
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = 0
+        self.upserts = []
+
+    def table(self, name):
+        return _Query(self)
+
+
+def _entry(university_id, field_name, value, expires_in=timedelta(days=3)):
+    now = datetime.utcnow()
+    return {
+        'university_id': university_id, 'field_name': field_name, 'field_value': value,
+        'data_source': 'wikipedia', 'cached_at': now.isoformat() + 'Z',
+        'expires_at': (now + expires_in).isoformat() + '+00:00',
+    }
+
+
+@pytest.mark.unit
+def test_prefetch_serves_batch_from_l1():
+    db = _FakeDB([
+        _entry(1, 'acceptance_rate', '0.25'),
+        _entry(1, 'city', '"Boston"'),
+        _entry(2, 'total_students', '12000'),
+        _entry(3, 'city', '"Elsewhere"'),
+    ])
+    cache = AsyncEnrichmentCache(db)
+
+    assert cache.prefetch([1, 2, 4]) == 3
+    assert db.reads == 1
+
+    assert cache.get_cached_fields(1, ['acceptance_rate', 'gpa_average']) == {'acceptance_rate': 0.25}
+    assert cache.get_cached_fields(2) == {'total_students': 12000}
+    assert cache.get_cached_fields(4, ['city']) == {}  # Known to have no entries
+    assert db.reads == 1
+    assert (cache.stats['hits'], cache.stats['misses']) == (2, 2)
+
+    # Universities outside the prefetch still read through (and are remembered)
+    assert cache.get_cached_fields(3) == {'city': 'Elsewhere'}
+    assert cache.get_cached_fields(3) == {'city': 'Elsewhere'}
+    assert db.reads == 2
+
+
+@pytest.mark.unit
+def test_async_prefetch_is_one_executor_call_per_chunk(monkeypatch):
+    from app.enrichment import async_enrichment_cache
+
+    db = _FakeDB([_entry(uid, 'city', '"X"') for uid in range(1, 6)])
+    cache = AsyncEnrichmentCache(db)
+    monkeypatch.setattr(async_enrichment_cache, 'PREFETCH_CHUNK_SIZE', 2)
+
+    calls = []
+    original = async_enrichment_cache.run_blocking
+
+    async def counting_run_blocking(fn, *args, **kwargs):
+        calls.append(args)
+        return await original(fn, *args, **kwargs)
+
+    monkeypatch.setattr(async_enrichment_cache, 'run_blocking', counting_run_blocking)
+
+    assert asyncio.run(cache.prefetch_async([1, 2, 3, 4, 5])) == 5
+    assert [len(args[0]) for args in calls] == [2, 2, 1]
+    assert cache.get_cached_fields(5) == {'city': 'X'} and db.reads == 3
+
+
+@pytest.mark.unit
+def test_l1_respects_expiry():
+    db = _FakeDB([])
+    cache = AsyncEnrichmentCache(db)
+    cache.prefetch([1])
+
+    cache.cache_field(1, 'city', 'Austin', 'wikipedia', ttl=timedelta(seconds=-1))
+    cache.cache_field(1, 'state', 'TX', 'wikipedia')
+
+    assert cache.get_cached_fields(1) == {'state': 'TX'}
+
+
+@pytest.mark.unit
+def test_buffered_writes_flush_in_batches():
+    db = _FakeDB([])
+    cache = AsyncEnrichmentCache(db, write_batch_size=4, flush_interval=3600)
+
+    assert cache.cache_multiple_fields(1, {'city': 'Austin', 'state': 'TX', 'website': None}, 'wikipedia') == 2
+    cache.cache_field(1, 'city', 'Dallas', 'web_scraping')  # Replaces the buffered value
+    assert db.upserts == []
+
+    cache.cache_multiple_fields(2, {'city': 'Reno', 'state': 'NV'}, 'college_scorecard')
+    assert cache.flush_due and db.upserts == []  # Never written from inside the coroutine that filled it
+    assert asyncio.run(cache.flush_if_due()) == 4
+    assert [len(batch) for batch in db.upserts] == [4] and not cache.flush_due
+    assert {row['field_value'] for row in db.upserts[0]} == {'"Dallas"', '"TX"', '"Reno"', '"NV"'}
+
+    cache.cache_field(3, 'city', 'Provo', 'wikipedia')
+    assert cache.get_stats()['pending_writes'] == 1
+    assert asyncio.run(cache.flush_if_due()) == 0
+    assert cache.flush() == 1
+    assert cache.stats['writes'] == 5
+
+
+@pytest.mark.unit
+def test_write_through_is_one_upsert_per_call():
+    db = _FakeDB([])
+    cache = AsyncEnrichmentCache(db)
+
+    cache.cache_multiple_fields(1, {'city': 'Austin', 'state': 'TX'}, 'wikipedia')
+
+    assert [len(batch) for batch in db.upserts] == [2]
+    assert cache.get_stats()['pending_writes'] == 0
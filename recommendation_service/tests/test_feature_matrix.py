@@ -0,0 +1,68 @@
+"""
+Test Feature Matrix
+Checks batched feature construction against per-university feature vectors
+"""
+import random
+
+import numpy as np
+import pytest
+
+from app.ml.feature_engineering import FeatureEngineer, UniversityFeatureTable
+from tests.test_vectorized_scorer import _random_university, _random_student, _random_programs
+
+
+def _with_ml_fields(rng, university):
+    # Per-university path divides by (sat_75th - sat_25th + 1), so keep ranges ordered
+    for section in ("math", "ebrw"):
+        low, high = university[f"sat_{section}_25th"], university[f"sat_{section}_75th"]
+        if low and high:
+            university[f"sat_{section}_75th"] = max(low, high)
+    university.update({
+        "acceptance_rate": rng.choice([None, round(rng.uniform(0.05, 0.9), 3)]),
+        "graduation_rate_4year": rng.choice([None, round(rng.uniform(0.3, 0.95), 3)]),
+        "median_earnings_10year": rng.choice([None, rng.randint(20000, 120000)]),
+        "global_rank": rng.choice([None, rng.randint(1, 2000)]),
+        "tuition_out_state": rng.choice([None, rng.randint(5000, 60000)]),
+    })
+    return university
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(20))
+def test_feature_matrix_matches_feature_vectors(seed):
+    rng = random.Random(seed)
+    universities = [_with_ml_fields(rng, _random_university(rng, i)) for i in range(150)]
+    programs_by_university = _random_programs(rng, universities)
+    student = _random_student(rng)
+    student["alternative_majors"] = rng.choice([None, ["biology"], ["business"]])
+
+    engineer = FeatureEngineer()
+    table = UniversityFeatureTable.from_universities(universities, engineer)
+    X = engineer.build_feature_matrix(student, table, programs_by_university)
+
+    expected = np.array([
+        engineer.create_feature_vector(student, u, programs_by_university.get(u["id"], []))
+        for u in universities
+    ])
+
+    assert X.dtype == np.float32
+    assert X.flags["C_CONTIGUOUS"]
+    assert X.shape == (len(universities), len(engineer.get_feature_names()))
+    np.testing.assert_array_equal(X, expected)
+
+
+@pytest.mark.unit
+def test_feature_table_take_matches_subset():
+    rng = random.Random(7)
+    universities = [_with_ml_fields(rng, _random_university(rng, i)) for i in range(50)]
+    student = _random_student(rng)
+    rows = np.array([40, 3, 17, 3])
+
+    engineer = FeatureEngineer()
+    table = UniversityFeatureTable.from_universities(universities, engineer)
+    subset = UniversityFeatureTable.from_universities([universities[i] for i in rows], engineer)
+
+    np.testing.assert_array_equal(
+        engineer.build_feature_matrix(student, table.take(rows), {}),
+        engineer.build_feature_matrix(student, subset, {}),
+    )
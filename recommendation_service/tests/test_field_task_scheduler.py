@@ -0,0 +1,126 @@
+"""
+Test Field Task Scheduler
+Concurrent field lookups with dependencies, skipping, precedence and time budget
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.enrichment.async_auto_fill_orchestrator import AsyncAutoFillOrchestrator
+from app.enrichment.field_task_scheduler import FieldTask, FieldTaskScheduler
+
+
+def _lookup(result, delay=0.0, log=None, name=None):
+    async def run(known):
+        if log is not None:
+            log.append((name, dict(known)))
+        await asyncio.sleep(delay)
+        return dict(result)
+    return run
+
+
+@pytest.mark.unit
+def test_dependencies_skip_and_rank():
+    log = []
+    tasks = [
+        FieldTask('scorecard', _lookup({'acceptance_rate': 0.4, 'website': 'https://x.edu'}, 0.02), rank=0),
+        FieldTask('acceptance', _lookup({'acceptance_rate': 0.9}), ('acceptance_rate',), ('scorecard',), rank=2),
+        FieldTask('tuition', _lookup({'tuition_out_state': 30000.0}, log=log, name='tuition'),
+                  ('tuition_out_state',), ('scorecard',), rank=3),
+        FieldTask('web', _lookup({'acceptance_rate': 0.7, 'city': 'Springfield'}, 0.04), rank=1),
+    ]
+
+    outcome = asyncio.run(FieldTaskScheduler().run(tasks, {'name': 'X', 'city': 'Old Town'}))
+
+    assert outcome.values == {'acceptance_rate': 0.4, 'website': 'https://x.edu', 'tuition_out_state': 30000.0}
+    assert outcome.skipped == ['acceptance']
+    assert log[0][1]['website'] == 'https://x.edu'  # Started after its dependency, with its output
+    assert not outcome.timed_out
+
+
+@pytest.mark.unit
+def test_runs_concurrently_and_cancels_redundant_lookups():
+    tasks = [FieldTask(f'f{i}', _lookup({f'f{i}': i + 1}, 0.1), (f'f{i}',)) for i in range(6)]
+    tasks.append(FieldTask('slow_f0', _lookup({'f0': 99}, 5.0), ('f0',), rank=5))
+
+    start = time.monotonic()
+    outcome = asyncio.run(FieldTaskScheduler().run(tasks))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5  # Slowest useful lookup, not the sum (and not the redundant 5s one)
+    assert outcome.values == {f'f{i}': i + 1 for i in range(6)}
+    assert outcome.cancelled == ['slow_f0']
+
+
+@pytest.mark.unit
+def test_time_budget_and_critical_fields():
+    def tasks():
+        return [
+            FieldTask('fast', _lookup({'acceptance_rate': 0.5}, 0.01), ('acceptance_rate',)),
+            FieldTask('slow', _lookup({'gpa_average': 3.9}, 5.0), ('gpa_average',)),
+            FieldTask('broken', _failing, ('city',)),
+        ]
+
+    budgeted = asyncio.run(FieldTaskScheduler(time_budget=0.1).run(tasks()))
+    assert budgeted.timed_out and budgeted.values == {'acceptance_rate': 0.5}
+    assert budgeted.cancelled == ['slow'] and budgeted.failed == ['broken']
+
+    critical = asyncio.run(FieldTaskScheduler(critical_fields=['acceptance_rate']).run(tasks()))
+    assert not critical.timed_out and critical.cancelled == ['slow']
+
+
+async def _failing(known):
+    raise RuntimeError("blocked")
+
+
+class _Scorecard:
+    async def enrich_university_async(self, university, session):
+        await asyncio.sleep(0.05)
+        return {'acceptance_rate': 0.3, 'tuition_out_state': 41000.0, 'total_students': 9000}
+
+
+class _Web:
+    async def enrich_university_async(self, university, session):
+        await asyncio.sleep(0.1)
+        return {'website': 'https://state.edu', 'acceptance_rate': 0.8, '_has_coords': True}
+
+
+class _Scrapers:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def lookup(university_name, *args):
+            self.calls.append(name)
+            await asyncio.sleep(0.1)
+            return {
+                'find_test_scores_async': {'sat_math_25th': 600},
+                'find_location_details_async': {'city': 'Springfield', 'state': 'IL'},
+                'find_tuition_costs_async': {'tuition_out_state': 1.0},
+            }.get(name, None)
+        return lookup
+
+
+@pytest.mark.unit
+def test_orchestrator_skips_fields_filled_by_scorecard():
+    orchestrator = AsyncAutoFillOrchestrator(db=None, max_concurrent=1)
+    scrapers = _Scrapers()
+    university = {'id': 1, 'name': 'State University', 'country': 'USA', 'gpa_average': 3.5}
+
+    start = time.monotonic()
+    enriched, filled = asyncio.run(orchestrator.enrich_university_async(
+        university, session=object(), web_enricher=_Web(), field_scrapers=scrapers,
+        scorecard_enricher=_Scorecard()
+    ))
+
+    assert time.monotonic() - start < 0.4
+    assert enriched == {
+        'acceptance_rate': 0.3, 'tuition_out_state': 41000.0, 'total_students': 9000,
+        'website': 'https://state.edu', 'sat_math_25th': 600, 'city': 'Springfield', 'state': 'IL',
+    }
+    assert filled == len(enriched)
+    assert sorted(scrapers.calls) == [
+        'find_graduation_rate_async', 'find_location_details_async',
+        'find_test_scores_async', 'find_university_type_async',
+    ]
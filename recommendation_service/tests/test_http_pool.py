@@ -0,0 +1,125 @@
+"""
+Test Enrichment HTTP Pool
+Per-host concurrency, host isolation, circuit breaking and the shared connector
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.enrichment.http_pool import KNOWN_HOSTS, EnrichmentHttpPool, HostLimiters
+from app.utils.retry import WIKIPEDIA_RATE_LIMITER
+
+
+class _Response:
+    def __init__(self, status):
+        self.status = status
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class _FakeSession:
+    """Records in-flight requests per host"""
+
+    closed = False
+
+    def __init__(self, status=200, delay=0.05):
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = {}
+        self.peak = {}
+
+    async def request(self, method, url, **kwargs):
+        host = url.split('/')[2]
+        self.calls += 1
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        await asyncio.sleep(self.delay)
+        self.in_flight[host] -= 1
+        return _Response(self.status)
+
+
+def _pool(session, max_per_host=2):
+    pool = EnrichmentHttpPool(HostLimiters(max_per_host=max_per_host, requests_per_second=1000, known_hosts={}))
+    pool._session = session
+    pool._loop = asyncio.get_running_loop()
+    return pool
+
+
+@pytest.mark.unit
+def test_hosts_limited_independently():
+    session = _FakeSession(delay=0.05)
+
+    async def scenario():
+        pool = _pool(session, max_per_host=2)
+
+        async def fetch(url):
+            async with pool.get(url) as response:
+                return response
+
+        start = time.monotonic()
+        responses = await asyncio.gather(*[
+            fetch(f"https://{host}.edu/page{i}") for host in ('a', 'b', 'c') for i in range(6)
+        ])
+        return responses, time.monotonic() - start
+
+    responses, elapsed = asyncio.run(scenario())
+
+    assert all(r.status == 200 and r.released for r in responses)
+    assert session.peak == {'a.edu': 2, 'b.edu': 2, 'c.edu': 2}
+    assert elapsed < 0.3  # 3 rounds per host, hosts in parallel (serial would be 18 x 0.05)
+
+
+@pytest.mark.unit
+def test_retryable_status_opens_host_circuit():
+    session = _FakeSession(status=503, delay=0)
+
+    async def scenario():
+        pool = _pool(session)
+        statuses = []
+        for _ in range(5):
+            async with pool.get("https://down.edu/") as response:
+                statuses.append(response.status)
+        with pytest.raises(Exception, match="Circuit breaker OPEN"):
+            async with pool.get("https://down.edu/"):
+                pass
+        async with pool.get("https://up.edu/") as response:
+            statuses.append(response.status)
+        # Slots were returned even when the breaker rejected the request
+        assert pool.limiters.for_host('down.edu').slots._value == 2
+        return statuses
+
+    assert asyncio.run(scenario()) == [503] * 6
+    assert session.calls == 6
+
+
+@pytest.mark.unit
+def test_known_hosts_share_api_limiters_and_registry_is_bounded():
+    limiters = HostLimiters(max_hosts=2)
+
+    assert limiters.for_host('en.wikipedia.org').rate_limiter is WIKIPEDIA_RATE_LIMITER
+    assert set(KNOWN_HOSTS) >= {'www.wikidata.org', 'html.duckduckgo.com', 'api.data.gov'}
+
+    first = limiters.for_host('a.edu')
+    second = limiters.for_host('b.edu')
+    assert len(limiters) == 2
+    assert limiters.for_host('a.edu') is first
+    limiters.for_host('c.edu')
+    assert limiters.for_host('b.edu') is not second  # Evicted as least recently used
+
+
+@pytest.mark.unit
+def test_shared_connector_settings():
+    async def scenario():
+        pool = EnrichmentHttpPool(HostLimiters(max_per_host=3), max_connections=50, dns_ttl=120)
+        session = pool.session
+        assert pool.session is session
+        connector = session.connector
+        settings = (connector.limit, connector.limit_per_host, connector.use_dns_cache)
+        await pool.close()
+        return settings, pool.closed
+
+    assert asyncio.run(scenario()) == ((50, 3, True), True)
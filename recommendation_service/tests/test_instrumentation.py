@@ -0,0 +1,98 @@
+"""
+Test Instrumentation
+Route-template labels, per-table query timing, cache hit/miss and recommendation stage metrics
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from postgrest import SyncPostgrestClient
+from prometheus_client import REGISTRY
+
+from app.cache.redis_cache import RedisCache
+from app.monitoring import (
+    UNMATCHED_ROUTE,
+    create_metrics_middleware,
+    describe_query,
+    instrument_postgrest,
+    recommendation_stage,
+    record_recommendations,
+)
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.unit
+def test_requests_labelled_by_route_template():
+    app = FastAPI()
+    app.add_middleware(create_metrics_middleware())
+
+    @app.get('/students/{student_id}/recommendations')
+    def recommendations(student_id: str):
+        return {'id': student_id}
+
+    template = '/students/{student_id}/recommendations'
+    before = _value('api_requests_total', method='GET', endpoint=template, status='200')
+    unmatched = _value('api_requests_total', method='GET', endpoint=UNMATCHED_ROUTE, status='404')
+
+    client = TestClient(app)
+    for student_id in ('3f2a', '9c1b', '77aa'):
+        assert client.get(f'/students/{student_id}/recommendations').status_code == 200
+    client.get('/no/such/path/123')
+
+    assert _value('api_requests_total', method='GET', endpoint=template, status='200') == before + 3
+    assert _value('api_requests_total', method='GET', endpoint=UNMATCHED_ROUTE, status='404') == unmatched + 1
+    assert _value('api_requests_total', method='GET', endpoint='/students/3f2a/recommendations', status='200') == 0
+
+
+@pytest.mark.unit
+def test_query_labels_and_execute_timing():
+    client = SyncPostgrestClient('http://127.0.0.1:9/rest/v1')
+
+    assert describe_query(client.from_('users').select('id').eq('id', 'x')) == ('users', 'select')
+    assert describe_query(client.from_('users').select('id', count='exact', head=True)) == ('users', 'count')
+    assert describe_query(client.from_('users').insert({'a': 1})) == ('users', 'insert')
+    assert describe_query(client.from_('users').upsert({'a': 1})) == ('users', 'upsert')
+    assert describe_query(client.from_('users').update({'a': 1}).eq('id', 1)) == ('users', 'update')
+    assert describe_query(client.from_('users').delete().eq('id', 1)) == ('users', 'delete')
+    assert describe_query(client.rpc('get_null_counts', {})) == ('get_null_counts', 'rpc')
+
+    assert instrument_postgrest() and instrument_postgrest()  # Idempotent
+    before = _value('database_queries_total', table='programs', operation='select')
+    with pytest.raises(Exception):
+        client.from_('programs').select('id').single().execute()  # Nothing listening; still timed
+    assert _value('database_queries_total', table='programs', operation='select') == before + 1
+    assert _value('database_query_duration_seconds_count', table='programs', operation='select') >= 1
+
+
+class _FakeRedis:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+@pytest.mark.unit
+def test_cache_access_and_recommendation_stages():
+    cache = RedisCache.__new__(RedisCache)
+    cache.client, cache.enabled = _FakeRedis({'hit': '{"a": 1}'}), True
+    hits, misses = _value('cache_hits_total', cache_type='redis'), _value('cache_misses_total', cache_type='redis')
+
+    assert cache.get('hit') == {'a': 1}
+    assert cache.get('miss') is None
+    assert _value('cache_hits_total', cache_type='redis') == hits + 1
+    assert _value('cache_misses_total', cache_type='redis') == misses + 1
+
+    stages = _value('recommendation_stage_seconds_count', stage='predict')
+    with pytest.raises(ValueError):
+        with recommendation_stage('predict'):
+            raise ValueError('model failed')  # Failed stages are timed too
+    assert _value('recommendation_stage_seconds_count', stage='predict') == stages + 1
+
+    runs = _value('recommendation_generation_seconds_count')
+    reach = _value('recommendations_generated_total', user_type='student', category='Reach')
+    record_recommendations([{'category': 'Reach'}, {'category': 'Match'}, {'category': 'Reach'}], 0.2)
+    assert _value('recommendations_generated_total', user_type='student', category='Reach') == reach + 2
+    assert _value('recommendation_generation_seconds_count') == runs + 1
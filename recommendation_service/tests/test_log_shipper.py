@@ -0,0 +1,169 @@
+"""
+Test Log Shipper
+Bounded buffer drop policies, batched shipping, spill-to-disk and replay in SupabaseHandler
+"""
+import gzip
+import json
+import logging
+import os
+
+import pytest
+
+from app.utils.supabase_logger import LogBuffer, SupabaseHandler
+
+
+def _entry(level, n):
+    return {'level': logging.getLevelName(level), 'message': f'{n}'}
+
+
+@pytest.mark.unit
+def test_buffer_drops_lowest_level_first():
+    buffer = LogBuffer(3, 'lowest_level')
+    buffer.put(logging.INFO, _entry(logging.INFO, 1))
+    buffer.put(logging.DEBUG, _entry(logging.DEBUG, 2))
+    buffer.put(logging.ERROR, _entry(logging.ERROR, 3))
+
+    assert buffer.put(logging.WARNING, _entry(logging.WARNING, 4))['message'] == '2'  # DEBUG goes first
+    assert buffer.put(logging.ERROR, _entry(logging.ERROR, 5))['message'] == '1'      # Then INFO
+    assert buffer.put(logging.DEBUG, _entry(logging.DEBUG, 6))['message'] == '6'      # Incoming DEBUG is least important
+    assert len(buffer) == 3
+    assert [e['message'] for e in buffer.take(10)] == ['3', '4', '5']  # Arrival order
+
+
+@pytest.mark.unit
+def test_buffer_oldest_and_newest_policies():
+    oldest, newest = LogBuffer(2, 'oldest'), LogBuffer(2, 'newest')
+    for n, level in enumerate([logging.ERROR, logging.DEBUG, logging.INFO]):
+        oldest.put(level, _entry(level, n))
+        newest.put(level, _entry(level, n))
+
+    assert [e['message'] for e in oldest.take(5)] == ['1', '2']
+    assert [e['message'] for e in newest.take(5)] == ['0', '1']
+    with pytest.raises(ValueError):
+        LogBuffer(2, 'random')
+
+
+class _Query:
+    def __init__(self, client, rows):
+        self.client = client
+        self.rows = rows
+
+    def execute(self):
+        self.client.calls += 1
+        if self.client.down:
+            raise ConnectionError('unreachable')
+        self.client.batches.append(len(self.rows))
+        self.client.rows.extend(self.rows)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.down = False
+        self.calls = 0
+        self.batches = []
+        self.rows = []
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows, returning=None):
+        logging.getLogger('httpx').warning('HTTP Request: POST /system_logs')  # Ignored: shipper's own thread
+        return _Query(self, rows)
+
+
+def _handler(client, tmp_path, **kwargs):
+    options = dict(batch_size=4, flush_interval=0.05, level=logging.DEBUG, buffer_size=100, spill_dir=str(tmp_path))
+    options.update(kwargs)
+    return SupabaseHandler(client=client, **options)
+
+
+@pytest.fixture
+def shipper_logger():
+    logger = logging.getLogger('tests.log_shipper')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    logger.handlers = []
+
+
+@pytest.mark.unit
+def test_batches_and_exception_fields(tmp_path, shipper_logger):
+    client = _FakeClient()
+    handler = _handler(client, tmp_path)
+    shipper_logger.addHandler(handler)
+    logging.getLogger('httpx').addHandler(handler)
+    try:
+        for n in range(10):
+            shipper_logger.info('event %s', n, extra={'payload': object()})
+        try:
+            raise ValueError('x' * 20000)
+        except ValueError:
+            shipper_logger.exception('failed')
+        handler.flush()
+    finally:
+        logging.getLogger('httpx').removeHandler(handler)
+        handler.close()
+
+    assert len(client.rows) == 11 and max(client.batches) <= 4
+    assert {row['logger_name'] for row in client.rows} == {'tests.log_shipper'}
+    assert all(set(row) == set(client.rows[0]) for row in client.rows)  # Uniform keys per batch
+    assert isinstance(client.rows[0]['extra_data']['payload'], str)
+    assert client.rows[-1]['exception_type'] == 'ValueError'
+    assert len(client.rows[-1]['exception_message']) < 10000
+
+
+@pytest.mark.unit
+def test_outage_spills_to_disk_and_replays(tmp_path, shipper_logger):
+    client = _FakeClient()
+    client.down = True
+    handler = _handler(client, tmp_path)
+    shipper_logger.addHandler(handler)
+    try:
+        for n in range(10):
+            shipper_logger.info('during outage %s', n)
+        handler.flush()
+        spill_files = os.listdir(tmp_path)
+        assert handler.stats['spilled'] == 10 and client.rows == []
+        assert client.calls == 1  # Backing off: later batches go straight to disk
+
+        client.down = False
+        handler._retry_at = 0.0
+        shipper_logger.info('recovered')
+        handler.flush()
+    finally:
+        handler.close()
+
+    assert len(spill_files) == 1 and spill_files[0].endswith('.jsonl.gz')
+    assert sorted(row['message'] for row in client.rows) == sorted(
+        [f'during outage {n}' for n in range(10)] + ['recovered']
+    )
+    assert handler.stats['replayed'] == 10
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.unit
+def test_orphaned_spill_replayed_and_spill_cap(tmp_path, shipper_logger):
+    with gzip.open(tmp_path / 'system_logs-999999999.jsonl.gz', 'wt') as spill:
+        for n in range(6):
+            spill.write(json.dumps({'level': 'INFO', 'message': f'orphan {n}'}) + '\n')
+        spill.write('{"level": "INFO", "mess')  # Truncated by a crash
+
+    client = _FakeClient()
+    handler = _handler(client, tmp_path, spill_max_bytes=1)
+    shipper_logger.addHandler(handler)
+    try:
+        shipper_logger.info('first')
+        handler.flush()
+        assert sorted(row['message'] for row in client.rows) == ['first'] + [f'orphan {n}' for n in range(6)]
+
+        client.down = True
+        handler._retry_at = 0.0
+        for n in range(8):
+            shipper_logger.warning('lost %s', n)
+        handler.flush()
+    finally:
+        handler.close()
+
+    stats = handler.get_stats()
+    assert stats['spilled'] + stats['dropped'] == 8 and stats['dropped'] >= 4  # Later batches hit the spill cap
+    assert stats['queue_depth'] == 0 and stats['backing_off']
@@ -0,0 +1,76 @@
+"""
+Test Model Registry
+Published model versions are picked up without reloading on every request
+"""
+import os
+
+import pytest
+
+from app.ml import model_registry
+from app.ml.model_registry import ModelRegistry, get_model_registry, publish_model, LEGACY_VERSION
+
+
+class _StubModel:
+    def save(self, model_dir):
+        os.makedirs(model_dir, exist_ok=True)
+        with open(os.path.join(model_dir, 'lightgbm_ranker.txt'), 'w') as f:
+            f.write('stub')
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Record loads and return the version name in place of a real model"""
+    calls = []
+
+    def fake_load(self, version):
+        calls.append(version)
+        return f"model-{version}"
+
+    monkeypatch.setattr(ModelRegistry, '_load', fake_load)
+    return calls
+
+
+@pytest.mark.unit
+def test_no_model_published(tmp_path, loads):
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.get_active() == (None, None)
+    assert loads == []
+
+
+@pytest.mark.unit
+def test_publish_swaps_active_version(tmp_path, loads):
+    registry = get_model_registry(str(tmp_path))
+
+    first = publish_model(_StubModel(), str(tmp_path))
+    assert registry.get_active() == (first, f"model-{first}")
+
+    # Repeated reads reuse the loaded model
+    registry.get_active()
+    registry.refresh()
+    assert loads == [first]
+
+    second = publish_model(_StubModel(), str(tmp_path))
+    assert second != first
+    assert registry.get_active() == (second, f"model-{second}")
+    assert loads == [first, second]
+
+
+@pytest.mark.unit
+def test_other_workers_notice_new_pointer(tmp_path, loads, monkeypatch):
+    monkeypatch.setattr(model_registry, 'POINTER_CHECK_SECONDS', 0)
+    other_worker = ModelRegistry(str(tmp_path))
+
+    first = publish_model(_StubModel(), str(tmp_path))
+    assert other_worker.get_active()[0] == first
+
+    second = publish_model(_StubModel(), str(tmp_path))
+    os.utime(os.path.join(tmp_path, 'ACTIVE'), (1e9 + 1, 1e9 + 1))  # mtime resolution on some filesystems
+    assert other_worker.get_active()[0] == second
+
+
+@pytest.mark.unit
+def test_unversioned_model_is_legacy(tmp_path, loads):
+    _StubModel().save(str(tmp_path))
+
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.get_active() == (LEGACY_VERSION, f"model-{LEGACY_VERSION}")
@@ -0,0 +1,196 @@
+"""
+Test Notification Fan-out
+Paged role targeting, bulk preference filtering, batched inserts and resume
+"""
+import asyncio
+
+import pytest
+
+from app.schemas.notifications import BroadcastNotificationRequest
+from app.services import notification_fanout
+from app.services.notification_fanout import (
+    NotificationFanout,
+    delivery_namespace,
+    is_opted_out,
+    payload_from_request,
+)
+
+
+class _Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.limit_rows = None
+        self.count = None
+        self.write = None
+
+    def select(self, columns, count=None):
+        self.count = count
+        return self
+
+    def overlaps(self, column, values):
+        self.filters.append(lambda row: bool(set(row[column]) & set(values)))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row[column] > value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.db.in_sizes.append(len(values))
+        if values & self.db.failing_lookups:
+            self.write = ('fail', [])
+        self.filters.append(lambda row: row[column] in values)
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, n):
+        self.limit_rows = n
+        return self
+
+    def insert(self, rows, returning=None):
+        self.write = ('insert', rows)
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False, returning=None):
+        self.write = ('upsert', rows)
+        return self
+
+    def execute(self):
+        if self.write:
+            kind, rows = self.write
+            if kind == 'fail':
+                raise Exception('lookup failed')
+            self.db.batches.append(len(rows))
+            if any(row['user_id'] in self.db.failing for row in rows):
+                raise Exception('insert failed')
+            for row in rows:
+                if kind == 'upsert' and row['id'] in self.db.notifications:
+                    continue
+                self.db.notifications[row['id']] = row
+            return _Response(None)
+
+        self.db.queries[self.table] = self.db.queries.get(self.table, 0) + 1
+        rows = sorted(self.db.tables[self.table], key=lambda r: r.get('id', ''))
+        rows = [row for row in rows if all(f(row) for f in self.filters)]
+        count = len(rows) if self.count else None
+        if self.limit_rows is not None:
+            rows = rows[:self.limit_rows]
+        return _Response(rows, count)
+
+
+class _FakeDB:
+    def __init__(self, users, preferences=()):
+        self.tables = {'users': users, 'notification_preferences': list(preferences)}
+        self.notifications = {}
+        self.batches = []
+        self.queries = {}
+        self.failing = set()
+        self.failing_lookups = set()
+        self.in_sizes = []
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+def _users(count):
+    return [
+        {'id': f'u{i:03d}', 'available_roles': ['student'] if i % 3 else ['parent', 'student']}
+        for i in range(count)
+    ]
+
+
+PAYLOAD = payload_from_request(BroadcastNotificationRequest(
+    notification_type='system', title='Maintenance', message='Down at 2am'
+))
+
+
+@pytest.mark.unit
+def test_payload_and_preferences():
+    assert PAYLOAD['notification_type'] == 'system'
+    assert PAYLOAD['priority'] == 'normal' and PAYLOAD['channels'] == ['in_app']
+
+    assert not is_opted_out(None, 'system')
+    assert is_opted_out({'in_app_enabled': False}, 'system')
+    assert is_opted_out({'in_app_enabled': True, 'notification_types': {'system': False}}, 'system')
+    assert not is_opted_out({'notification_types': {'message': False}}, 'system')
+
+
+@pytest.mark.unit
+def test_role_pages_preferences_and_batches():
+    db = _FakeDB(_users(25), preferences=[
+        {'user_id': 'u000', 'in_app_enabled': False, 'notification_types': {}},
+        {'user_id': 'u003', 'in_app_enabled': True, 'notification_types': {'system': False}},
+    ])
+    fanout = NotificationFanout(db, page_size=4, batch_size=3, concurrency=2)
+    pages = []
+
+    totals = asyncio.run(fanout.run(PAYLOAD, target_roles=['Parent'], on_page=lambda r, c: pages.append(c)))
+
+    parents = [u['id'] for u in _users(25) if 'parent' in u['available_roles']]
+    assert fanout.count_targets(['parent']) == len(parents) == 9
+    assert (totals['created'], totals['skipped'], totals['failed_users']) == (7, 2, [])
+    assert {row['user_id'] for row in db.notifications.values()} == set(parents) - {'u000', 'u003'}
+    assert pages == ['u009', 'u021', 'u024']
+    assert db.queries['notification_preferences'] == 3  # One lookup per page
+    assert max(db.batches) <= 3
+
+
+@pytest.mark.unit
+def test_preferences_are_read_in_chunks_and_failed_lookups_ignored(monkeypatch):
+    monkeypatch.setattr(notification_fanout, 'NOTIFICATION_PREFERENCES_CHUNK_SIZE', 3)
+    db = _FakeDB(_users(8), preferences=[
+        {'user_id': 'u001', 'in_app_enabled': False, 'notification_types': {}},
+        {'user_id': 'u006', 'in_app_enabled': False, 'notification_types': {}},
+    ])
+    db.failing_lookups = {'u004'}  # Second chunk (u003-u005) cannot be read
+    fanout = NotificationFanout(db, page_size=8)
+
+    allowed, opted_out = fanout.filter_by_preferences([u['id'] for u in _users(8)], 'system')
+
+    assert opted_out == ['u001', 'u006']
+    assert len(allowed) == 6
+    assert db.queries['notification_preferences'] == 2 and db.in_sizes == [3, 3, 2]
+
+
+@pytest.mark.unit
+def test_failed_batch_reported_and_resume_is_idempotent():
+    db = _FakeDB(_users(10))
+    db.failing = {'u004'}
+    fanout = NotificationFanout(db, page_size=5, batch_size=2)
+    namespace = delivery_namespace('job-1')
+
+    first = asyncio.run(fanout.run(PAYLOAD, namespace=namespace))
+    assert first['failed_users'] == ['u004']
+    assert first['created'] == 9
+
+    # Restarting from an earlier cursor re-delivers without duplicates
+    db.failing = set()
+    again = asyncio.run(fanout.run(PAYLOAD, cursor='u002', namespace=namespace))
+    assert again['created'] == 7
+    assert len(db.notifications) == 10
+
+    stopped = asyncio.run(fanout.run(PAYLOAD, should_continue=lambda: False))
+    assert not stopped['completed'] and stopped['created'] == 0
+
+
+@pytest.mark.unit
+def test_explicit_user_ids_are_deduplicated_and_paged():
+    db = _FakeDB([])
+    fanout = NotificationFanout(db, page_size=2)
+
+    totals = asyncio.run(fanout.run(PAYLOAD, user_ids=['b', 'a', 'c', 'a']))
+
+    assert totals['created'] == 3
+    assert fanout.count_targets(user_ids=['b', 'a', 'a']) == 2
+    assert db.queries.get('users') is None
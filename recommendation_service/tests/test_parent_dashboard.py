@@ -0,0 +1,131 @@
+"""
+Test Parent Dashboard Aggregator
+All linked students are aggregated with one query per table and cached per parent
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.parent_dashboard import DashboardCache, ParentDashboardAggregator, aggregate_dashboard
+
+
+NOW = datetime(2025, 3, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.unit
+def test_aggregate_matches_per_student_rules():
+    stats = aggregate_dashboard(
+        {'s1': 'Ana', 's2': 'Ben'},
+        enrollments=[
+            {'student_id': 's1', 'status': 'active', 'progress_percentage': 40},
+            {'student_id': 's1', 'status': 'active', 'progress_percentage': 80},
+            {'student_id': 's1', 'status': 'completed', 'progress_percentage': 10},
+        ],
+        applications=[
+            {'student_id': 's1', 'status': 'pending'},
+            {'student_id': 's1', 'status': 'under_review'},
+            {'student_id': 's1', 'status': 'accepted'},
+            {'student_id': 's2', 'status': 'rejected'},
+        ],
+        sessions=[
+            {'student_id': 's2', 'status': 'scheduled', 'updated_at': '2025-03-01T00:00:00Z'},
+            {'student_id': 's2', 'status': 'completed', 'updated_at': '2025-03-02T00:00:00Z', 'feedback_rating': 4},
+            {'student_id': 's2', 'status': 'completed', 'updated_at': '2025-02-20T00:00:00', 'feedback_rating': 2},
+        ],
+        achievements=[
+            {'student_id': 's1', 'earned_at': '2025-03-10T00:00:00+00:00'},
+            {'student_id': 's1', 'earned_at': '2025-01-10T00:00:00+00:00'},
+        ],
+        alerts=[{'student_id': 's2', 'severity': 'high'}, {'student_id': 's2', 'severity': 'low'}],
+        activities=[
+            {'student_id': 's1', 'activity_type': 'course_progress', 'timestamp': '2025-03-14T00:00:00+00:00'},
+            {'student_id': 's1', 'activity_type': 'course_progress', 'timestamp': '2025-03-13T00:00:00+00:00'},
+            {'student_id': 's1', 'activity_type': 'application_submitted', 'timestamp': '2025-03-01T00:00:00+00:00'},
+        ],
+        last_activity={'s1': '2025-03-14T00:00:00+00:00', 's2': '2025-01-01T00:00:00+00:00'},
+        now=NOW,
+    )
+    ana, ben = stats
+
+    assert ana.is_active and not ben.is_active
+    assert (ana.active_courses, ana.average_course_progress, ana.courses_at_risk) == (2, 60.0, 1)
+    assert (ana.total_applications, ana.pending_applications, ana.accepted_applications) == (3, 2, 1)
+    assert (ana.achievements_count, ana.achievements_this_month) == (2, 1)
+    assert ana.total_activities_last_30_days == 3
+    assert ana.most_frequent_activity_type == 'course_progress'
+
+    assert ben.rejected_applications == 1
+    assert (ben.upcoming_sessions, ben.completed_sessions_this_month) == (1, 1)
+    assert ben.average_counseling_rating == 3.0
+    assert (ben.unread_alerts, ben.high_severity_alerts) == (2, 1)
+    assert ben.student_name == 'Ben'
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.ids = None
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def in_(self, column, values):
+        self.ids = set(values)
+        return self
+
+    def execute(self):
+        self.db.tables_queried.append(self.table)
+        rows = self.db.rows.get(self.table, [])
+        if self.ids is not None:
+            key = 'id' if self.table == 'users' else 'student_id'
+            rows = [row for row in rows if row[key] in self.ids]
+        return type('Response', (), {'data': rows})()
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.tables_queried = []
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+def _db(student_count):
+    ids = [f's{i}' for i in range(student_count)]
+    recent = datetime.now(timezone.utc).isoformat()
+    return _FakeDB({
+        'parent_student_links': [{'student_id': s} for s in ids],
+        'users': [{'id': s, 'display_name': s.upper()} for s in ids],
+        'applications': [{'student_id': s, 'status': 'pending'} for s in ids],
+        'student_activities': [{'student_id': s, 'activity_type': 'login', 'timestamp': recent} for s in ids],
+    })
+
+
+@pytest.mark.unit
+def test_query_count_does_not_grow_with_children():
+    for count in (1, 4):
+        db = _db(count)
+        dashboard = asyncio.run(ParentDashboardAggregator(db, cache=DashboardCache()).get_dashboard('p1'))
+
+        assert dashboard.total_students == count
+        assert all(s.total_applications == 1 and s.is_active for s in dashboard.students)
+        assert len(db.tables_queried) == 8
+
+
+@pytest.mark.unit
+def test_cache_hit_and_student_invalidation():
+    db = _db(2)
+    cache = DashboardCache(ttl=60)
+    aggregator = ParentDashboardAggregator(db, cache=cache)
+
+    first = asyncio.run(aggregator.get_dashboard('p1'))
+    assert asyncio.run(aggregator.get_dashboard('p1')) is first
+    assert len(db.tables_queried) == 8
+
+    cache.invalidate_student('s9')  # Not this parent's child
+    assert cache.get('p1') is first
+
+    cache.invalidate_student('s1')
+    assert cache.get('p1') is None
@@ -0,0 +1,180 @@
+"""
+Test Principal Cache
+TTL/LRU behaviour, lookup coalescing, invalidation and get_current_user resolution
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import principal_cache, security
+from app.utils.principal_cache import PrincipalCache
+
+
+def _loader(value, calls, delay=0.0):
+    async def load():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+    return load
+
+
+@pytest.mark.unit
+def test_ttl_and_lru_bounds():
+    cache = PrincipalCache(ttl=60, max_entries=2)
+    calls = []
+
+    async def scenario():
+        await cache.get('a', _loader('A', calls))
+        await cache.get('b', _loader('B', calls))
+        assert await cache.get('a', _loader('A2', calls)) == 'A'  # Hit; 'a' now most recent
+        await cache.get('c', _loader('C', calls))                  # Evicts 'b'
+        assert cache.peek('b') is None and len(cache) == 2
+
+        cache.ttl = 0
+        await cache.get('d', _loader('D', calls))
+        assert cache.peek('d') is None  # Expired immediately
+
+    asyncio.run(scenario())
+    assert calls == ['A', 'B', 'C', 'D']
+    assert cache.stats['hits'] == 1
+
+
+@pytest.mark.unit
+def test_concurrent_lookups_coalesce_and_failures_are_not_cached():
+    cache = PrincipalCache()
+    calls = []
+
+    async def failing():
+        calls.append('boom')
+        await asyncio.sleep(0.01)
+        raise RuntimeError('db down')
+
+    async def scenario():
+        results = await asyncio.gather(*[cache.get('u1', _loader('U1', calls, 0.02)) for _ in range(10)])
+        assert results == ['U1'] * 10
+
+        outcomes = await asyncio.gather(*[cache.get('u2', failing) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+        assert await cache.get('u2', _loader('U2', calls)) == 'U2'
+
+    asyncio.run(scenario())
+    assert calls == ['U1', 'boom', 'U2']
+    assert cache.stats['coalesced'] == 11
+
+
+@pytest.mark.unit
+def test_invalidation_drops_entry_and_in_flight_result():
+    cache = PrincipalCache()
+    calls = []
+
+    async def scenario():
+        await cache.get('u', _loader('old', calls))
+        cache.invalidate('u')
+        assert cache.peek('u') is None
+
+        # A lookup that started before the change must not be cached
+        pending = asyncio.ensure_future(cache.get('u', _loader('stale', calls, 0.02)))
+        await asyncio.sleep(0)
+        cache.invalidate('u')
+        assert await pending == 'stale'
+        assert await cache.get('u', _loader('new', calls)) == 'new'
+
+    asyncio.run(scenario())
+    assert calls == ['old', 'stale', 'new']
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.id = None
+        self.as_list = False
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.id = value
+        return self
+
+    def single(self):
+        return self
+
+    def limit(self, count):
+        self.as_list = True
+        return self
+
+    def execute(self):
+        self.db.queries.append(self.table)
+        if self.table in self.db.failing:
+            raise RuntimeError(f'{self.table} unavailable')
+        row = self.db.tables[self.table].get(self.id)
+        if self.as_list:
+            return _Response([row] if row else [])
+        return _Response(row)
+
+
+class _FakeDB:
+    def __init__(self):
+        self.queries = []
+        self.failing = set()
+        self.tables = {
+            'users': {
+                'admin-1': {'id': 'admin-1', 'email': 'a@x.org', 'active_role': 'regionaladmin',
+                            'display_name': 'Ada', 'available_roles': ['regionaladmin']},
+                'student-1': {'id': 'student-1', 'email': 's@x.org', 'active_role': 'student',
+                              'available_roles': ['student']},
+            },
+            'admin_users': {'admin-1': {'admin_role': 'regionaladmin', 'regional_scope': 'EU'}},
+        }
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+@pytest.mark.unit
+def test_resolve_principal_reads_once_per_user(monkeypatch):
+    db = _FakeDB()
+    monkeypatch.setattr(security, 'get_supabase_admin', lambda: db)
+    monkeypatch.setattr(principal_cache, '_principal_cache', PrincipalCache())
+
+    async def scenario():
+        first = await security.resolve_principal('admin-1')
+        first.role = 'tampered'  # Callers get copies
+        second = await security.resolve_principal('admin-1')
+        student = await security.resolve_principal('student-1')
+        with pytest.raises(HTTPException):
+            await security.resolve_principal('missing')
+        return second, student
+
+    admin, student = asyncio.run(scenario())
+
+    assert admin.role == 'regionaladmin' and admin.is_regional_admin and admin.regional_scope == 'EU'
+    assert student.admin_role is None
+    assert db.queries == ['users', 'admin_users', 'users', 'users']
+
+    principal_cache.invalidate_principal('admin-1')
+    asyncio.run(security.resolve_principal('admin-1'))
+    assert db.queries[-2:] == ['users', 'admin_users']
+
+
+@pytest.mark.unit
+def test_admin_principal_is_not_cached_without_its_scope(monkeypatch):
+    db = _FakeDB()
+    db.failing.add('admin_users')
+    monkeypatch.setattr(security, 'get_supabase_admin', lambda: db)
+    monkeypatch.setattr(principal_cache, '_principal_cache', PrincipalCache())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(security.resolve_principal('admin-1'))
+    assert principal_cache.get_principal_cache().peek('admin-1') is None
+
+    db.failing.clear()
+    admin = asyncio.run(security.resolve_principal('admin-1'))
+    assert admin.is_regional_admin and admin.regional_scope == 'EU'
@@ -0,0 +1,117 @@
+"""
+Test Program Match Index
+Inverted index lookups agree with scanning programs, handle synonyms and update incrementally
+"""
+import random
+
+import pytest
+
+from app.ml.ml_recommendation_engine import MLRecommendationEngine
+from app.services.program_index import (
+    ProgramMatchIndex,
+    MATCH_NAME,
+    MATCH_FIELD,
+    MATCH_ALTERNATIVE,
+    expand_major,
+    text_matches,
+)
+
+
+PROGRAMS = [
+    {"id": "p1", "university_id": 1, "name": "Computer Science", "field": "Engineering"},
+    {"id": "p2", "university_id": 1, "name": "Physics", "field": "Science"},
+    {"id": "p3", "university_id": 2, "name": "Physics", "field": "Science"},
+    {"id": "p4", "university_id": 3, "name": "Business  &  Management", "field": "Business"},
+    {"id": "p5", "university_id": 4, "name": "Economics", "field": None},
+]
+
+
+@pytest.mark.unit
+def test_abbreviations_expand_to_full_names():
+    index = ProgramMatchIndex(PROGRAMS)
+
+    # "CS" means Computer Science and no longer matches the "cs" inside "Physics"
+    assert index.match("CS") == {1: MATCH_NAME}
+    assert index.match("econ") == {4: MATCH_NAME}
+    assert index.match("business and management") == {3: MATCH_NAME}
+
+
+@pytest.mark.unit
+def test_match_strengths():
+    index = ProgramMatchIndex(PROGRAMS)
+
+    assert index.match("Nursing", "science") == {1: MATCH_FIELD, 2: MATCH_FIELD}
+    assert index.match("Nursing", "science", ["Economics"]) == {1: MATCH_FIELD, 2: MATCH_FIELD, 4: MATCH_ALTERNATIVE}
+    assert index.match("phy", "engineering") == {1: MATCH_NAME, 2: MATCH_NAME}
+    assert index.university_ids == {1, 2, 3, 4}
+
+
+@pytest.mark.unit
+def test_incremental_update_and_remove():
+    index = ProgramMatchIndex(PROGRAMS)
+    assert index.match("physics") == {1: MATCH_NAME, 2: MATCH_NAME}
+
+    index.update([{"id": "p3", "university_id": 2, "name": "Chemistry", "field": "Science"}])
+    assert index.match("physics") == {1: MATCH_NAME}
+    assert index.match("chem") == {2: MATCH_NAME}
+
+    index.remove(["p5"])
+    assert index.match("economics") == {}
+    assert not index.has_programs(4)
+
+    # Copies are independent of the original
+    clone = index.copy()
+    clone.remove(["p1", "p2"])
+    assert index.match("computer science") == {1: MATCH_NAME}
+    assert clone.match("computer science") == {}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(10))
+def test_index_agrees_with_scan(seed):
+    rng = random.Random(seed)
+    words = ["computer", "science", "data", "bio", "chemistry", "engineering", "art", "history", "economics"]
+    programs = [
+        {
+            "id": i,
+            "university_id": rng.randint(1, 40),
+            "name": " ".join(rng.sample(words, rng.randint(1, 3))).title(),
+            "field": rng.choice(words + [None]),
+        }
+        for i in range(300)
+    ]
+    index = ProgramMatchIndex(programs)
+
+    for query in ["sci", "ata", "Computer Science", "bio", "art history", "y", "CS"]:
+        variants = expand_major(query)
+        expected = {p["university_id"] for p in programs if text_matches(variants, p["name"])}
+        assert set(index.match(query)) == expected
+
+
+@pytest.mark.unit
+def test_query_cache_is_a_bounded_lru():
+    index = ProgramMatchIndex(PROGRAMS, cache_size=2)
+
+    index.match("physics")
+    index.match("economics")
+    index.match("physics")           # Most recently used again
+    index.match("computer science")  # Evicts "economics"
+
+    assert len(index._query_cache) == 2
+    assert [key[0] for key in index._query_cache] == ["physics", "computer science"]
+    assert index.match("economics") == {4: MATCH_NAME}
+
+
+@pytest.mark.unit
+def test_ml_engine_program_score_reads_the_index():
+    engine = MLRecommendationEngine.__new__(MLRecommendationEngine)
+    index = ProgramMatchIndex(PROGRAMS)
+
+    def score(university_id, **student):
+        return engine._calculate_program_score(student, {"id": university_id}, index)
+
+    assert score(1, intended_major="CS") == 95.0
+    assert score(2, intended_major="CS", field_of_study="Science") == 80.0
+    assert score(3, intended_major="CS") == 50.0
+    assert score(99, intended_major="CS") == 60.0  # No programs listed
+    assert score(1) == 70.0
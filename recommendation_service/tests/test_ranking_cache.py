@@ -0,0 +1,150 @@
+"""
+Test Ranking Cache
+Generated rankings are paged and streamed by cursor without recomputation
+"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import recommendations as recommendations_api
+from app.database.config import get_db
+from app.services.catalog_snapshot import CatalogSnapshot
+from app.services.ranking_cache import RankingCache
+
+
+def _ranked(n):
+    return [
+        {
+            "student_id": "s1",
+            "university_id": i,
+            "match_score": 100.0 - i,
+            "category": ("Safety", "Match", "Reach")[i % 3],
+        }
+        for i in range(n)
+    ]
+
+
+def _stored(recommendations):
+    return [dict(rec, id=rec["university_id"], favorited=0, created_at="2025-01-01T00:00:00") for rec in recommendations]
+
+
+def _rows(n):
+    return _stored(_ranked(n))
+
+
+class FakeWriter:
+    """Records writes; `sync` stores the whole ranking"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def save_first(self, recommendations):
+        self.calls.append(("save_first", len(recommendations)))
+        return _stored(recommendations)
+
+    def sync(self, student_id, recommendations):
+        self.calls.append(("sync", len(recommendations)))
+        return _stored(recommendations)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def fake_rank(db, user_id, max_results):
+        calls.append(user_id)
+        return {"id": "s1"}, _ranked(45), "v1"
+
+    catalog = CatalogSnapshot([{"id": i, "name": f"U{i}", "country": "US"} for i in range(45)], {})
+    monkeypatch.setattr(recommendations_api, "_rank", fake_rank)
+    monkeypatch.setattr(recommendations_api, "RecommendationWriter", lambda db: FakeWriter(calls))
+    monkeypatch.setattr(recommendations_api, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(recommendations_api, "get_ranking_cache", lambda cache=RankingCache(): cache)
+
+    app = FastAPI()
+    app.include_router(recommendations_api.router)
+    app.dependency_overrides[get_db] = lambda: None
+    test_client = TestClient(app)
+    test_client.generate_calls = calls
+    return test_client
+
+
+@pytest.mark.unit
+def test_cache_expiry_and_eviction():
+    cache = RankingCache(ttl=60, max_entries=2)
+    first = cache.put("s1", _rows(3))
+    assert cache.get(first)["rows"][0]["university_id"] == 0
+
+    cache.put("s2", _rows(1))
+    cache.put("s3", _rows(1))
+    assert cache.get(first) is None
+
+    expired = RankingCache(ttl=-1).put("s1", _rows(1))
+    assert RankingCache().get(expired) is None
+
+
+@pytest.mark.unit
+def test_pages_served_from_cursor(client):
+    first = client.post("/recommendations/generate/ranked?page_size=20", json={"user_id": "u1"}).json()
+    assert first["total"] == 45
+    assert first["page"] == 1 and first["total_pages"] == 3 and first["has_next"]
+    assert first["model_version"] == "v1"
+
+    last = client.get(f"/recommendations/ranked/{first['cursor']}?page=3&page_size=20").json()
+    ids = [r["id"] for group in ("safety_schools", "match_schools", "reach_schools") for r in last[group]]
+    assert sorted(ids) == list(range(40, 45))
+    assert not last["has_next"]
+
+    assert client.generate_calls == ["u1", ("save_first", 20), ("sync", 45)]
+    assert client.get("/recommendations/ranked/unknown").status_code == 410
+
+
+@pytest.mark.unit
+def test_ndjson_stream_in_rank_order(client):
+    response = client.post("/recommendations/generate/ranked?stream=ndjson", json={"user_id": "u1"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["total"] == 45 and lines[0]["cursor"]
+    assert [line["rank"] for line in lines[1:]] == list(range(1, 46))
+    assert lines[1]["universities"]["name"] == "U0"
+
+
+@pytest.mark.unit
+def test_explicit_max_results_caps_the_ranking(client):
+    first = client.post("/recommendations/generate/ranked?page_size=4", json={"user_id": "u1", "max_results": 10}).json()
+
+    assert first["total"] == 10 and first["total_pages"] == 3
+    assert client.generate_calls == ["u1", ("save_first", 4), ("sync", 10)]
+
+
+@pytest.mark.unit
+def test_stream_reports_a_failed_save(client, monkeypatch):
+    class BrokenWriter(FakeWriter):
+        def sync(self, student_id, recommendations):
+            raise RuntimeError("db down")
+
+    monkeypatch.setattr(recommendations_api, "RecommendationWriter", lambda db: BrokenWriter([]))
+    response = client.post("/recommendations/generate/ranked?stream=ndjson", json={"user_id": "u1"})
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["rank"] for line in lines[1:-1]] == list(range(1, 46))
+    assert "id" not in lines[1] and lines[1]["university_id"] == 0
+    assert "error" in lines[-1]
+    assert client.get(f"/recommendations/ranked/{lines[0]['cursor']}").status_code == 410
+
+
+@pytest.mark.unit
+def test_unstored_pages_are_not_served(client):
+    cache = recommendations_api.get_ranking_cache()
+    cursor = cache.put("s1", _rows(20) + _ranked(25), "v1", pending=True)
+
+    assert client.get(f"/recommendations/ranked/{cursor}?page=1&page_size=20").status_code == 200
+    response = client.get(f"/recommendations/ranked/{cursor}?page=2&page_size=20")
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
+
+    cache.replace(cursor, "s1", _rows(45), "v1")
+    assert client.get(f"/recommendations/ranked/{cursor}?page=2&page_size=20").status_code == 200
@@ -0,0 +1,67 @@
+"""
+Test Sliding-Window Rate Limiter
+Per-key limits, window roll-over, LRU eviction and backend fallback
+"""
+import pytest
+
+from app.middleware import rate_limiting
+from app.middleware.rate_limiting import MemoryRateLimitBackend, RateLimiter
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock(6000.0)  # Start of a 60s window
+    monkeypatch.setattr(rate_limiting.time, "time", fake.time)
+    return fake
+
+
+@pytest.mark.unit
+def test_limit_per_key(clock):
+    limiter = RateLimiter("test", limit=3, window=60, backend=MemoryRateLimitBackend())
+
+    assert [limiter.allow("a") for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("b")
+
+
+@pytest.mark.unit
+def test_previous_window_is_weighted(clock):
+    limiter = RateLimiter("test", limit=4, window=60, backend=MemoryRateLimitBackend())
+    assert all(limiter.allow("a") for _ in range(4))
+
+    # Half-way into the next window half of the previous 4 hits still count
+    clock.now += 90
+    assert [limiter.allow("a") for _ in range(3)] == [True, True, False]
+
+    # Two windows later nothing carries over
+    clock.now += 120
+    assert all(limiter.allow("a") for _ in range(4))
+
+
+@pytest.mark.unit
+def test_memory_backend_evicts_least_recent_keys(clock):
+    backend = MemoryRateLimitBackend(max_keys=2)
+    limiter = RateLimiter("test", limit=1, window=60, backend=backend)
+
+    assert limiter.allow("a")
+    assert limiter.allow("b")
+    assert limiter.allow("c")
+    assert len(backend._counters) == 2
+    assert limiter.allow("a")  # Evicted, so starts fresh
+
+
+@pytest.mark.unit
+def test_backend_errors_fall_back_to_memory(clock):
+    class Broken:
+        def hit(self, key, limit, window):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter("test", limit=2, window=60, backend=Broken())
+    assert [limiter.allow("a") for _ in range(3)] == [True, True, False]
@@ -0,0 +1,102 @@
+"""
+Test Recommendation Writer
+Only changed recommendations are written and student-owned columns survive
+"""
+import pytest
+
+from app.services.recommendation_writer import RecommendationWriter, diff_recommendations
+
+
+def _rec(university_id, score, category="Match"):
+    return {
+        "student_id": "s1",
+        "university_id": university_id,
+        "match_score": score,
+        "category": category,
+        "academic_score": 50.0,
+        "financial_score": 50.0,
+        "program_score": 50.0,
+        "location_score": 50.0,
+        "characteristics_score": 50.0,
+        "strengths": ["Good fit"],
+        "concerns": [],
+        "favorited": 0,
+        "notes": None,
+    }
+
+
+def _stored(row_id, university_id, score, **state):
+    return dict(_rec(university_id, score), id=row_id, created_at="2025-01-01T00:00:00", **state)
+
+
+class _FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.ops = []
+
+    def __getattr__(self, name):
+        def op(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+        return op
+
+    def execute(self):
+        self.db.calls.append(self.ops)
+        name, args, _ = self.ops[0]
+        data = []
+        if name == 'select':
+            data = self.db.rows
+        elif name == 'upsert':
+            data = [dict(row, id=1000 + i, favorited=0, notes=None) for i, row in enumerate(args[0])]
+        return type('Response', (), {'data': data})()
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+@pytest.mark.unit
+def test_diff_classifies_rows():
+    stored = [
+        _stored(1, 10, 80.0, favorited=1, notes="visit"),
+        _stored(2, 20, 70.0),
+        _stored(3, 30, 60.0),
+    ]
+    generated = [_rec(10, 80.001), _rec(20, 72.5), _rec(40, 55.0)]
+
+    unchanged, to_upsert, to_delete = diff_recommendations(stored, generated)
+
+    assert [row["id"] for row in unchanged] == [1]
+    assert [row["university_id"] for row in to_upsert] == [20, 40]
+    assert all("favorited" not in row and "notes" not in row for row in to_upsert)
+    assert to_delete == [3]
+
+
+@pytest.mark.unit
+def test_sync_skips_writes_when_nothing_changed():
+    db = _FakeDB([_stored(1, 10, 80.0, favorited=1), _stored(2, 20, 70.0)])
+
+    rows = RecommendationWriter(db).sync("s1", [_rec(20, 70.0), _rec(10, 80.0)])
+
+    assert [call[0][0] for call in db.calls] == ['select']
+    assert [row["id"] for row in rows] == [1, 2]
+    assert rows[0]["favorited"] == 1
+
+
+@pytest.mark.unit
+def test_sync_returns_ranked_rows_without_rereading():
+    db = _FakeDB([_stored(1, 10, 80.0, notes="keep"), _stored(2, 20, 70.0)])
+
+    rows = RecommendationWriter(db).sync("s1", [_rec(10, 80.0), _rec(30, 90.0, "Safety")])
+
+    assert [call[0][0] for call in db.calls] == ['select', 'upsert', 'delete']
+    assert [row["university_id"] for row in rows] == [30, 10]
+    assert rows[1]["notes"] == "keep"
+    delete_call = db.calls[2]
+    assert ('in_', ('id', [2]), {}) in delete_call
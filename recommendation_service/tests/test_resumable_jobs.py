@@ -0,0 +1,233 @@
+"""
+Test Resumable Jobs
+Exclusive regeneration/notification job claims with heartbeat leases, cursor resume and stale recommendation cleanup
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import config
+
+
+class _Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db = db
+        self.rows = db.tables.setdefault(table, [])
+        self.filters = []
+        self.action = None
+        self.limit_rows = None
+
+    def select(self, columns, count=None):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row[column] < value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression):
+        tests = []
+        for condition in expression.split(','):
+            column, op, value = condition.split('.', 2)
+            if op == 'is':
+                tests.append(lambda row, c=column: row.get(c) is None)
+            else:
+                tests.append(lambda row, c=column, v=value: row.get(c) is not None and row[c] < v)
+        self.filters.append(lambda row: any(test(row) for test in tests))
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by = column
+        return self
+
+    def limit(self, n):
+        self.limit_rows = n
+        return self
+
+    def insert(self, row):
+        self.action = ('insert', row)
+        return self
+
+    def update(self, fields):
+        self.action = ('update', fields)
+        return self
+
+    def upsert(self, rows, on_conflict=None, default_to_null=True, returning=None):
+        self.action = ('upsert', rows, on_conflict.split(','))
+        return self
+
+    def delete(self, returning=None):
+        self.action = ('delete',)
+        return self
+
+    def execute(self):
+        matching = [row for row in self.rows if all(f(row) for f in self.filters)]
+        if self.action is None:
+            matching = sorted(matching, key=lambda row: row.get(getattr(self, 'order_by', 'id'), ''))
+            return _Response([dict(row) for row in matching[:self.limit_rows or None]])
+
+        kind = self.action[0]
+        if kind == 'insert':
+            self.rows.append(dict(self.action[1]))
+            return _Response([self.action[1]])
+        if kind == 'update':
+            for row in matching:
+                row.update(self.action[1])
+            return _Response([dict(row) for row in matching])
+        if kind == 'delete':
+            self.rows[:] = [row for row in self.rows if row not in matching]
+            return _Response(None)
+
+        _, rows, keys = self.action
+        for new in rows:
+            existing = next((row for row in self.rows if all(row[k] == new[k] for k in keys)), None)
+            if existing is None:
+                self.rows.append(dict(new))
+            else:
+                existing.update(new)  # default_to_null=False: omitted columns keep their values
+        return _Response(None)
+
+
+class _FakeDB:
+    def __init__(self, **tables):
+        self.tables = tables
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+if config._supabase_client is None:
+    config._supabase_client = _FakeDB()  # app.jobs builds its enrichment queue on import
+
+from app.jobs import regeneration_worker  # noqa: E402
+from app.jobs.job_queue import (  # noqa: E402
+    JOB_LEASE_SECONDS,
+    JobStatus,
+    NotificationJobQueue,
+    RegenerationJobQueue,
+)
+from app.jobs.regeneration_worker import RegenerationWorker  # noqa: E402
+
+
+def _job(job_id, status, age, cursor=None, created=0):
+    now = datetime.utcnow()
+    return {
+        'job_id': job_id, 'status': status, 'cursor': cursor,
+        'created_at': (now - timedelta(hours=2, minutes=-created)).isoformat(),
+        'updated_at': (now - age).isoformat(),
+    }
+
+
+def _queue(db, queue_class=RegenerationJobQueue):
+    """A fresh process's view of the queue (the class itself is a per-process singleton)"""
+    queue = object.__new__(queue_class)
+    queue.jobs, queue.pending_queue, queue.db = {}, [], db
+    queue._load_pending_jobs()
+    return queue
+
+
+@pytest.mark.unit
+def test_claims_are_exclusive_and_only_stale_jobs_resume():
+    lease = timedelta(seconds=JOB_LEASE_SECONDS)
+    db = _FakeDB(recommendation_jobs=[
+        _job('live', 'running', lease / 10, cursor='s03', created=1),   # Its worker is still alive
+        _job('crashed', 'running', lease * 2, cursor='s05', created=2),
+        _job('queued', 'pending', timedelta(0), created=3),
+        _job('done', 'completed', lease * 2, created=4),
+    ])
+
+    first, second = _queue(db), _queue(db)
+    assert sorted(first.pending_queue) == sorted(second.pending_queue) == ['crashed', 'queued']
+
+    job = first.claim_job('crashed')
+    assert job.status == JobStatus.RUNNING and job.cursor == 's05'
+    assert second.claim_job('crashed') is None  # Heartbeat just renewed by the first claim
+    assert second.claim_job('queued').job_id == 'queued'
+    assert first.claim_job('queued') is None
+    assert first.pending_queue == [] and second.pending_queue == []
+
+    first.update_job_progress('crashed', processed=2, written=30, cursor='s07')
+    row = next(row for row in db.tables['recommendation_jobs'] if row['job_id'] == 'crashed')
+    assert (row['cursor'], row['processed_students']) == ('s07', 2)
+    assert row['updated_at'] > (datetime.utcnow() - timedelta(seconds=5)).isoformat()
+
+    # Nothing to pick up until a lease runs out again
+    assert _queue(db).pending_queue == []
+
+
+@pytest.mark.unit
+def test_notification_job_is_delivered_by_one_worker():
+    lease = timedelta(seconds=JOB_LEASE_SECONDS)
+    db = _FakeDB(notification_jobs=[
+        dict(_job('broadcast', 'running', lease * 3, cursor='u040'), notifications_created=40, processed_users=40),
+    ])
+    workers = [_queue(db, NotificationJobQueue) for _ in range(3)]  # e.g. a rolling restart
+
+    claimed = [queue.claim_job('broadcast') for queue in workers]
+    owners = [queue for queue, job in zip(workers, claimed) if job is not None]
+    assert len(owners) == 1
+    job = owners[0].jobs['broadcast']
+    assert (job.cursor, job.notifications_created) == ('u040', 40)  # Resumes with stored counters
+
+    owners[0].update_job_progress('broadcast', processed=10, created=10, cursor='u050')
+    row = db.tables['notification_jobs'][0]
+    assert (row['notifications_created'], row['cursor']) == (50, 'u050')
+
+
+@pytest.mark.unit
+def test_student_pages_resume_after_cursor(monkeypatch):
+    monkeypatch.setattr(regeneration_worker, 'PAGE_SIZE', 3)
+    db = _FakeDB(student_profiles=[{'id': f's{i:02d}'} for i in range(10)])
+    worker = RegenerationWorker.__new__(RegenerationWorker)
+    worker.db = db
+
+    queue = _queue(_FakeDB())
+    job = queue.create_job()
+    job.cursor = 's04'
+    pages = list(worker._student_pages(job))
+    assert [[s['id'] for s in page] for page in pages] == [['s05', 's06', 's07'], ['s08', 's09']]
+
+    chosen = queue.create_job(student_ids=['s09', 's01', 's06', 's03'])
+    chosen.cursor = 's03'
+    assert [s['id'] for page in worker._student_pages(chosen) for s in page] == ['s06', 's09']
+
+
+@pytest.mark.unit
+def test_write_chunk_replaces_stale_rows_and_keeps_user_state():
+    old = '2020-01-01T00:00:00'
+    db = _FakeDB(recommendations=[
+        {'student_id': 's1', 'university_id': 1, 'match_score': 50, 'favorited': 1, 'generated_at': old},
+        {'student_id': 's1', 'university_id': 2, 'match_score': 40, 'favorited': 0, 'generated_at': old},
+        {'student_id': 's2', 'university_id': 3, 'match_score': 70, 'favorited': 0, 'generated_at': old},
+    ])
+    worker = RegenerationWorker.__new__(RegenerationWorker)
+    worker.db = db
+
+    recommendations = [
+        {'student_id': 's1', 'university_id': 1, 'match_score': 90, 'favorited': 0},
+        {'student_id': 's1', 'university_id': 9, 'match_score': 80, 'favorited': 0},
+    ]
+    assert worker._write_chunk(['s1', 's2'], ['s2'], recommendations) == 2
+
+    rows = {(r['student_id'], r['university_id']): r for r in db.tables['recommendations']}
+    assert set(rows) == {('s1', 1), ('s1', 9), ('s2', 3)}  # s1/2 not regenerated; s2 failed, kept
+    assert rows[('s1', 1)]['match_score'] == 90 and rows[('s1', 1)]['favorited'] == 1
+    assert rows[('s2', 3)]['generated_at'] == old
@@ -0,0 +1,189 @@
+"""
+Test Unread Counters
+Send/read/delete keep per-conversation unread counts equal to a full recount
+"""
+import asyncio
+
+import pytest
+
+from app.schemas.messaging import MessageCreateRequest, ReadReceiptRequest
+from app.services import messaging_service
+from app.services.unread_counters import COUNTERS_TABLE
+
+
+class _Query:
+    """Just enough of the PostgREST builder for MessagingService"""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.rows = db.tables.setdefault(table, [])
+        self.filters = []
+        self.action = None
+        self.negate = False
+        self.is_single = False
+
+    def select(self, *args, **kwargs):
+        self.action = self.action or ('select', None)
+        return self
+
+    def insert(self, row):
+        self.action = ('insert', row)
+        return self
+
+    def update(self, values):
+        self.action = ('update', values)
+        return self
+
+    def _filter(self, test):
+        negate, self.negate = self.negate, False
+        self.filters.append((lambda row: not test(row)) if negate else test)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(lambda row: row.get(column) == value)
+
+    def gt(self, column, value):
+        return self._filter(lambda row: row.get(column, 0) > value)
+
+    def in_(self, column, values):
+        return self._filter(lambda row: row.get(column) in values)
+
+    def contains(self, column, values):
+        return self._filter(lambda row: set(values) <= set(row.get(column) or []))
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def single(self):
+        self.is_single = True
+        return self
+
+    def execute(self):
+        self.db.queries += 1
+        action, payload = self.action
+        if action == 'insert':
+            self.rows.append(dict(payload))
+            data = [dict(payload)]
+        else:
+            matched = [row for row in self.rows if all(test(row) for test in self.filters)]
+            if action == 'update':
+                for row in matched:
+                    row.update(payload)
+            data = [dict(row) for row in matched]
+            if self.is_single:
+                data = data[0] if data else None
+        return type('Response', (), {'data': data, 'count': None})()
+
+
+class _FakeDB:
+    def __init__(self):
+        self.tables = {}
+        self.queries = 0
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def _counter(self, user_id, conversation_id):
+        rows = self.tables.setdefault(COUNTERS_TABLE, [])
+        for row in rows:
+            if row['user_id'] == user_id and row['conversation_id'] == conversation_id:
+                return row
+        row = {'user_id': user_id, 'conversation_id': conversation_id, 'unread_count': 0}
+        rows.append(row)
+        return row
+
+    def rpc(self, name, params):
+        """In-memory versions of the migration's counter functions"""
+        def run():
+            if name == 'increment_unread_counts':
+                conv = next(c for c in self.tables['conversations'] if c['id'] == params['p_conversation_id'])
+                for pid in conv['participant_ids']:
+                    if pid != params['p_sender_id']:
+                        self._counter(pid, conv['id'])['unread_count'] += 1
+            elif name == 'decrement_unread_counts':
+                for pid in params['p_user_ids']:
+                    row = self._counter(pid, params['p_conversation_id'])
+                    row['unread_count'] = max(row['unread_count'] - params['p_amount'], 0)
+            return type('Response', (), {'data': None})()
+        return type('Rpc', (), {'execute': staticmethod(run)})()
+
+
+def _recount(db, user_id):
+    """What the old implementation computed by scanning every message"""
+    counts = {}
+    for message in db.tables.get('messages', []):
+        if message['is_deleted'] or message['sender_id'] == user_id:
+            continue
+        conv = next(c for c in db.tables['conversations'] if c['id'] == message['conversation_id'])
+        if user_id in conv['participant_ids'] and user_id not in message['read_by']:
+            counts[conv['id']] = counts.get(conv['id'], 0) + 1
+    return counts
+
+
+@pytest.fixture
+def service(monkeypatch):
+    db = _FakeDB()
+    db.tables['conversations'] = [
+        {'id': 'c1', 'participant_ids': ['alice', 'bob']},
+        {'id': 'c2', 'participant_ids': ['alice', 'bob', 'carol']},
+    ]
+    monkeypatch.setattr(messaging_service, 'get_supabase', lambda: db)
+    svc = messaging_service.MessagingService()
+
+    async def participant_check(conversation_id, user_id):
+        return None
+
+    monkeypatch.setattr(svc, 'get_conversation', participant_check)
+    svc.fake_db = db
+    return svc
+
+
+def _send(service, sender, conversation_id, text='hi'):
+    return asyncio.run(service.send_message(sender, MessageCreateRequest(conversation_id=conversation_id, content=text)))
+
+
+@pytest.mark.unit
+def test_counters_track_send_read_delete(service):
+    db = service.fake_db
+    m1 = _send(service, 'alice', 'c1')
+    _send(service, 'alice', 'c1')
+    m3 = _send(service, 'bob', 'c2')
+    _send(service, 'alice', 'c2')
+
+    assert asyncio.run(service.get_unread_count('bob')) == {
+        'total_unread': 3, 'by_conversation': {'c1': 2, 'c2': 1}
+    }
+
+    # Reading twice (or a concurrent duplicate) only counts once
+    asyncio.run(service.mark_messages_as_read('bob', ReadReceiptRequest(message_ids=[m1.id, m1.id])))
+    asyncio.run(service.mark_messages_as_read('bob', ReadReceiptRequest(message_ids=[m1.id])))
+    # Deleting a message only affects participants who hadn't read it
+    asyncio.run(service.mark_messages_as_read('carol', ReadReceiptRequest(message_ids=[m3.id])))
+    asyncio.run(service.delete_message(m3.id, 'bob'))
+
+    for user in ('alice', 'bob', 'carol'):
+        assert asyncio.run(service.get_unread_count(user))['by_conversation'] == _recount(db, user)
+
+
+@pytest.mark.unit
+def test_badges_are_one_query(service):
+    for _ in range(5):
+        _send(service, 'alice', 'c1')
+        _send(service, 'carol', 'c2')
+
+    before = service.fake_db.queries
+    result = asyncio.run(service.get_unread_count('bob'))
+
+    assert result['total_unread'] == 10
+    assert service.fake_db.queries - before == 1
+
+
+@pytest.mark.unit
+def test_non_participants_cannot_mark_read(service):
+    message = _send(service, 'alice', 'c1')
+    result = asyncio.run(service.mark_messages_as_read('carol', ReadReceiptRequest(message_ids=[message.id])))
+
+    assert result['marked_count'] == 0
+    assert asyncio.run(service.get_unread_count('bob'))['total_unread'] == 1
@@ -0,0 +1,107 @@
+"""
+Test User Growth Analytics
+Growth windows, comparisons and role totals computed from daily rollups
+"""
+import asyncio
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.services.user_growth import UserGrowthEngine, UserGrowthSnapshot
+
+
+NOW = datetime(2025, 7, 15, 12, 0, tzinfo=timezone.utc)
+
+ROWS = [
+    {'registration_date': '2024-09-10', 'role': 'student', 'user_count': 4},   # Comparison period
+    {'registration_date': '2024-12-31', 'role': 'parent', 'user_count': 1},    # Comparison period
+    {'registration_date': '2025-02-10', 'role': 'student', 'user_count': 3},
+    {'registration_date': '2025-02-20', 'role': 'counselor', 'user_count': 1},
+    {'registration_date': '2025-05-02', 'role': 'student', 'user_count': 2},
+    {'registration_date': '2025-07-14', 'role': 'parent', 'user_count': 2},
+    {'registration_date': '2025-07-14', 'role': 'institution', 'user_count': 0},  # Emptied by role changes
+]
+
+
+@pytest.mark.unit
+def test_growth_series_and_comparison():
+    growth = UserGrowthSnapshot(ROWS).growth("6_months", NOW)
+
+    assert [(p['label'], p['value']) for p in growth['data_points']] == [('Feb', 4), ('May', 6), ('Jul', 8)]
+    assert growth['data_points'][0]['date'] == datetime(2025, 2, 1, tzinfo=timezone.utc)
+    assert growth['total_users'] == 13
+    assert growth['comparison_period_users'] == 5
+    assert growth['growth_rate'] == 60.0
+    assert growth['average_per_period'] == round(8 / 6, 2)
+
+
+@pytest.mark.unit
+def test_windows_and_roles():
+    snapshot = UserGrowthSnapshot(ROWS)
+
+    assert snapshot.registrations(date(2025, 7, 8)) == 2
+    assert snapshot.registrations(date(2025, 2, 10), date(2025, 2, 20)) == 3
+    assert snapshot.registrations(date(2026, 1, 1)) == 0
+    assert snapshot.role_counts == {'student': 9, 'parent': 3, 'counselor': 1}
+
+    three_months = snapshot.growth("3_months", NOW)
+    assert three_months['comparison_period_users'] == 4 and three_months['growth_rate'] == 0.0
+
+
+class _Query:
+    def __init__(self, db):
+        self.db = db
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def range(self, start, end):
+        self.page = self.db.rows[start:end + 1]
+        return self
+
+    def execute(self):
+        self.db.loads += 1
+        return type('Response', (), {'data': self.page})()
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+
+    def table(self, name):
+        return _Query(self)
+
+
+@pytest.mark.unit
+def test_engine_caches_until_invalidated():
+    db = _FakeDB(ROWS)
+    engine = UserGrowthEngine(ttl=300)
+
+    first = asyncio.run(engine.get_snapshot(db))
+    assert asyncio.run(engine.get_snapshot(db)) is first
+    assert db.loads == 1
+
+    db.rows = ROWS + [{'registration_date': '2025-07-15', 'role': 'student', 'user_count': 1}]
+    engine.invalidate()
+    assert asyncio.run(engine.get_snapshot(db)).total_users == 14
+
+
+@pytest.mark.unit
+def test_invalidation_during_a_load_is_not_lost():
+    engine = UserGrowthEngine(ttl=300)
+
+    class _InvalidatingDB(_FakeDB):
+        def table(self, name):
+            engine.invalidate()  # A signup lands while the rollups are being read
+            return _Query(self)
+
+    db = _InvalidatingDB(ROWS)
+    asyncio.run(engine.get_snapshot(db))
+    db.table = lambda name: _Query(db)
+    asyncio.run(engine.get_snapshot(db))
+
+    assert db.loads == 2
+
+    with engine._lock:  # A load in progress does not block invalidation
+        engine.invalidate()
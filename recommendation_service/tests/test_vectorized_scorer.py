@@ -0,0 +1,119 @@
+"""
+Test Vectorized Scorer
+Checks the columnar scoring path against RecommendationEngine per-dict scoring
+"""
+import random
+
+import pytest
+
+from app.services.recommendation_engine import RecommendationEngine
+from app.services.vectorized_scorer import (
+    CATEGORY_NAMES,
+    UniversityColumns,
+    VectorizedScorer,
+    select_diverse_indices,
+)
+
+
+STATES = ["CA", "NY", "TX", "MA", "", None]
+COUNTRIES = ["United States", "Canada", "Kenya", "Ghana", None]
+LOCATION_TYPES = ["Urban", "Suburban", "Rural", None]
+UNIVERSITY_TYPES = ["Public", "Private", None]
+PROGRAM_NAMES = ["Computer Science", "Business Administration", "Biology", "Mechanical Engineering"]
+FIELDS = ["Engineering", "Business", "Science", None]
+
+
+def _maybe(rng, value, p=0.8):
+    return value if rng.random() < p else None
+
+
+def _random_university(rng, univ_id):
+    return {
+        "id": univ_id,
+        "gpa_average": _maybe(rng, round(rng.uniform(2.5, 4.0), 2)),
+        "sat_math_25th": _maybe(rng, rng.choice([0, rng.randint(450, 700)])),
+        "sat_math_75th": _maybe(rng, rng.randint(550, 800)),
+        "sat_ebrw_25th": _maybe(rng, rng.randint(450, 700)),
+        "sat_ebrw_75th": _maybe(rng, rng.randint(550, 800)),
+        "act_composite_25th": _maybe(rng, rng.randint(18, 30)),
+        "act_composite_75th": _maybe(rng, rng.choice([0, rng.randint(22, 36)])),
+        "total_cost": _maybe(rng, rng.choice([0, rng.randint(5000, 90000)])),
+        "total_students": _maybe(rng, rng.randint(500, 40000)),
+        "state": rng.choice(STATES),
+        "country": rng.choice(COUNTRIES),
+        "location_type": rng.choice(LOCATION_TYPES),
+        "university_type": rng.choice(UNIVERSITY_TYPES),
+    }
+
+
+def _random_student(rng):
+    return {
+        "id": 1,
+        "gpa": _maybe(rng, round(rng.uniform(2.0, 4.0), 2)),
+        "sat_total": _maybe(rng, rng.randint(900, 1600)),
+        "act_composite": _maybe(rng, rng.randint(15, 36)),
+        "class_rank": _maybe(rng, rng.randint(1, 50), p=0.5),
+        "class_size": _maybe(rng, 300, p=0.5),
+        "max_budget_per_year": _maybe(rng, rng.randint(10000, 80000)),
+        "intended_major": _maybe(rng, rng.choice(["computer science", "Biology", "Nursing"])),
+        "field_of_study": _maybe(rng, rng.choice(["engineering", "business"])),
+        "preferred_states": _maybe(rng, rng.sample(STATES[:4], 2), p=0.5),
+        "preferred_countries": _maybe(rng, rng.sample(COUNTRIES[:4], 2), p=0.5),
+        "location_type_preference": rng.choice(LOCATION_TYPES),
+        "preferred_university_type": rng.choice(UNIVERSITY_TYPES),
+        "preferred_size": rng.choice(["Small", "Medium", "Large", None]),
+    }
+
+
+def _random_programs(rng, universities):
+    programs_by_university = {}
+    for university in universities:
+        if rng.random() < 0.3:
+            continue
+        programs_by_university[university["id"]] = [
+            {"name": rng.choice(PROGRAM_NAMES), "field": rng.choice(FIELDS)}
+            for _ in range(rng.randint(1, 4))
+        ]
+    return programs_by_university
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(25))
+def test_scores_match_per_dict_scoring(seed):
+    """Every dimension and the weighted total are identical to the per-dict path"""
+    rng = random.Random(seed)
+    universities = [_random_university(rng, i) for i in range(200)]
+    programs_by_university = _random_programs(rng, universities)
+    student = _random_student(rng)
+
+    engine = RecommendationEngine(db=None)
+    scores = VectorizedScorer(UniversityColumns(universities)).score(student, programs_by_university)
+
+    for i, university in enumerate(universities):
+        expected = engine._calculate_scores(student, university, programs_by_university)
+        for key, value in expected.items():
+            assert scores[key][i] == value, (key, university)
+        assert scores["total"][i] == engine._calculate_total_score(expected)
+        assert CATEGORY_NAMES[scores["category"][i]] == engine._determine_category(student, university, expected)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("max_results", [1, 5, 15, 50])
+def test_diverse_selection_matches_sorted_selection(seed, max_results):
+    """argpartition-based top-K picks the same universities in the same order"""
+    rng = random.Random(seed)
+    universities = [_random_university(rng, i) for i in range(120)]
+    student = _random_student(rng)
+
+    engine = RecommendationEngine(db=None)
+    scores = VectorizedScorer(UniversityColumns(universities)).score(student, {})
+
+    scored = [
+        {"index": i, "total_score": scores["total"][i], "category": CATEGORY_NAMES[scores["category"][i]]}
+        for i in range(len(universities))
+    ]
+    scored.sort(key=lambda x: x["total_score"], reverse=True)
+    expected = [item["index"] for item in engine._select_diverse_recommendations(scored, max_results)]
+
+    assert select_diverse_indices(scores["total"], scores["category"], max_results) == expected
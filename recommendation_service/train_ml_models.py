@@ -14,7 +14,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 from app.database.config import get_supabase
 from app.ml.feature_engineering import FeatureEngineer
 from app.ml.models import EnsembleRecommendationModel
-from app.services.recommendation_engine import RecommendationEngine
+from app.ml.model_registry import publish_model
+from app.services.program_index import ProgramMatchIndex
+from app.services.vectorized_scorer import UniversityColumns, VectorizedScorer
 
 # Configure logging
 logging.basicConfig(
@@ -95,22 +97,14 @@ def generate_synthetic_training_data(
 
     # Calculate rule-based scores as training labels
     logger.info("Calculating rule-based scores as training labels...")
-    rule_engine = RecommendationEngine(db)
-
-    scores_list = []
-    for student in students:
-        student_scores = []
-        for university in universities:
-            programs = programs_by_university.get(university['id'], [])
-            dimension_scores = rule_engine._calculate_scores(
-                student, university, programs_by_university
-            )
-            total_score = rule_engine._calculate_total_score(dimension_scores)
-            student_scores.append(total_score)
-
-        scores_list.append(student_scores)
-
-    scores = np.array(scores_list)
+    # Columnar scorer gives the same totals as RecommendationEngine per-dict scoring
+    scorer = VectorizedScorer(UniversityColumns(universities))
+    program_index = ProgramMatchIndex.from_programs_by_university(programs_by_university)
+
+    scores = np.array([
+        scorer.score(student, programs_by_university, program_index)["total"]
+        for student in students
+    ])
     logger.info(f"Calculated scores matrix: {scores.shape}")
 
     return students, universities, programs_by_university, scores
@@ -158,16 +152,14 @@ def train_models(model_dir: str = "ml_models"):
     logger.info(f"Saving models to {model_dir}")
     logger.info("=" * 80)
 
-    os.makedirs(model_dir, exist_ok=True)
-    ml_model.save(model_dir)
+    version = publish_model(ml_model, model_dir)
 
     logger.info("✅ Model training completed successfully!")
-    logger.info(f"✅ Models saved to {model_dir}/")
+    logger.info(f"✅ Model version {version} published to {model_dir}/")
     logger.info("")
     logger.info("To use the trained models:")
-    logger.info("1. The models will be automatically loaded by the API")
-    logger.info("2. Set ML_MODELS_DIR environment variable (default: ./ml_models)")
-    logger.info("3. Restart the API server")
+    logger.info("1. Set ML_MODELS_DIR environment variable (default: ./ml_models)")
+    logger.info("2. Running API workers switch to the new version automatically (no restart needed)")
 
 
 if __name__ == "__main__":